@@ -3,7 +3,8 @@ API routes for dataset management with full database integration
 Handle image datasets, uploads, and auto-labeling
 """
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Form, BackgroundTasks
+from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Form, BackgroundTasks, Header
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
@@ -16,6 +17,8 @@ from database.operations import (
 from database.models import Annotation
 from core.file_handler import file_handler
 from core.auto_labeler import auto_labeler
+from core.thumbnail_cache import cached_file_thumbnail, render_thumbnail, warm_file_thumbnails
+from utils.path_utils import path_manager
 from models.model_manager import model_manager
 from logging_system.professional_logger import get_professional_logger
 
@@ -86,6 +89,7 @@ class AutoLabelRequest(BaseModel):
     confidence_threshold: float = 0.5
     iou_threshold: float = 0.45
     overwrite_existing: bool = False
+    batch_size: Optional[int] = None  # None -> settings.AUTO_LABEL_BATCH_SIZE
 
 
 @router.get("/", response_model=List[Dict[str, Any]])
@@ -546,7 +550,8 @@ async def start_auto_labeling(
             confidence_threshold=request.confidence_threshold,
             iou_threshold=request.iou_threshold,
             overwrite_existing=request.overwrite_existing,
-            job_id=job.id
+            job_id=job.id,
+            batch_size=request.batch_size
         )
         
         logger.info("operations.operations", f"Auto-labeling job started successfully", "auto_labeling_job_started", {
@@ -710,6 +715,63 @@ async def get_image_by_id(
         raise HTTPException(status_code=500, detail=f"Failed to get image: {str(e)}")
 
 
+@router.get("/images/{image_id}/thumbnail")
+def get_image_thumbnail(
+    image_id: str,
+    size: int = 256,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    db: Session = Depends(get_db)
+):
+    """
+    Thumbnail of a dataset image (cached on disk, ETag / 304 aware)
+    A plain def so FastAPI runs it in the thread pool: a cache miss hashes and decodes the source
+    """
+    image = ImageOperations.get_image(db, image_id)
+    if not image or not image.file_path:
+        raise HTTPException(status_code=404, detail="Image not found")
+    absolute_path = path_manager.get_absolute_path(image.file_path)
+    if not absolute_path.exists():
+        raise HTTPException(status_code=404, detail="Image file not found")
+    
+    try:
+        response = cached_file_thumbnail(str(absolute_path), size, if_none_match)
+        if response is None:
+            # Thumbnail cache disabled: render on every request
+            with open(absolute_path, "rb") as source:
+                data, media_type = render_thumbnail(source, size)
+            response = Response(content=data, media_type=media_type)
+        return response
+    except Exception as e:
+        logger.error("errors.system", f"Error creating image thumbnail", "image_thumbnail_error", {
+            "image_id": image_id,
+            "size": size,
+            "error": str(e)
+        })
+        raise HTTPException(status_code=500, detail=f"Failed to create thumbnail: {str(e)}")
+
+
+@router.post("/{dataset_id}/thumbnails/warm")
+async def warm_dataset_thumbnails(
+    dataset_id: str,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """Render missing thumbnails (all configured sizes) for a dataset in the background"""
+    dataset = DatasetOperations.get_dataset(db, dataset_id)
+    if not dataset:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    
+    images = ImageOperations.get_images_by_dataset(db, dataset_id, limit=None)
+    paths = [str(path_manager.get_absolute_path(image.file_path)) for image in images if image.file_path]
+    background_tasks.add_task(warm_file_thumbnails, paths, None, {"dataset_id": dataset_id})
+    
+    logger.info("operations.images", f"Thumbnail warm-up scheduled", "thumbnail_warm_scheduled", {
+        "dataset_id": dataset_id,
+        "image_count": len(paths)
+    })
+    return {"dataset_id": dataset_id, "image_count": len(paths), "status": "warming"}
+
+
 @router.delete("/images/{image_id}")
 async def delete_image_by_id(
     image_id: str,
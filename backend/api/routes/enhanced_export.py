@@ -14,10 +14,11 @@ import tempfile
 import shutil
 
 from fastapi import APIRouter, HTTPException, Response
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 
 from logging_system.professional_logger import get_professional_logger
+from core.coco_writer import CocoSection, iter_coco_json
 
 logger = get_professional_logger()
 
@@ -143,11 +144,11 @@ class ExportFormats:
         return format_mappings.get(normalized, normalized)
     
     @staticmethod
-    def export_coco(data: ExportRequest) -> Dict[str, Any]:
-        """Export to COCO JSON format"""
-        coco_data = {
+    def coco_fields(dataset_name: str) -> Dict[str, Any]:
+        """COCO top-level info and licenses"""
+        return {
             "info": {
-                "description": f"{data.dataset_name} - Auto-Labeling Tool Export",
+                "description": f"{dataset_name} - Auto-Labeling Tool Export",
                 "version": "1.0",
                 "year": datetime.now().year,
                 "contributor": "Auto-Labeling Tool",
@@ -157,88 +158,109 @@ class ExportFormats:
                 "id": 1,
                 "name": "Unknown",
                 "url": ""
-            }],
-            "images": [],
-            "annotations": [],
-            "categories": []
+            }]
         }
+    
+    @staticmethod
+    def coco_category(idx: int, cls: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": idx + 1,
+            "name": cls.get("name", f"class_{idx}"),
+            "supercategory": cls.get("supercategory", "object")
+        }
+    
+    @staticmethod
+    def coco_image(idx: int, img: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": idx + 1,
+            "width": img.get("width", 640),
+            "height": img.get("height", 480),
+            "file_name": img.get("name", f"image_{idx}.jpg"),
+            "license": 1,
+            "flickr_url": "",
+            "coco_url": "",
+            "date_captured": datetime.now().isoformat()
+        }
+    
+    @staticmethod
+    def coco_annotation(annotation_id: int, ann: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """COCO annotation of one bbox/polygon export annotation; None for other types"""
+        image_id = ann.get("image_id", 1)
+        category_id = ann.get("class_id", 1) + 1
         
-        # Add categories
-        for idx, cls in enumerate(data.classes):
-            coco_data["categories"].append({
-                "id": idx + 1,
-                "name": cls.get("name", f"class_{idx}"),
-                "supercategory": cls.get("supercategory", "object")
-            })
-        
-        # Add images
-        for idx, img in enumerate(data.images):
-            coco_data["images"].append({
-                "id": idx + 1,
-                "width": img.get("width", 640),
-                "height": img.get("height", 480),
-                "file_name": img.get("name", f"image_{idx}.jpg"),
-                "license": 1,
-                "flickr_url": "",
-                "coco_url": "",
-                "date_captured": datetime.now().isoformat()
-            })
-        
-        # Add annotations
-        annotation_id = 1
-        for ann in data.annotations:
-            image_id = ann.get("image_id", 1)
-            category_id = ann.get("class_id", 1) + 1
+        if ann.get("type") == "bbox":
+            bbox = ann.get("bbox", [])
             
-            if ann.get("type") == "bbox":
-                bbox = ann.get("bbox", [])
-                
-                # Handle bbox format: [x_min, y_min, x_max, y_max] from _prepare_export_data
-                if isinstance(bbox, list) and len(bbox) >= 4:
-                    x_min, y_min, x_max, y_max = bbox[0], bbox[1], bbox[2], bbox[3]
-                    x, y = x_min, y_min
-                    w, h = x_max - x_min, y_max - y_min
+            # Handle bbox format: [x_min, y_min, x_max, y_max] from _prepare_export_data
+            if isinstance(bbox, list) and len(bbox) >= 4:
+                x_min, y_min, x_max, y_max = bbox[0], bbox[1], bbox[2], bbox[3]
+                x, y = x_min, y_min
+                w, h = x_max - x_min, y_max - y_min
+            else:
+                # Fallback for old dict format
+                if isinstance(bbox, dict):
+                    x, y, w, h = bbox.get("x", 0), bbox.get("y", 0), bbox.get("width", 0), bbox.get("height", 0)
                 else:
-                    # Fallback for old dict format
-                    if isinstance(bbox, dict):
-                        x, y, w, h = bbox.get("x", 0), bbox.get("y", 0), bbox.get("width", 0), bbox.get("height", 0)
-                    else:
-                        x, y, w, h = 0, 0, 0, 0
-                area = w * h
-                
-                coco_data["annotations"].append({
-                    "id": annotation_id,
-                    "image_id": image_id,
-                    "category_id": category_id,
-                    "segmentation": [],
-                    "area": area,
-                    "bbox": [x, y, w, h],
-                    "iscrowd": 0
-                })
-            elif ann.get("type") == "polygon":
-                points = ann.get("points", [])
-                segmentation = []
-                for point in points:
-                    segmentation.extend([point.get("x", 0), point.get("y", 0)])
-                
-                # Calculate bounding box from polygon
-                x_coords = [p.get("x", 0) for p in points]
-                y_coords = [p.get("y", 0) for p in points]
-                x_min, x_max = min(x_coords), max(x_coords)
-                y_min, y_max = min(y_coords), max(y_coords)
-                
-                coco_data["annotations"].append({
-                    "id": annotation_id,
-                    "image_id": image_id,
-                    "category_id": category_id,
-                    "segmentation": [segmentation],
-                    "area": (x_max - x_min) * (y_max - y_min),
-                    "bbox": [x_min, y_min, x_max - x_min, y_max - y_min],
-                    "iscrowd": 0
-                })
+                    x, y, w, h = 0, 0, 0, 0
+            area = w * h
+            
+            return {
+                "id": annotation_id,
+                "image_id": image_id,
+                "category_id": category_id,
+                "segmentation": [],
+                "area": area,
+                "bbox": [x, y, w, h],
+                "iscrowd": 0
+            }
+        elif ann.get("type") == "polygon":
+            points = ann.get("points", [])
+            segmentation = []
+            for point in points:
+                segmentation.extend([point.get("x", 0), point.get("y", 0)])
             
-            annotation_id += 1
+            # Calculate bounding box from polygon
+            x_coords = [p.get("x", 0) for p in points]
+            y_coords = [p.get("y", 0) for p in points]
+            x_min, x_max = min(x_coords), max(x_coords)
+            y_min, y_max = min(y_coords), max(y_coords)
+            
+            return {
+                "id": annotation_id,
+                "image_id": image_id,
+                "category_id": category_id,
+                "segmentation": [segmentation],
+                "area": (x_max - x_min) * (y_max - y_min),
+                "bbox": [x_min, y_min, x_max - x_min, y_max - y_min],
+                "iscrowd": 0
+            }
+        return None
+    
+    @staticmethod
+    def coco_sections(data: ExportRequest) -> List[CocoSection]:
+        """
+        COCO arrays of an export request as lazily built rows, in document order
+        (for core.coco_writer; export_coco collects the same rows into a dict)
+        """
+        def annotations():
+            # Ids count every input annotation, including skipped types
+            for annotation_id, ann in enumerate(data.annotations, start=1):
+                row = ExportFormats.coco_annotation(annotation_id, ann)
+                if row is not None:
+                    yield row
         
+        return [
+            ("images", (ExportFormats.coco_image(idx, img) for idx, img in enumerate(data.images))),
+            ("annotations", annotations()),
+            ("categories", (ExportFormats.coco_category(idx, cls) for idx, cls in enumerate(data.classes)))
+        ]
+    
+    @staticmethod
+    def export_coco(data: ExportRequest) -> Dict[str, Any]:
+        """Export to COCO JSON format (whole document in memory; see coco_sections to stream it)"""
+        coco_data = ExportFormats.coco_fields(data.dataset_name)
+        for name, rows in ExportFormats.coco_sections(data):
+            coco_data[name] = list(rows)
         return coco_data
     
     @staticmethod
@@ -725,28 +747,13 @@ async def download_export(request: ExportRequest):
         })
         
         if format_name == "coco":
-            data = ExportFormats.export_coco(request)
-            
-            temp_file = tempfile.NamedTemporaryFile(
-                mode='w', 
-                suffix='.json', 
-                delete=False,
-                prefix=f"{request.dataset_name}_coco_"
+            # Streamed row by row: the document is never built in memory or on disk
+            return StreamingResponse(
+                iter_coco_json(ExportFormats.coco_fields(request.dataset_name),
+                               ExportFormats.coco_sections(request), indent=2),
+                media_type='application/json',
+                headers={"Content-Disposition": f'attachment; filename="{request.dataset_name}_coco.json"'}
             )
-            
-            try:
-                json.dump(data, temp_file, indent=2)
-                temp_file.close()
-                
-                return FileResponse(
-                    temp_file.name,
-                    media_type='application/json',
-                    filename=f"{request.dataset_name}_coco.json"
-                )
-            except Exception as e:
-                if os.path.exists(temp_file.name):
-                    os.unlink(temp_file.name)
-                raise e
         
         elif format_name in ["yolo", "yolo_detection", "yolo_segmentation", "pascal_voc"]:
             if format_name in ["yolo", "yolo_detection"]:
@@ -829,6 +836,135 @@ async def download_export(request: ExportRequest):
         })
         raise HTTPException(status_code=500, detail=f"Download failed: {str(e)}")
 
+# Rows fetched per database round trip while streaming a project export
+COCO_STREAM_BATCH = 1000
+
+
+def _segmentation_points(segmentation: Any) -> List[Dict[str, float]]:
+    """Stored segmentation ([{x,y}] or [[x,y]], JSON text or list) as export points"""
+    if isinstance(segmentation, str):
+        try:
+            segmentation = json.loads(segmentation)
+        except ValueError:
+            return []
+    points = []
+    for point in segmentation or []:
+        if isinstance(point, dict) and "x" in point and "y" in point:
+            points.append({"x": float(point["x"]), "y": float(point["y"])})
+        elif isinstance(point, (list, tuple)) and len(point) >= 2:
+            points.append({"x": float(point[0]), "y": float(point[1])})
+    return points
+
+
+def project_coco_sections(db, project_id: int, dataset_id: Optional[str] = None) -> List[CocoSection]:
+    """
+    COCO arrays of a project's images and annotations, read from the database in batches
+    of COCO_STREAM_BATCH rows while they are written. Images are numbered in Image.id
+    order; annotations are read in the same order and matched to those numbers by a
+    second cursor over the image ids, so no id map is held. Annotations with a polygon
+    of 3+ points are exported as polygons, the rest as boxes.
+    """
+    from database.models import Annotation, Dataset, Image
+    
+    def in_project(query):
+        query = query.join(Dataset, Dataset.id == Image.dataset_id).filter(Dataset.project_id == project_id)
+        return query.filter(Image.dataset_id == dataset_id) if dataset_id else query
+    
+    def images():
+        rows = in_project(db.query(Image.filename, Image.width, Image.height)).order_by(Image.id)
+        for idx, (filename, width, height) in enumerate(rows.yield_per(COCO_STREAM_BATCH)):
+            image = {"name": filename, "width": width, "height": height}
+            yield ExportFormats.coco_image(idx, {key: value for key, value in image.items() if value is not None})
+    
+    def annotations():
+        image_ids = in_project(db.query(Image.id)).order_by(Image.id).yield_per(COCO_STREAM_BATCH)
+        image_numbers = ((image_id, number) for number, (image_id,) in enumerate(image_ids, start=1))
+        current_image, current_number = None, 0
+        rows = in_project(db.query(
+            Annotation.image_id, Annotation.class_id,
+            Annotation.x_min, Annotation.y_min, Annotation.x_max, Annotation.y_max,
+            Annotation.segmentation
+        ).join(Image, Image.id == Annotation.image_id)).order_by(Image.id, Annotation.id)
+        for annotation_id, (image_id, class_id, x_min, y_min, x_max, y_max, segmentation) in enumerate(
+                rows.yield_per(COCO_STREAM_BATCH), start=1):
+            while image_id != current_image:
+                current_image, current_number = next(image_numbers)
+            ann = {"image_id": current_number, "class_id": class_id or 0}
+            points = _segmentation_points(segmentation) if segmentation else []
+            if len(points) >= 3:
+                ann.update(type="polygon", points=points)
+            else:
+                ann.update(type="bbox", bbox=[x_min or 0.0, y_min or 0.0, x_max or 0.0, y_max or 0.0])
+            yield ExportFormats.coco_annotation(annotation_id, ann)
+    
+    def categories():
+        # One category per class id (first name seen), ids as export_coco: class_id + 1
+        names: Dict[int, str] = {}
+        rows = in_project(db.query(Annotation.class_id, Annotation.class_name)
+                          .join(Image, Image.id == Annotation.image_id)).distinct().order_by(Annotation.class_id)
+        for class_id, class_name in rows:
+            names.setdefault(class_id or 0, class_name)
+        for class_id, class_name in names.items():
+            yield ExportFormats.coco_category(class_id, {"name": class_name})
+    
+    return [("images", images()), ("annotations", annotations()), ("categories", categories())]
+
+
+@router.get("/export/coco/{project_id}")
+def stream_project_coco(project_id: int, dataset_id: Optional[str] = None):
+    """
+    Export a project's annotations (optionally one dataset's) as COCO JSON streamed
+    straight from the database: rows are written to the response as they are read,
+    so memory stays flat however many annotations the project has. Compact JSON.
+    """
+    from database.database import SessionLocal
+    from database.models import Project
+    
+    logger.info("app.backend", "Starting streamed COCO export", "coco_stream_export_start", {
+        "project_id": project_id,
+        "dataset_id": dataset_id,
+        "endpoint": "/export/coco/{project_id}"
+    })
+    
+    # The session outlives this handler: it is closed when the response body is finished
+    db = SessionLocal()
+    try:
+        project = db.query(Project).filter(Project.id == project_id).first()
+    except Exception:
+        db.close()
+        raise
+    if project is None:
+        db.close()
+        raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
+    dataset_name = f"{project.name}_{dataset_id}" if dataset_id else project.name
+    
+    def body():
+        started = datetime.now()
+        try:
+            yield from iter_coco_json(ExportFormats.coco_fields(dataset_name),
+                                      project_coco_sections(db, project_id, dataset_id))
+            logger.info("operations.exports", "Streamed COCO export completed", "coco_stream_export_complete", {
+                "project_id": project_id,
+                "dataset_id": dataset_id,
+                "duration_seconds": (datetime.now() - started).total_seconds()
+            })
+        except Exception as e:
+            logger.error("errors.system", "Streamed COCO export failed", "coco_stream_export_failure", {
+                "project_id": project_id,
+                "dataset_id": dataset_id,
+                "error": str(e),
+                "error_type": type(e).__name__
+            })
+            raise
+        finally:
+            db.close()
+    
+    return StreamingResponse(
+        body(),
+        media_type='application/json',
+        headers={"Content-Disposition": f'attachment; filename="{dataset_name}_coco.json"'}
+    )
+
 @router.get("/formats")
 async def get_export_formats():
     """Get all supported export formats"""
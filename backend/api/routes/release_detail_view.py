@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, BackgroundTasks
 from sqlalchemy.orm import Session
 import os
 import zipfile
@@ -6,9 +6,12 @@ import json
 from database.database import get_db
 from database.models import Release
 from utils.path_utils import PathManager
+from core.release_zip_index import get_release_zip_cache, zip_entry_response
+from core.thumbnail_cache import cached_zip_thumbnail, warm_release_thumbnails
 from fastapi.responses import StreamingResponse
 from PIL import Image
 import io
+from typing import Optional
 
 router = APIRouter()
 
@@ -60,7 +63,9 @@ def get_release_package_info(release_id: str, db: Session = Depends(get_db)):
         }
 
 @router.get("/releases/{release_id}/file/{filename:path}")
-def serve_release_file(release_id: str, filename: str, thumbnail: bool = False, size: int = 256, db: Session = Depends(get_db)):
+def serve_release_file(release_id: str, filename: str, thumbnail: bool = False, size: int = 256,
+                       range_header: Optional[str] = Header(None, alias="Range"),
+                       if_none_match: Optional[str] = Header(None, alias="If-None-Match"), db: Session = Depends(get_db)):
     release = db.query(Release).filter(Release.id == release_id).first()
     if not release:
         raise HTTPException(status_code=404, detail="Release not found")
@@ -69,54 +74,55 @@ def serve_release_file(release_id: str, filename: str, thumbnail: bool = False,
         raise HTTPException(status_code=404, detail="Release ZIP not found")
     if '..' in filename or filename.startswith('/') or filename.startswith('\\'):
         raise HTTPException(status_code=400, detail="Invalid filename")
-    with zipfile.ZipFile(abs_model_path, 'r') as zipf:
-        if filename not in zipf.namelist():
-            raise HTTPException(status_code=404, detail="File not found in ZIP")
-        if not thumbnail:
-            mime_types = {
-                '.jpg': 'image/jpeg',
-                '.jpeg': 'image/jpeg',
-                '.png': 'image/png',
-                '.gif': 'image/gif',
-                '.bmp': 'image/bmp',
-                '.tif': 'image/tiff',
-                '.tiff': 'image/tiff',
-                '.webp': 'image/webp',
-                '.tga': 'image/x-tga',
-                '.avif': 'image/avif',
-                '.heic': 'image/heic',
-                '.ico': 'image/x-icon'
-            }
-            ext = os.path.splitext(filename.lower())[1]
-            content_type = mime_types.get(ext, 'application/octet-stream')
-            def iterfile():
-                with zipf.open(filename, 'r') as file_in_zip:
-                    while True:
-                        chunk = file_in_zip.read(8192)
-                        if not chunk:
-                            break
-                        yield chunk
-            headers = {
-                'Cache-Control': 'no-cache, no-store, must-revalidate',
-                'Pragma': 'no-cache',
-                'Expires': '0'
-            }
-            return StreamingResponse(iterfile(), media_type=content_type, headers=headers)
-        else:
-            with zipf.open(filename, 'r') as file_in_zip:
-                img = Image.open(file_in_zip)
-                print(f"🔍 THUMBNAIL DEBUG: Original size: {img.size}, Target size: {size}")
-                # Preserve aspect ratio - thumbnail() already does this correctly
-                img.thumbnail((size, size), Image.Resampling.LANCZOS)
-                print(f"🔍 THUMBNAIL DEBUG: After thumbnail: {img.size}")
-                buf = io.BytesIO()
-                save_format = img.format or 'JPEG'
-                img.save(buf, format=save_format)
-                buf.seek(0)
-            content_type = f'image/{save_format.lower()}'
-            headers = {
-                'Cache-Control': 'no-cache, no-store, must-revalidate',
-                'Pragma': 'no-cache',
-                'Expires': '0'
-            }
-            return StreamingResponse(buf, media_type=content_type, headers=headers)
\ No newline at end of file
+    zip_index = get_release_zip_cache().get(release_id, str(abs_model_path))
+    if zip_index.get(filename) is None:
+        raise HTTPException(status_code=404, detail="File not found in ZIP")
+    headers = {
+        'Cache-Control': 'no-cache, no-store, must-revalidate',
+        'Pragma': 'no-cache',
+        'Expires': '0'
+    }
+    if not thumbnail:
+        mime_types = {
+            '.jpg': 'image/jpeg',
+            '.jpeg': 'image/jpeg',
+            '.png': 'image/png',
+            '.gif': 'image/gif',
+            '.bmp': 'image/bmp',
+            '.tif': 'image/tiff',
+            '.tiff': 'image/tiff',
+            '.webp': 'image/webp',
+            '.tga': 'image/x-tga',
+            '.avif': 'image/avif',
+            '.heic': 'image/heic',
+            '.ico': 'image/x-icon'
+        }
+        ext = os.path.splitext(filename.lower())[1]
+        content_type = mime_types.get(ext, 'application/octet-stream')
+        return zip_entry_response(zip_index, filename, content_type, range_header=range_header, headers=headers)
+    else:
+        cached_response = cached_zip_thumbnail(zip_index, filename, size, if_none_match)
+        if cached_response is not None:
+            return cached_response
+        with zip_index.open(filename) as file_in_zip:
+            img = Image.open(file_in_zip)
+            # Preserve aspect ratio - thumbnail() already does this correctly
+            img.thumbnail((size, size), Image.Resampling.LANCZOS)
+            buf = io.BytesIO()
+            save_format = img.format or 'JPEG'
+            img.save(buf, format=save_format)
+            buf.seek(0)
+        content_type = f'image/{save_format.lower()}'
+        return StreamingResponse(buf, media_type=content_type, headers=headers)
+
+@router.post("/releases/{release_id}/thumbnails/warm")
+def warm_release_thumbnail_cache(release_id: str, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """Render any missing gallery thumbnails for a release in the background."""
+    release = db.query(Release).filter(Release.id == release_id).first()
+    if not release:
+        raise HTTPException(status_code=404, detail="Release not found")
+    abs_model_path = PathManager.get_absolute_path(release.model_path) if release.model_path else None
+    if not abs_model_path or not os.path.exists(abs_model_path) or not str(abs_model_path).endswith('.zip'):
+        raise HTTPException(status_code=404, detail="Release ZIP not found")
+    background_tasks.add_task(warm_release_thumbnails, release_id, str(abs_model_path))
+    return {"release_id": release_id, "status": "warming"}
@@ -4,7 +4,7 @@ Integrates new release generation system with existing functionality
 """
 
 from pathlib import Path
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Header
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from typing import List, Optional, Tuple, Dict
@@ -25,6 +25,9 @@ from fastapi.responses import StreamingResponse
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
 from core.release_controller import ReleaseController, ReleaseConfig, create_release_controller
+from core.release_zip_index import get_release_zip_cache, zip_entry_response
+from core.thumbnail_cache import cached_zip_thumbnail
+from core.image_buffer import ImageBuffer
 from core.transformation_schema import generate_release_configurations
 
 # Import professional logging system
@@ -68,6 +71,9 @@ class EnhancedReleaseCreate(BaseModel):
     sampling_strategy: str = "intelligent"
     output_format: str = "jpg"
     include_original: bool = True
+    resume_release_id: Optional[str] = None  # continue an interrupted release instead of starting over
+    encode_preset: Optional[str] = None  # quality, balanced, fast (None -> server default)
+    encoder_backend: Optional[str] = None  # pil, cv2 (None -> server default)
 
 class ReleaseProgressResponse(BaseModel):
     release_id: str
@@ -96,6 +102,9 @@ class ReleaseCreate(BaseModel):
     verified_only: bool = False
     output_format: str = "original"  # Image format: original, jpg, png, webp, bmp, tiff
     preview_data: Optional[dict] = None  # Preview data with calculated split counts
+    encode_preset: Optional[str] = None  # quality, balanced, fast (None -> server default)
+    encoder_backend: Optional[str] = None  # pil, cv2 (None -> server default)
+    resume_release_id: Optional[str] = None  # id of a failed create to continue from its checkpoint
 
 class DatasetRebalanceRequest(BaseModel):
     train_count: int
@@ -181,7 +190,10 @@ async def generate_enhanced_release(
             task_type=payload.task_type,
             images_per_original=payload.images_per_original,
             output_format=payload.output_format,
-            include_original=payload.include_original
+            include_original=payload.include_original,
+            resume_release_id=payload.resume_release_id,
+            encode_preset=payload.encode_preset,
+            encoder_backend=payload.encoder_backend
         )
         
         logger.info("operations.releases", f"Release configuration created successfully", "release_config_created", {
@@ -457,8 +469,13 @@ def create_release(payload: ReleaseCreate, db: Session = Depends(get_db)):
             "project_name": project.name
         })
 
-        # Generate release ID
-        release_id = str(uuid.uuid4())
+        # Generate release ID (a failed create is resumed under its own id)
+        if payload.resume_release_id:
+            if db.query(Release).filter(Release.id == payload.resume_release_id).first():
+                raise HTTPException(status_code=409, detail="Release already exists, nothing to resume")
+            release_id = payload.resume_release_id
+        else:
+            release_id = str(uuid.uuid4())
         
         logger.debug("operations.releases", f"Generated release ID", "release_id_generated", {
             "release_id": release_id,
@@ -533,7 +550,9 @@ def create_release(payload: ReleaseCreate, db: Session = Depends(get_db)):
             output_format=payload.output_format,
             include_original=True,
             split_sections=["train", "val", "test"],
-            preserve_original_splits=True  # Always preserve original splits
+            preserve_original_splits=True,  # Always preserve original splits
+            encode_preset=payload.encode_preset,
+            encoder_backend=payload.encoder_backend
         )
         
         # Calculate image counts BEFORE creating release
@@ -668,6 +687,7 @@ def create_release(payload: ReleaseCreate, db: Session = Depends(get_db)):
             'project_id': project_id
         })
         
+        progress_controller = create_release_controller(db)
         try:
             # Create the complete release ZIP with proper dataset aggregation
             create_complete_release_zip(
@@ -678,7 +698,20 @@ def create_release(payload: ReleaseCreate, db: Session = Depends(get_db)):
                 config=config,
                 transformations=normalized_transformations,
                 multiplier=payload.multiplier,
-                zip_path=model_path
+                zip_path=model_path,
+                progress_callback=lambda done, total: progress_controller.update_release_progress(
+                    release_id,
+                    status="processing",
+                    current_step="processing_images",
+                    total_images=total,
+                    processed_images=done
+                )
+            )
+            progress_controller.update_release_progress(
+                release_id,
+                status="completed",
+                current_step="completed",
+                completed_at=datetime.utcnow()
             )
             
             logger.info("operations.releases", f"Release ZIP created successfully", "release_zip_created", {
@@ -694,8 +727,16 @@ def create_release(payload: ReleaseCreate, db: Session = Depends(get_db)):
                 'release_id': release_id,
                 'error': str(e)
             })
+            progress_controller.update_release_progress(
+                release_id,
+                status="failed",
+                error_message=str(e),
+                completed_at=datetime.utcnow()
+            )
             db.rollback()
-            raise HTTPException(status_code=500, detail=f"Failed to create release: {str(e)}")
+            # The id resumes this run's checkpoint (resume_release_id)
+            raise HTTPException(status_code=500, detail=f"Failed to create release: {str(e)}",
+                                headers={"X-Release-Id": release_id})
         
         # Update transformations status
         logger.debug("operations.transformations", f"Updating transformation status to completed", "transformation_status_update", {
@@ -999,6 +1040,8 @@ def rename_release(release_id: str, new_name: dict, db: Session = Depends(get_db
             })
             
             try:
+                # Close the cached archive first; an open handle blocks the rename on Windows
+                get_release_zip_cache().invalidate(release_id)
                 # Rename the ZIP file
                 os.rename(old_zip_path, new_zip_path)
                 
@@ -1122,6 +1165,8 @@ def delete_release(release_id: str, db: Session = Depends(get_db)):
             
             if abs_zip_path and os.path.exists(abs_zip_path):
                 try:
+                    # Close the cached archive first; an open handle blocks the delete on Windows
+                    get_release_zip_cache().invalidate(release_id)
                     os.remove(abs_zip_path)
                     zip_deleted = True
                     logger.info("operations.releases", f"ZIP file deleted successfully", "zip_file_delete_success", {
@@ -1439,7 +1484,10 @@ def download_release(release_id: str, db: Session = Depends(get_db)):
     }
 
 @router.get("/releases/{release_id}/file/{filename:path}")
-def serve_release_file(release_id: str, filename: str, thumbnail: bool = False, db: Session = Depends(get_db)):
+def serve_release_file(release_id: str, filename: str, thumbnail: bool = False,
+                       range_header: Optional[str] = Header(None, alias="Range"),
+                       if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+                       db: Session = Depends(get_db)):
     """
     Serve individual files from release ZIP archives
     
@@ -1447,9 +1495,11 @@ def serve_release_file(release_id: str, filename: str, thumbnail: bool = False,
         release_id: The release identifier
         filename: Path to the file within the ZIP (e.g., "images/train/car_1.jpg")
         thumbnail: If True, resize image to thumbnail size for faster loading
+        range_header: Optional "bytes=start-end" range (answered with 206)
+        if_none_match: ETag from a previous thumbnail response (answered with 304 when unchanged)
     
     Returns:
-        StreamingResponse with the file content
+        StreamingResponse with the file content (streamed from the cached ZIP index)
     """
     logger = get_professional_logger()
     
@@ -1478,91 +1528,106 @@ def serve_release_file(release_id: str, filename: str, thumbnail: bool = False,
             })
             raise HTTPException(status_code=404, detail="Release ZIP file not found")
         
-        # Open ZIP file and extract the requested file
+        # Look the file up in the cached ZIP index (archive stays open between requests)
         try:
-            with zipfile.ZipFile(abs_model_path, 'r') as zip_file:
-                # Check if file exists in ZIP
-                if filename not in zip_file.namelist():
-                    logger.warning("errors.validation", f"File not found in ZIP", "file_not_found_in_zip", {
-                        "release_id": release_id,
-                        "filename": filename,
-                        "available_files": zip_file.namelist()[:10]  # Log first 10 files
-                    })
-                    raise HTTPException(status_code=404, detail=f"File '{filename}' not found in release")
-                
-                # Extract file content
-                file_content = zip_file.read(filename)
-                
-                # Determine content type
-                content_type = "application/octet-stream"
-                if filename.lower().endswith(('.jpg', '.jpeg')):
-                    content_type = "image/jpeg"
-                elif filename.lower().endswith('.png'):
-                    content_type = "image/png"
-                elif filename.lower().endswith('.webp'):
-                    content_type = "image/webp"
-                elif filename.lower().endswith('.bmp'):
-                    content_type = "image/bmp"
-                elif filename.lower().endswith(('.tiff', '.tif')):
-                    content_type = "image/tiff"
-                elif filename.lower().endswith('.gif'):
-                    content_type = "image/gif"
-                elif filename.lower().endswith('.svg'):
-                    content_type = "image/svg+xml"
-                elif filename.lower().endswith('.txt'):
-                    content_type = "text/plain"
-                elif filename.lower().endswith('.json'):
-                    content_type = "application/json"
-                elif filename.lower().endswith('.yaml', '.yml'):
-                    content_type = "text/yaml"
-                
-                # If it's an image and thumbnail is requested, resize it
-                if thumbnail and content_type.startswith('image/'):
-                    try:
-                        # Open image with PIL
-                        image = PILImage.open(BytesIO(file_content))
-                        
-                        # Resize to thumbnail (max 200x200, maintain aspect ratio)
-                        image.thumbnail((200, 200), PILImage.Resampling.LANCZOS)
-                        
-                        # Save resized image to bytes
-                        output = BytesIO()
-                        # Preserve original format
-                        format_name = 'JPEG' if content_type == 'image/jpeg' else 'PNG'
-                        image.save(output, format=format_name, quality=85 if format_name == 'JPEG' else None)
-                        file_content = output.getvalue()
-                        
-                        logger.debug("operations.images", f"Generated thumbnail for image", "thumbnail_generated", {
-                            "release_id": release_id,
-                            "filename": filename,
-                            "original_size": len(zip_file.read(filename)),
-                            "thumbnail_size": len(file_content)
-                        })
-                        
-                    except Exception as e:
-                        logger.warning("errors.image_processing", f"Failed to generate thumbnail, serving original", "thumbnail_generation_failed", {
-                            "release_id": release_id,
-                            "filename": filename,
-                            "error": str(e)
-                        })
-                        # If thumbnail generation fails, serve original
-                        pass
-                
-                logger.info("operations.releases", f"Successfully served file from ZIP", "file_served_from_zip", {
+            zip_index = get_release_zip_cache().get(release_id, str(abs_model_path))
+            entry = zip_index.get(filename)
+            
+            # Check if file exists in ZIP
+            if entry is None:
+                logger.warning("errors.validation", f"File not found in ZIP", "file_not_found_in_zip", {
                     "release_id": release_id,
                     "filename": filename,
-                    "content_type": content_type,
-                    "file_size": len(file_content),
-                    "thumbnail": thumbnail
+                    "available_files": zip_index.names[:10]  # Log first 10 files
                 })
-                
-                # Return file as streaming response
-                return StreamingResponse(
-                    BytesIO(file_content),
-                    media_type=content_type,
-                    headers={"Content-Disposition": f"inline; filename={os.path.basename(filename)}"}
-                )
-                
+                raise HTTPException(status_code=404, detail=f"File '{filename}' not found in release")
+            
+            # Determine content type
+            content_type = "application/octet-stream"
+            if filename.lower().endswith(('.jpg', '.jpeg')):
+                content_type = "image/jpeg"
+            elif filename.lower().endswith('.png'):
+                content_type = "image/png"
+            elif filename.lower().endswith('.webp'):
+                content_type = "image/webp"
+            elif filename.lower().endswith('.bmp'):
+                content_type = "image/bmp"
+            elif filename.lower().endswith(('.tiff', '.tif')):
+                content_type = "image/tiff"
+            elif filename.lower().endswith('.gif'):
+                content_type = "image/gif"
+            elif filename.lower().endswith('.svg'):
+                content_type = "image/svg+xml"
+            elif filename.lower().endswith('.txt'):
+                content_type = "text/plain"
+            elif filename.lower().endswith('.json'):
+                content_type = "application/json"
+            elif filename.lower().endswith(('.yaml', '.yml')):
+                content_type = "text/yaml"
+            
+            # If it's an image and thumbnail is requested, resize it
+            if thumbnail and content_type.startswith('image/'):
+                try:
+                    # Served from the persistent thumbnail cache when it is enabled
+                    cached_response = cached_zip_thumbnail(
+                        zip_index, filename, 200, if_none_match,
+                        headers={"Content-Disposition": f"inline; filename={os.path.basename(filename)}"}
+                    )
+                    if cached_response is not None:
+                        return cached_response
+                    
+                    # Open image with PIL
+                    with zip_index.open(filename) as file_in_zip:
+                        image = PILImage.open(file_in_zip)
+                        image.load()
+                    
+                    # Resize to thumbnail (max 200x200, maintain aspect ratio)
+                    image.thumbnail((200, 200), PILImage.Resampling.LANCZOS)
+                    
+                    # Save resized image to bytes
+                    output = BytesIO()
+                    # Preserve original format
+                    format_name = 'JPEG' if content_type == 'image/jpeg' else 'PNG'
+                    image.save(output, format=format_name, quality=85 if format_name == 'JPEG' else None)
+                    file_content = output.getvalue()
+                    
+                    logger.debug("operations.images", f"Generated thumbnail for image", "thumbnail_generated", {
+                        "release_id": release_id,
+                        "filename": filename,
+                        "original_size": entry.file_size,
+                        "thumbnail_size": len(file_content)
+                    })
+                    
+                    return StreamingResponse(
+                        BytesIO(file_content),
+                        media_type=content_type,
+                        headers={"Content-Disposition": f"inline; filename={os.path.basename(filename)}"}
+                    )
+                    
+                except Exception as e:
+                    logger.warning("errors.image_processing", f"Failed to generate thumbnail, serving original", "thumbnail_generation_failed", {
+                        "release_id": release_id,
+                        "filename": filename,
+                        "error": str(e)
+                    })
+                    # If thumbnail generation fails, serve original
+                    pass
+            
+            logger.info("operations.releases", f"Successfully served file from ZIP", "file_served_from_zip", {
+                "release_id": release_id,
+                "filename": filename,
+                "content_type": content_type,
+                "file_size": entry.file_size,
+                "thumbnail": thumbnail,
+                "range": range_header
+            })
+            
+            # Stream the entry straight from the archive (206 for range requests)
+            return zip_entry_response(
+                zip_index, filename, content_type, range_header=range_header,
+                headers={"Content-Disposition": f"inline; filename={os.path.basename(filename)}"}
+            )
+            
         except zipfile.BadZipFile:
             logger.error("errors.system", f"Invalid ZIP file", "invalid_zip_file", {
                 "release_id": release_id,
@@ -2344,7 +2409,8 @@ def create_complete_release_zip(
     config: ReleaseConfig,
     transformations: List[dict],
     multiplier: int,
-    zip_path: str
+    zip_path: str,
+    progress_callback=None
 ):
     """
     🎯 MAIN RELEASE ZIP CREATION FUNCTION - COMPLETE WORKFLOW
@@ -2357,10 +2423,16 @@ def create_complete_release_zip(
     5. Final ZIP packaging
     
     Workflow: Images → Transform → Track → Convert to YOLO → Package
+
+    Finished images are recorded in a journal next to the staging directory. If the
+    run is interrupted, the staging tree is kept and calling this again with the same
+    release_id (same settings) skips the finished images; checkpoints nobody resumes
+    expire after RELEASE_CHECKPOINT_MAX_AGE_HOURS. progress_callback, when given,
+    is called as (processed_images, total_images) after every image.
     """
     import tempfile
-    import zipfile
     from PIL import Image as PILImage
+    from core.release_packager import write_directory_to_zip, zip_compression_metadata
     import io
     import yaml
     import json
@@ -2375,10 +2447,39 @@ def create_complete_release_zip(
     images_per_original = max(0, multiplier - 1)  # Calculate augmented images count
     
     # 📁 Create hidden staging directory (avoids Windows temp issues)
+    # Keyed by release id: a retry passes resume_release_id to find the interrupted run
+    from core.release_journal import remove_stale_checkpoints
+    remove_stale_checkpoints(os.path.dirname(zip_path))
     staging_root = os.path.join(os.path.dirname(zip_path), f".staging_{release_id}")
-    if os.path.exists(staging_root):
+    staging_dir = os.path.join(staging_root, "staging")
+    os.makedirs(staging_root, exist_ok=True)
+
+    # 📒 Completion journal: images finished by an interrupted run with the same settings
+    journal = None
+    try:
+        from core.release_journal import ReleaseJournal, JOURNAL_FILENAME, journal_fingerprint
+        journal = ReleaseJournal(
+            os.path.join(staging_root, JOURNAL_FILENAME),
+            journal_fingerprint({
+                "dataset_ids": sorted(dataset_ids),
+                "transformations": transformations,
+                "multiplier": multiplier,
+                "output_format": getattr(config, 'output_format', 'original'),
+                "export_format": getattr(config, 'export_format', None),
+                "task_type": getattr(config, 'task_type', None),
+            })
+        )
+    except Exception as _e:
+        logger.warning("errors.system", f"Release journal unavailable, release will not be resumable", "release_journal_unavailable", {
+            'staging_root': staging_root,
+            'error': str(_e)
+        })
+    finished_images = journal.completed() if journal is not None else {}
+    release_packaged = False
+
+    if not finished_images and os.path.exists(staging_dir):
         try:
-            shutil.rmtree(staging_root, ignore_errors=True)  # Clean existing directory
+            shutil.rmtree(staging_dir, ignore_errors=True)  # Clean existing directory
             logger.debug("operations.releases", f"Cleaned up existing staging directory", "staging_cleanup_success", {
                 'staging_root': staging_root
             })
@@ -2387,7 +2488,12 @@ def create_complete_release_zip(
                 'staging_root': staging_root,
                 'error': str(_e)
             })
-    os.makedirs(staging_root, exist_ok=True)
+    elif finished_images:
+        logger.info("operations.releases", f"Resuming release ZIP creation", "release_zip_resumed", {
+            'release_id': release_id,
+            'staging_root': staging_root,
+            'finished_images': len(finished_images)
+        })
     
     # 🪟 Windows-specific: Mark staging directory as hidden
     try:
@@ -2405,13 +2511,16 @@ def create_complete_release_zip(
         })
     
     # 📂 Create main staging directory structure
-    staging_dir = os.path.join(staging_root, "staging")
     os.makedirs(staging_dir, exist_ok=True)
     
     # 🖼️ Initialize image format engine for consistent output formatting
     try:
         from core.image_generator import create_augmentation_engine
-        image_format_engine = create_augmentation_engine(staging_dir)
+        image_format_engine = create_augmentation_engine(
+            staging_dir,
+            encode_preset=getattr(config, 'encode_preset', None),
+            encoder_backend=getattr(config, 'encoder_backend', None)
+        )
         logger.debug("operations.images", f"Image format engine initialized", "image_format_engine_success", {
             'staging_dir': staging_dir
         })
@@ -2651,6 +2760,8 @@ def create_complete_release_zip(
         # 🎯 Main processing loop: Iterates through train/val/test splits for comprehensive dataset generation
         # Each split is processed independently with its own augmentation strategy and image count tracking
         final_image_count = 0
+        total_source_images = sum(len(images) for images in all_images_by_split.values())
+        processed_source_images = 0
         
         for split, images in all_images_by_split.items():
             if not images:
@@ -2727,6 +2838,17 @@ def create_complete_release_zip(
             #   - Coordinates with transformation system for augmented variants
             #   - Maintains proper directory structure for YOLO format
             for img_data in images:
+                # 📒 Skip images an interrupted run already finished (their files are in staging)
+                processed_source_images += 1
+                journal_key = f"{img_data['dataset_name']}/{split}/{img_data['filename']}"
+                finished = finished_images.get(journal_key)
+                if finished is not None:
+                    final_image_count += finished.get("image_count", 0)
+                    if progress_callback:
+                        progress_callback(processed_source_images, total_source_images)
+                    continue
+                images_before = final_image_count
+
                 # 📁 Copy original image
                 # 🎯 Extract image metadata for processing
                 original_filename = img_data["filename"]
@@ -3166,11 +3288,10 @@ def create_complete_release_zip(
                             resize_params_for_aug = resize_baseline_params
                             if resize_params_for_aug:
                                 config_dict["resize"] = resize_params_for_aug
-                            # Load PIL image and apply
-                            from PIL import Image as PILImage
-                            pil_img = PILImage.open(original_path).convert('RGB')
-                            original_dims = pil_img.size  # Track original dimensions
-                            augmented_image = transformer.apply_transformations(pil_img, config_dict)
+                            # Decode once into a buffer and apply; the result stays a buffer through encoding
+                            source_image = ImageBuffer.open(original_path)
+                            original_dims = source_image.size  # Track original dimensions
+                            augmented_image = transformer.apply_transformations(source_image, config_dict)
                             final_dims = augmented_image.size if augmented_image else original_dims  # Track final dimensions
                             
                             # ✅ TRACK TRANSFORMATIONS FOR ANNOTATION PROCESSING
@@ -3198,9 +3319,6 @@ def create_complete_release_zip(
                                 final_dims=final_dims,
                                 transformer=transformer
                             )
-                            
-                            # Close the original PIL image
-                            pil_img.close()
                         except Exception as _e:
                             logger.warning("errors.system", f"Falling back to simple apply", "simple_apply_fallback", {
                                 'original_path': original_path,
@@ -3218,14 +3336,14 @@ def create_complete_release_zip(
                                         if target_w > 0 and target_h > 0:
                                             # Only enforce exact size for stretch_to mode, not fit_within
                                             if resize_mode == "stretch_to" and augmented_image.size != (target_w, target_h):
-                                                augmented_image = augmented_image.resize((target_w, target_h))
+                                                augmented_image = ImageBuffer.from_pil(augmented_image.pil().resize((target_w, target_h)))
                                 except Exception:
                                     pass
                                 # Use centralized format conversion for augmented images
                                 if image_format_engine is not None:
                                     image_format_engine._save_image_with_format(augmented_image, aug_dest_path, config.output_format)
                                 else:
-                                    augmented_image.save(aug_dest_path)
+                                    augmented_image.pil().save(aug_dest_path)
                                 
                                 # Create corresponding label updated for transforms (use same descriptive naming)
                                 aug_label_filename = os.path.splitext(aug_filename)[0] + ".txt"
@@ -3405,6 +3523,11 @@ def create_complete_release_zip(
                                             f.write("")
                                 
                                 final_image_count += 1
+
+                if journal is not None:
+                    journal.record(journal_key, {"image_count": final_image_count - images_before})
+                if progress_callback:
+                    progress_callback(processed_source_images, total_source_images)
         
         # Step 3: Create data.yaml
         # Use the exact ordered class list used by the resolver
@@ -3509,6 +3632,7 @@ def create_complete_release_zip(
             config_data_json["classes"] = classes_sorted
         config_data_json["split_counts"] = split_counts_meta
         config_data_json["total_images"] = final_image_count
+        config_data_json["zip_compression"] = zip_compression_metadata(getattr(config, "zip_compression", None))
         # Embed transformation info for transparency
         try:
             if transformations:
@@ -3528,29 +3652,29 @@ def create_complete_release_zip(
         import gc
         gc.collect()
         
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(staging_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arc_path = os.path.relpath(file_path, staging_dir)
-                    try:
-                        zipf.write(file_path, arc_path)
-                    except Exception as e:
-                        logger.error("errors.system", f"Error writing file to zip: {file_path} - {str(e)}", "zip_file_write_error", {
-                            'release_id': release_id,
-                            'file_path': file_path,
-                            'error': str(e)
-                        })
-                        raise
+        # Images are stored as-is, labels / YAML / JSON are deflated (see RELEASE_ZIP_COMPRESSION)
+        write_directory_to_zip(staging_dir, str(zip_path), policy=getattr(config, "zip_compression", None))
         
         logger.info("operations.releases", f"Successfully created ZIP file", "zip_creation_complete", {
             'zip_path': str(zip_path),
             'final_image_count': final_image_count
         })
+        release_packaged = True
     finally:
+        # An interrupted run keeps its staging tree and journal so a retry can resume it
+        keep_checkpoint = False
+        if journal is not None:
+            keep_checkpoint = not release_packaged and journal.count() > 0
+            journal.close()
+            if keep_checkpoint:
+                logger.info("operations.releases", f"Release staging kept for resume", "release_checkpoint_kept", {
+                    'release_id': release_id,
+                    'staging_root': staging_root
+                })
+
         # Force cleanup staging directory with proper file handle management
         try:
-            if os.path.exists(staging_root):
+            if not keep_checkpoint and os.path.exists(staging_root):
                 # Force garbage collection to close any open file handles
                 import gc
                 gc.collect()
@@ -4,18 +4,21 @@ Handles real-time image transformation preview generation
 """
 
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from fastapi.responses import JSONResponse
-from typing import Dict, Any, List
+from fastapi.responses import JSONResponse, Response
+from typing import Dict, Any, List, Optional
 import json
+import base64
 import tempfile
 import os
-import numpy as np
 import logging
 import sys
 from pathlib import Path
 from PIL import Image, ImageEnhance, ImageFilter
 
 from ..services.image_transformer import ImageTransformer
+from ..services.preview_service import (
+    PREVIEW_FORMATS, PreviewSuperseded, get_preview_service, get_preview_sessions
+)
 from utils.image_utils import encode_image_to_base64, resize_image_for_preview
 
 # Import professional logging system
@@ -33,19 +36,28 @@ transformer = ImageTransformer()
 @router.post("/preview")
 async def generate_transformation_preview(
     image: UploadFile = File(...),
-    transformations: str = Form(...)
+    transformations: str = Form(...),
+    session_id: Optional[str] = Form(None)
 ):
     """
     Generate real-time preview of image transformations
+    
+    With a session_id, requests for the same file name are latest-wins: one that is
+    still queued when a newer one arrives gets 409 instead of being rendered.
     """
     logger.info("app.backend", "Transformation preview endpoint called", "preview_endpoint_start", {
         "endpoint": "/api/transformation/preview",
         "image_filename": image.filename,
         "image_content_type": image.content_type,
-        "image_size": image.size if hasattr(image, 'size') else "unknown"
+        "image_size": image.size if hasattr(image, 'size') else "unknown",
+        "session_id": session_id
     })
     
     try:
+        # Newer requests from this session supersede this one from here on
+        sessions = get_preview_sessions()
+        ticket = sessions.begin(session_id, image.filename or "")
+        
         # Parse transformations JSON
         try:
             transform_config = json.loads(transformations)
@@ -83,12 +95,12 @@ async def generate_transformation_preview(
                 "content_size_bytes": len(content)
             })
         
-        try:
+        def render():
             # Load and process image
             logger.debug("operations.images", "Loading image for transformation", "image_loading_start", {
                 "temp_path": temp_path
             })
-            original_image = transformer.load_image(temp_path)
+            original_image = transformer.load_image(temp_path, [transform_config])
             if original_image is None:
                 logger.error("errors.system", "Failed to load image from temporary file", "image_load_failure", {
                     "temp_path": temp_path
@@ -105,18 +117,17 @@ async def generate_transformation_preview(
                 "transformation_count": len(transform_config),
                 "transformation_types": list(transform_config.keys())
             })
-            transformed_image = transformer.apply_transformations(original_image, transform_config)
+            # Renders run on worker threads: each uses a transformer of its own from the preview pool
+            with get_preview_service().borrow_transformer() as render_transformer:
+                transformed_image = render_transformer.apply_transformations(original_image, transform_config)
             
             logger.info("operations.transformations", "Transformations applied successfully", "transformations_complete", {
                 "transformation_count": len(transform_config),
                 "final_dimensions": f"{transformed_image.width}x{transformed_image.height}"
             })
             
-            # Convert PIL Image to numpy array for preview processing
-            transformed_array = np.array(transformed_image)
-            
-            # Resize for preview
-            preview_image = resize_image_for_preview(transformed_array, max_size=400)
+            # Resize for preview (the buffer keeps its color order, no PIL/array round trip)
+            preview_image = resize_image_for_preview(transformed_image, max_size=400)
             
             # Convert to base64
             preview_base64 = encode_image_to_base64(preview_image)
@@ -125,6 +136,10 @@ async def generate_transformation_preview(
                 "preview_dimensions": f"{preview_image.shape[1]}x{preview_image.shape[0]}",
                 "base64_length": len(preview_base64)
             })
+            return transformed_image, preview_base64
+        
+        try:
+            transformed_image, preview_base64 = await sessions.run(ticket, render)
             
             return JSONResponse({
                 "success": True,
@@ -146,6 +161,8 @@ async def generate_transformation_preview(
                     "temp_path": temp_path
                 })
                 
+    except PreviewSuperseded:
+        raise HTTPException(status_code=409, detail="Preview superseded by a newer request")
     except HTTPException:
         raise
     except Exception as e:
@@ -220,7 +237,9 @@ async def generate_batch_transformation_preview(
             logger.debug("operations.images", "Loading image for batch transformations", "batch_image_loading_start", {
                 "temp_path": temp_path
             })
-            original_image = transformer.load_image(temp_path)
+            original_image = transformer.load_image(
+                temp_path, [t for t in transform_list if isinstance(t, dict)]
+            )
             if original_image is None:
                 logger.error("errors.system", "Failed to load image for batch transformations", "batch_image_load_failure", {
                     "temp_path": temp_path
@@ -248,7 +267,8 @@ async def generate_batch_transformation_preview(
                         "transformation_types": list(transform_config.keys()) if isinstance(transform_config, dict) else []
                     })
                     
-                    transformed_image = transformer.apply_transformations(original_image, transform_config)
+                    with get_preview_service().borrow_transformer() as render_transformer:
+                        transformed_image = render_transformer.apply_transformations(original_image, transform_config)
                     preview_image = resize_image_for_preview(transformed_image, max_size=300)
                     preview_base64 = encode_image_to_base64(preview_image)
                     
@@ -443,18 +463,32 @@ async def get_transformation_presets():
 @router.post("/preview-with-image-id")
 async def generate_preview_with_image_id(
     image_id: str = Form(...),
-    transformations: str = Form(...)
+    transformations: str = Form(...),
+    response_format: str = Form("json"),
+    session_id: Optional[str] = Form(None)
 ):
     """
     Generate transformation preview using image ID from database
     Enhanced for the new UI with better integration
+    
+    Rendered on the image's cached proxy (see PreviewService). response_format "json"
+    returns the preview as a base64 data URL with its metadata; "jpeg" or "webp" return
+    the encoded bytes directly, with the metadata in X-Preview-* headers.
+    With a session_id, requests for the same image are latest-wins: one that is still
+    queued when a newer one arrives gets 409 instead of being rendered.
     """
     logger.info("app.backend", "Transformation preview with image ID endpoint called", "preview_with_id_endpoint_start", {
         "endpoint": "/api/transformation/preview-with-image-id",
-        "image_id": image_id
+        "image_id": image_id,
+        "response_format": response_format,
+        "session_id": session_id
     })
     
     try:
+        # Newer requests from this session supersede this one from here on
+        sessions = get_preview_sessions()
+        ticket = sessions.begin(session_id, image_id)
+        
         # Parse transformations JSON
         try:
             transform_config = json.loads(transformations)
@@ -470,180 +504,57 @@ async def generate_preview_with_image_id(
             })
             raise HTTPException(status_code=400, detail="Invalid transformations JSON")
         
-        # Get image from database using image_id
-        from core.file_handler import file_handler
-        import cv2
-        import time
-        
-        start_time = time.time()
-        
-        # Get the actual file path using the database
-        from database.database import SessionLocal
-        from database.operations import ImageOperations
-        from utils.path_utils import path_manager
-        
-        logger.debug("app.database", "Retrieving image from database", "database_image_retrieval_start", {
-            "image_id": image_id
-        })
-        
-        image_file = None
-        db = SessionLocal()
-        try:
-            image = ImageOperations.get_image(db, image_id)
-            if image and image.file_path:
-                logger.debug("app.database", "Image found in database", "database_image_found", {
-                    "image_id": image_id,
-                    "file_path": image.file_path
-                })
-                
-                # Check if file exists using path manager
-                if path_manager.file_exists(image.file_path):
-                    image_file = image.file_path
-                    logger.debug("operations.images", "Image file exists at original path", "image_path_valid", {
-                        "file_path": image.file_path
-                    })
-                else:
-                    logger.debug("operations.images", "Image file not found at original path, attempting migration", "image_path_migration_attempt", {
-                        "original_path": image.file_path
-                    })
-                    # Try to migrate old path format
-                    migrated_path = path_manager.migrate_old_path(image.file_path)
-                    if migrated_path and path_manager.file_exists(migrated_path):
-                        # Update database with new path
-                        ImageOperations.update_image_path(db, image_id, migrated_path)
-                        image_file = migrated_path
-                        logger.info("operations.images", "Image path migrated successfully", "image_path_migrated", {
-                            "old_path": image.file_path,
-                            "new_path": migrated_path
-                        })
-                    else:
-                        logger.warning("operations.images", "Image path migration failed", "image_path_migration_failed", {
-                            "original_path": image.file_path,
-                            "migrated_path": migrated_path
-                        })
-            else:
-                logger.warning("app.database", "Image not found in database", "database_image_not_found", {
-                    "image_id": image_id
-                })
-        finally:
-            db.close()
+        if response_format != "json" and response_format not in PREVIEW_FORMATS:
+            raise HTTPException(status_code=400, detail=f"Unsupported response_format: {response_format}")
         
-        if not image_file:
+        # Decoded proxy from the LRU (database and decode only on a miss), transformed and encoded
+        result = await sessions.run(ticket, lambda: get_preview_service().render(
+            image_id, transform_config, "jpeg" if response_format == "json" else response_format
+        ))
+        if result is None:
             logger.error("errors.validation", "Image file not found for ID", "image_file_not_found", {
                 "image_id": image_id
             })
             raise HTTPException(status_code=404, detail=f"Image file not found for ID {image_id}")
         
-        # Load the actual image (fix path separators and make absolute path)
-        # Convert Windows-style backslashes to forward slashes for Linux compatibility
-        image_file_normalized = image_file.replace('\\', '/')
-        
-        # Make sure we have an absolute path relative to project root
-        if not os.path.isabs(image_file_normalized):
-            # All paths in database are relative to project root
-            # Get project root dynamically (cross-platform compatible)
-            import sys
-            current_dir = os.getcwd()
-            if 'backend' in current_dir:
-                project_root = os.path.dirname(current_dir)  # Go up one level from backend to project root
-            else:
-                project_root = current_dir
-            
-            # Join with forward slashes for Linux
-            image_file_normalized = os.path.join(project_root, image_file_normalized).replace('\\', '/')
-        
-        logger.info("operations.images", f"Attempting to load image from: {image_file_normalized}", "image_load_attempt", {
-            'image_path': image_file_normalized,
-            'endpoint': '/api/transformation/preview-with-image-id'
-        })
-        
-        sample_image = cv2.imread(image_file_normalized)
-        if sample_image is None:
-            logger.error("errors.system", "Failed to load image file with OpenCV", "opencv_image_load_failure", {
-                "image_path": image_file_normalized
-            })
-            raise HTTPException(status_code=400, detail=f"Failed to load image file: {image_file_normalized}")
-        
-        logger.info("operations.images", "Image loaded successfully with OpenCV", "opencv_image_loaded", {
-            "image_path": image_file_normalized,
-            "image_shape": sample_image.shape,
-            "image_dtype": str(sample_image.dtype)
-        })
-        
-        # Convert to PIL Image for transformations
-        from PIL import Image
-        if len(sample_image.shape) == 3:
-            sample_image_rgb = cv2.cvtColor(sample_image, cv2.COLOR_BGR2RGB)
-        else:
-            sample_image_rgb = sample_image
-        
-        pil_image = Image.fromarray(sample_image_rgb)
-        
-        # Apply transformations using the ImageTransformer class
-        logger.debug("operations.transformations", "Applying transformations to image from database", "database_image_transformations_start", {
-            "transformation_count": len(transform_config),
-            "transformation_types": list(transform_config.keys())
-        })
-        
-        transformed_image = transformer.apply_transformations(pil_image, transform_config)
-        
-        logger.info("operations.transformations", "Transformations applied successfully to database image", "database_image_transformations_complete", {
-            "transformation_count": len(transform_config),
-            "original_dimensions": f"{pil_image.width}x{pil_image.height}",
-            "final_dimensions": f"{transformed_image.width}x{transformed_image.height}"
-        })
-        
-        # Resize for preview (max 400px)
-        original_size = transformed_image.size
-        max_size = 400
-        if max(original_size) > max_size:
-            ratio = max_size / max(original_size)
-            new_size = (int(original_size[0] * ratio), int(original_size[1] * ratio))
-            transformed_image = transformed_image.resize(new_size, Image.Resampling.LANCZOS)
-            logger.debug("operations.images", "Image resized for preview", "preview_resize_complete", {
-                "original_size": original_size,
-                "new_size": new_size,
-                "max_size": max_size
-            })
-        
-        # Convert to base64
-        from utils.image_utils import encode_image_to_base64
-        
-        # Convert PIL to numpy array
-        preview_array = np.array(transformed_image)
-        if len(preview_array.shape) == 3:
-            preview_array = cv2.cvtColor(preview_array, cv2.COLOR_RGB2BGR)
-        
-        preview_base64 = encode_image_to_base64(preview_array)
-        
-        processing_time = int((time.time() - start_time) * 1000)
-        
         logger.info("operations.images", "Preview generation with image ID completed successfully", "preview_with_id_generation_complete", {
             "image_id": image_id,
-            "processing_time_ms": processing_time,
-            "preview_dimensions": f"{transformed_image.size[0]}x{transformed_image.size[1]}",
-            "base64_length": len(preview_base64)
+            "processing_time_ms": result.processing_time_ms,
+            "proxy_hit": result.proxy_hit,
+            "preview_dimensions": f"{result.preview_size[0]}x{result.preview_size[1]}",
+            "preview_bytes": len(result.data)
         })
         
+        if response_format != "json":
+            return Response(content=result.data, media_type=result.media_type, headers={
+                "X-Preview-Applied-Transformations": ",".join(result.applied_transformations),
+                "X-Preview-Image-Width": str(result.transformed_size[0]),
+                "X-Preview-Image-Height": str(result.transformed_size[1]),
+                "X-Preview-Processing-Time-Ms": str(result.processing_time_ms),
+                "X-Preview-Proxy-Hit": "1" if result.proxy_hit else "0"
+            })
+        
         return JSONResponse({
             "success": True,
             "data": {
-                "preview_image": preview_base64,
+                "preview_image": f"data:{result.media_type};base64,{base64.b64encode(result.data).decode('ascii')}",
                 "original_image_id": image_id,
                 "applied_transformations": list(transform_config.keys()),
                 "transformation_count": len(transform_config),
-                "processing_time_ms": processing_time,
+                "processing_time_ms": result.processing_time_ms,
                 "image_dimensions": {
-                    "width": original_size[0],
-                    "height": original_size[1]
+                    "width": result.transformed_size[0],
+                    "height": result.transformed_size[1]
                 },
                 "preview_dimensions": {
-                    "width": transformed_image.size[0],
-                    "height": transformed_image.size[1]
+                    "width": result.preview_size[0],
+                    "height": result.preview_size[1]
                 }
             }
         })
         
+    except PreviewSuperseded:
+        raise HTTPException(status_code=409, detail="Preview superseded by a newer request")
     except HTTPException:
         raise
     except Exception as e:
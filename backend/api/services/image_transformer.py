@@ -8,7 +8,7 @@ import cv2
 from PIL import Image, ImageEnhance, ImageFilter, ImageOps
 import random
 import math
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional, Union
 import sys
 import os
 from logging_system.professional_logger import get_professional_logger
@@ -33,6 +33,20 @@ from core.transformation_config import (
     get_random_zoom_parameters, get_affine_transform_parameters,
     get_perspective_warp_parameters
 )
+from core.photometric_lut import PhotometricChain, PhotometricOp
+from core import array_augment
+from core.image_buffer import ImageBuffer, as_pil
+from core.decode_planner import open_image
+from core.transform_plan import TransformPlan, compile_plan
+
+# Geometric steps that apply_transformations_fused folds into one warp matrix
+FUSABLE_GEOMETRY_TRANSFORMS = (
+    'resize', 'rotate', 'flip', 'crop', 'random_zoom',
+    'affine_transform', 'perspective_warp', 'shear'
+)
+
+# Steps whose _apply_* method works in place on an ImageBuffer's array (no PIL round trip)
+ARRAY_NATIVE_TRANSFORMS = ('noise', 'cutout', 'color_jitter')
 
 
 
@@ -41,12 +55,19 @@ class ImageTransformer:
     Handles all image transformation operations
     """
     
-    def __init__(self):
+    def __init__(self, fuse_photometric: Optional[bool] = None, seed: Optional[int] = None):
+        from core.config import settings
+        # Random draws of noise and cutout (seed for reproducible output)
+        self.rng = np.random.default_rng(seed)
+        # Fold runs of point-wise photometric steps into one lookup table (see PhotometricChain)
+        self.fuse_photometric = settings.TRANSFORM_FUSED_PHOTOMETRIC if fuse_photometric is None else fuse_photometric
+        
         logger.info("operations.transformations", "Initializing ImageTransformer service", "transformer_init", {
             'transformation_count': 18,
             'basic_transformations': ['resize', 'rotate', 'flip', 'crop', 'brightness', 'contrast', 'blur', 'noise'],
             'advanced_transformations': ['color_jitter', 'cutout', 'random_zoom', 'affine_transform', 'perspective_warp', 'grayscale', 'shear', 'gamma_correction', 'equalize', 'clahe'],
-            'central_config_integration': True
+            'central_config_integration': True,
+            'fuse_photometric': self.fuse_photometric
         })
         
         # Store actual parameters for geometry tools (crop, rotation, affine_transform)
@@ -102,72 +123,113 @@ class ImageTransformer:
             'clahe': self._apply_clahe
         }
     
-    def apply_transformations(self, image: Image.Image, config: Dict[str, Any]) -> Image.Image:
+    def compile(self, config: Dict[str, Any]) -> TransformPlan:
+        """
+        Compile a resolved config into a TransformPlan for this transformer: enabled
+        steps with their lookup tables prebuilt and geometry matrices cached per size.
+        Apply the same plan to many images to skip re-reading the config each time.
+        """
+        return compile_plan(config, self, FUSABLE_GEOMETRY_TRANSFORMS)
+    
+    def apply_transformations(self, image: Union[Image.Image, ImageBuffer],
+                              config: Union[Dict[str, Any], TransformPlan]) -> Union[Image.Image, ImageBuffer]:
         """
         Apply a series of transformations to an image
         
+        With fuse_photometric on, consecutive point-wise steps (brightness, contrast,
+        gamma, grayscale, color jitter) are folded into one lookup table and applied
+        in a single pass when the next other step (or the end) is reached.
+        
+        The image travels between steps as an ImageBuffer, so array-native steps
+        (noise, cutout, color jitter) and PIL steps only convert when the
+        representation actually changes.
+        
         Args:
-            image: PIL Image to transform
-            config: Dictionary containing transformation parameters
+            image: PIL Image or ImageBuffer to transform
+            config: Dictionary containing transformation parameters, or its compiled plan
             
         Returns:
-            Transformed PIL Image
+            Transformed image, of the same kind as `image`
         """
         try:
             original_size = image.size
-            enabled_transformations = [name for name, params in config.items() if params.get('enabled', True)]
+            plan = config if isinstance(config, TransformPlan) else self.compile(config)
+            config = plan.config
             
             logger.info("operations.transformations", f"Starting image transformations", "transformations_start", {
                 'transformation_count': len(config),
-                'enabled_transformations': enabled_transformations,
+                'enabled_transformations': plan.names,
                 'image_size': f"{original_size[0]}x{original_size[1]}",
                 'config_keys': list(config.keys())
             })
             
-            result_image = image.copy()
+            result_image = image.copy() if isinstance(image, ImageBuffer) else ImageBuffer.from_pil(image)
             applied_transformations = []
             failed_transformations = []
+            photometric: Optional[PhotometricChain] = None
+            lut_passes = 0
+            
+            def flush_photometric(current: ImageBuffer) -> ImageBuffer:
+                nonlocal photometric, lut_passes
+                if photometric is not None:
+                    current = ImageBuffer.from_pil(photometric.result())
+                    lut_passes += photometric.passes
+                    photometric = None
+                return current
             
             # Show image transformation order
             transformation_order = list(config.keys())
             logger.info("operations.transformations", f"Image generation order: {transformation_order}")
             
             # Apply transformations in order
-            for transform_name, params in config.items():
-                if transform_name in self.transformation_methods and params.get('enabled', True):
-                    try:
-                        logger.info("operations.transformations", f"Applying transformation: {transform_name}", "transformation_apply", {
-                            'transform_name': transform_name,
-                            'params': params,
-                            'image_size_before': f"{result_image.size[0]}x{result_image.size[1]}"
-                        })
-                        
-                        result_image = self.transformation_methods[transform_name](result_image, params)
+            for step in plan.steps:
+                transform_name, params = step.name, step.params
+                try:
+                    ops = step.photometric_ops
+                    if ops is not None and (photometric is not None or PhotometricChain.supports(result_image)):
+                        # Point-wise step: fold into the pending lookup table
+                        if photometric is None:
+                            photometric = PhotometricChain(result_image.pil())
+                        photometric.extend(ops)
                         applied_transformations.append(transform_name)
-                        
-                        logger.info("operations.transformations", f"Successfully applied transformation: {transform_name}", "transformation_success", {
-                            'transform_name': transform_name,
-                            'image_size_after': f"{result_image.size[0]}x{result_image.size[1]}"
-                        })
-                        
-                    except Exception as e:
-                        logger.warning("errors.system", f"Failed to apply {transform_name}: {str(e)}", "transformation_failed", {
-                            'transform_name': transform_name,
-                            'error': str(e),
-                            'params': params
-                        })
-                        failed_transformations.append(transform_name)
                         continue
+                    result_image = flush_photometric(result_image)
+                    
+                    logger.info("operations.transformations", f"Applying transformation: {transform_name}", "transformation_apply", {
+                        'transform_name': transform_name,
+                        'params': params,
+                        'image_size_before': f"{result_image.size[0]}x{result_image.size[1]}"
+                    })
+                    
+                    result_image = self._apply_step(transform_name, result_image, params)
+                    applied_transformations.append(transform_name)
+                    
+                    logger.info("operations.transformations", f"Successfully applied transformation: {transform_name}", "transformation_success", {
+                        'transform_name': transform_name,
+                        'image_size_after': f"{result_image.size[0]}x{result_image.size[1]}"
+                    })
+                    
+                except Exception as e:
+                    logger.warning("errors.system", f"Failed to apply {transform_name}: {str(e)}", "transformation_failed", {
+                        'transform_name': transform_name,
+                        'error': str(e),
+                        'params': params
+                    })
+                    failed_transformations.append(transform_name)
+                    continue
+            
+            result_image = flush_photometric(result_image)
             
             logger.info("operations.transformations", f"Completed image transformations", "transformations_complete", {
                 'applied_transformations': applied_transformations,
                 'failed_transformations': failed_transformations,
+                'lut_passes': lut_passes,
                 'success_rate': f"{len(applied_transformations)}/{len(applied_transformations) + len(failed_transformations)}",
                 'final_image_size': f"{result_image.size[0]}x{result_image.size[1]}",
                 'original_size': f"{original_size[0]}x{original_size[1]}"
             })
             
-            return result_image
+            return self._buffer_output(result_image, image)
             
         except Exception as e:
             logger.error("errors.system", f"Error applying transformations: {str(e)}", "transformations_error", {
@@ -177,6 +239,162 @@ class ImageTransformer:
             })
             return image
     
+    def apply_transformations_fused(self, image: Union[Image.Image, ImageBuffer],
+                                    config: Union[Dict[str, Any], TransformPlan]
+                                    ) -> Tuple[Union[Image.Image, ImageBuffer], np.ndarray]:
+        """
+        Apply transformations with consecutive geometric steps composed into one warp
+        
+        Each geometric step contributes a 3x3 matrix (pixel coordinates of its input
+        to pixel coordinates of its output) instead of resampling the image. A run of
+        geometric steps is warped once, so the image is resampled once rather than
+        once per step. Photometric steps still run in config order on the warped image
+        (point-wise ones folded into a lookup table, as in apply_transformations), and a
+        run is also split when two steps would pad with different fill colors.
+        
+        Args:
+            image: PIL Image or ImageBuffer to transform
+            config: Dictionary containing transformation parameters, or its compiled plan
+            
+        Returns:
+            (transformed image of the same kind as `image`, 3x3 matrix mapping
+            source pixels to output pixels)
+        """
+        original_size = image.size
+        plan = config if isinstance(config, TransformPlan) else self.compile(config)
+        total_matrix = np.eye(3)
+        run_matrix = np.eye(3)
+        run_size = original_size
+        run_fill = None
+        run_steps: List[str] = []
+        warp_count = 0
+        applied_transformations = []
+        failed_transformations = []
+        result_image = image.copy() if isinstance(image, ImageBuffer) else ImageBuffer.from_pil(image)
+        photometric: Optional[PhotometricChain] = None
+        lut_passes = 0
+        
+        def flush_photometric(current: ImageBuffer) -> ImageBuffer:
+            nonlocal photometric, lut_passes
+            if photometric is not None:
+                current = ImageBuffer.from_pil(photometric.result())
+                lut_passes += photometric.passes
+                photometric = None
+            return current
+        
+        def flush_run(current: ImageBuffer) -> ImageBuffer:
+            nonlocal run_matrix, run_fill, run_steps, warp_count
+            if run_steps:
+                current = self._warp_with_matrix(current, run_matrix, run_size, run_fill)
+                warp_count += 1
+            run_matrix = np.eye(3)
+            run_fill = None
+            run_steps = []
+            return current
+        
+        for plan_step in plan.steps:
+            transform_name, params = plan_step.name, plan_step.params
+            try:
+                ops = None if transform_name in FUSABLE_GEOMETRY_TRANSFORMS else plan_step.photometric_ops
+                if ops is not None and photometric is None:
+                    # Point-wise step: warp any pending geometry, then start a lookup table
+                    result_image = flush_run(result_image)
+                    if PhotometricChain.supports(result_image):
+                        photometric = PhotometricChain(result_image.pil())
+                if ops is not None and photometric is not None:
+                    photometric.extend(ops)
+                    applied_transformations.append(transform_name)
+                elif transform_name in FUSABLE_GEOMETRY_TRANSFORMS:
+                    result_image = flush_photometric(result_image)
+                    step = plan_step.geometry_matrix(self, run_size)
+                    applied_transformations.append(transform_name)
+                    if step is None:
+                        continue  # step is a no-op for these parameters
+                    step_matrix, step_size, step_fill = step
+                    if step_fill is not None and run_fill is not None and step_fill != run_fill:
+                        result_image = flush_run(result_image)
+                    run_matrix = step_matrix @ run_matrix
+                    total_matrix = step_matrix @ total_matrix
+                    run_size = step_size
+                    run_fill = run_fill if step_fill is None else step_fill
+                    run_steps.append(transform_name)
+                else:
+                    result_image = flush_run(flush_photometric(result_image))
+                    result_image = self._apply_step(transform_name, result_image, params)
+                    run_size = result_image.size
+                    applied_transformations.append(transform_name)
+            except Exception as e:
+                logger.warning("errors.system", f"Failed to apply {transform_name}: {str(e)}", "transformation_failed", {
+                    'transform_name': transform_name,
+                    'error': str(e),
+                    'params': params,
+                    'fused_geometry': True
+                })
+                failed_transformations.append(transform_name)
+        
+        try:
+            result_image = flush_run(flush_photometric(result_image))
+        except Exception as e:
+            logger.error("errors.system", f"Fused geometry warp failed: {str(e)}", "fused_warp_error", {
+                'error': str(e),
+                'image_size': f"{original_size[0]}x{original_size[1]}"
+            })
+            raise
+        
+        logger.info("operations.transformations", "Completed fused image transformations", "transformations_fused_complete", {
+            'applied_transformations': applied_transformations,
+            'failed_transformations': failed_transformations,
+            'warp_count': warp_count,
+            'lut_passes': lut_passes,
+            'final_image_size': f"{result_image.size[0]}x{result_image.size[1]}",
+            'original_size': f"{original_size[0]}x{original_size[1]}"
+        })
+        
+        return self._buffer_output(result_image, image), total_matrix
+    
+    def load_image(self, image_path: str, configs: Optional[List[Dict[str, Any]]] = None) -> Optional[ImageBuffer]:
+        """
+        Decode an image file into an RGB ImageBuffer
+        
+        Args:
+            image_path: Path to the image file
+            configs: Transformation configs that will run on the image; when they all
+                start by downscaling, JPEGs are decoded at reduced resolution
+            
+        Returns:
+            ImageBuffer, or None if the file cannot be decoded
+        """
+        try:
+            image, plan = open_image(image_path, configs, self)
+            if plan.reduced:
+                logger.debug("operations.images", "Decoded image at reduced resolution", "reduced_decode", {
+                    'image_path': image_path,
+                    'original_size': plan.original_size,
+                    'decoded_size': plan.decoded_size,
+                    'scale': plan.scale
+                })
+            return ImageBuffer.from_pil(image)
+        except Exception as e:
+            logger.error("errors.system", f"Failed to load image: {str(e)}", "image_load_error", {
+                'image_path': image_path,
+                'error': str(e)
+            })
+            return None
+    
+    def _apply_step(self, transform_name: str, current: ImageBuffer, params: Dict[str, Any]) -> ImageBuffer:
+        """Run one _apply_* method: array-native ones in place on the buffer, the rest on its PIL image"""
+        if transform_name in ARRAY_NATIVE_TRANSFORMS:
+            return self.transformation_methods[transform_name](current, params)
+        return ImageBuffer.from_pil(self.transformation_methods[transform_name](current.pil(), params))
+    
+    @staticmethod
+    def _buffer_output(result: ImageBuffer, image: Union[Image.Image, ImageBuffer]) -> Union[Image.Image, ImageBuffer]:
+        """Hand the result back in the caller's representation; PIL callers always get a new image"""
+        if isinstance(image, ImageBuffer):
+            return result
+        output = result.pil()
+        return output.copy() if output is image else output
+    
     def get_available_transformations(self) -> Dict[str, Dict[str, Any]]:
         """
         Get specifications for all available transformations
@@ -968,16 +1186,37 @@ class ImageTransformer:
             })
             raise
     
+    def _brightness_factor(self, params: Dict[str, Any]) -> Tuple[Any, float]:
+        """(percentage, ImageEnhance factor) for a brightness step"""
+        from core.transformation_config import brightness_percentage_to_factor
+        
+        # Get percentage value (centralized format)
+        percentage = params.get('percentage', params.get('adjustment', params.get('factor', self._get_brightness_params()['default'])))
+        
+        # Use centralized bridge function for 100% consistency
+        if isinstance(percentage, (int, float)) and -50 <= percentage <= 50:
+            return percentage, brightness_percentage_to_factor(percentage)
+        # Fallback for legacy formats
+        return percentage, (percentage if percentage > 0 else 1.0)
+    
+    def _contrast_factor(self, params: Dict[str, Any]) -> Tuple[Any, float]:
+        """(percentage, ImageEnhance factor) for a contrast step"""
+        from core.transformation_config import contrast_percentage_to_factor
+        
+        # Get percentage value (centralized format)
+        percentage = params.get('percentage', params.get('adjustment', params.get('factor', self._get_contrast_params()['default'])))
+        
+        # Use centralized bridge function for 100% consistency
+        if isinstance(percentage, (int, float)) and -50 <= percentage <= 50:
+            return percentage, contrast_percentage_to_factor(percentage)
+        # Fallback for legacy formats
+        return percentage, (percentage if percentage > 0 else 1.0)
+    
     def _apply_brightness(self, image: Image.Image, params: Dict[str, Any]) -> Image.Image:
         """Adjust image brightness using centralized config bridge"""
         try:
             original_size = image.size
-            from core.transformation_config import brightness_percentage_to_factor
-            
-            # Get parameters from central config
-            brightness_params = self._get_brightness_params()
-            # Get percentage value (centralized format)
-            percentage = params.get('percentage', params.get('adjustment', params.get('factor', brightness_params['default'])))
+            percentage, factor = self._brightness_factor(params)
             
             logger.info("operations.transformations", f"Applying brightness transformation", "brightness_start", {
                 'original_size': f"{original_size[0]}x{original_size[1]}",
@@ -985,13 +1224,6 @@ class ImageTransformer:
                 'params': params
             })
             
-            # Use centralized bridge function for 100% consistency
-            if isinstance(percentage, (int, float)) and -50 <= percentage <= 50:
-                factor = brightness_percentage_to_factor(percentage)
-            else:
-                # Fallback for legacy formats
-                factor = percentage if percentage > 0 else 1.0
-                
             enhancer = ImageEnhance.Brightness(image)
             result = enhancer.enhance(factor)
             
@@ -1016,12 +1248,7 @@ class ImageTransformer:
         """Adjust image contrast using centralized config bridge"""
         try:
             original_size = image.size
-            from core.transformation_config import contrast_percentage_to_factor
-            
-            # Get parameters from central config
-            contrast_params = self._get_contrast_params()
-            # Get percentage value (centralized format)
-            percentage = params.get('percentage', params.get('adjustment', params.get('factor', contrast_params['default'])))
+            percentage, factor = self._contrast_factor(params)
             
             logger.info("operations.transformations", f"Applying contrast transformation", "contrast_start", {
                 'original_size': f"{original_size[0]}x{original_size[1]}",
@@ -1029,13 +1256,6 @@ class ImageTransformer:
                 'params': params
             })
             
-            # Use centralized bridge function for 100% consistency
-            if isinstance(percentage, (int, float)) and -50 <= percentage <= 50:
-                factor = contrast_percentage_to_factor(percentage)
-            else:
-                # Fallback for legacy formats
-                factor = percentage if percentage > 0 else 1.0
-                
             enhancer = ImageEnhance.Contrast(image)
             result = enhancer.enhance(factor)
             
@@ -1137,31 +1357,12 @@ class ImageTransformer:
                 # Old intensity format (0.001-0.1) for backwards compatibility
                 intensity = strength
             
-            # Convert to numpy array
-            img_array = np.array(image).astype(np.float32)
-            
-            if noise_type == 'gaussian':
-                # Gaussian noise
-                noise = np.random.normal(0, intensity * 255, img_array.shape)
-            elif noise_type == 'salt_pepper':
-                # Salt and pepper noise
-                noise = np.zeros_like(img_array)
-                # Salt noise (white pixels)
-                salt_coords = np.random.random(img_array.shape[:2]) < intensity / 2
-                noise[salt_coords] = 255 - img_array[salt_coords]
-                # Pepper noise (black pixels)
-                pepper_coords = np.random.random(img_array.shape[:2]) < intensity / 2
-                noise[pepper_coords] = -img_array[pepper_coords]
-            elif noise_type == 'uniform':
-                # Uniform noise
-                noise = np.random.uniform(-intensity * 255, intensity * 255, img_array.shape)
-            else:
-                # Default to Gaussian
-                noise = np.random.normal(0, intensity * 255, img_array.shape)
-            
-            # Add noise and clip values
-            noisy_array = np.clip(img_array + noise, 0, 255).astype(np.uint8)
-            result = Image.fromarray(noisy_array)
+            # Gaussian / salt_pepper / uniform (unknown types default to Gaussian), added
+            # in place on the thread's working buffer
+            workspace = array_augment.get_workspace()
+            pixels = workspace.load(image)
+            array_augment.add_noise(pixels, self.rng, noise_type, intensity, workspace)
+            result = workspace.result(image, pixels)
             
             logger.info("operations.transformations", f"Noise transformation completed", "noise_success", {
                 'original_size': f"{original_size[0]}x{original_size[1]}",
@@ -1181,6 +1382,39 @@ class ImageTransformer:
             })
             raise
     
+    @staticmethod
+    def _color_jitter_factors(params: Dict[str, Any]) -> Dict[str, Any]:
+        """Raw values and factors for each color jitter component"""
+        # Handle hue shift (new parameter name: hue_shift)
+        hue_shift = params.get('hue_shift', params.get('hue', 0))  # Support both old and new parameter names
+        if isinstance(hue_shift, int) and -30 <= hue_shift <= 30:
+            # New degrees format (-30 to +30) - convert to factor
+            hue_factor = hue_shift / 180.0  # Convert degrees to factor
+        else:
+            # Old factor format (-0.1 to 0.1) for backwards compatibility
+            hue_factor = hue_shift
+        
+        factors = {'hue_shift': hue_shift, 'hue_factor': hue_factor}
+        # Brightness, contrast and saturation variations share one format:
+        # new percentage format (-20 to +20) or old factor format (0.8-1.2)
+        for component in ('brightness', 'contrast', 'saturation'):
+            variation = params.get(f'{component}_variation', params.get(component, 1.0))  # Support both old and new parameter names
+            if isinstance(variation, int) and -20 <= variation <= 20:
+                factor = 1.0 + (variation / 100.0)
+            else:
+                factor = variation
+            factors[f'{component}_variation'] = variation
+            factors[f'{component}_factor'] = factor
+        return factors
+    
+    @staticmethod
+    def _color_jitter_effect(image: Image.Image, **factors) -> Image.Image:
+        """One color jitter effect (hue_factor= or saturation_factor=) on the working buffer"""
+        workspace = array_augment.get_workspace()
+        pixels = workspace.load(image, 'RGB' if image.mode == 'RGB' else None)
+        array_augment.color_jitter(pixels, workspace, **factors)
+        return workspace.result(image, pixels)
+    
     # Advanced transformation methods
     def _apply_color_jitter(self, image: Image.Image, params: Dict[str, Any]) -> Image.Image:
         """Apply color jittering with improved parameter names"""
@@ -1192,92 +1426,20 @@ class ImageTransformer:
                 'params': params
             })
             
-            result = image
-            applied_effects = []
-            
-            # Handle hue shift (new parameter name: hue_shift)
-            hue_shift = params.get('hue_shift', params.get('hue', 0))  # Support both old and new parameter names
-            
-            # Convert hue shift to factor if needed
-            if isinstance(hue_shift, int) and -30 <= hue_shift <= 30:
-                # New degrees format (-30 to +30) - convert to factor
-                hue_factor = hue_shift / 180.0  # Convert degrees to factor
-            else:
-                # Old factor format (-0.1 to 0.1) for backwards compatibility
-                hue_factor = hue_shift
-            
-            if hue_factor != 0:
-                logger.info("operations.transformations", f"Applying hue shift in color jitter", "color_jitter_hue", {
-                    'hue_shift': hue_shift,
-                    'hue_factor': hue_factor
-                })
-                # Convert to HSV, shift hue, convert back
-                img_array = np.array(result)
-                hsv = cv2.cvtColor(img_array, cv2.COLOR_RGB2HSV)
-                hsv[:, :, 0] = (hsv[:, :, 0] + hue_factor * 180) % 180
-                rgb = cv2.cvtColor(hsv, cv2.COLOR_HSV2RGB)
-                result = Image.fromarray(rgb)
-                applied_effects.append('hue_shift')
-            
-            # Handle brightness variation (new parameter name: brightness_variation)
-            brightness_variation = params.get('brightness_variation', params.get('brightness', 1.0))  # Support both old and new parameter names
-            
-            # Convert brightness variation to factor if needed
-            if isinstance(brightness_variation, int) and -20 <= brightness_variation <= 20:
-                # New percentage format (-20 to +20) - convert to factor
-                brightness_factor = 1.0 + (brightness_variation / 100.0)
-            else:
-                # Old factor format (0.8-1.2) for backwards compatibility
-                brightness_factor = brightness_variation
-            
-            if brightness_factor != 1.0:
-                logger.info("operations.transformations", f"Applying brightness variation in color jitter", "color_jitter_brightness", {
-                    'brightness_variation': brightness_variation,
-                    'brightness_factor': brightness_factor
-                })
-                enhancer = ImageEnhance.Brightness(result)
-                result = enhancer.enhance(brightness_factor)
-                applied_effects.append('brightness_variation')
-            
-            # Handle contrast variation (new parameter name: contrast_variation)
-            contrast_variation = params.get('contrast_variation', params.get('contrast', 1.0))  # Support both old and new parameter names
-            
-            # Convert contrast variation to factor if needed
-            if isinstance(contrast_variation, int) and -20 <= contrast_variation <= 20:
-                # New percentage format (-20 to +20) - convert to factor
-                contrast_factor = 1.0 + (contrast_variation / 100.0)
-            else:
-                # Old factor format (0.8-1.2) for backwards compatibility
-                contrast_factor = contrast_variation
-            
-            if contrast_factor != 1.0:
-                logger.info("operations.transformations", f"Applying contrast variation in color jitter", "color_jitter_contrast", {
-                    'contrast_variation': contrast_variation,
-                    'contrast_factor': contrast_factor
-                })
-                enhancer = ImageEnhance.Contrast(result)
-                result = enhancer.enhance(contrast_factor)
-                applied_effects.append('contrast_variation')
-            
-            # Handle saturation variation (new parameter name: saturation_variation)
-            saturation_variation = params.get('saturation_variation', params.get('saturation', 1.0))  # Support both old and new parameter names
-            
-            # Convert saturation variation to factor if needed
-            if isinstance(saturation_variation, int) and -20 <= saturation_variation <= 20:
-                # New percentage format (-20 to +20) - convert to factor
-                saturation_factor = 1.0 + (saturation_variation / 100.0)
-            else:
-                # Old factor format (0.8-1.2) for backwards compatibility
-                saturation_factor = saturation_variation
-            
-            if saturation_factor != 1.0:
-                logger.info("operations.transformations", f"Applying saturation variation in color jitter", "color_jitter_saturation", {
-                    'saturation_variation': saturation_variation,
-                    'saturation_factor': saturation_factor
-                })
-                enhancer = ImageEnhance.Color(result)
-                result = enhancer.enhance(saturation_factor)
-                applied_effects.append('saturation_variation')
+            factors = self._color_jitter_factors(params)
+            hue_shift, hue_factor = factors['hue_shift'], factors['hue_factor']
+            brightness_variation, brightness_factor = factors['brightness_variation'], factors['brightness_factor']
+            contrast_variation, contrast_factor = factors['contrast_variation'], factors['contrast_factor']
+            saturation_variation, saturation_factor = factors['saturation_variation'], factors['saturation_factor']
+            
+            # Hue, brightness, contrast, saturation in place on the thread's working buffer
+            workspace = array_augment.get_workspace()
+            pixels = workspace.load(image, 'RGB' if image.mode == 'RGB' else None)
+            applied_effects = [f"{effect}_shift" if effect == 'hue' else f"{effect}_variation"
+                               for effect in array_augment.color_jitter(
+                                   pixels, workspace, hue_factor, brightness_factor,
+                                   contrast_factor, saturation_factor)]
+            result = workspace.result(image, pixels)
             
             logger.info("operations.transformations", f"Color jitter transformation completed", "color_jitter_success", {
                 'original_size': f"{original_size[0]}x{original_size[1]}",
@@ -1316,17 +1478,10 @@ class ImageTransformer:
                 'params': params
             })
             
-            img_array = np.array(image)
-            height, width = img_array.shape[:2]
-            
-            hole_positions = []
-            for _ in range(num_holes):
-                y = random.randint(0, height - hole_size)
-                x = random.randint(0, width - hole_size)
-                img_array[y:y+hole_size, x:x+hole_size] = 0
-                hole_positions.append((x, y))
-            
-            result = Image.fromarray(img_array)
+            workspace = array_augment.get_workspace()
+            pixels = workspace.load(image)
+            hole_positions = array_augment.cutout(pixels, self.rng, num_holes, hole_size)
+            result = workspace.result(image, pixels)
             
             logger.info("operations.transformations", f"Cutout transformation completed", "cutout_success", {
                 'original_size': f"{original_size[0]}x{original_size[1]}",
@@ -1817,6 +1972,306 @@ class ImageTransformer:
             })
             raise
     
+    # ------------------------------------------------------------------
+    # Fused geometry: per-step matrices for apply_transformations_fused
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _fill_rgb(fill_color: Any, default: Tuple[int, int, int]) -> Tuple[int, int, int]:
+        """Normalize a fill color parameter ('white'/'black'/RGB sequence) to an RGB tuple"""
+        if isinstance(fill_color, str):
+            return {'white': (255, 255, 255), 'black': (0, 0, 0)}.get(fill_color.lower(), default)
+        if isinstance(fill_color, (list, tuple)) and len(fill_color) >= 3:
+            return tuple(int(c) for c in fill_color[:3])
+        return default
+    
+    @staticmethod
+    def _scale_translate(sx: float, sy: float, tx: float = 0.0, ty: float = 0.0) -> np.ndarray:
+        return np.array([[sx, 0.0, tx], [0.0, sy, ty], [0.0, 0.0, 1.0]])
+    
+    @staticmethod
+    def _shift_factor(value: Any) -> float:
+        """Percentage (-20..20 int) or factor shift, as in _apply_affine_transform"""
+        if isinstance(value, int) and -20 <= value <= 20:
+            return value / 100.0
+        return value
+    
+    def _rotation_matrix(self, angle: float, size: Tuple[int, int],
+                         expand: bool) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """Forward matrix and canvas size of PIL's Image.rotate(angle, expand=...)"""
+        w, h = size
+        a = -math.radians(angle % 360.0)
+        cos_a, sin_a = round(math.cos(a), 15), round(math.sin(a), 15)
+        cx, cy = w / 2, h / 2
+        # PIL's inverse (output -> input) matrix, built the same way Image.rotate does
+        inverse = np.array([
+            [cos_a, sin_a, cx - cos_a * cx - sin_a * cy],
+            [-sin_a, cos_a, cy + sin_a * cx - cos_a * cy],
+            [0.0, 0.0, 1.0]
+        ])
+        if expand:
+            corners = inverse[:2, :2] @ np.array([[0, w, w, 0], [0, 0, h, h]], dtype=float) + inverse[:2, 2:]
+            nw = math.ceil(corners[0].max()) - math.floor(corners[0].min())
+            nh = math.ceil(corners[1].max()) - math.floor(corners[1].min())
+            dx, dy = -(nw - w) / 2.0, -(nh - h) / 2.0
+            inverse[0, 2] += inverse[0, 0] * dx + inverse[0, 1] * dy
+            inverse[1, 2] += inverse[1, 0] * dx + inverse[1, 1] * dy
+            w, h = nw, nh
+        return np.linalg.inv(inverse), (w, h)
+    
+    def _photometric_ops(self, transform_name: str, params: Dict[str, Any]) -> Optional[List[PhotometricOp]]:
+        """
+        Describe one photometric step as PhotometricChain ops, or None when it is not
+        point-wise (or LUT fusion is off). Mirrors the matching _apply_* method: same
+        factors and the same order of effects; color jitter's hue shift and saturation
+        are kept as "apply" steps around its brightness/contrast tables.
+        """
+        if not self.fuse_photometric:
+            return None
+        if transform_name == 'brightness':
+            return [('brightness', self._brightness_factor(params)[1])]
+        if transform_name == 'contrast':
+            return [('contrast', self._contrast_factor(params)[1])]
+        if transform_name == 'gamma_correction':
+            gamma = params.get('gamma', self._get_gamma_params()['default'])
+            return [] if gamma == 1.0 else [('gamma', gamma)]
+        if transform_name == 'grayscale':
+            return [('grayscale', None)]
+        if transform_name == 'color_jitter':
+            factors = self._color_jitter_factors(params)
+            ops: List[PhotometricOp] = []
+            if factors['hue_factor'] != 0:
+                ops.append(('apply', lambda img, f=factors['hue_factor']: self._color_jitter_effect(img, hue_factor=f)))
+            if factors['brightness_factor'] != 1.0:
+                ops.append(('brightness', factors['brightness_factor']))
+            if factors['contrast_factor'] != 1.0:
+                ops.append(('contrast', factors['contrast_factor']))
+            if factors['saturation_factor'] != 1.0:
+                ops.append(('apply', lambda img, f=factors['saturation_factor']: self._color_jitter_effect(img, saturation_factor=f)))
+            return ops
+        return None
+    
+    def _geometry_step_matrix(self, transform_name: str, params: Dict[str, Any], size: Tuple[int, int]
+                              ) -> Optional[Tuple[np.ndarray, Tuple[int, int], Optional[Tuple[int, int, int]]]]:
+        """
+        Describe one geometric step as (matrix, output size, fill color).
+        
+        Mirrors the matching _apply_* method: same parameters, canvas size and padding
+        color, and the same random draws. Fill is None when the step never exposes
+        area outside its input. Returns None when the step leaves the image unchanged.
+        """
+        w, h = size
+        
+        if transform_name == 'resize':
+            preset_resolution = params.get('preset_resolution', 'custom')
+            try:
+                if preset_resolution == 'custom':
+                    raise ValueError
+                tw, th = map(int, preset_resolution.split('x'))
+            except (ValueError, AttributeError):
+                tw, th = params.get('width', 640), params.get('height', 640)
+            resize_mode = params.get('resize_mode', 'stretch_to')
+            
+            if resize_mode == 'fill_center_crop':
+                aspect = w / h
+                if aspect > tw / th:
+                    sw, sh = int(th * aspect), th
+                else:
+                    sw, sh = tw, int(tw / aspect)
+                matrix = self._scale_translate(sw / w, sh / h, -((sw - tw) // 2), -((sh - th) // 2))
+                return matrix, (tw, th), None
+            if resize_mode == 'fit_within':
+                scale = min(float(tw) / w, float(th) / h)
+                nw, nh = int(round(w * scale)), int(round(h * scale))
+                return self._scale_translate(nw / w, nh / h), (nw, nh), None
+            if resize_mode in ('fit_reflect_edges', 'fit_black_edges', 'fit_white_edges'):
+                if w / h > tw / th:
+                    nw, nh = tw, int(tw / (w / h))
+                else:
+                    nw, nh = int(th * (w / h)), th
+                if resize_mode == 'fit_black_edges':
+                    fill = (0, 0, 0)
+                elif resize_mode == 'fit_white_edges':
+                    fill = (255, 255, 255)
+                else:
+                    fill = self._fill_rgb(params.get('fill_color', 'black'), (0, 0, 0))
+                matrix = self._scale_translate(nw / w, nh / h, (tw - nw) // 2, (th - nh) // 2)
+                return matrix, (tw, th), fill
+            return self._scale_translate(tw / w, th / h), (tw, th), None
+        
+        if transform_name == 'rotate':
+            angle = params.get('angle', self._get_rotation_params()['default'])
+            fill = self._fill_rgb(params.get('fill_color', 'white'), (255, 255, 255))
+            matrix, new_size = self._rotation_matrix(angle, size, expand=True)
+            self._actual_geometry_params['rotation'] = {
+                'actual_angle': angle,
+                'fill_color': fill,
+                'expand': True,
+                'original_size': size,
+                'final_size': new_size
+            }
+            if angle % 360.0 == 0:
+                return None
+            return matrix, new_size, fill
+        
+        if transform_name == 'flip':
+            horizontal = params.get('horizontal', False)
+            vertical = params.get('vertical', False)
+            if not (horizontal or vertical):
+                return None
+            matrix = self._scale_translate(-1.0 if horizontal else 1.0, -1.0 if vertical else 1.0,
+                                           w if horizontal else 0.0, h if vertical else 0.0)
+            return matrix, size, None
+        
+        if transform_name == 'crop':
+            crop_percentage = params.get('crop_percentage', params.get('scale', self._get_crop_params()['default']))
+            crop_mode = params.get('crop_mode', 'center')
+            scale = crop_percentage / 100.0 if crop_percentage > 1.0 else crop_percentage
+            if scale >= 1.0:
+                return None
+            nw, nh = int(w * scale), int(h * scale)
+            if crop_mode == 'random':
+                left, top = random.randint(0, w - nw), random.randint(0, h - nh)
+            elif crop_mode == 'top_left':
+                left, top = 0, 0
+            elif crop_mode == 'top_right':
+                left, top = w - nw, 0
+            elif crop_mode == 'bottom_left':
+                left, top = 0, h - nh
+            elif crop_mode == 'bottom_right':
+                left, top = w - nw, h - nh
+            else:
+                left, top = (w - nw) // 2, (h - nh) // 2
+            self._actual_geometry_params['crop'] = {
+                'x': left, 'y': top, 'width': nw, 'height': nh,
+                'scale': scale, 'crop_mode': crop_mode
+            }
+            matrix = self._scale_translate(w / nw, h / nh) @ self._scale_translate(1.0, 1.0, -left, -top)
+            return matrix, size, None
+        
+        if transform_name == 'random_zoom':
+            zoom_factor = params.get('zoom_factor', params.get('zoom_range', self._get_random_zoom_params()['default']))
+            if zoom_factor == 1.0:
+                return None
+            if zoom_factor > 1.0:
+                nw, nh = int(w / zoom_factor), int(h / zoom_factor)
+                left, top = (w - nw) // 2, (h - nh) // 2
+                matrix = self._scale_translate(w / nw, h / nh) @ self._scale_translate(1.0, 1.0, -left, -top)
+                return matrix, size, None
+            nw, nh = int(w * zoom_factor), int(h * zoom_factor)
+            matrix = self._scale_translate(nw / w, nh / h, (w - nw) // 2, (h - nh) // 2)
+            return matrix, size, (255, 255, 255)
+        
+        if transform_name == 'affine_transform':
+            affine_params = self._get_affine_transform_params()
+            rotation_angle = params.get('rotation_angle', params.get('rotate', affine_params['rotation']['default']))
+            scale_factor = params.get('scale_factor', params.get('scale', affine_params['scale']['default']))
+            horizontal_shift = params.get('horizontal_shift', params.get('shift_x', affine_params['horizontal_shift']['default']))
+            vertical_shift = params.get('vertical_shift', params.get('shift_y', affine_params['vertical_shift']['default']))
+            shift_x_factor = self._shift_factor(horizontal_shift)
+            shift_y_factor = self._shift_factor(vertical_shift)
+            
+            matrix = np.eye(3)
+            if rotation_angle != 0:
+                matrix = self._rotation_matrix(rotation_angle, size, expand=False)[0] @ matrix
+            if scale_factor != 1.0:
+                nw, nh = int(w * scale_factor), int(h * scale_factor)
+                if scale_factor > 1.0:
+                    offset = (-((nw - w) // 2), -((nh - h) // 2))
+                else:
+                    offset = ((w - nw) // 2, (h - nh) // 2)
+                matrix = self._scale_translate(nw / w, nh / h, *offset) @ matrix
+            if shift_x_factor != 0 or shift_y_factor != 0:
+                matrix = self._scale_translate(1.0, 1.0, int(w * shift_x_factor), int(h * shift_y_factor)) @ matrix
+            
+            self._actual_geometry_params['affine_transform'] = {
+                'actual_rotation_angle': rotation_angle,
+                'actual_scale_factor': scale_factor,
+                'actual_horizontal_shift': horizontal_shift,
+                'actual_vertical_shift': vertical_shift,
+                'shift_x_factor': shift_x_factor,
+                'shift_y_factor': shift_y_factor,
+                'original_size': size,
+                'final_size': size
+            }
+            if np.array_equal(matrix, np.eye(3)):
+                return None
+            return matrix, size, (255, 255, 255)
+        
+        if transform_name == 'perspective_warp':
+            distortion_strength = params.get('distortion_strength', params.get('distortion', self._get_perspective_warp_params()['default']))
+            if isinstance(distortion_strength, int) and 0 <= distortion_strength <= 30:
+                distortion = distortion_strength / 100.0
+            else:
+                distortion = distortion_strength
+            if distortion == 0:
+                return None
+            max_distortion = int(min(w, h) * distortion)
+            src_points = np.float32([[0, 0], [w, 0], [w, h], [0, h]])
+            dst_points = np.float32([
+                [random.randint(0, max_distortion), random.randint(0, max_distortion)],
+                [w - random.randint(0, max_distortion), random.randint(0, max_distortion)],
+                [w - random.randint(0, max_distortion), h - random.randint(0, max_distortion)],
+                [random.randint(0, max_distortion), h - random.randint(0, max_distortion)]
+            ])
+            return cv2.getPerspectiveTransform(src_points, dst_points).astype(float), size, (255, 255, 255)
+        
+        if transform_name == 'shear':
+            shear_angle = params.get('shear_angle', params.get('angle', self._get_shear_params()['default']))
+            if shear_angle == 0:
+                return None
+            shear_factor = math.tan(math.radians(shear_angle))
+            matrix = np.array([[1.0, shear_factor, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+            return matrix, size, (255, 255, 255)
+        
+        raise ValueError(f"Not a fusable geometry transform: {transform_name}")
+    
+    def _warp_with_matrix(self, image: Union[Image.Image, ImageBuffer], matrix: np.ndarray, size: Tuple[int, int],
+                          fill: Optional[Tuple[int, int, int]]) -> Union[Image.Image, ImageBuffer]:
+        """Resample image once through a composed 3x3 matrix onto a size canvas"""
+        if isinstance(image, ImageBuffer) and image.order in ('RGB', 'BGR', 'L'):
+            # Warp the native array as it is (channel order does not matter to the warp)
+            img_array = image.array()
+            if image.order == 'BGR' and fill is not None:
+                fill = tuple(fill[::-1])
+        else:
+            img_array = np.array(as_pil(image))
+        src_h, src_w = img_array.shape[:2]
+        is_affine = np.allclose(matrix[2], [0.0, 0.0, 1.0])
+        
+        # Strong downscales alias with a single bicubic warp; pre-shrink with area
+        # averaging and let the warp do the remaining (near unit scale) mapping
+        if is_affine:
+            sx = math.hypot(matrix[0, 0], matrix[1, 0])
+            sy = math.hypot(matrix[0, 1], matrix[1, 1])
+            if min(sx, sy) < 0.5:
+                pw = max(1, int(round(src_w * min(sx, 1.0))))
+                ph = max(1, int(round(src_h * min(sy, 1.0))))
+                img_array = cv2.resize(img_array, (pw, ph), interpolation=cv2.INTER_AREA)
+                matrix = matrix @ self._scale_translate(src_w / pw, src_h / ph)
+        
+        # Matrices use continuous coordinates (pixel corners); OpenCV samples pixel centers
+        to_centers = self._scale_translate(1.0, 1.0, -0.5, -0.5)
+        from_centers = self._scale_translate(1.0, 1.0, 0.5, 0.5)
+        warp_matrix = to_centers @ matrix @ from_centers
+        
+        channels = 1 if img_array.ndim == 2 else img_array.shape[2]
+        if fill is None:
+            border_mode, border_value = cv2.BORDER_REPLICATE, 0
+        else:
+            border_mode = cv2.BORDER_CONSTANT
+            border_value = fill[0] if channels == 1 else tuple(fill) + (255,) * (channels - 3)
+        
+        if is_affine:
+            warped = cv2.warpAffine(img_array, warp_matrix[:2], size, flags=cv2.INTER_CUBIC,
+                                    borderMode=border_mode, borderValue=border_value)
+        else:
+            warped = cv2.warpPerspective(img_array, warp_matrix, size, flags=cv2.INTER_CUBIC,
+                                         borderMode=border_mode, borderValue=border_value)
+        if isinstance(image, ImageBuffer):
+            return ImageBuffer.from_array(warped, image.order) if image.order in ('RGB', 'BGR', 'L') else ImageBuffer.from_pil(Image.fromarray(warped))
+        return Image.fromarray(warped)
+    
     def get_actual_geometry_parameters(self) -> Dict[str, Any]:
         """
         Get actual parameters calculated during geometry transformations.
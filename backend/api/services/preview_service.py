@@ -0,0 +1,389 @@
+"""
+Transformation preview service
+Keeps decoded, downscaled proxies of dataset images in memory (LRU, keyed by image id) so
+the transformation UI can re-render a preview on every slider change without opening a
+database session or decoding the source again. Transformations run on the proxy and the
+preview comes back as encoded JPEG/WebP bytes.
+Interactive clients tag requests with a session id; PreviewSessions then renders only the
+latest request per session and image, dropping older ones that have not started yet.
+"""
+
+import asyncio
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from PIL import Image
+
+from core.image_buffer import ImageBuffer
+from core.image_encoder import ImageEncoder
+from utils.image_utils import resize_image_for_preview
+from .image_transformer import FUSABLE_GEOMETRY_TRANSFORMS, ImageTransformer
+
+# Import professional logging system - CORRECT UNIFORM PATTERN
+from logging_system.professional_logger import get_professional_logger
+
+# Initialize professional logger
+logger = get_professional_logger()
+
+# Binary preview formats: encoder format name and media type
+PREVIEW_FORMATS = {
+    'jpeg': ('jpg', 'image/jpeg'),
+    'webp': ('webp', 'image/webp'),
+}
+
+
+@dataclass
+class PreviewProxy:
+    """A dataset image decoded once at proxy resolution"""
+    image_id: str
+    path: str
+    mtime: float
+    original_size: Tuple[int, int]
+    image: ImageBuffer
+
+
+@dataclass
+class PreviewResult:
+    """A rendered preview; original_size and transformed_size are in source-image pixels"""
+    data: bytes
+    media_type: str
+    applied_transformations: List[str]
+    original_size: Tuple[int, int]
+    transformed_size: Tuple[int, int]
+    preview_size: Tuple[int, int]
+    processing_time_ms: float
+    proxy_hit: bool
+
+
+def resolve_image_path(image_id: str) -> Optional[str]:
+    """Absolute file path of a dataset image, migrating old-style stored paths; None if missing"""
+    from database.database import SessionLocal
+    from database.operations import ImageOperations
+    from utils.path_utils import path_manager
+
+    image_file = None
+    db = SessionLocal()
+    try:
+        image = ImageOperations.get_image(db, image_id)
+        if image and image.file_path:
+            if path_manager.file_exists(image.file_path):
+                image_file = image.file_path
+            else:
+                # Try to migrate old path format
+                migrated_path = path_manager.migrate_old_path(image.file_path)
+                if migrated_path and path_manager.file_exists(migrated_path):
+                    ImageOperations.update_image_path(db, image_id, migrated_path)
+                    image_file = migrated_path
+                    logger.info("operations.images", "Image path migrated successfully", "image_path_migrated", {
+                        "old_path": image.file_path,
+                        "new_path": migrated_path
+                    })
+                else:
+                    logger.warning("operations.images", "Image path migration failed", "image_path_migration_failed", {
+                        "original_path": image.file_path,
+                        "migrated_path": migrated_path
+                    })
+        else:
+            logger.warning("app.database", "Image not found in database", "database_image_not_found", {
+                "image_id": image_id
+            })
+    finally:
+        db.close()
+
+    if not image_file:
+        return None
+
+    # Stored paths use either separator and are relative to the project root
+    image_file = image_file.replace('\\', '/')
+    if not os.path.isabs(image_file):
+        current_dir = os.getcwd()
+        project_root = os.path.dirname(current_dir) if 'backend' in current_dir else current_dir
+        image_file = os.path.join(project_root, image_file).replace('\\', '/')
+    return image_file
+
+
+class PreviewService:
+    """
+    Preview renderer with an in-memory LRU of image proxies.
+
+    A proxy is the source decoded straight at proxy_size (JPEG draft decoding through
+    Image.thumbnail) and is reused until its file changes on disk (mtime). Previews are
+    rendered on the proxy, so steps with pixel-sized parameters (blur radius, cutout
+    holes) look proportionally stronger than on the full image, as in any proxy editor;
+    resize targets and relative steps are unaffected.
+    """
+
+    def __init__(self, max_entries: int = 32, proxy_size: int = 800, preview_size: int = 400,
+                 encoder: Optional[ImageEncoder] = None, transformer: Optional[ImageTransformer] = None,
+                 render_workers: int = 1):
+        self.max_entries = max(0, int(max_entries))
+        self.proxy_size = int(proxy_size)
+        self.preview_size = int(preview_size)
+        self.encoder = encoder or ImageEncoder(preset="fast", backend="cv2")
+        self._proxies: "OrderedDict[str, PreviewProxy]" = OrderedDict()
+        self._lock = threading.Lock()
+        # A transformer keeps per-call state, so each concurrent render checks out its own
+        self._transformers: "queue.SimpleQueue[ImageTransformer]" = queue.SimpleQueue()
+        for index in range(max(1, int(render_workers))):
+            self._transformers.put(transformer if index == 0 and transformer is not None else ImageTransformer())
+        self.hits = 0
+        self.misses = 0
+
+    @contextmanager
+    def borrow_transformer(self) -> Iterator[ImageTransformer]:
+        """A transformer no other render is using; waits while all render_workers are busy"""
+        transformer = self._transformers.get()
+        try:
+            yield transformer
+        finally:
+            self._transformers.put(transformer)
+
+    def _load_proxy(self, image_id: str, path: str) -> PreviewProxy:
+        mtime = os.stat(path).st_mtime
+        image = Image.open(path)
+        original_size = image.size
+        # thumbnail() lets the JPEG decoder scale down while decoding (draft mode)
+        image.thumbnail((self.proxy_size, self.proxy_size), Image.Resampling.LANCZOS)
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        return PreviewProxy(image_id, path, mtime, original_size, ImageBuffer.from_pil(image))
+
+    def get_proxy(self, image_id: str) -> Tuple[Optional[PreviewProxy], bool]:
+        """(proxy, cache hit); proxy is None when the image or its file cannot be found"""
+        with self._lock:
+            proxy = self._proxies.get(image_id)
+            if proxy is not None:
+                self._proxies.move_to_end(image_id)
+        if proxy is not None:
+            try:
+                if os.stat(proxy.path).st_mtime == proxy.mtime:
+                    self.hits += 1
+                    return proxy, True
+            except OSError:
+                pass
+            self.invalidate(image_id)
+
+        self.misses += 1
+        path = resolve_image_path(image_id)
+        if not path or not os.path.exists(path):
+            return None, False
+        proxy = self._load_proxy(image_id, path)
+        if self.max_entries:
+            with self._lock:
+                self._proxies[image_id] = proxy
+                self._proxies.move_to_end(image_id)
+                while len(self._proxies) > self.max_entries:
+                    self._proxies.popitem(last=False)
+        return proxy, False
+
+    def render(self, image_id: str, config: Dict[str, Any], preview_format: str = 'jpeg') -> Optional[PreviewResult]:
+        """Transform the image's proxy and encode it; None when the image cannot be found"""
+        started = time.perf_counter()
+        if preview_format not in PREVIEW_FORMATS:
+            raise ValueError(f"Unsupported preview format: {preview_format}")
+        proxy, hit = self.get_proxy(image_id)
+        if proxy is None:
+            return None
+
+        with self.borrow_transformer() as transformer:
+            plan = transformer.compile(config)
+            transformed = transformer.apply_transformations(proxy.image, plan)
+            if proxy.image.size == proxy.original_size:
+                transformed_size = transformed.size
+            else:
+                transformed_size = self._output_size(transformer, plan, proxy.original_size)
+        # Area-averaged downscale on the buffer's array (as /preview)
+        preview = resize_image_for_preview(transformed, max_size=self.preview_size)
+
+        extension, media_type = PREVIEW_FORMATS[preview_format]
+        data = self.encoder.encode(preview, f"preview.{extension}", extension)
+        enabled = [name for name, params in config.items() if isinstance(params, dict) and params.get('enabled', True)]
+        result = PreviewResult(
+            data=data,
+            media_type=media_type,
+            applied_transformations=enabled,
+            original_size=proxy.original_size,
+            transformed_size=transformed_size,
+            preview_size=preview.size,
+            processing_time_ms=round((time.perf_counter() - started) * 1000, 2),
+            proxy_hit=hit
+        )
+        logger.debug("operations.images", "Preview rendered from proxy", "preview_proxy_render", {
+            'image_id': image_id,
+            'proxy_hit': hit,
+            'proxy_size': proxy.image.size,
+            'preview_size': result.preview_size,
+            'format': preview_format,
+            'bytes': len(data),
+            'processing_time_ms': result.processing_time_ms
+        })
+        return result
+
+    @staticmethod
+    def _output_size(transformer: ImageTransformer, plan, size: Tuple[int, int]) -> Tuple[int, int]:
+        """
+        Size the plan's output has when run on a `size` image. Only geometric steps change
+        the size, so their geometry is replayed without touching pixels; the proxy's own
+        output size cannot simply be scaled up, since resize targets are absolute.
+        """
+        for step in plan.steps:
+            if step.name not in FUSABLE_GEOMETRY_TRANSFORMS:
+                continue
+            try:
+                geometry = transformer._geometry_step_matrix(step.name, step.params, size)
+            except Exception:
+                continue  # the render skipped this step too
+            if geometry is not None:
+                size = geometry[1]
+        return size
+
+    def invalidate(self, image_id: Optional[str] = None) -> None:
+        """Drop one image's proxy, or all of them"""
+        with self._lock:
+            if image_id is None:
+                self._proxies.clear()
+            else:
+                self._proxies.pop(image_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = len(self._proxies)
+        return {
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'proxy_size': self.proxy_size,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+class PreviewSuperseded(Exception):
+    """A newer preview request for the same session and image arrived before this one started"""
+
+
+@dataclass(frozen=True)
+class PreviewTicket:
+    """One request's place in its (session, image) sequence"""
+    session_id: str
+    image_key: str
+    generation: int
+
+
+T = TypeVar('T')
+
+
+class PreviewSessions:
+    """
+    Latest-wins scheduling for interactive previews.
+
+    Every request tagged with a session id gets the next generation number of its
+    (session, image) pair. Renders run on worker threads, at most max_concurrent at a
+    time; a request still waiting for a slot when a newer one for the same pair arrives
+    is dropped with PreviewSuperseded instead of being rendered. Renders that have already
+    started finish normally. Requests without a session id are never dropped.
+    """
+
+    def __init__(self, max_concurrent: int = 2, max_sessions: int = 1024):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_sessions = max(1, int(max_sessions))
+        self._generations: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Render slots, created on (and bound to) the event loop that uses them
+        self._slots: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+        self.rendered = 0
+        self.superseded = 0
+
+    def begin(self, session_id: Optional[str], image_key: str) -> Optional[PreviewTicket]:
+        """Register a request; None (never superseded) without a session id"""
+        if not session_id:
+            return None
+        key = (session_id, image_key)
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            self._generations.move_to_end(key)
+            while len(self._generations) > self.max_sessions:
+                self._generations.popitem(last=False)
+        return PreviewTicket(session_id, image_key, generation)
+
+    def is_current(self, ticket: Optional[PreviewTicket]) -> bool:
+        """False once a newer request for the ticket's session and image has been registered"""
+        if ticket is None:
+            return True
+        with self._lock:
+            latest = self._generations.get((ticket.session_id, ticket.image_key))
+        return latest is None or latest == ticket.generation
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots[0] is not loop:
+            self._slots = (loop, asyncio.Semaphore(self.max_concurrent))
+        return self._slots[1]
+
+    async def run(self, ticket: Optional[PreviewTicket], render: Callable[[], T]) -> T:
+        """
+        Wait for a render slot and call render() on a worker thread, unless the ticket
+        was superseded in the meantime (raises PreviewSuperseded)
+        """
+        async with self._semaphore():
+            if not self.is_current(ticket):
+                self.superseded += 1
+                logger.debug("operations.images", "Preview request superseded before rendering", "preview_superseded", {
+                    'session_id': ticket.session_id,
+                    'image_key': ticket.image_key,
+                    'generation': ticket.generation
+                })
+                raise PreviewSuperseded()
+            result = await asyncio.get_running_loop().run_in_executor(None, render)
+            self.rendered += 1
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sessions = len(self._generations)
+        return {
+            'sessions': sessions,
+            'max_concurrent': self.max_concurrent,
+            'rendered': self.rendered,
+            'superseded': self.superseded
+        }
+
+
+_preview_service: Optional[PreviewService] = None
+_preview_service_lock = threading.Lock()
+
+
+def get_preview_service() -> PreviewService:
+    """Process-wide preview service configured from settings"""
+    global _preview_service
+    if _preview_service is None:
+        from core.config import settings
+        with _preview_service_lock:
+            if _preview_service is None:
+                _preview_service = PreviewService(
+                    max_entries=settings.PREVIEW_PROXY_CACHE_SIZE,
+                    proxy_size=settings.PREVIEW_PROXY_SIZE,
+                    preview_size=settings.PREVIEW_MAX_SIZE,
+                    render_workers=settings.PREVIEW_RENDER_CONCURRENCY
+                )
+    return _preview_service
+
+
+_preview_sessions: Optional[PreviewSessions] = None
+
+
+def get_preview_sessions() -> PreviewSessions:
+    """Process-wide preview scheduler configured from settings"""
+    global _preview_sessions
+    if _preview_sessions is None:
+        from core.config import settings
+        with _preview_service_lock:
+            if _preview_sessions is None:
+                _preview_sessions = PreviewSessions(max_concurrent=settings.PREVIEW_RENDER_CONCURRENCY)
+    return _preview_sessions
@@ -4,11 +4,10 @@ from typing import List, Optional, Dict, Any
 import numpy as np
 import cv2
 import base64
-from io import BytesIO
-from PIL import Image
 import os
 from pathlib import Path
 from logging_system.professional_logger import get_professional_logger
+from core.image_buffer import ImageBuffer
 
 logger = get_professional_logger()
 
@@ -102,8 +101,8 @@ async def click_to_segment(request: SegmentationRequest):
         })
         raise HTTPException(status_code=500, detail=f"Segmentation failed: {str(e)}")
 
-async def load_image_from_url(image_url: str) -> np.ndarray:
-    """Load image from URL or base64 data"""
+async def load_image_from_url(image_url: str) -> ImageBuffer:
+    """Load image from URL or base64 data as an RGB ImageBuffer (no array copy until one is needed)"""
     try:
         source_type = 'base64' if image_url.startswith('data:image') else 'url'
         logger.info("operations.images", "Loading image", "load_image_start", {
@@ -113,8 +112,7 @@ async def load_image_from_url(image_url: str) -> np.ndarray:
             # Handle base64 encoded images
             header, data = image_url.split(',', 1)
             image_data = base64.b64decode(data)
-            image = Image.open(BytesIO(image_data))
-            img = np.array(image.convert('RGB'))
+            img = ImageBuffer.decode(image_data)
             logger.info("operations.images", "Image loaded from base64", "load_image_success", {
                 'width': int(img.shape[1]),
                 'height': int(img.shape[0])
@@ -123,7 +121,7 @@ async def load_image_from_url(image_url: str) -> np.ndarray:
         else:
             # Handle regular URLs (placeholder - in real implementation would fetch from URL)
             # For now, create a sample image
-            img = np.random.randint(0, 255, (600, 800, 3), dtype=np.uint8)
+            img = ImageBuffer.from_array(np.random.randint(0, 255, (600, 800, 3), dtype=np.uint8), 'RGB')
             logger.info("operations.images", "Image loaded from url (mock)", "load_image_success", {
                 'width': 800,
                 'height': 600
@@ -136,7 +134,7 @@ async def load_image_from_url(image_url: str) -> np.ndarray:
         })
         raise HTTPException(status_code=400, detail=f"Failed to load image: {str(e)}")
 
-async def segment_with_sam(image: np.ndarray, point: SegmentationPoint) -> SegmentationResponse:
+async def segment_with_sam(image: ImageBuffer, point: SegmentationPoint) -> SegmentationResponse:
     """
     Segment using SAM (Segment Anything Model)
     This is a placeholder - in real implementation would use actual SAM model
@@ -169,7 +167,7 @@ async def segment_with_sam(image: np.ndarray, point: SegmentationPoint) -> Segme
         })
         raise HTTPException(status_code=500, detail=f"SAM segmentation failed: {str(e)}")
 
-async def segment_with_yolo(image: np.ndarray, point: SegmentationPoint, class_index: int) -> SegmentationResponse:
+async def segment_with_yolo(image: ImageBuffer, point: SegmentationPoint, class_index: int) -> SegmentationResponse:
     """
     Segment using YOLO instance segmentation
     """
@@ -205,7 +203,7 @@ async def segment_with_yolo(image: np.ndarray, point: SegmentationPoint, class_i
         })
         raise HTTPException(status_code=500, detail=f"YOLO segmentation failed: {str(e)}")
 
-async def segment_with_watershed(image: np.ndarray, point: SegmentationPoint) -> SegmentationResponse:
+async def segment_with_watershed(image: ImageBuffer, point: SegmentationPoint) -> SegmentationResponse:
     """
     Segment using watershed algorithm for quick segmentation
     """
@@ -234,7 +232,7 @@ async def segment_with_watershed(image: np.ndarray, point: SegmentationPoint) ->
         })
         raise HTTPException(status_code=500, detail=f"Watershed segmentation failed: {str(e)}")
 
-async def segment_with_hybrid(image: np.ndarray, point: SegmentationPoint, class_index: int) -> SegmentationResponse:
+async def segment_with_hybrid(image: ImageBuffer, point: SegmentationPoint, class_index: int) -> SegmentationResponse:
     """
     Intelligent hybrid segmentation combining multiple approaches
     """
@@ -138,6 +138,17 @@ def _transform_polygon_with_matrix(polygon: Polygon, A: np.ndarray,
                        "invalid_polygon_after_matrix", {"original_points": len(polygon.points)})
         return None
 
+    # 2-4) clip to the canvas, drop tiny polygons, clamp
+    out = _clip_polygon_to_canvas(pts, w, h)
+    if out is None:
+        return None
+
+    return Polygon(out, polygon.class_name, polygon.class_id, polygon.confidence)
+
+
+def _clip_polygon_to_canvas(pts: List[Tuple[float, float]], w: float, h: float
+                            ) -> Optional[List[Tuple[float, float]]]:
+    """Sutherland–Hodgman clip to [0,w]x[0,h]; None if fully clipped or near-zero area."""
     # 2) clip against the image rectangle using Sutherland–Hodgman (inline)
     def clip_against_edge(points: List[Tuple[float,float]], edge: str) -> List[Tuple[float,float]]:
         out: List[Tuple[float,float]] = []
@@ -204,9 +215,500 @@ def _transform_polygon_with_matrix(polygon: Polygon, A: np.ndarray,
         return None
 
     # 4) final numeric clamp (safety), now that shape is clipped
-    out = [(_clip(x, 0.0, w), _clip(y, 0.0, h)) for (x, y) in pts]
+    return [(_clip(x, 0.0, w), _clip(y, 0.0, h)) for (x, y) in pts]
 
-    return Polygon(out, polygon.class_name, polygon.class_id, polygon.confidence)
+
+# ------------------------------------------------------
+# Batched (vectorized) paths
+#
+# Same math, same operation order and same quirks as the per-annotation
+# functions above/below, but every box is a row of an (N,4) array and every
+# polygon vertex a row of one ragged (M,2) array with offsets. Used by
+# update_annotations_for_transformations; any unexpected input makes it fall
+# back to the per-annotation loop so results never diverge.
+# ------------------------------------------------------
+
+_LEGACY_COORDINATE_TRANSFORMS = {'resize', 'rotation', 'rotate', 'flip', 'crop', 'random_zoom',
+                                 'affine_transform', 'perspective_warp', 'shear'}
+
+
+def _np_clip(v: np.ndarray, lo: float, hi: float) -> np.ndarray:
+    """Vector form of _clip: max(lo, min(hi, v))"""
+    return np.maximum(lo, np.minimum(hi, v))
+
+
+def _pack_polygons(polygons: List[Polygon]) -> Tuple[np.ndarray, np.ndarray]:
+    """Ragged pack: all vertices as (M,2) plus offsets (len(polygons)+1,)"""
+    counts = [len(p.points) for p in polygons]
+    offsets = np.zeros(len(polygons) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    if offsets[-1] == 0:
+        return np.zeros((0, 2), dtype=float), offsets
+    xy = np.array([pt for p in polygons for pt in p.points], dtype=float).reshape(-1, 2)
+    return xy, offsets
+
+
+def _legacy_bboxes_batched(boxes: np.ndarray, transformation_config: Dict[str, Any],
+                           original_dims: Tuple[int, int], new_dims: Tuple[int, int]
+                           ) -> Tuple[np.ndarray, np.ndarray]:
+    """Vector form of _transform_bbox. Returns (boxes (N,4), keep mask)."""
+    x_min, y_min, x_max, y_max = (boxes[:, i].copy() for i in range(4))
+    alive = np.ones(len(boxes), dtype=bool)
+
+    current_width, current_height = original_dims
+    actual_canvas_width, actual_canvas_height = new_dims
+
+    for transform_name, params in transformation_config.items():
+        if transform_name not in _LEGACY_COORDINATE_TRANSFORMS or not params.get('enabled', True):
+            continue
+
+        if transform_name == 'flip':
+            if params.get('horizontal', False):
+                x_min, x_max = current_width - x_max, current_width - x_min
+            if params.get('vertical', False):
+                y_min, y_max = current_height - y_max, current_height - y_min
+
+        elif transform_name == 'resize':
+            source_w = float(current_width)
+            source_h = float(current_height)
+            tw = float(params.get('width', 640))
+            th = float(params.get('height', 640))
+            resize_mode = params.get('resize_mode', 'stretch_to')
+
+            if resize_mode == 'fit_within':
+                s = min(tw / source_w, th / source_h)
+                x_min = x_min * s; x_max = x_max * s
+                y_min = y_min * s; y_max = y_max * s
+                canvas_width, canvas_height = source_w * s, source_h * s
+            elif resize_mode in ['fit_reflect_edges', 'fit_black_edges', 'fit_white_edges']:
+                s = min(tw / source_w, th / source_h)
+                pad_x = int(round((tw - source_w * s) / 2.0))
+                pad_y = int(round((th - source_h * s) / 2.0))
+                x_min = x_min * s + pad_x; x_max = x_max * s + pad_x
+                y_min = y_min * s + pad_y; y_max = y_max * s + pad_y
+                canvas_width, canvas_height = tw, th
+            elif resize_mode == 'fill_center_crop':
+                s = max(tw / source_w, th / source_h)
+                crop_left = (source_w * s - tw) / 2.0
+                crop_top = (source_h * s - th) / 2.0
+                x_min = x_min * s - crop_left; x_max = x_max * s - crop_left
+                y_min = y_min * s - crop_top; y_max = y_max * s - crop_top
+                canvas_width, canvas_height = tw, th
+            else:
+                # stretch_to and unknown modes
+                sx = tw / source_w
+                sy = th / source_h
+                x_min = x_min * sx; x_max = x_max * sx
+                y_min = y_min * sy; y_max = y_max * sy
+                canvas_width, canvas_height = tw, th
+
+            actual_canvas_width, actual_canvas_height = canvas_width, canvas_height
+            current_width, current_height = canvas_width, canvas_height
+
+        elif transform_name in ('rotation', 'rotate'):
+            actual_params = params.get('actual_params', {})
+            if actual_params:
+                angle = float(actual_params.get('actual_angle', 0))
+            else:
+                angle = float(params.get('angle', params.get('degrees', params.get('rotation', 0))))
+
+            if angle != 0:
+                angle_rad = math.radians(angle)
+                cos_a = math.cos(angle_rad)
+                sin_a = math.sin(angle_rad)
+                center_x, center_y = current_width / 2, current_height / 2
+
+                cx = np.stack([x_min - center_x, x_max - center_x, x_min - center_x, x_max - center_x])
+                cy = np.stack([y_min - center_y, y_min - center_y, y_max - center_y, y_max - center_y])
+                xs = cx * cos_a - cy * sin_a + center_x
+                ys = cx * sin_a + cy * cos_a + center_y
+                x_min, x_max = xs.min(axis=0), xs.max(axis=0)
+                y_min, y_max = ys.min(axis=0), ys.max(axis=0)
+
+                abs_cos = abs(math.cos(angle_rad))
+                abs_sin = abs(math.sin(angle_rad))
+                new_width = current_width * abs_cos + current_height * abs_sin
+                new_height = current_width * abs_sin + current_height * abs_cos
+                translate_x = new_width / 2 - current_width / 2
+                translate_y = new_height / 2 - current_height / 2
+                x_min = x_min + translate_x; x_max = x_max + translate_x
+                y_min = y_min + translate_y; y_max = y_max + translate_y
+
+                current_width, current_height = new_width, new_height
+                actual_canvas_width, actual_canvas_height = new_width, new_height
+
+        elif transform_name == 'crop':
+            actual_params = params.get('actual_params', {})
+            source = actual_params if actual_params else params
+            crop_x = source.get('x', 0)
+            crop_y = source.get('y', 0)
+            crop_w = source.get('width', current_width - crop_x)
+            crop_h = source.get('height', current_height - crop_y)
+
+            x_min = np.maximum(0, x_min - crop_x)
+            y_min = np.maximum(0, y_min - crop_y)
+            x_max = np.minimum(crop_w, x_max - crop_x)
+            y_max = np.minimum(crop_h, y_max - crop_y)
+
+            # boxes emptied by the crop are dropped (the scalar path returns None here)
+            alive &= (x_min < x_max) & (y_min < y_max)
+            current_width, current_height = float(crop_w), float(crop_h)
+
+        elif transform_name == 'random_zoom':
+            zoom_factor = params.get('zoom_factor', 1.0)
+            center_x, center_y = current_width / 2, current_height / 2
+            x_min = center_x + (x_min - center_x) * zoom_factor
+            x_max = center_x + (x_max - center_x) * zoom_factor
+            y_min = center_y + (y_min - center_y) * zoom_factor
+            y_max = center_y + (y_max - center_y) * zoom_factor
+
+        elif transform_name == 'shear':
+            shear_angle = params.get('shear_angle', 0) or params.get('angle', 0)
+            if shear_angle != 0:
+                shear_factor = math.tan(math.radians(shear_angle))
+                xs = np.stack([x_min + shear_factor * y_min, x_max + shear_factor * y_min,
+                               x_min + shear_factor * y_max, x_max + shear_factor * y_max])
+                ys = np.stack([y_min, y_min, y_max, y_max])
+                x_min, x_max = xs.min(axis=0), xs.max(axis=0)
+                y_min, y_max = ys.min(axis=0), ys.max(axis=0)
+
+        elif transform_name == 'affine_transform':
+            actual_params = params.get('actual_params', {})
+            if actual_params:
+                scale_x = actual_params.get('actual_scale_factor', 1.0)
+                scale_y = actual_params.get('actual_scale_factor', 1.0)
+                translate_x = actual_params.get('shift_x_factor', 0) * current_width
+                translate_y = actual_params.get('shift_y_factor', 0) * current_height
+                rotation_angle = actual_params.get('actual_rotation_angle', 0)
+            else:
+                scale_x = params.get('scale_x', 1.0)
+                scale_y = params.get('scale_y', 1.0)
+                translate_x = params.get('translate_x', 0)
+                translate_y = params.get('translate_y', 0)
+                rotation_angle = params.get('rotation', 0)
+
+            if scale_x != 1.0 or scale_y != 1.0 or translate_x != 0 or translate_y != 0 or rotation_angle != 0:
+                center_x, center_y = current_width / 2, current_height / 2
+                x_min = center_x + (x_min - center_x) * scale_x + translate_x
+                x_max = center_x + (x_max - center_x) * scale_x + translate_x
+                y_min = center_y + (y_min - center_y) * scale_y + translate_y
+                y_max = center_y + (y_max - center_y) * scale_y + translate_y
+
+                if rotation_angle != 0:
+                    angle_rad = math.radians(rotation_angle)
+                    cos_a = math.cos(angle_rad)
+                    sin_a = math.sin(angle_rad)
+                    cx = np.stack([x_min - center_x, x_max - center_x, x_min - center_x, x_max - center_x])
+                    cy = np.stack([y_min - center_y, y_min - center_y, y_max - center_y, y_max - center_y])
+                    xs = cx * cos_a - cy * sin_a + center_x
+                    ys = cx * sin_a + cy * cos_a + center_y
+                    x_min, x_max = xs.min(axis=0), xs.max(axis=0)
+                    y_min, y_max = ys.min(axis=0), ys.max(axis=0)
+
+        elif transform_name == 'perspective_warp':
+            logger.warning("operations.transformations",
+                           "Perspective transformation in legacy path not fully supported, use matrix-based path for precision",
+                           "perspective_legacy_warning", {
+                               'transform_name': transform_name,
+                               'annotation_count': int(len(boxes))
+                           })
+
+    # clip to the ACTUAL final canvas dimensions (not target dims)
+    x_min = _np_clip(x_min, 0.0, actual_canvas_width)
+    x_max = _np_clip(x_max, 0.0, actual_canvas_width)
+    y_min = _np_clip(y_min, 0.0, actual_canvas_height)
+    y_max = _np_clip(y_max, 0.0, actual_canvas_height)
+
+    keep = alive & (x_min < x_max) & (y_min < y_max)
+    return np.stack([x_min, y_min, x_max, y_max], axis=1), keep
+
+
+def _legacy_polygons_batched(xy: np.ndarray, transformation_config: Dict[str, Any],
+                             original_dims: Tuple[int, int]) -> np.ndarray:
+    """
+    Vector form of _transform_polygon on packed vertices.
+    Keeps its quirks: rotation does not expand/translate the canvas and crop clamps per vertex.
+    """
+    X = xy[:, 0].copy()
+    Y = xy[:, 1].copy()
+    current_width, current_height = original_dims
+
+    for transform_name, params in transformation_config.items():
+        if transform_name not in _LEGACY_COORDINATE_TRANSFORMS or not params.get('enabled', True):
+            continue
+
+        if transform_name == 'flip':
+            if params.get('horizontal', False):
+                X = current_width - X
+            if params.get('vertical', False):
+                Y = current_height - Y
+
+        elif transform_name == 'resize':
+            source_w = float(current_width)
+            source_h = float(current_height)
+            tw = float(params.get('width', 640))
+            th = float(params.get('height', 640))
+            resize_mode = params.get('resize_mode', 'stretch_to')
+
+            if resize_mode == 'fit_within':
+                s = min(tw / source_w, th / source_h)
+                X = X * s; Y = Y * s
+                canvas_width, canvas_height = source_w * s, source_h * s
+            elif resize_mode in ['fit_reflect_edges', 'fit_black_edges', 'fit_white_edges']:
+                s = min(tw / source_w, th / source_h)
+                pad_x = int(round((tw - source_w * s) / 2.0))
+                pad_y = int(round((th - source_h * s) / 2.0))
+                X = X * s + pad_x; Y = Y * s + pad_y
+                canvas_width, canvas_height = tw, th
+            elif resize_mode == 'fill_center_crop':
+                s = max(tw / source_w, th / source_h)
+                X = X * s - (source_w * s - tw) / 2.0
+                Y = Y * s - (source_h * s - th) / 2.0
+                canvas_width, canvas_height = tw, th
+            else:
+                X = X * (tw / source_w); Y = Y * (th / source_h)
+                canvas_width, canvas_height = tw, th
+
+            current_width, current_height = canvas_width, canvas_height
+
+        elif transform_name in ('rotation', 'rotate'):
+            actual_params = params.get('actual_params', {})
+            if actual_params:
+                angle = float(actual_params.get('actual_angle', 0))
+            else:
+                angle = float(params.get('angle', params.get('degrees', params.get('rotation', 0))))
+
+            if angle != 0:
+                angle_rad = math.radians(angle)
+                cos_a = math.cos(angle_rad)
+                sin_a = math.sin(angle_rad)
+                center_x, center_y = current_width / 2, current_height / 2
+                xc = X - center_x
+                yc = Y - center_y
+                X = xc * cos_a - yc * sin_a + center_x
+                Y = xc * sin_a + yc * cos_a + center_y
+
+        elif transform_name == 'crop':
+            actual_params = params.get('actual_params', {})
+            source = actual_params if actual_params else params
+            crop_x = source.get('x', 0)
+            crop_y = source.get('y', 0)
+            crop_w = source.get('width', current_width - crop_x)
+            crop_h = source.get('height', current_height - crop_y)
+
+            X = np.maximum(0, np.minimum(crop_w, X - crop_x))
+            Y = np.maximum(0, np.minimum(crop_h, Y - crop_y))
+            current_width, current_height = float(crop_w), float(crop_h)
+
+        elif transform_name == 'random_zoom':
+            zoom_factor = params.get('zoom_factor', 1.0)
+            center_x, center_y = current_width / 2.0, current_height / 2.0
+            X = center_x + (X - center_x) * zoom_factor
+            Y = center_y + (Y - center_y) * zoom_factor
+
+        elif transform_name == 'shear':
+            shear_angle = params.get('shear_angle', 0) or params.get('angle', 0)
+            if shear_angle != 0:
+                X = X + math.tan(math.radians(shear_angle)) * Y
+
+        elif transform_name == 'affine_transform':
+            actual_params = params.get('actual_params', {})
+            if actual_params:
+                scale_x = actual_params.get('actual_scale_factor', 1.0)
+                scale_y = actual_params.get('actual_scale_factor', 1.0)
+                translate_x = actual_params.get('shift_x_factor', 0) * current_width
+                translate_y = actual_params.get('shift_y_factor', 0) * current_height
+                rotation_angle = actual_params.get('actual_rotation_angle', 0)
+            else:
+                scale_x = params.get('scale_x', 1.0)
+                scale_y = params.get('scale_y', 1.0)
+                translate_x = params.get('translate_x', 0)
+                translate_y = params.get('translate_y', 0)
+                rotation_angle = params.get('rotation', 0)
+
+            if scale_x != 1.0 or scale_y != 1.0 or translate_x != 0 or translate_y != 0 or rotation_angle != 0:
+                center_x, center_y = current_width / 2, current_height / 2
+                X = center_x + (X - center_x) * scale_x + translate_x
+                Y = center_y + (Y - center_y) * scale_y + translate_y
+
+                if rotation_angle != 0:
+                    angle_rad = math.radians(rotation_angle)
+                    cos_a = math.cos(angle_rad)
+                    sin_a = math.sin(angle_rad)
+                    xc = X - center_x
+                    yc = Y - center_y
+                    X = xc * cos_a - yc * sin_a + center_x
+                    Y = xc * sin_a + yc * cos_a + center_y
+
+        elif transform_name == 'perspective_warp':
+            logger.warning("operations.transformations",
+                           "Perspective transformation in legacy path not fully supported, use matrix-based path for precision",
+                           "perspective_legacy_warning", {
+                               'transform_name': transform_name,
+                               'vertex_count': int(len(xy))
+                           })
+
+    # clip points to the current canvas
+    return np.stack([_np_clip(X, 0.0, current_width), _np_clip(Y, 0.0, current_height)], axis=1)
+
+
+def _apply_matrix_to_points(A: np.ndarray, X: np.ndarray, Y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vector form of _apply_matrix_to_point.
+    A stacked (N,3,1) matmul keeps the per-point A @ p summation, so results are
+    bit-identical to the scalar helper (a single 3xN product is not).
+    """
+    shape = np.shape(X)
+    P = np.stack([np.ravel(X), np.ravel(Y), np.ones(np.size(X))], axis=1)[:, :, None]
+    P2 = np.matmul(A[None], P)[:, :, 0]
+    wp = np.where(np.abs(P2[:, 2]) < 1e-12, 1e-12, P2[:, 2])
+    return (P2[:, 0] / wp).reshape(shape), (P2[:, 1] / wp).reshape(shape)
+
+
+def _matrix_bboxes_batched(boxes: np.ndarray, A: np.ndarray,
+                           new_dims: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Vector form of _transform_bbox_with_matrix. Returns (boxes (N,4), keep mask)."""
+    w, h = new_dims
+    x_min, y_min, x_max, y_max = (boxes[:, i] for i in range(4))
+    keep = (x_max > x_min) & (y_max > y_min)
+
+    cx = np.stack([x_min, x_max, x_min, x_max])
+    cy = np.stack([y_min, y_min, y_max, y_max])
+    tx, ty = _apply_matrix_to_points(A, cx, cy)
+    keep &= np.isfinite(tx).all(axis=0) & np.isfinite(ty).all(axis=0)
+
+    nx_min = _np_clip(tx.min(axis=0), 0, w)
+    nx_max = _np_clip(tx.max(axis=0), 0, w)
+    ny_min = _np_clip(ty.min(axis=0), 0, h)
+    ny_max = _np_clip(ty.max(axis=0), 0, h)
+    keep &= (nx_min < nx_max) & (ny_min < ny_max)
+    return np.stack([nx_min, ny_min, nx_max, ny_max], axis=1), keep
+
+
+def _matrix_polygons_batched(polygons: List[Polygon], A: np.ndarray,
+                             new_dims: Tuple[int, int]) -> List[Optional[List[Tuple[float, float]]]]:
+    """
+    Vector form of _transform_polygon_with_matrix.
+    All vertices are transformed at once; polygons entirely inside the canvas
+    skip Sutherland–Hodgman (it is the identity for them) and get a bulk
+    shoelace area check. Only polygons crossing the border are clipped one by one.
+    """
+    w, h = new_dims
+    xy, offsets = _pack_polygons(polygons)
+    X, Y = _apply_matrix_to_points(A, xy[:, 0], xy[:, 1])
+
+    counts = np.diff(offsets)
+    n = len(polygons)
+    nonempty = counts > 0
+    starts = offsets[:-1][nonempty]
+
+    finite = np.isfinite(X) & np.isfinite(Y)
+    inside = finite & (X >= 0.0) & (X <= w) & (Y >= 0.0) & (Y <= h)
+    all_finite = np.ones(n, dtype=bool)
+    all_inside = np.zeros(n, dtype=bool)
+    if len(starts):
+        all_finite[nonempty] = np.logical_and.reduceat(finite, starts)
+        all_inside[nonempty] = np.logical_and.reduceat(inside, starts)
+
+    # shoelace per polygon with the next vertex wrapping inside each ring
+    area = np.zeros(n, dtype=float)
+    if len(X):
+        idx = np.arange(len(X))
+        nxt = idx + 1
+        ring_end = np.repeat(offsets[1:], counts)
+        ring_start = np.repeat(offsets[:-1], counts)
+        nxt = np.where(nxt == ring_end, ring_start, nxt)
+        cross = X * Y[nxt] - X[nxt] * Y
+        area[nonempty] = np.abs(np.add.reduceat(cross, starts)) * 0.5
+
+    out: List[Optional[List[Tuple[float, float]]]] = []
+    for i in range(n):
+        s, e = offsets[i], offsets[i + 1]
+        if counts[i] < 3 or not all_finite[i]:
+            out.append(None)
+        elif all_inside[i]:
+            out.append(list(zip(X[s:e].tolist(), Y[s:e].tolist())) if area[i] >= 1e-3 else None)
+        else:
+            out.append(_clip_polygon_to_canvas(list(zip(X[s:e].tolist(), Y[s:e].tolist())), w, h))
+    return out
+
+
+def _update_annotations_batched(annotations: List[Union[BoundingBox, Polygon]],
+                                transformation_config: Dict[str, Any],
+                                original_dims: Tuple[int, int],
+                                final_dims: Tuple[int, int],
+                                A: Optional[np.ndarray] = None,
+                                label_mode: str = "yolo_detection") -> List[Union[BoundingBox, Polygon]]:
+    """
+    Batched replacement for the per-annotation loops of update_annotations_for_transformations.
+    BoundingBox/Polygon go through the vector kernels; anything else (e.g. ORM
+    annotations or boxes carrying segmentation) through the scalar functions, in order.
+    """
+    box_idx = [i for i, a in enumerate(annotations)
+               if type(a) is BoundingBox and not hasattr(a, 'segmentation')]
+    poly_idx = [i for i, a in enumerate(annotations) if type(a) is Polygon]
+    results: List[Optional[Union[BoundingBox, Polygon]]] = [None] * len(annotations)
+    handled = set(box_idx) | set(poly_idx)
+
+    if box_idx:
+        boxes = np.array([[annotations[i].x_min, annotations[i].y_min, annotations[i].x_max, annotations[i].y_max]
+                          for i in box_idx], dtype=float)
+        if A is None:
+            new_boxes, keep = _legacy_bboxes_batched(boxes, transformation_config, original_dims, final_dims)
+        else:
+            new_boxes, keep = _matrix_bboxes_batched(boxes, A, final_dims)
+        dropped = int((~keep).sum())
+        if dropped:
+            logger.warning("errors.validation", f"{dropped} bounding boxes invalid after transformation, skipping",
+                           "invalid_bbox_skipped", {
+                               'dropped': dropped,
+                               'original_dims': original_dims,
+                               'new_dims': final_dims
+                           })
+        for row, i in enumerate(box_idx):
+            if keep[row]:
+                src = annotations[i]
+                bx0, by0, bx1, by1 = new_boxes[row].tolist()
+                results[i] = BoundingBox(bx0, by0, bx1, by1, src.class_name, src.class_id, src.confidence)
+
+    if poly_idx:
+        polygons = [annotations[i] for i in poly_idx]
+        if A is None:
+            xy, offsets = _pack_polygons(polygons)
+            new_xy = _legacy_polygons_batched(xy, transformation_config, original_dims)
+            xs, ys = new_xy[:, 0].tolist(), new_xy[:, 1].tolist()
+            point_lists = []
+            for k in range(len(polygons)):
+                s, e = int(offsets[k]), int(offsets[k + 1])
+                point_lists.append(list(zip(xs[s:e], ys[s:e])) if e - s >= 3 else None)
+        else:
+            point_lists = _matrix_polygons_batched(polygons, A, final_dims)
+        for k, i in enumerate(poly_idx):
+            if point_lists[k] is not None:
+                src = annotations[i]
+                results[i] = Polygon(point_lists[k], src.class_name, src.class_id, src.confidence)
+
+    updated: List[Union[BoundingBox, Polygon]] = []
+    for i, ann in enumerate(annotations):
+        if i in handled:
+            if results[i] is not None:
+                updated.append(results[i])
+            continue
+        # Non-dataclass annotations keep the exact scalar behaviour
+        try:
+            if A is None:
+                u = _transform_single_annotation(ann, transformation_config, original_dims, final_dims, label_mode)
+            else:
+                u = ann
+        except Exception as e:
+            logger.warning("errors.validation", f"Failed to update annotation: {str(e)}", "annotation_update_failed", {
+                'error': str(e),
+                'annotation_type': type(ann).__name__
+            })
+            u = ann
+        if u:
+            updated.append(u)
+    return updated
 
 
 # ------------------------------------------------------
@@ -264,7 +766,8 @@ def update_annotations_for_transformations(
     # --- resolve the REAL final canvas we must clip to ---
     final_dims = new_dims  # default fallback
     try:
-        if 'resize' in transformation_config and transformation_config['resize'].get('enabled', True):
+        # With a matrix the caller warped onto exactly new_dims; only re-derive it for the legacy path
+        if affine_matrix is None and 'resize' in transformation_config and transformation_config['resize'].get('enabled', True):
             rz = transformation_config['resize']
             mode = rz.get('resize_mode', 'stretch_to')
             tw = int(rz.get('width',  new_dims[0]))
@@ -311,7 +814,15 @@ def update_annotations_for_transformations(
         if A is not None:
             fw, fh = final_dims
             assert fw > 0 and fh > 0, "final_dims must be > 0 for matrix path"
-            for ann in annotations:
+            batched = None
+            try:
+                batched = _update_annotations_batched(
+                    annotations, transformation_config, original_dims, final_dims, A=A, label_mode=label_mode
+                )
+            except Exception as e:
+                logger.warning("errors.validation", f"Batched matrix update failed, using per-annotation path: {str(e)}",
+                               "annotation_batched_matrix_fallback", {'annotation_count': len(annotations)})
+            for ann in (annotations if batched is None else []):
                 try:
                     if isinstance(ann, BoundingBox):
                         u = _transform_bbox_with_matrix(ann, A, final_dims)   # << use final_dims
@@ -328,6 +839,9 @@ def update_annotations_for_transformations(
                                    "annotation_update_failed_matrix", {"type": type(ann).__name__})
                     updated_annotations.append(ann)
 
+            if batched is not None:
+                updated_annotations = batched
+
             logger.info("operations.transformations", f"Updated {len(updated_annotations)} annotations (matrix path)",
                         "annotations_updated_matrix", {
                             'annotation_count': len(updated_annotations),
@@ -348,7 +862,20 @@ def update_annotations_for_transformations(
             return updated_annotations
 
     # --- Legacy fallback (sequential config order) ---
-    for ann_idx, annotation in enumerate(annotations):
+    # Batched vector kernels first; debug tracking needs the per-annotation loop
+    batched = None
+    if not debug_tracking:
+        try:
+            batched = _update_annotations_batched(
+                annotations, transformation_config, original_dims, final_dims, label_mode=label_mode
+            )
+        except Exception as e:
+            logger.warning("errors.validation", f"Batched annotation update failed, using per-annotation path: {str(e)}",
+                           "annotation_batched_fallback", {'annotation_count': len(annotations)})
+    if batched is not None:
+        updated_annotations = batched
+
+    for ann_idx, annotation in enumerate(annotations if batched is None else []):
         try:
             # Always use the working transformation function
             updated_annotation = _transform_single_annotation(
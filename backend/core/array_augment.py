@@ -0,0 +1,205 @@
+"""
+Array-native augmentation kernels
+Noise, cutout and color jitter applied in place to a reusable per-thread uint8 buffer,
+with randomness drawn from a seeded np.random.Generator. Work that needs wider types
+(noise, saturation, luminance) runs in bands of rows through a small reused scratch
+buffer, so a 4K image never needs a full-size float temporary.
+"""
+
+import threading
+from typing import List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from core.image_buffer import ImageBuffer
+from core.photometric_lut import brightness_table, contrast_table
+
+# Rows processed per band by the kernels that need a wider scratch type
+BAND_ROWS = 128
+
+# PIL's RGB -> L conversion (Convert.c), reproduced exactly on integer scratch
+_L_WEIGHTS = (19595, 38470, 7471)
+
+
+class ArrayWorkspace:
+    """
+    Reusable buffers for one thread: the uint8 image being augmented plus band-sized
+    scratch arrays. Buffers grow to the largest image seen and are reused afterwards.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+
+    def take(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """C-contiguous view of the named buffer with `shape`, growing it if needed"""
+        dtype = np.dtype(dtype)
+        size = int(np.prod(shape))
+        flat = self._buffers.get(name)
+        if flat is None or flat.dtype != dtype or flat.size < size:
+            flat = np.empty(size, dtype=dtype)
+            self._buffers[name] = flat
+        return flat[:size].reshape(shape)
+
+    def load(self, image: Union[Image.Image, ImageBuffer], order: Optional[str] = None) -> np.ndarray:
+        """
+        Writable pixels (H x W [x C]) to augment in place: an ImageBuffer's own array
+        (in `order` if given), or a PIL image copied into the working buffer.
+        """
+        if isinstance(image, ImageBuffer):
+            return image.writable(order)
+        source = np.asarray(image)
+        pixels = self.take("pixels", source.shape)
+        np.copyto(pixels, source)
+        return pixels
+
+    @staticmethod
+    def result(image: Union[Image.Image, ImageBuffer], pixels: np.ndarray) -> Union[Image.Image, ImageBuffer]:
+        """
+        The augmented image in the caller's representation: the ImageBuffer itself, or a
+        new PIL image holding a copy of `pixels` (the working buffer stays reusable)
+        """
+        if isinstance(image, ImageBuffer):
+            return image
+        return Image.frombytes(image.mode, (pixels.shape[1], pixels.shape[0]), pixels)
+
+    def bands(self, pixels: np.ndarray):
+        for top in range(0, pixels.shape[0], BAND_ROWS):
+            yield pixels[top:top + BAND_ROWS]
+
+
+_local = threading.local()
+
+
+def get_workspace() -> ArrayWorkspace:
+    """Workspace of the calling thread"""
+    workspace = getattr(_local, "workspace", None)
+    if workspace is None:
+        workspace = _local.workspace = ArrayWorkspace()
+    return workspace
+
+
+def add_noise(pixels: np.ndarray, rng: np.random.Generator, noise_type: str, intensity: float,
+              workspace: ArrayWorkspace) -> None:
+    """
+    Noise in place. intensity is a fraction of full scale: the standard deviation
+    (gaussian), the half-width (uniform), or twice the per-pixel probability of salt
+    and of pepper (salt_pepper). Results are truncated to uint8 like astype.
+    """
+    if noise_type == 'salt_pepper':
+        for band in workspace.bands(pixels):
+            draws = workspace.take("noise_mask", band.shape[:2], np.float32)
+            rng.random(out=draws, dtype=np.float32)
+            band[draws < intensity / 2] = 255
+            rng.random(out=draws, dtype=np.float32)
+            band[draws < intensity / 2] = 0
+        return
+    scale = intensity * 255
+    for band in workspace.bands(pixels):
+        scratch = workspace.take("noise", band.shape, np.float32)
+        if noise_type == 'uniform':
+            rng.random(out=scratch, dtype=np.float32)
+            scratch *= 2 * scale
+            scratch -= scale
+        else:
+            rng.standard_normal(out=scratch, dtype=np.float32)
+            scratch *= scale
+        scratch += band
+        np.clip(scratch, 0, 255, out=scratch)
+        np.copyto(band, scratch, casting='unsafe')
+
+
+def cutout(pixels: np.ndarray, rng: np.random.Generator, num_holes: int, hole_size: int) -> List[Tuple[int, int]]:
+    """Black out num_holes squares in place; returns their (x, y) corners"""
+    height, width = pixels.shape[:2]
+    positions = []
+    for _ in range(num_holes):
+        y = int(rng.integers(0, height - hole_size + 1))
+        x = int(rng.integers(0, width - hole_size + 1))
+        pixels[y:y + hole_size, x:x + hole_size] = 0
+        positions.append((x, y))
+    return positions
+
+
+def _band_luma(band: np.ndarray, workspace: ArrayWorkspace) -> np.ndarray:
+    """PIL-exact L values of an RGB band (uint32 scratch)"""
+    luma = workspace.take("luma", band.shape[:2], np.uint32)
+    np.multiply(band[..., 0], _L_WEIGHTS[0], out=luma, dtype=np.uint32)
+    for channel in (1, 2):
+        luma += band[..., channel].astype(np.uint32) * _L_WEIGHTS[channel]
+    luma += 0x8000
+    luma >>= 16
+    return luma
+
+
+def luma_mean(pixels: np.ndarray, workspace: ArrayWorkspace) -> float:
+    """Mean of the image's L conversion (as ImageStat on image.convert('L'))"""
+    if pixels.ndim == 2:
+        return float(pixels.mean())
+    total = 0
+    for band in workspace.bands(pixels):
+        total += int(_band_luma(band, workspace).sum(dtype=np.uint64))
+    return total / (pixels.shape[0] * pixels.shape[1])
+
+
+def shift_hue(pixels: np.ndarray, hue_factor: float, workspace: ArrayWorkspace) -> None:
+    """Rotate OpenCV hue (0..180) by hue_factor * 180 in place on an RGB buffer"""
+    table = np.empty((256, 1, 3), dtype=np.uint8)
+    table[:, 0, 0] = ((np.arange(256) + hue_factor * 180) % 180).astype(np.uint8)
+    table[:, 0, 1] = table[:, 0, 2] = np.arange(256, dtype=np.uint8)
+    for band in workspace.bands(pixels):
+        hsv = workspace.take("hsv", band.shape)
+        cv2.cvtColor(band, cv2.COLOR_RGB2HSV, dst=hsv)
+        cv2.LUT(hsv, table, dst=hsv)
+        cv2.cvtColor(hsv, cv2.COLOR_HSV2RGB, dst=band)
+
+
+def adjust_brightness(pixels: np.ndarray, factor: float) -> None:
+    """ImageEnhance.Brightness in place"""
+    cv2.LUT(pixels, brightness_table(factor), dst=pixels)
+
+
+def adjust_contrast(pixels: np.ndarray, factor: float, workspace: ArrayWorkspace) -> None:
+    """ImageEnhance.Contrast in place"""
+    cv2.LUT(pixels, contrast_table(factor, int(luma_mean(pixels, workspace) + 0.5)), dst=pixels)
+
+
+def adjust_saturation(pixels: np.ndarray, factor: float, workspace: ArrayWorkspace) -> None:
+    """ImageEnhance.Color in place: blend each pixel with its own L value"""
+    if pixels.ndim == 2:
+        return
+    factor = np.float32(factor)
+    for band in workspace.bands(pixels):
+        gray = workspace.take("gray", band.shape[:2] + (1,), np.float32)
+        np.copyto(gray[..., 0], _band_luma(band, workspace), casting='unsafe')
+        scratch = workspace.take("blend", band.shape, np.float32)
+        np.subtract(band, gray, out=scratch, dtype=np.float32)
+        scratch *= factor
+        scratch += gray
+        np.clip(scratch, 0, 255, out=scratch)
+        np.copyto(band, scratch, casting='unsafe')
+
+
+def color_jitter(pixels: np.ndarray, workspace: ArrayWorkspace, hue_factor: float = 0,
+                 brightness_factor: float = 1.0, contrast_factor: float = 1.0,
+                 saturation_factor: float = 1.0, order: Optional[List[str]] = None) -> List[str]:
+    """
+    Color jitter in place; effects at their neutral value are skipped. `order` lists
+    'hue', 'brightness', 'contrast', 'saturation' (default in that order).
+    Returns the effects that were applied.
+    """
+    applied = []
+    for effect in order or ['hue', 'brightness', 'contrast', 'saturation']:
+        if effect == 'hue' and hue_factor != 0:
+            shift_hue(pixels, hue_factor, workspace)
+        elif effect == 'brightness' and brightness_factor != 1.0:
+            adjust_brightness(pixels, brightness_factor)
+        elif effect == 'contrast' and contrast_factor != 1.0:
+            adjust_contrast(pixels, contrast_factor, workspace)
+        elif effect == 'saturation' and saturation_factor != 1.0:
+            adjust_saturation(pixels, saturation_factor, workspace)
+        else:
+            continue
+        applied.append(effect)
+    return applied
@@ -0,0 +1,266 @@
+"""
+Content-addressed augmentation cache
+Stores rendered augmentation outputs on disk keyed by the source image bytes and the
+resolved transformation config, so unchanged images are not re-rendered across releases.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from core.annotation_transformer import BoundingBox, Polygon
+
+# Import professional logging system - CORRECT UNIFORM PATTERN
+from logging_system.professional_logger import get_professional_logger
+
+# Initialize professional logger
+logger = get_professional_logger()
+
+# Bump when rendering code changes in a way that should invalidate stored outputs
+CACHE_VERSION = 3
+
+
+def file_digest(path: Union[str, Path], chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def make_cache_key(source_digest: str, resolved_config: Dict[str, Any], output_format: str,
+                   output_extension: str, fuse_geometry: bool, encoding: Optional[str] = None,
+                   fuse_photometric: bool = True, reduced_decode: bool = True) -> str:
+    """
+    Key for one rendered output: source bytes + resolved config + rendering/encoding choices.
+    `encoding` names a non-default encoder preset/backend; None is the historical encoding.
+    `fuse_photometric` is the transformer's LUT fusion, which can move contrast by one level.
+    `reduced_decode` is whether JPEGs may be decoded at reduced scale, which changes pixels.
+    """
+    fields = {
+        "version": CACHE_VERSION,
+        "source": source_digest,
+        "config": resolved_config,
+        "format": output_format.lower(),
+        "extension": output_extension.lower(),
+        "fuse_geometry": bool(fuse_geometry),
+        "fuse_photometric": bool(fuse_photometric),
+        "reduced_decode": bool(reduced_decode),
+    }
+    if encoding is not None:
+        fields["encoding"] = encoding
+    payload = json.dumps(fields, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _file_size(path: Path) -> int:
+    """Size of a file, 0 when it does not exist"""
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def annotations_digest(annotations: Optional[List[Union[BoundingBox, Polygon]]]) -> str:
+    """Stable hash of a source annotation list"""
+    return hashlib.sha256(
+        json.dumps(serialize_annotations(annotations or []), sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def serialize_annotations(annotations: List[Union[BoundingBox, Polygon]]) -> List[Dict[str, Any]]:
+    out = []
+    for ann in annotations:
+        item = asdict(ann)
+        item["type"] = "polygon" if isinstance(ann, Polygon) else "bbox"
+        out.append(item)
+    return out
+
+
+def deserialize_annotations(items: List[Dict[str, Any]]) -> List[Union[BoundingBox, Polygon]]:
+    out: List[Union[BoundingBox, Polygon]] = []
+    for item in items:
+        item = dict(item)
+        kind = item.pop("type", "bbox")
+        if kind == "polygon":
+            item["points"] = [tuple(p) for p in item["points"]]
+            out.append(Polygon(**item))
+        else:
+            out.append(BoundingBox(**item))
+    return out
+
+
+class AugmentationCache:
+    """
+    Size-bounded on-disk cache of encoded augmentation outputs.
+
+    Each entry is `<key>.bin` (encoded image) plus `<key>.json` (dimensions, matrix and
+    transformed annotations), written atomically so several release workers can share
+    the directory. Recency is the .bin mtime, refreshed on every hit; when the cache
+    grows past max_bytes the least recently used entries are evicted down to 90%.
+    `label` names the cache in log messages (the thumbnail cache reuses this store).
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: int, label: str = "augmentation"):
+        self.cache_dir = Path(cache_dir)
+        self.label = label
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._size = self._scan_size()
+        self.hits = 0
+        self.misses = 0
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        shard = self.cache_dir / key[:2]
+        return shard / f"{key}.bin", shard / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        """Return (encoded image, metadata) or None"""
+        data_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(data_path, "rb") as f:
+                data = f.read()
+            os.utime(data_path, None)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data, meta
+
+    def contains(self, key: str) -> bool:
+        """True when an entry exists (does not count as a hit or refresh its recency)"""
+        data_path, meta_path = self._paths(key)
+        return data_path.exists() and meta_path.exists()
+
+    def put(self, key: str, data: bytes, meta: Dict[str, Any]) -> None:
+        """Store an entry; failures are logged and otherwise ignored"""
+        data_path, meta_path = self._paths(key)
+        # Net bytes added: both files written, minus whatever they replace
+        added = 0
+        try:
+            data_path.parent.mkdir(parents=True, exist_ok=True)
+            suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+            for path, payload in ((data_path, data), (meta_path, json.dumps(meta).encode("utf-8"))):
+                tmp_path = path.with_name(path.name + suffix)
+                with open(tmp_path, "wb") as f:
+                    f.write(payload)
+                added += len(payload) - _file_size(path)
+                os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("errors.system", f"Could not write {self.label} cache entry: {e}", "augmentation_cache_write_failed", {
+                'cache': self.label,
+                'key': key,
+                'error': str(e)
+            })
+            return
+        with self._lock:
+            self._size += added
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def update_meta(self, key: str, meta: Dict[str, Any]) -> None:
+        """Rewrite the metadata of an existing entry (e.g. annotations for edited labels)"""
+        _, meta_path = self._paths(key)
+        tmp_path = meta_path.with_name(meta_path.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+        payload = json.dumps(meta).encode("utf-8")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            added = len(payload) - _file_size(meta_path)
+            os.replace(tmp_path, meta_path)
+        except OSError as e:
+            logger.warning("errors.system", f"Could not update {self.label} cache metadata: {e}", "augmentation_cache_meta_update_failed", {
+                'cache': self.label,
+                'key': key,
+                'error': str(e)
+            })
+            return
+        with self._lock:
+            self._size += added
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".bin"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    data_path = Path(entry.path)
+                    size = stat.st_size + _file_size(data_path.with_suffix(".json"))
+                    entries.append((stat.st_mtime, size, data_path))
+        return entries
+
+    def _scan_size(self) -> int:
+        try:
+            return sum(size for _, size, _ in self._entries())
+        except OSError:
+            return 0
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the cache is at 90% of max_bytes"""
+        with self._lock:
+            try:
+                entries = sorted(self._entries())
+            except OSError:
+                return 0
+            total = sum(size for _, size, _ in entries)
+            target = int(self.max_bytes * 0.9)
+            removed = 0
+            for _, size, data_path in entries:
+                if total <= target:
+                    break
+                for path in (data_path, data_path.with_suffix(".json")):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= size
+                removed += 1
+            self._size = total
+        if removed:
+            logger.info("operations.releases", f"Evicted {removed} {self.label} cache entries", "augmentation_cache_evicted", {
+                'cache': self.label,
+                'removed_entries': removed,
+                'cache_bytes': total,
+                'max_bytes': self.max_bytes
+            })
+        return removed
+
+
+_cache_instance: Optional[AugmentationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_augmentation_cache() -> Optional[AugmentationCache]:
+    """Process-wide cache configured from settings; None when caching is disabled"""
+    global _cache_instance
+    from core.config import settings
+    if not settings.AUGMENTATION_CACHE_ENABLED or settings.AUGMENTATION_CACHE_MAX_MB <= 0:
+        return None
+    with _cache_lock:
+        if _cache_instance is None:
+            try:
+                _cache_instance = AugmentationCache(
+                    settings.AUGMENTATION_CACHE_DIR,
+                    settings.AUGMENTATION_CACHE_MAX_MB * 1024 * 1024
+                )
+            except OSError as e:
+                logger.warning("errors.system", f"Augmentation cache unavailable: {e}", "augmentation_cache_unavailable", {
+                    'cache_dir': str(settings.AUGMENTATION_CACHE_DIR),
+                    'error': str(e)
+                })
+                return None
+        return _cache_instance
@@ -5,9 +5,11 @@ Core functionality for automatic annotation generation
 
 import os
 import time
+import queue
 import asyncio
+import threading
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 import cv2
 import numpy as np
 from PIL import Image
@@ -71,6 +73,71 @@ class AutoLabeler:
             })
             return None
     
+    def _result_to_annotations(self, result, model: YOLO, image_path: str,
+                               processing_time: float) -> List[Dict]:
+        """Convert one ultralytics result to normalized annotation dicts (dims from result.orig_shape)"""
+        annotations = []
+        
+        # orig_shape is the (height, width) of the image the model was given; no second decode
+        img_height, img_width = result.orig_shape[:2]
+        
+        # Process detections
+        if result.boxes is not None:
+            boxes = result.boxes
+            detection_count = len(boxes)
+            
+            logger.info("operations.images", f"Processing {detection_count} detections for image: {os.path.basename(image_path)}", "detections_processing", {
+                'image_path': image_path,
+                'detection_count': detection_count,
+                'image_dimensions': f"{img_width}x{img_height}"
+            })
+            
+            # Whole-tensor conversion: one device->host copy per field instead of three per box.
+            # Dividing in the tensors' own dtype keeps values identical to the per-box version.
+            xyxy = boxes.xyxy.cpu().numpy()
+            scale = np.array([img_width, img_height, img_width, img_height], dtype=xyxy.dtype)
+            coords = (xyxy / scale).tolist()
+            confidences = boxes.conf.cpu().numpy().tolist()
+            class_ids = boxes.cls.cpu().numpy().astype(np.int64).tolist()
+            
+            # Class names resolved once per distinct class
+            names = model.names
+            class_names = {
+                class_id: names[class_id] if class_id in names else f"class_{class_id}"
+                for class_id in set(class_ids)
+            }
+            
+            # Handle segmentation if available: normalize every polygon as one array op
+            segmentations = [None] * detection_count
+            if result.masks is not None:
+                polygons = result.masks.xy
+                for i in range(min(detection_count, len(polygons))):
+                    mask = polygons[i]  # (N, 2) polygon points
+                    if len(mask) > 0:
+                        mask = np.asarray(mask)
+                        segmentations[i] = (mask / np.array([img_width, img_height], dtype=mask.dtype)).ravel().tolist()
+            
+            annotations = [
+                {
+                    'class_name': class_names[class_id],
+                    'class_id': class_id,
+                    'confidence': confidence,
+                    'x_min': box[0],
+                    'y_min': box[1],
+                    'x_max': box[2],
+                    'y_max': box[3],
+                    'segmentation': segmentation
+                }
+                for box, confidence, class_id, segmentation in zip(coords, confidences, class_ids, segmentations)
+            ]
+        else:
+            logger.info("operations.images", f"No detections found for image: {os.path.basename(image_path)}", "no_detections", {
+                'image_path': image_path,
+                'processing_time': processing_time
+            })
+        
+        return annotations
+    
     def predict_image(
         self, 
         image_path: str, 
@@ -109,74 +176,7 @@ class AutoLabeler:
                 return [], processing_time
             
             result = results[0]  # Get first result
-            annotations = []
-            
-            # Get image dimensions
-            img = cv2.imread(image_path)
-            if img is None:
-                logger.error("errors.system", f"Failed to read image: {image_path}", "image_read_failed", {
-                    'image_path': image_path,
-                    'processing_time': processing_time
-                })
-                return [], processing_time
-            
-            img_height, img_width = img.shape[:2]
-            
-            # Process detections
-            if result.boxes is not None:
-                boxes = result.boxes
-                detection_count = len(boxes)
-                
-                logger.info("operations.images", f"Processing {detection_count} detections for image: {os.path.basename(image_path)}", "detections_processing", {
-                    'image_path': image_path,
-                    'detection_count': detection_count,
-                    'image_dimensions': f"{img_width}x{img_height}"
-                })
-                
-                for i in range(len(boxes)):
-                    # Get bounding box (xyxy format)
-                    box = boxes.xyxy[i].cpu().numpy()
-                    confidence = float(boxes.conf[i].cpu().numpy())
-                    class_id = int(boxes.cls[i].cpu().numpy())
-                    
-                    # Convert to normalized coordinates
-                    x_min = float(box[0] / img_width)
-                    y_min = float(box[1] / img_height)
-                    x_max = float(box[2] / img_width)
-                    y_max = float(box[3] / img_height)
-                    
-                    # Get class name
-                    class_name = model.names[class_id] if class_id in model.names else f"class_{class_id}"
-                    
-                    # Handle segmentation if available
-                    segmentation = None
-                    if result.masks is not None and i < len(result.masks):
-                        mask = result.masks.xy[i]  # Get polygon points
-                        if len(mask) > 0:
-                            # Normalize polygon points
-                            segmentation = []
-                            for point in mask:
-                                segmentation.extend([
-                                    float(point[0] / img_width),
-                                    float(point[1] / img_height)
-                                ])
-                    
-                    annotation = {
-                        'class_name': class_name,
-                        'class_id': class_id,
-                        'confidence': confidence,
-                        'x_min': x_min,
-                        'y_min': y_min,
-                        'x_max': x_max,
-                        'y_max': y_max,
-                        'segmentation': segmentation
-                    }
-                    annotations.append(annotation)
-            else:
-                logger.info("operations.images", f"No detections found for image: {os.path.basename(image_path)}", "no_detections", {
-                    'image_path': image_path,
-                    'processing_time': processing_time
-                })
+            annotations = self._result_to_annotations(result, model, image_path, processing_time)
             
             logger.info("operations.images", f"Inference completed for image: {os.path.basename(image_path)}", "inference_completed", {
                 'image_path': image_path,
@@ -195,6 +195,131 @@ class AutoLabeler:
             })
             return [], processing_time
     
+    def predict_batch(
+        self,
+        images: List[np.ndarray],
+        model: YOLO,
+        confidence_threshold: float = 0.5,
+        iou_threshold: float = 0.45,
+        image_paths: Optional[List[str]] = None
+    ) -> List[Tuple[List[Dict], float]]:
+        """
+        Run inference on a batch of decoded (BGR) images in one model.predict call
+        Returns: [(annotations, processing_time)] in input order; batch time is split evenly
+        """
+        if not images:
+            return []
+        image_paths = image_paths or [f"batch_image_{i}" for i in range(len(images))]
+        
+        start_time = time.time()
+        try:
+            results = model.predict(
+                images,
+                conf=confidence_threshold,
+                iou=iou_threshold,
+                verbose=False
+            )
+        except Exception as e:
+            if len(images) == 1:
+                processing_time = time.time() - start_time
+                logger.error("errors.system", f"Error processing image {image_paths[0]}: {e}", "inference_error", {
+                    'image_path': image_paths[0],
+                    'error': str(e),
+                    'processing_time': processing_time
+                })
+                return [([], processing_time)]
+            # One bad input should not fail its neighbours; retry image by image
+            logger.warning("errors.system", f"Batch inference failed, retrying per image: {e}", "batch_inference_fallback", {
+                'batch_size': len(images),
+                'error': str(e)
+            })
+            predictions = []
+            for image, image_path in zip(images, image_paths):
+                predictions.extend(self.predict_batch(
+                    [image], model, confidence_threshold, iou_threshold, [image_path]
+                ))
+            return predictions
+        
+        per_image_time = (time.time() - start_time) / len(images)
+        logger.info("operations.images", f"Batch inference completed for {len(images)} images", "batch_inference_completed", {
+            'batch_size': len(images),
+            'processing_time': per_image_time * len(images),
+            'confidence_threshold': confidence_threshold,
+            'iou_threshold': iou_threshold
+        })
+        
+        predictions = []
+        for result, image_path in zip(results, image_paths):
+            try:
+                annotations = self._result_to_annotations(result, model, image_path, per_image_time)
+            except Exception as e:
+                logger.error("errors.system", f"Error processing image {image_path}: {e}", "inference_error", {
+                    'image_path': image_path,
+                    'error': str(e),
+                    'processing_time': per_image_time
+                })
+                annotations = []
+            predictions.append((annotations, per_image_time))
+        return predictions
+    
+    def _iter_image_batches(
+        self,
+        image_refs: List[Tuple[str, str, str]],
+        batch_size: int,
+        prefetch_batches: int = 2
+    ) -> Iterator[List[Tuple[Tuple[str, str, str], Optional[np.ndarray]]]]:
+        """
+        Yield batches of (image_ref, decoded BGR array or None) decoded on a loader thread
+        
+        image_refs are plain (id, filename, file_path) tuples so the loader never touches
+        the SQLAlchemy session. Up to prefetch_batches batches are decoded ahead of the model.
+        """
+        batches: "queue.Queue" = queue.Queue(maxsize=max(1, prefetch_batches))
+        stop = threading.Event()
+        
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def loader():
+            batch = []
+            try:
+                for ref in image_refs:
+                    if stop.is_set():
+                        return
+                    file_path = ref[2]
+                    image = cv2.imread(file_path) if os.path.exists(file_path) else None
+                    batch.append((ref, image))
+                    if len(batch) >= batch_size:
+                        if not put(batch):
+                            return
+                        batch = []
+                if batch:
+                    put(batch)
+            except Exception as e:
+                logger.error("errors.system", f"Auto-label image loader failed: {e}", "auto_label_loader_failed", {
+                    'error': str(e)
+                })
+            finally:
+                put(None)
+        
+        thread = threading.Thread(target=loader, name="auto-label-loader", daemon=True)
+        thread.start()
+        try:
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    break
+                yield batch
+        finally:
+            stop.set()
+            thread.join(timeout=5)
+    
     async def auto_label_dataset(
         self,
         dataset_id: str,
@@ -202,13 +327,17 @@ class AutoLabeler:
         confidence_threshold: float = 0.5,
         iou_threshold: float = 0.45,
         overwrite_existing: bool = False,
-        job_id: str = None
+        job_id: str = None,
+        batch_size: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Auto-label all images in a dataset
+        Images are decoded on a loader thread and sent to the model batch_size at a time
+        (None -> settings.AUTO_LABEL_BATCH_SIZE).
         Returns job results and statistics
         """
         db = SessionLocal()
+        batch_size = max(1, int(batch_size or settings.AUTO_LABEL_BATCH_SIZE))
         
         logger.info("operations.operations", f"Starting auto-labeling job for dataset: {dataset_id}", "auto_label_job_start", {
             'dataset_id': dataset_id,
@@ -216,7 +345,8 @@ class AutoLabeler:
             'confidence_threshold': confidence_threshold,
             'iou_threshold': iou_threshold,
             'overwrite_existing': overwrite_existing,
-            'job_id': job_id
+            'job_id': job_id,
+            'batch_size': batch_size
         })
         
         try:
@@ -325,92 +455,119 @@ class AutoLabeler:
             
             logger.info("operations.operations", f"Starting image processing for auto-labeling job: {job_id}", "image_processing_start", {
                 'job_id': job_id,
-                'total_images': total_images
+                'total_images': total_images,
+                'batch_size': batch_size
             })
             
-            for i, image in enumerate(images):
-                try:
-                    logger.info("operations.images", f"Processing image {i+1}/{total_images}: {image.filename}", "image_processing", {
+            # Plain tuples: the loader thread must not touch ORM objects (they expire on commit)
+            image_refs = [(image.id, image.filename, image.file_path) for image in images]
+            
+            for batch in self._iter_image_batches(image_refs, batch_size):
+                decoded = [(ref, array) for ref, array in batch if array is not None]
+                batch_predictions = self.predict_batch(
+                    [array for _, array in decoded], model, confidence_threshold, iou_threshold,
+                    image_paths=[ref[2] for ref, _ in decoded]
+                )
+                predictions = {ref[0]: prediction for (ref, _), prediction in zip(decoded, batch_predictions)}
+                
+                # Rows for the whole batch go to the database in one transaction: (image_id, rows)
+                batch_items = []
+                batch_start = processed_count
+                
+                for image_id, image_filename, image_path in (ref for ref, _ in batch):
+                    i = processed_count
+                    processed_count += 1
+                    logger.info("operations.images", f"Processing image {i+1}/{total_images}: {image_filename}", "image_processing", {
                         'job_id': job_id,
-                        'image_id': image.id,
-                        'image_filename': image.filename,
-                        'image_path': image.file_path,
+                        'image_id': image_id,
+                        'image_filename': image_filename,
+                        'image_path': image_path,
                         'progress': f"{i+1}/{total_images}"
                     })
                     
-                    # Check if image file exists
-                    if not os.path.exists(image.file_path):
-                        logger.error("errors.validation", f"Image file not found: {image.file_path}", "image_file_missing", {
-                            'job_id': job_id,
-                            'image_id': image.id,
-                            'image_filename': image.filename,
-                            'image_path': image.file_path
-                        })
+                    if image_id not in predictions:
+                        if not os.path.exists(image_path):
+                            logger.error("errors.validation", f"Image file not found: {image_path}", "image_file_missing", {
+                                'job_id': job_id,
+                                'image_id': image_id,
+                                'image_filename': image_filename,
+                                'image_path': image_path
+                            })
+                        else:
+                            logger.error("errors.system", f"Failed to read image: {image_path}", "image_read_failed", {
+                                'job_id': job_id,
+                                'image_id': image_id,
+                                'image_path': image_path
+                            })
                         failed_count += 1
                         continue
                     
-                    # Clear existing annotations if overwriting
-                    if overwrite_existing:
-                        deleted_count = AnnotationOperations.delete_annotations_by_image(db, image.id)
-                        logger.info("operations.annotations", f"Cleared {deleted_count} existing annotations for image: {image.filename}", "annotations_cleared", {
-                            'job_id': job_id,
-                            'image_id': image.id,
-                            'deleted_annotations': deleted_count
-                        })
-                    
-                    # Run inference
-                    annotations, processing_time = self.predict_image(
-                        image.file_path, model, confidence_threshold, iou_threshold
-                    )
-                    
+                    annotations, processing_time = predictions[image_id]
                     total_processing_time += processing_time
-                    
-                    # Save annotations
+                    image_rows = []
+                    batch_items.append((image_id, image_rows))
                     for ann_data in annotations:
-                        annotation = AnnotationOperations.create_annotation(
-                            db=db,
-                            image_id=image.id,
-                            class_name=ann_data['class_name'],
-                            class_id=ann_data['class_id'],
-                            x_min=ann_data['x_min'],
-                            y_min=ann_data['y_min'],
-                            x_max=ann_data['x_max'],
-                            y_max=ann_data['y_max'],
-                            confidence=ann_data['confidence'],
-                            segmentation=ann_data['segmentation'],
-                            is_auto_generated=True,
-                            model_id=model_id
+                        image_rows.append({
+                            'image_id': image_id,
+                            'class_name': ann_data['class_name'],
+                            'class_id': ann_data['class_id'],
+                            'x_min': ann_data['x_min'],
+                            'y_min': ann_data['y_min'],
+                            'x_max': ann_data['x_max'],
+                            'y_max': ann_data['y_max'],
+                            'confidence': ann_data['confidence'],
+                            'segmentation': ann_data['segmentation'],
+                            'is_auto_generated': True,
+                            'model_id': model_id
+                        })
+                
+                # Save annotations, clear overwritten ones and set image flags in one commit
+                if batch_items:
+                    def save(items):
+                        return AnnotationOperations.bulk_create_annotations(
+                            db,
+                            [row for _, rows in items for row in rows],
+                            image_ids=[image_id for image_id, _ in items],
+                            is_auto_labeled=True,
+                            replace_existing=overwrite_existing
                         )
-                        total_annotations += 1
-                        confidence_sum += ann_data['confidence']
-                        confidence_count += 1
                     
-                    logger.info("operations.annotations", f"Created {len(annotations)} annotations for image: {image.filename}", "annotations_created", {
-                        'job_id': job_id,
-                        'image_id': image.id,
-                        'annotations_count': len(annotations),
-                        'total_annotations': total_annotations
-                    })
-                    
-                    # Update image status
-                    ImageOperations.update_image_status(
-                        db, image.id, 
-                        is_labeled=len(annotations) > 0,
-                        is_auto_labeled=True
-                    )
+                    try:
+                        created = save(batch_items)
+                        saved_items = batch_items
+                    except Exception as e:
+                        # Rolled back: retry image by image so one bad row only fails its own image
+                        logger.warning("errors.system", f"Batch save failed, retrying {len(batch_items)} images one by one: {e}", "annotation_batch_retry", {
+                            'job_id': job_id,
+                            'image_ids': [image_id for image_id, _ in batch_items],
+                            'error': str(e)
+                        })
+                        created = 0
+                        saved_items = []
+                        for item in batch_items:
+                            try:
+                                created += save([item])
+                                saved_items.append(item)
+                            except Exception as image_error:
+                                logger.error("errors.system", f"Failed to save annotations for image {item[0]}: {image_error}", "image_processing_failed", {
+                                    'job_id': job_id,
+                                    'image_id': item[0],
+                                    'error': str(image_error)
+                                })
+                                failed_count += 1
                     
-                    successful_count += 1
+                    total_annotations += created
+                    for _, rows in saved_items:
+                        confidence_sum += sum(row['confidence'] for row in rows)
+                        confidence_count += len(rows)
+                    successful_count += len(saved_items)
                     
-                except Exception as e:
-                    logger.error("errors.system", f"Failed to process image {image.filename}: {e}", "image_processing_failed", {
+                    logger.info("operations.annotations", f"Created {created} annotations for {len(saved_items)} images", "annotations_created", {
                         'job_id': job_id,
-                        'image_id': image.id,
-                        'image_filename': image.filename,
-                        'error': str(e)
+                        'images_count': len(saved_items),
+                        'annotations_count': created,
+                        'total_annotations': total_annotations
                     })
-                    failed_count += 1
-                
-                processed_count += 1
                 
                 # Update progress
                 progress = (processed_count / total_images) * 100
@@ -423,7 +580,8 @@ class AutoLabeler:
                     total_annotations_created=total_annotations
                 )
                 
-                if processed_count % 10 == 0 or processed_count == total_images:
+                crossed_tenth = processed_count // 10 != batch_start // 10
+                if crossed_tenth or processed_count == total_images:
                     logger.info("operations.operations", f"Auto-labeling progress update: {progress:.1f}% ({processed_count}/{total_images})", "job_progress_update", {
                         'job_id': job_id,
                         'progress': progress,
@@ -433,8 +591,8 @@ class AutoLabeler:
                         'total_annotations': total_annotations
                     })
                 
-                # Small delay to prevent overwhelming the system
-                if i % 10 == 0:
+                # Small delay to prevent overwhelming the system (about once per 10 images)
+                if crossed_tenth or batch_start == 0:
                     await asyncio.sleep(0.1)
             
             # Calculate average confidence
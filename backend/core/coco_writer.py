@@ -0,0 +1,128 @@
+"""
+Streaming COCO JSON writer
+Writes a COCO document one row at a time: the top-level fields first, then each array
+(images, annotations, categories) as its rows arrive, so neither the document nor the row
+lists are ever held in memory. With indent=2 the bytes are identical to json.dump(...,
+indent=2) of the equivalent dict, which is what the exporters wrote before.
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+# Characters buffered before iter_coco_json hands a chunk to the HTTP response
+STREAM_CHUNK_CHARS = 64 * 1024
+
+# (array name, rows) in document order
+CocoSection = Tuple[str, Iterable[Dict[str, Any]]]
+
+
+class CocoStreamWriter:
+    """
+    Incremental writer for one JSON object whose large members are arrays of rows.
+
+    Call field() for small top-level members, then begin_array() / add() / end_array()
+    per array, and close() once. `write` receives the text piece by piece (a file's
+    write method, or any callable taking a str).
+    """
+
+    def __init__(self, write: Callable[[str], Any], indent: Optional[int] = None):
+        self._write = write
+        self.indent = indent
+        self._members = 0
+        self._rows: Optional[int] = None
+        self.rows_written = 0
+        self._write("{")
+
+    def _newline(self, level: int) -> str:
+        return "" if self.indent is None else "\n" + " " * (self.indent * level)
+
+    def _dump(self, value: Any, level: int) -> str:
+        text = json.dumps(value, indent=self.indent)
+        if self.indent is not None and level:
+            # json.dumps escapes newlines inside strings, so every raw newline is layout
+            text = text.replace("\n", self._newline(level))
+        return text
+
+    def _member(self, name: str) -> None:
+        if self._rows is not None:
+            raise RuntimeError("end_array() must be called before the next member")
+        separator = ("," if self.indent is not None else ", ") if self._members else ""
+        self._write(f"{separator}{self._newline(1)}{json.dumps(name)}: ")
+        self._members += 1
+
+    def field(self, name: str, value: Any) -> None:
+        """A small top-level member, written whole"""
+        self._member(name)
+        self._write(self._dump(value, 1))
+
+    def begin_array(self, name: str) -> None:
+        self._member(name)
+        self._write("[")
+        self._rows = 0
+
+    def add(self, row: Any) -> None:
+        """Append one row to the open array"""
+        if self._rows is None:
+            raise RuntimeError("begin_array() must be called before add()")
+        separator = ("," if self.indent is not None else ", ") if self._rows else ""
+        self._write(f"{separator}{self._newline(2)}{self._dump(row, 2)}")
+        self._rows += 1
+        self.rows_written += 1
+
+    def end_array(self) -> None:
+        self._write((self._newline(1) if self._rows else "") + "]")
+        self._rows = None
+
+    def close(self) -> None:
+        if self._rows is not None:
+            self.end_array()
+        self._write((self._newline(0) if self._members else "") + "}")
+
+
+def iter_coco_json(fields: Dict[str, Any], sections: Iterable[CocoSection],
+                   indent: Optional[int] = None, chunk_chars: int = STREAM_CHUNK_CHARS) -> Iterator[str]:
+    """
+    COCO document as text chunks of about chunk_chars: `fields` (info, licenses) first,
+    then each section's rows, consumed lazily. For StreamingResponse.
+    """
+    pending = []
+    size = 0
+
+    def write(text: str) -> None:
+        nonlocal size
+        pending.append(text)
+        size += len(text)
+
+    def flush() -> str:
+        nonlocal size
+        chunk = "".join(pending)
+        pending.clear()
+        size = 0
+        return chunk
+
+    writer = CocoStreamWriter(write, indent)
+    for name, value in fields.items():
+        writer.field(name, value)
+    for name, rows in sections:
+        writer.begin_array(name)
+        for row in rows:
+            writer.add(row)
+            if size >= chunk_chars:
+                yield flush()
+        writer.end_array()
+    writer.close()
+    yield flush()
+
+
+def write_coco(fp, fields: Dict[str, Any], sections: Iterable[CocoSection], indent: Optional[int] = None) -> int:
+    """Stream a COCO document into an open text file; returns the number of rows written"""
+    writer = CocoStreamWriter(fp.write, indent)
+    for name, value in fields.items():
+        writer.field(name, value)
+    for name, rows in sections:
+        writer.begin_array(name)
+        for row in rows:
+            writer.add(row)
+        writer.end_array()
+    writer.close()
+    return writer.rows_written
@@ -38,6 +38,7 @@ class Settings(BaseSettings):
     DEFAULT_CONFIDENCE_THRESHOLD: float = 0.5
     DEFAULT_IOU_THRESHOLD: float = 0.45
     MAX_IMAGE_SIZE: int = 1280
+    AUTO_LABEL_BATCH_SIZE: int = 8  # images per model.predict call when auto-labeling a dataset
     
     # Supported formats
     SUPPORTED_IMAGE_FORMATS: list = [".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".webp"]
@@ -54,7 +55,41 @@ class Settings(BaseSettings):
     # File upload limits
     MAX_FILE_SIZE: int = 100 * 1024 * 1024  # 100MB per image
     MAX_BATCH_SIZE: int = 10000  # 10,000 images
-    
+
+    # Release generation
+    RELEASE_MAX_WORKERS: int = 1  # worker processes for augmentation (1 = serial, 0 = cpu count)
+    RELEASE_STREAM_PACKAGE: bool = False  # write release images/labels straight into the ZIP
+    RELEASE_FUSED_GEOMETRY: bool = False  # compose geometric steps into one warp (labels follow the same matrix)
+    TRANSFORM_FUSED_PHOTOMETRIC: bool = True  # fold consecutive brightness/contrast/gamma/grayscale steps into one lookup table
+    TRANSFORM_REDUCED_DECODE: bool = True  # decode JPEGs at 1/2-1/8 scale when every config starts by downscaling
+    RELEASE_PIPELINE: bool = False  # decode / transform / encode / package as concurrent stages
+    RELEASE_DECODE_WORKERS: int = 2  # pipeline threads per stage (0 = cpu count)
+    RELEASE_TRANSFORM_WORKERS: int = 0
+    RELEASE_ENCODE_WORKERS: int = 2
+    RELEASE_PIPELINE_QUEUE_SIZE: int = 4  # images buffered between two stages
+    RELEASE_ENCODE_PRESET: str = "quality"  # quality | balanced | fast
+    RELEASE_ENCODER_BACKEND: str = "pil"  # pil | cv2 (cv2.imencode for JPEG/PNG/WebP)
+    RELEASE_ENCODE_THREADS: int = 2  # encoder threads per engine (1 = inline, 0 = cpu count)
+    RELEASE_ZIP_COMPRESSION: str = "auto"  # auto (store JPEG/PNG/WebP, deflate text) | deflate | store
+    RELEASE_ZIP_READ_WORKERS: int = 2  # threads reading files ahead of the ZIP writer (1 = inline, 0 = cpu count)
+    RELEASE_CHECKPOINT_MAX_AGE_HOURS: int = 72  # interrupted-release checkpoints not resumed within this are deleted (0 = keep)
+    RELEASE_ZIP_INDEX_MAX_OPEN: int = 16  # release ZIPs kept open for file serving (LRU)
+    AUGMENTATION_CACHE_ENABLED: bool = True  # reuse rendered augmentations across releases
+    AUGMENTATION_CACHE_DIR: Path = BASE_DIR / "cache" / "augmentations"
+    AUGMENTATION_CACHE_MAX_MB: int = 2048  # LRU eviction above this size
+
+    # Thumbnails (release gallery and dataset browsing)
+    THUMBNAIL_CACHE_ENABLED: bool = True
+    THUMBNAIL_CACHE_DIR: Path = BASE_DIR / "cache" / "thumbnails"
+    THUMBNAIL_CACHE_MAX_MB: int = 512  # LRU eviction above this size
+    THUMBNAIL_SIZES: list = [128, 256, 512]  # requested sizes snap up to one of these
+
+    # Transformation previews (decoded proxies kept in memory per image)
+    PREVIEW_PROXY_CACHE_SIZE: int = 32  # images kept decoded (LRU); 0 = decode on every request
+    PREVIEW_PROXY_SIZE: int = 800  # longest side of the proxy transformations run on
+    PREVIEW_MAX_SIZE: int = 400  # longest side of the returned preview
+    PREVIEW_RENDER_CONCURRENCY: int = 2  # previews rendered at once (one transformer each); queued ones a newer request replaces are dropped
+
     
     
     class Config:
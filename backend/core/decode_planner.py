@@ -0,0 +1,123 @@
+"""
+Reduced-resolution decode planner
+When every transformation config that will run on an image starts by downscaling (a
+resize, with at most point-wise photometric steps before it), JPEG sources are decoded
+straight at 1/2, 1/4 or 1/8 scale through PIL's draft() (libjpeg DCT scaling) instead of
+at full resolution. A scale is only used when the resize lands on exactly the geometry
+it would produce from the full image, so output sizes and annotations do not change.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+# Point-wise steps: running them before the resize on fewer pixels gives the same picture
+POINTWISE_TRANSFORMS = ('brightness', 'contrast', 'gamma_correction', 'grayscale', 'color_jitter')
+
+# DCT scale factors libjpeg can decode at, largest first
+DRAFT_SCALES = (8, 4, 2)
+
+# Keep the decoded image at least this much larger than what the resize scales it to,
+# so the final LANCZOS pass still has detail to filter (as Image.thumbnail's default)
+REDUCING_GAP = 2.0
+
+
+@dataclass
+class DecodePlan:
+    """How one source image is decoded: its full size and the size actually decoded"""
+    original_size: Tuple[int, int]
+    decoded_size: Tuple[int, int]
+    scale: int = 1
+
+    @property
+    def reduced(self) -> bool:
+        return self.scale > 1
+
+    def matrix(self) -> np.ndarray:
+        """3x3 matrix mapping full-resolution pixel coordinates to decoded ones"""
+        return decode_scale_matrix(self.original_size, self.decoded_size)
+
+
+def decode_scale_matrix(original_size: Tuple[int, int], decoded_size: Tuple[int, int]) -> np.ndarray:
+    return np.diag([decoded_size[0] / original_size[0], decoded_size[1] / original_size[1], 1.0])
+
+
+def leading_resize(config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Params of the config's resize when it is the first enabled step other than point-wise ones"""
+    for name, params in config.items():
+        if not isinstance(params, dict) or not params.get('enabled', True):
+            continue
+        if name == 'resize':
+            return params
+        if name not in POINTWISE_TRANSFORMS:
+            return None
+    return None
+
+
+def plan_decode(original_size: Tuple[int, int], configs: Iterable[Dict[str, Any]], transformer) -> DecodePlan:
+    """
+    Largest draft scale that every config tolerates, for an image of `original_size`.
+
+    `transformer` is the ImageTransformer that will run the configs; its resize geometry
+    decides. A scale is accepted when it divides both sides (otherwise the last DCT
+    pixel covers a partial block and the reduced image is not a uniform rescale), when
+    for each config the resize from the reduced image gives the same output size,
+    scaled size and placement as from the full image, and when the reduced image is
+    still REDUCING_GAP times larger than the scaled size.
+    """
+    full = DecodePlan(original_size, original_size)
+    resizes = [leading_resize(config) for config in configs]
+    if not resizes or any(params is None for params in resizes):
+        return full
+
+    width, height = original_size
+    targets = [transformer._geometry_step_matrix('resize', params, original_size) for params in resizes]
+    for scale in DRAFT_SCALES:
+        if width % scale or height % scale:
+            continue
+        decoded_size = (width // scale, height // scale)
+        to_decoded = decode_scale_matrix(original_size, decoded_size)
+        for params, (matrix, output_size, _) in zip(resizes, targets):
+            scaled_size = (matrix[0, 0] * width, matrix[1, 1] * height)
+            if decoded_size[0] < REDUCING_GAP * scaled_size[0] or decoded_size[1] < REDUCING_GAP * scaled_size[1]:
+                break
+            reduced_matrix, reduced_output, _ = transformer._geometry_step_matrix('resize', params, decoded_size)
+            if reduced_output != output_size or not np.allclose(reduced_matrix @ to_decoded, matrix):
+                break
+        else:
+            return DecodePlan(original_size, decoded_size, scale)
+    return full
+
+
+def open_image(source: Union[str, Any], configs: Optional[Iterable[Dict[str, Any]]] = None,
+               transformer=None, mode: str = 'RGB', reduce: Optional[bool] = None) -> Tuple[Image.Image, DecodePlan]:
+    """
+    Decode `source` (path or file object) converted to `mode`, at reduced resolution when
+    the configs allow it. Without configs (or a transformer) the image is decoded in full;
+    `reduce` defaults to settings.TRANSFORM_REDUCED_DECODE.
+    Returns the image and its plan; plan.original_size is the size annotations refer to.
+    """
+    if reduce is None:
+        from core.config import settings
+        reduce = settings.TRANSFORM_REDUCED_DECODE
+    image = Image.open(source)
+    plan = DecodePlan(image.size, image.size)
+    if reduce and configs is not None and transformer is not None and image.format == 'JPEG':
+        plan = plan_decode(image.size, list(configs), transformer)
+    if plan.reduced:
+        # Requesting the decoded size makes draft() pick exactly `scale`
+        image.draft(mode, plan.decoded_size)
+        if image.size != plan.decoded_size:
+            # Unexpected scale: decode in full rather than risk a geometry mismatch
+            image.close()
+            if hasattr(source, 'seek'):
+                source.seek(0)
+            image = Image.open(source)
+            plan = DecodePlan(image.size, image.size)
+    if image.mode != mode:
+        image = image.convert(mode)
+    else:
+        image.load()
+    return image, plan
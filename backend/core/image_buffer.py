@@ -0,0 +1,209 @@
+"""
+Image buffer
+One image as it travels through the transform, preview and release code: a single pixel
+buffer (a PIL image, or a contiguous NumPy array with a known color order) that hands out
+PIL images and RGB/BGR arrays on demand. Each representation is derived at most once and
+cached, so passing the buffer across a boundary costs nothing until a different
+representation is actually needed.
+"""
+
+import io
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+try:
+    import cv2
+except ImportError:  # channel swaps fall back to NumPy indexing
+    cv2 = None
+
+# Color orders an array-backed buffer can hold, and the PIL mode of each
+COLOR_ORDERS = {'RGB': 'RGB', 'BGR': 'RGB', 'L': 'L', 'RGBA': 'RGBA', 'BGRA': 'RGBA'}
+
+# Channel-order swaps: the channel permutation of each
+_SWAPS = {
+    ('RGB', 'BGR'): [2, 1, 0],
+    ('BGR', 'RGB'): [2, 1, 0],
+    ('RGBA', 'BGRA'): [2, 1, 0, 3],
+    ('BGRA', 'RGBA'): [2, 1, 0, 3],
+}
+
+
+def _swap(array: np.ndarray, source: str, target: str) -> np.ndarray:
+    """Contiguous copy of `array` with its channels reordered from `source` to `target`"""
+    if cv2 is not None:
+        return cv2.cvtColor(array, getattr(cv2, f"COLOR_{source}2{target}"))
+    return np.ascontiguousarray(array[..., _SWAPS[(source, target)]])
+
+
+class ImageBuffer:
+    """
+    An image with one native representation and lazily derived others.
+
+    Built from a PIL image (native order = its mode) or from an array plus its color
+    order. pil(), array(order) and view(order) never copy when the native representation
+    already matches; otherwise the conversion happens once and is cached. Treat what
+    they return as read-only: in-place work goes through writable(), and copy() is
+    copy-on-write, so buffers that share pixels never see each other's edits.
+    """
+
+    def __init__(self, image: Optional[Image.Image] = None, array: Optional[np.ndarray] = None,
+                 order: str = 'RGB'):
+        if (image is None) == (array is None):
+            raise ValueError("ImageBuffer needs exactly one of image or array")
+        self._image = image
+        self._arrays: Dict[str, np.ndarray] = {}
+        # False while the pixels may be shared with another buffer or a PIL image
+        self._owned = True
+        if array is not None:
+            if order not in COLOR_ORDERS:
+                raise ValueError(f"Unsupported color order: {order}")
+            channels = 1 if array.ndim == 2 else array.shape[2]
+            if channels != len(COLOR_ORDERS[order]):
+                raise ValueError(f"{order} needs {len(COLOR_ORDERS[order])} channels, got {channels}")
+            self._arrays[order] = np.ascontiguousarray(array, dtype=np.uint8)
+            self.order = order
+        else:
+            self.order = image.mode
+
+    # Construction
+    @classmethod
+    def from_pil(cls, image: Image.Image) -> "ImageBuffer":
+        return cls(image=image)
+
+    @classmethod
+    def from_array(cls, array: np.ndarray, order: str = 'RGB', copy: bool = False) -> "ImageBuffer":
+        """Wrap an array; without copy the buffer takes it over and may modify it in place"""
+        return cls(array=np.array(array) if copy else array, order=order)
+
+    @classmethod
+    def open(cls, source: Union[str, io.IOBase], mode: Optional[str] = 'RGB') -> "ImageBuffer":
+        """Decode a file (path or file object), converted to `mode` unless mode is None"""
+        image = Image.open(source)
+        if mode is not None and image.mode != mode:
+            image = image.convert(mode)
+        else:
+            image.load()
+        return cls(image=image)
+
+    @classmethod
+    def decode(cls, data: bytes, mode: Optional[str] = 'RGB') -> "ImageBuffer":
+        return cls.open(io.BytesIO(data), mode)
+
+    # Pixels are always 8 bits per channel
+    dtype = np.dtype(np.uint8)
+
+    # Geometry, without touching pixels
+    @property
+    def mode(self) -> str:
+        """PIL mode of the pixels (BGR buffers report RGB)"""
+        return self._image.mode if self._image is not None else COLOR_ORDERS[self.order]
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        if self._image is not None:
+            return self._image.size
+        array = self._arrays[self.order]
+        return array.shape[1], array.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.size[0]
+
+    @property
+    def height(self) -> int:
+        return self.size[1]
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """NumPy shape of the native array: (height, width) or (height, width, channels)"""
+        width, height = self.size
+        channels = Image.getmodebands(self.mode)
+        return (height, width) if channels == 1 else (height, width, channels)
+
+    # Representations
+    def pil(self) -> Image.Image:
+        """PIL image of the pixels (cached)"""
+        if self._image is None:
+            rgb_order = COLOR_ORDERS[self.order]
+            self._image = Image.fromarray(self.array(rgb_order), rgb_order)
+            if self._image.readonly:
+                # PIL kept a pointer into our array instead of copying it
+                self._owned = False
+        return self._image
+
+    def array(self, order: Optional[str] = None) -> np.ndarray:
+        """Contiguous array in `order` (default: native order), converted once and cached"""
+        order = order or self.order
+        array = self._arrays.get(order)
+        if array is not None:
+            return array
+        native = self._native_array()
+        if (self.order, order) in _SWAPS and native is not None:
+            array = _swap(native, self.order, order)
+        else:
+            # Different band layout (e.g. RGB -> L): let PIL do it, as the PIL code paths would
+            target_mode = COLOR_ORDERS.get(order, order)
+            image = self.pil()
+            array = np.asarray(image if image.mode == target_mode else image.convert(target_mode))
+            if order != target_mode:
+                array = _swap(array, target_mode, order)
+        self._arrays[order] = array
+        return array
+
+    def view(self, order: Optional[str] = None) -> np.ndarray:
+        """
+        Array in `order` without copying when possible: the native array, or its channels
+        reversed as a strided view for RGB <-> BGR. May be non-contiguous; use array()
+        for code that needs contiguous input.
+        """
+        order = order or self.order
+        if order in self._arrays:
+            return self._arrays[order]
+        native = self._native_array()
+        if native is not None and {self.order, order} == {'RGB', 'BGR'}:
+            return native[..., ::-1]
+        return self.array(order)
+
+    def _native_array(self) -> Optional[np.ndarray]:
+        if self.order not in COLOR_ORDERS:
+            return None
+        array = self._arrays.get(self.order)
+        if array is None:
+            # Read-only array of PIL's pixel bytes
+            array = self._arrays[self.order] = np.asarray(self._image)
+        return array
+
+    def writable(self, order: Optional[str] = None) -> np.ndarray:
+        """
+        Array in `order` that the caller may modify in place. Copies first when the pixels
+        are shared or read-only; every other cached representation is dropped.
+        """
+        order = order or (self.order if self.order in COLOR_ORDERS else 'RGB')
+        array = self.array(order)
+        if not self._owned or not array.flags.writeable:
+            array = np.array(array)
+        self._arrays = {order: array}
+        self._image = None
+        self.order = order
+        self._owned = True
+        return array
+
+    def copy(self) -> "ImageBuffer":
+        """Copy-on-write duplicate: shares pixels until either side calls writable()"""
+        duplicate = ImageBuffer.__new__(ImageBuffer)
+        duplicate._image = self._image
+        duplicate._arrays = dict(self._arrays)
+        duplicate.order = self.order
+        duplicate._owned = self._owned = False
+        return duplicate
+
+    def __repr__(self) -> str:
+        native = 'pil' if self._image is not None and self.order not in self._arrays else 'array'
+        return f"<ImageBuffer {self.order} {self.size[0]}x{self.size[1]} native={native}>"
+
+
+def as_pil(image: Union[Image.Image, ImageBuffer]) -> Image.Image:
+    """PIL image of either a PIL image or an ImageBuffer"""
+    return image.pil() if isinstance(image, ImageBuffer) else image
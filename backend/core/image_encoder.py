@@ -0,0 +1,212 @@
+"""
+Release image encoder
+Encodes PIL images and ImageBuffers to bytes with per-release quality presets, using PIL or (optionally)
+OpenCV's libjpeg-turbo / libpng / libwebp codecs, and keeps per-format encode timings.
+Both backends release the GIL while compressing, so encoders can run on a thread pool.
+"""
+
+import io
+import os
+import time
+import threading
+from typing import Any, Dict, Optional, Union
+
+from PIL import Image
+
+from core.image_buffer import ImageBuffer
+
+# Import professional logging system - CORRECT UNIFORM PATTERN
+from logging_system.professional_logger import get_professional_logger
+
+# Initialize professional logger
+logger = get_professional_logger()
+
+# PIL save options per preset. "quality" is the historical release encoding.
+PIL_PRESETS: Dict[str, Dict[str, Dict[str, Any]]] = {
+    "quality": {
+        "JPEG": {"quality": 95, "optimize": True},
+        "PNG": {"optimize": True},
+        "WEBP": {"quality": 95, "optimize": True},
+        "TIFF": {"quality": 95},
+        "BMP": {},
+    },
+    "balanced": {
+        "JPEG": {"quality": 90},
+        "PNG": {"compress_level": 6},
+        "WEBP": {"quality": 90, "method": 4},
+        "TIFF": {},
+        "BMP": {},
+    },
+    "fast": {
+        "JPEG": {"quality": 85},
+        "PNG": {"compress_level": 1},
+        "WEBP": {"quality": 80, "method": 0},
+        "TIFF": {},
+        "BMP": {},
+    },
+}
+
+# cv2.imencode settings per preset (resolved to IMWRITE_* flags at encode time)
+CV2_PRESETS: Dict[str, Dict[str, int]] = {
+    "quality": {"jpeg_quality": 95, "jpeg_optimize": 1, "png_compression": 9, "webp_quality": 95},
+    "balanced": {"jpeg_quality": 90, "jpeg_optimize": 0, "png_compression": 6, "webp_quality": 90},
+    "fast": {"jpeg_quality": 85, "jpeg_optimize": 0, "png_compression": 1, "webp_quality": 80},
+}
+
+ENCODE_PRESETS = tuple(PIL_PRESETS)
+ENCODER_BACKENDS = ("pil", "cv2")
+
+_FORMAT_ALIASES = {"jpg": "JPEG", "jpeg": "JPEG", "png": "PNG", "webp": "WEBP", "bmp": "BMP", "tiff": "TIFF"}
+_CV2_EXTENSIONS = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp"}
+
+try:
+    import cv2
+except ImportError:  # optional backend
+    cv2 = None
+
+
+class EncodeStats:
+    """Thread-safe per-format encode counters (count, seconds, bytes)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._formats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, image_format: str, seconds: float, size: int) -> None:
+        with self._lock:
+            entry = self._formats.setdefault(image_format, {"count": 0, "seconds": 0.0, "bytes": 0})
+            entry["count"] += 1
+            entry["seconds"] += seconds
+            entry["bytes"] += size
+
+    def merge(self, other: Dict[str, Dict[str, float]]) -> None:
+        """Add counters exported by snapshot()/drain() (e.g. from a worker process)"""
+        with self._lock:
+            for image_format, values in (other or {}).items():
+                entry = self._formats.setdefault(image_format, {"count": 0, "seconds": 0.0, "bytes": 0})
+                for key in ("count", "seconds", "bytes"):
+                    entry[key] += values.get(key, 0)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {fmt: dict(values) for fmt, values in self._formats.items()}
+
+    def drain(self) -> Dict[str, Dict[str, float]]:
+        """Return the counters and reset them"""
+        with self._lock:
+            formats, self._formats = self._formats, {}
+        return formats
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Counters plus average milliseconds per image, rounded for logging"""
+        return {
+            fmt: {
+                "count": int(values["count"]),
+                "seconds": round(values["seconds"], 3),
+                "avg_ms": round(1000.0 * values["seconds"] / values["count"], 2) if values["count"] else 0.0,
+                "megabytes": round(values["bytes"] / (1024 * 1024), 2),
+            }
+            for fmt, values in self.snapshot().items()
+        }
+
+
+def resolve_image_format(filename: str, output_format: str) -> Optional[str]:
+    """PIL format name for an output ("original" follows the filename extension); None if unknown"""
+    fmt = (output_format or "original").lower()
+    if fmt == "original":
+        ext = os.path.splitext(filename or "")[1].lower()
+        return Image.registered_extensions().get(ext)
+    return _FORMAT_ALIASES.get(fmt)
+
+
+class ImageEncoder:
+    """
+    Encodes one image per call; safe to share between threads.
+
+    preset: "quality" (default, historical settings), "balanced" or "fast"
+    backend: "pil", or "cv2" to use cv2.imencode for JPEG/PNG/WebP (PIL for everything
+             else, and whenever OpenCV is unavailable or fails)
+    """
+
+    def __init__(self, preset: str = "quality", backend: str = "pil", stats: Optional[EncodeStats] = None):
+        if preset not in PIL_PRESETS:
+            logger.warning("errors.validation", f"Unknown encode preset: {preset}, using quality", "unknown_encode_preset", {
+                'preset': preset,
+                'available_presets': list(ENCODE_PRESETS)
+            })
+            preset = "quality"
+        if backend == "cv2" and cv2 is None:
+            logger.warning("errors.validation", "OpenCV not available, encoding with PIL", "cv2_encoder_unavailable", {
+                'preset': preset
+            })
+            backend = "pil"
+        self.preset = preset
+        self.backend = backend if backend in ENCODER_BACKENDS else "pil"
+        self.stats = stats if stats is not None else EncodeStats()
+
+    @property
+    def cache_tag(self) -> Optional[str]:
+        """Identifies non-default encodings in augmentation cache keys (None for quality/pil)"""
+        if self.preset == "quality" and self.backend == "pil":
+            return None
+        return f"{self.preset}/{self.backend}"
+
+    def encode(self, image: Union[Image.Image, ImageBuffer], filename: str, output_format: str) -> bytes:
+        """Encode `image` (PIL image or ImageBuffer) as it should be stored under `filename`"""
+        image_format = resolve_image_format(filename, output_format)
+        if image_format is None:
+            logger.warning("errors.validation", f"Unsupported output format: {output_format}, using original", "unsupported_format", {
+                'output_format': output_format,
+                'output_path': str(filename)
+            })
+            image_format = resolve_image_format(filename, "original") or "JPEG"
+
+        if not isinstance(image, ImageBuffer):
+            image = ImageBuffer.from_pil(image)
+
+        # JPEG and BMP have no alpha channel
+        if image_format == "JPEG" and image.mode in ("RGBA", "LA", "P"):
+            # Create white background for transparent images
+            source = image.pil()
+            background = Image.new("RGB", source.size, (255, 255, 255))
+            if source.mode == "P":
+                source = source.convert("RGBA")
+            background.paste(source, mask=source.split()[-1] if source.mode == "RGBA" else None)
+            image = ImageBuffer.from_pil(background)
+        elif image_format == "BMP" and image.mode in ("RGBA", "LA", "P"):
+            image = ImageBuffer.from_pil(image.pil().convert("RGB"))
+
+        started = time.perf_counter()
+        data = None
+        if self.backend == "cv2" and image_format in _CV2_EXTENSIONS:
+            data = self._encode_cv2(image, image_format)
+        if data is None:
+            buffer = io.BytesIO()
+            image.pil().save(buffer, format=image_format, **PIL_PRESETS[self.preset].get(image_format, {"quality": 95, "optimize": True}))
+            data = buffer.getvalue()
+        self.stats.record(image_format, time.perf_counter() - started, len(data))
+        return data
+
+    def _encode_cv2(self, image: ImageBuffer, image_format: str) -> Optional[bytes]:
+        preset = CV2_PRESETS[self.preset]
+        if image_format == "JPEG":
+            params = [cv2.IMWRITE_JPEG_QUALITY, preset["jpeg_quality"], cv2.IMWRITE_JPEG_OPTIMIZE, preset["jpeg_optimize"]]
+        elif image_format == "PNG":
+            params = [cv2.IMWRITE_PNG_COMPRESSION, preset["png_compression"]]
+        else:
+            params = [cv2.IMWRITE_WEBP_QUALITY, preset["webp_quality"]]
+
+        # cv2 wants BGR(A); a buffer that already holds BGR pixels hands them over without a copy
+        if image.mode == "RGB":
+            array = image.array("BGR")
+        elif image.mode == "RGBA":
+            array = image.array("BGRA")
+        elif image.mode == "L":
+            array = image.array("L")
+        else:
+            return None
+        try:
+            ok, encoded = cv2.imencode(_CV2_EXTENSIONS[image_format], array, params)
+        except cv2.error:
+            ok = False
+        return encoded.tobytes() if ok else None
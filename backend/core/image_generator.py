@@ -2,14 +2,17 @@
 Integrates with existing ImageTransformer service and handles annotation updates
 """
 
+import io
 import os
 import json
 import numpy as np
-from typing import List, Dict, Any, Tuple, Optional, Union
-from dataclasses import dataclass
+from typing import List, Dict, Any, Tuple, Optional, Union, Callable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
 from PIL import Image
 import uuid
+import threading
 
 # Pillow 9/10 compatibility for resampling
 RESAMPLING = getattr(Image, "Resampling", Image)
@@ -39,6 +42,18 @@ logger = get_professional_logger()
 
 # Centralized annotation utilities
 from core.annotation_transformer import BoundingBox, Polygon, update_annotations_for_transformations
+from core.stage_pipeline import BoundedPipeline, PipelineStage, StageFailure
+from core.image_encoder import ImageEncoder, EncodeStats
+from core.image_buffer import ImageBuffer, as_pil
+from core.decode_planner import decode_scale_matrix, open_image
+from core.transform_plan import TransformPlan
+from core.augmentation_cache import (
+    get_augmentation_cache, file_digest, make_cache_key,
+    annotations_digest, serialize_annotations, deserialize_annotations
+)
+
+# Compiled plans an engine keeps (distinct transformation configs)
+MAX_COMPILED_PLANS = 256
 
 @dataclass
 class AugmentationResult:
@@ -49,6 +64,16 @@ class AugmentationResult:
     original_dimensions: Tuple[int, int]
     augmented_dimensions: Tuple[int, int]
     config_id: str
+    encoded_image: Optional[bytes] = None  # set instead of a file when the engine runs in_memory
+
+@dataclass
+class RenderedAugmentation:
+    """A transformed image and its annotations, not yet encoded"""
+    image: ImageBuffer
+    resolved_config: Dict[str, Any]
+    original_dims: Tuple[int, int]
+    affine_matrix: Optional[np.ndarray]
+    updated_annotations: List[Union[BoundingBox, Polygon]]
 
 class ImageAugmentationEngine:
     """
@@ -56,84 +81,118 @@ class ImageAugmentationEngine:
     Phase 1: Integrates with existing ImageTransformer service
     """
     
-    def __init__(self, output_base_dir: str = "augmented"):
+    def __init__(self, output_base_dir: str = "augmented", in_memory: bool = False,
+                 fuse_geometry: Optional[bool] = None, use_cache: Optional[bool] = None,
+                 encode_preset: Optional[str] = None, encoder_backend: Optional[str] = None,
+                 encode_threads: Optional[int] = None, encode_stats: Optional[EncodeStats] = None):
         self.output_base_dir = Path(output_base_dir)
         self.transformer = ImageTransformer()
         self.supported_formats = ['.jpg', '.jpeg', '.png', '.bmp', '.webp', '.tiff']
+        # in_memory: encode results into AugmentationResult.encoded_image instead of writing files
+        self.in_memory = in_memory
+        # fuse_geometry: warp all geometric steps at once and update annotations with the same matrix
+        if fuse_geometry is None:
+            from core.config import settings
+            fuse_geometry = settings.RELEASE_FUSED_GEOMETRY
+        self.fuse_geometry = fuse_geometry
+        # use_cache: reuse outputs from the content-addressed augmentation cache (None -> settings)
+        self.cache = get_augmentation_cache() if use_cache is not False else None
+        # Encoding: preset/backend per release, and a thread pool so variants of one source
+        # are encoded while the next variant is being transformed (None -> settings)
+        from core.config import settings
+        self.encoder = ImageEncoder(
+            encode_preset or settings.RELEASE_ENCODE_PRESET,
+            encoder_backend or settings.RELEASE_ENCODER_BACKEND,
+            stats=encode_stats
+        )
+        if encode_threads is None:
+            encode_threads = settings.RELEASE_ENCODE_THREADS
+        if encode_threads <= 0:
+            encode_threads = os.cpu_count() or 1
+        self.encode_threads = encode_threads
+        # reduced_decode: JPEGs may be decoded at 1/2-1/8 scale (part of the cache key, since it changes pixels)
+        self.reduced_decode = settings.TRANSFORM_REDUCED_DECODE
+        self._encode_pool: Optional[ThreadPoolExecutor] = None
+        # Compiled plans by raw config (see compile_plan)
+        self._plans: Dict[str, TransformPlan] = {}
         
         # Create output directories
-        for split in ['train', 'val', 'test']:
-            (self.output_base_dir / split).mkdir(parents=True, exist_ok=True)
+        if not in_memory:
+            for split in ['train', 'val', 'test']:
+                (self.output_base_dir / split).mkdir(parents=True, exist_ok=True)
         
         logger.info("operations.transformations", f"Initialized ImageAugmentationEngine with output dir: {self.output_base_dir}", "augmentation_engine_initialized", {
-            'output_base_dir': str(self.output_base_dir)
+            'output_base_dir': str(self.output_base_dir),
+            'in_memory': in_memory,
+            'fuse_geometry': self.fuse_geometry,
+            'cache_enabled': self.cache is not None,
+            'encode_preset': self.encoder.preset,
+            'encoder_backend': self.encoder.backend,
+            'encode_threads': self.encode_threads
         })
+
+    def _get_encode_pool(self) -> Optional[ThreadPoolExecutor]:
+        """Lazily started encoder threads (None when encoding inline)"""
+        if self.encode_threads <= 1:
+            return None
+        if self._encode_pool is None:
+            self._encode_pool = ThreadPoolExecutor(max_workers=self.encode_threads, thread_name_prefix="encode")
+        return self._encode_pool
+
+    def close(self) -> None:
+        """Stop the encoder threads"""
+        if self._encode_pool is not None:
+            self._encode_pool.shutdown(wait=True)
+            self._encode_pool = None
     
-    def load_image_from_path(self, image_path: str) -> Tuple[Image.Image, Tuple[int, int]]:
-        """Load image and return PIL Image with original dimensions"""
+    def load_image_from_path(self, image_path: str,
+                             transformation_configs: Optional[List[Dict[str, Any]]] = None
+                             ) -> Tuple[Image.Image, Tuple[int, int]]:
+        """
+        Load image and return PIL Image (RGB, decoded) with original dimensions
+        
+        When transformation_configs are given and every one of them starts by downscaling,
+        a JPEG is decoded at reduced resolution; original_dims is still the full size, which
+        is what annotations and _render_from_decoded work from.
+        """
         if not os.path.exists(image_path):
             raise FileNotFoundError(f"Image not found: {image_path}")
         
         try:
-            image = Image.open(image_path)
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+            resolved_configs = None
+            if transformation_configs is not None:
+                resolved_configs = [self.compile_plan(config).config for config in transformation_configs]
+            image, plan = open_image(image_path, resolved_configs, self.transformer,
+                                     reduce=self.reduced_decode)
             
-            original_dims = image.size  # (width, height)
+            original_dims = plan.original_size  # (width, height)
             logger.info("operations.images", f"Loaded image: {image_path}, dimensions: {original_dims}", "image_loaded", {
                 'image_path': image_path,
-                'dimensions': original_dims
+                'dimensions': original_dims,
+                'decoded_dimensions': plan.decoded_size,
+                'decode_scale': plan.scale
             })
             return image, original_dims
             
         except Exception as e:
             raise ValueError(f"Failed to load image {image_path}: {str(e)}")
     
-    def _save_image_with_format(self, image: Image.Image, output_path: Path, output_format: str) -> None:
+    def _save_image_with_format(self, image: Union[Image.Image, ImageBuffer], output_path: Path, output_format: str) -> None:
         """
         Save image with proper format conversion
         
         Args:
-            image: PIL Image to save
-            output_path: Output file path
+            image: PIL Image or ImageBuffer to save
+            output_path: Output file path (or a writable buffer with a .name)
             output_format: Target format (original, jpg, png, webp, bmp, tiff)
         """
         try:
-            if output_format.lower() == "original":
-                # Keep original format - save as-is
-                image.save(output_path, quality=95, optimize=True)
-            elif output_format.lower() in ["jpg", "jpeg"]:
-                # Convert to RGB for JPEG (no transparency)
-                if image.mode in ("RGBA", "LA", "P"):
-                    # Create white background for transparent images
-                    background = Image.new("RGB", image.size, (255, 255, 255))
-                    if image.mode == "P":
-                        image = image.convert("RGBA")
-                    background.paste(image, mask=image.split()[-1] if image.mode == "RGBA" else None)
-                    image = background
-                image.save(output_path, format="JPEG", quality=95, optimize=True)
-            elif output_format.lower() == "png":
-                # PNG supports transparency
-                image.save(output_path, format="PNG", optimize=True)
-            elif output_format.lower() == "webp":
-                # WebP format
-                image.save(output_path, format="WEBP", quality=95, optimize=True)
-            elif output_format.lower() == "bmp":
-                # BMP format (convert to RGB)
-                if image.mode in ("RGBA", "LA", "P"):
-                    image = image.convert("RGB")
-                image.save(output_path, format="BMP")
-            elif output_format.lower() == "tiff":
-                # TIFF format
-                image.save(output_path, format="TIFF", quality=95)
+            data = self.encoder.encode(image, getattr(output_path, "name", str(output_path)), output_format)
+            if hasattr(output_path, "write"):
+                output_path.write(data)
             else:
-                # Fallback to original format
-                logger.warning("errors.validation", f"Unsupported output format: {output_format}, using original", "unsupported_format", {
-                'output_format': output_format,
-                'output_path': str(output_path)
-            })
-                image.save(output_path, quality=95, optimize=True)
+                with open(output_path, "wb") as f:
+                    f.write(data)
                 
             logger.info("operations.images", f"Saved image as {output_format.upper()}: {output_path}", "image_saved", {
                 'output_format': output_format.upper(),
@@ -147,7 +206,15 @@ class ImageAugmentationEngine:
                 'output_path': str(output_path)
             })
             # Fallback to default save
-            image.save(output_path, quality=95, optimize=True)
+            as_pil(image).save(output_path, quality=95, optimize=True)
+    
+    def _encode_image_with_format(self, image: Union[Image.Image, ImageBuffer], filename: str, output_format: str) -> bytes:
+        """Encode image to bytes exactly as _save_image_with_format would write it to `filename`"""
+        buffer = io.BytesIO()
+        # PIL derives the format from fp.name when saving "original"
+        buffer.name = filename
+        self._save_image_with_format(image, buffer, output_format)
+        return buffer.getvalue()
     
     def generate_augmented_filename(self, original_filename: str, config_id: str, 
                                   output_format: str = "jpg") -> str:
@@ -231,17 +298,38 @@ class ImageAugmentationEngine:
         })
         return resolved_config
     
+    def compile_plan(self, transformation_config: Dict[str, Any]) -> TransformPlan:
+        """
+        Resolved and compiled form of a transformation config, built once per distinct
+        config. Release configs are generated per image but repeat across images, so they
+        are looked up by content; the lookup is the only per-image work on the config.
+        """
+        key = json.dumps(transformation_config or {}, sort_keys=True, default=str)
+        plan = self._plans.get(key)
+        if plan is None:
+            resolved_config = self._resolve_dual_value_parameters(transformation_config or {})
+            plan = self.transformer.compile(resolved_config)
+            if len(self._plans) >= MAX_COMPILED_PLANS:
+                self._plans.pop(next(iter(self._plans)))
+            self._plans[key] = plan
+            logger.debug("operations.transformations", "Compiled transformation plan", "transformation_plan_compiled", {
+                'steps': plan.names,
+                'compiled_plans': len(self._plans)
+            })
+        return plan
+    
 # REMOVED: _split_config_into_geometry_and_photometric - no longer needed with sequential approach
     
     def apply_transformations_to_image(self, image: Image.Image, 
                                      transformation_config: Dict[str, Any]) -> Image.Image:
         """Apply transformations to image - KEEP WORKING AS-IS"""
         try:
-            # Resolve dual-value parameters before applying transformations
-            resolved_config = self._resolve_dual_value_parameters(transformation_config)
+            # Resolve dual-value parameters before applying transformations (compiled once per config)
+            plan = self.compile_plan(transformation_config)
+            resolved_config = plan.config
             
             # Use ImageTransformer for all transformations (working approach)
-            transformed_image = self.transformer.apply_transformations(image, resolved_config)
+            transformed_image = self.transformer.apply_transformations(image, plan)
             
             logger.info("operations.transformations", f"Applied transformations: {list(resolved_config.keys())}", "transformations_applied", {
                 'transformation_types': list(resolved_config.keys()),
@@ -257,62 +345,47 @@ class ImageAugmentationEngine:
             # Return original image if transformation fails
             return image
     
+    def _apply_with_shared_resize(self, original_image: ImageBuffer, plan: TransformPlan,
+                                  resize_cache: Optional[Dict[str, ImageBuffer]]) -> ImageBuffer:
+        """Apply a compiled config, reusing a cached baseline resize when the config starts with one"""
+        if resize_cache is None or plan.leading_resize is None:
+            return self.transformer.apply_transformations(original_image, plan)
+
+        resize_params = plan.leading_resize.params
+        resize_key = json.dumps(resize_params, sort_keys=True, default=str)
+        base_image = resize_cache.get(resize_key)
+        if base_image is None:
+            base_image = self.transformer.apply_transformations(original_image, {'resize': resize_params})
+            resize_cache[resize_key] = base_image
+            logger.info("operations.transformations", "Cached baseline resize for shared configs", "baseline_resize_cached", {
+                'resize_params': resize_params,
+                'base_dimensions': base_image.size
+            })
+
+        if not plan.remainder:
+            # Copy-on-write: shares the cached pixels until someone writes to them
+            return base_image.copy()
+        return self.transformer.apply_transformations(base_image, plan.remainder)
+
     def generate_augmented_image(self, image_path: str, transformation_config: Dict[str, Any], 
                               config_id: str, dataset_split: str = "train", 
                               output_format: str = "jpg", 
-                              annotations: Optional[List[Union[BoundingBox, Polygon]]] = None) -> AugmentationResult: 
+                              annotations: Optional[List[Union[BoundingBox, Polygon]]] = None,
+                              output_filename: Optional[str] = None) -> AugmentationResult: 
         """ 
         Generate augmented image with updated annotations and dual-value support: 
         geometry via single affine, then optional photometric pass. 
         """ 
+        cached, cache_key = self._reuse_cached_output(
+            image_path, self._source_digest(image_path), transformation_config, config_id,
+            dataset_split, output_format, annotations, output_filename
+        )
+        if cached is not None:
+            return cached
+
         try: 
-            # 0) basic guard 
-            if not transformation_config: 
-                logger.warning("errors.validation", f"Empty transformation config for image: {image_path}", "empty_transformation_config", { 
-                    'image_path': image_path 
-                }) 
-                transformation_config = {} 
- 
             # 1) load source 
-            original_image, original_dims = self.load_image_from_path(image_path) 
- 
-            # 2) resolve dual-value params once 
-            resolved_config = self._resolve_dual_value_parameters(transformation_config) 
- 
-            # 3) Apply transformations using simple sequential approach (same as releases.py)
-            augmented_image = self.transformer.apply_transformations(original_image, resolved_config)
-            augmented_dims = augmented_image.size 
- 
-            # 6) save with requested format and name 
-            original_filename = os.path.basename(image_path) 
-            augmented_filename = self.generate_augmented_filename(original_filename, config_id, output_format) 
-            output_path = self.output_base_dir / dataset_split / augmented_filename 
-            self._save_image_with_format(augmented_image, output_path, output_format) 
- 
-            # 7) update annotations (using sequential transformations - same as releases.py) 
-            updated_annotations: List[Union[BoundingBox, Polygon]] = [] 
-            if annotations: 
-                # Use the centralized annotation transformer with sequential approach (no matrix)
-                updated_annotations = update_annotations_for_transformations( 
-                    annotations, resolved_config, original_dims, augmented_dims, affine_matrix=None 
-                ) 
- 
-            result = AugmentationResult( 
-                augmented_image_path=str(output_path), 
-                updated_annotations=updated_annotations, 
-                transformation_applied=resolved_config, 
-                original_dimensions=original_dims, 
-                augmented_dimensions=augmented_dims, 
-                config_id=config_id 
-            ) 
- 
-            logger.info("operations.transformations", f"Generated augmented image: {augmented_filename}", "augmented_image_generated", { 
-                'augmented_filename': augmented_filename, 
-                'config_id': config_id, 
-                'output_path': str(output_path) 
-            }) 
-            return result 
- 
+            original_image, original_dims = self.load_image_from_path(image_path, [transformation_config]) 
         except Exception as e: 
             logger.error("errors.system", f"Failed to generate augmented image: {str(e)}", "augmented_image_generation_error", { 
                 'error': str(e), 
@@ -320,40 +393,300 @@ class ImageAugmentationEngine:
                 'config_id': config_id 
             }) 
             raise
+
+        return self._generate_from_decoded(
+            image_path, original_image, original_dims, transformation_config, config_id,
+            dataset_split, output_format, annotations, output_filename, cache_key=cache_key
+        )
+
+    def _source_digest(self, image_path: str) -> Optional[str]:
+        """Content hash of the source file when caching is on"""
+        if self.cache is None:
+            return None
+        try:
+            return file_digest(image_path)
+        except OSError:
+            return None
+
+    def _reuse_cached_output(self, image_path: str, source_digest: Optional[str],
+                             transformation_config: Dict[str, Any], config_id: str,
+                             dataset_split: str, output_format: str,
+                             annotations: Optional[List[Union[BoundingBox, Polygon]]],
+                             output_filename: Optional[str]) -> Tuple[Optional[AugmentationResult], Optional[str]]:
+        """
+        Look up a rendered output in the augmentation cache.
+
+        Returns (result, cache_key). On a hit the stored bytes are written (or attached)
+        without decoding, transforming or encoding; annotations are reused when the source
+        labels are unchanged and otherwise recomputed from the stored geometry.
+        On a miss result is None and cache_key tells _generate_from_decoded where to store.
+        Configs with random steps are never cached (cache_key None): each release draws anew.
+        """
+        if self.cache is None or source_digest is None:
+            return None, None
+        try:
+            plan = self.compile_plan(transformation_config)
+            if plan.is_random:
+                return None, None
+            resolved_config = plan.config
+            original_filename = output_filename or os.path.basename(image_path)
+            augmented_filename = self.generate_augmented_filename(original_filename, config_id, output_format)
+            cache_key = make_cache_key(source_digest, resolved_config, output_format,
+                                       Path(augmented_filename).suffix, self.fuse_geometry,
+                                       encoding=self.encoder.cache_tag,
+                                       fuse_photometric=self.transformer.fuse_photometric,
+                                       reduced_decode=self.reduced_decode)
+            entry = self.cache.get(cache_key)
+            if entry is None:
+                return None, cache_key
+            data, meta = entry
+            original_dims = tuple(meta['original_dims'])
+            augmented_dims = tuple(meta['augmented_dims'])
+
+            updated_annotations: List[Union[BoundingBox, Polygon]] = []
+            if annotations:
+                labels_digest = annotations_digest(annotations)
+                if meta.get('annotations_digest') == labels_digest:
+                    updated_annotations = deserialize_annotations(meta.get('annotations', []))
+                else:
+                    updated_annotations = update_annotations_for_transformations(
+                        annotations, resolved_config, original_dims, augmented_dims,
+                        affine_matrix=meta.get('affine_matrix')
+                    )
+                    meta['annotations_digest'] = labels_digest
+                    meta['annotations'] = serialize_annotations(updated_annotations)
+                    self.cache.update_meta(cache_key, meta)
+
+            encoded_image = None
+            if self.in_memory:
+                output_path = Path(dataset_split) / augmented_filename
+                encoded_image = data
+            else:
+                output_path = self.output_base_dir / dataset_split / augmented_filename
+                output_path.write_bytes(data)
+
+            logger.info("operations.transformations", f"Reused cached augmentation: {augmented_filename}", "augmentation_cache_hit", {
+                'augmented_filename': augmented_filename,
+                'config_id': config_id,
+                'cache_key': cache_key
+            })
+            return AugmentationResult(
+                augmented_image_path=str(output_path),
+                updated_annotations=updated_annotations,
+                transformation_applied=resolved_config,
+                original_dimensions=original_dims,
+                augmented_dimensions=augmented_dims,
+                config_id=config_id,
+                encoded_image=encoded_image
+            ), cache_key
+        except Exception as e:
+            logger.warning("errors.system", f"Augmentation cache lookup failed, rendering instead: {str(e)}", "augmentation_cache_lookup_failed", {
+                'error': str(e),
+                'image_path': image_path,
+                'config_id': config_id
+            })
+            return None, None
+
+    def _render_from_decoded(self, original_image: Union[Image.Image, ImageBuffer], original_dims: Tuple[int, int],
+                             transformation_config: Dict[str, Any],
+                             annotations: Optional[List[Union[BoundingBox, Polygon]]] = None,
+                             resize_cache: Optional[Dict[str, ImageBuffer]] = None) -> RenderedAugmentation:
+        """Transform a decoded source image and its annotations (no encoding)"""
+        # resolve dual-value params and compile once per distinct config
+        plan = self.compile_plan(transformation_config)
+        resolved_config = plan.config
+        # Work on a buffer from here to the encoder, so each representation is built at most once
+        if not isinstance(original_image, ImageBuffer):
+            original_image = ImageBuffer.from_pil(original_image)
+
+        # One composed warp for geometry, or the sequential approach (same as releases.py)
+        # with the shared baseline resize
+        affine_matrix = None
+        if self.fuse_geometry:
+            augmented_image, affine_matrix = self.transformer.apply_transformations_fused(original_image, plan)
+            if original_image.size != tuple(original_dims):
+                # Decoded at reduced resolution: annotations are in full-resolution pixels
+                affine_matrix = affine_matrix @ decode_scale_matrix(tuple(original_dims), original_image.size)
+        else:
+            augmented_image = self._apply_with_shared_resize(original_image, plan, resize_cache)
+
+        # update annotations (exact matrix when fused, otherwise sequential - same as releases.py)
+        updated_annotations: List[Union[BoundingBox, Polygon]] = []
+        if annotations:
+            updated_annotations = update_annotations_for_transformations(
+                annotations, resolved_config, original_dims, augmented_image.size, affine_matrix=affine_matrix
+            )
+
+        return RenderedAugmentation(
+            image=augmented_image,
+            resolved_config=resolved_config,
+            original_dims=original_dims,
+            affine_matrix=affine_matrix,
+            updated_annotations=updated_annotations
+        )
+
+    def _encode_rendered(self, image_path: str, rendered: RenderedAugmentation, config_id: str,
+                         dataset_split: str = "train", output_format: str = "jpg",
+                         annotations: Optional[List[Union[BoundingBox, Polygon]]] = None,
+                         output_filename: Optional[str] = None,
+                         cache_key: Optional[str] = None) -> AugmentationResult:
+        """Encode/save a rendered image, store it in the cache and build its result"""
+        augmented_image = rendered.image
+        augmented_dims = augmented_image.size
+
+        # save with requested format and name
+        original_filename = output_filename or os.path.basename(image_path)
+        augmented_filename = self.generate_augmented_filename(original_filename, config_id, output_format)
+        encoded_image = None
+        cached_bytes = None
+        if self.in_memory:
+            # Logical split/filename path; the bytes travel with the result
+            output_path = Path(dataset_split) / augmented_filename
+            encoded_image = self._encode_image_with_format(augmented_image, augmented_filename, output_format)
+            cached_bytes = encoded_image
+        elif cache_key is not None and self.cache is not None:
+            # Encode once and keep the bytes for the cache
+            output_path = self.output_base_dir / dataset_split / augmented_filename
+            cached_bytes = self._encode_image_with_format(augmented_image, augmented_filename, output_format)
+            output_path.write_bytes(cached_bytes)
+        else:
+            output_path = self.output_base_dir / dataset_split / augmented_filename
+            self._save_image_with_format(augmented_image, output_path, output_format)
+
+        if cache_key is not None and self.cache is not None and cached_bytes is not None:
+            self.cache.put(cache_key, cached_bytes, {
+                'original_dims': list(rendered.original_dims),
+                'augmented_dims': list(augmented_dims),
+                'affine_matrix': rendered.affine_matrix.tolist() if rendered.affine_matrix is not None else None,
+                'annotations_digest': annotations_digest(annotations),
+                'annotations': serialize_annotations(rendered.updated_annotations)
+            })
+
+        logger.info("operations.transformations", f"Generated augmented image: {augmented_filename}", "augmented_image_generated", {
+            'augmented_filename': augmented_filename,
+            'config_id': config_id,
+            'output_path': str(output_path)
+        })
+        return AugmentationResult(
+            augmented_image_path=str(output_path),
+            updated_annotations=rendered.updated_annotations,
+            transformation_applied=rendered.resolved_config,
+            original_dimensions=rendered.original_dims,
+            augmented_dimensions=augmented_dims,
+            config_id=config_id,
+            encoded_image=encoded_image
+        )
+
+    def _generate_from_decoded(self, image_path: str, original_image: Image.Image, original_dims: Tuple[int, int],
+                               transformation_config: Dict[str, Any], config_id: str,
+                               dataset_split: str = "train", output_format: str = "jpg",
+                               annotations: Optional[List[Union[BoundingBox, Polygon]]] = None,
+                               output_filename: Optional[str] = None,
+                               resize_cache: Optional[Dict[str, ImageBuffer]] = None,
+                               cache_key: Optional[str] = None) -> AugmentationResult:
+        """Generate one augmented image from an already decoded source image (stored under cache_key if given)"""
+        try:
+            if not transformation_config:
+                logger.warning("errors.validation", f"Empty transformation config for image: {image_path}", "empty_transformation_config", {
+                    'image_path': image_path
+                })
+            rendered = self._render_from_decoded(original_image, original_dims, transformation_config,
+                                                 annotations, resize_cache)
+            return self._encode_rendered(image_path, rendered, config_id, dataset_split, output_format,
+                                         annotations, output_filename, cache_key)
+
+        except Exception as e:
+            logger.error("errors.system", f"Failed to generate augmented image: {str(e)}", "augmented_image_generation_error", {
+                'error': str(e),
+                'image_path': image_path,
+                'config_id': config_id
+            })
+            raise
     
     def process_image_with_multiple_configs(self, image_path: str, 
                                           transformation_configs: List[Dict[str, Any]],
                                           dataset_split: str = "train",
                                           output_format: str = "jpg",
-                                          annotations: Optional[List[Union[BoundingBox, Polygon]]] = None) -> List[AugmentationResult]:
+                                          annotations: Optional[List[Union[BoundingBox, Polygon]]] = None,
+                                          output_filename: Optional[str] = None) -> List[AugmentationResult]:
         """
         Process a single image with multiple transformation configurations
         
+        The source is decoded once and shared by every config; configs that begin
+        with the same resize step also share the resized baseline image. Configs found
+        in the augmentation cache are served from it, and when every config hits the
+        source is never decoded at all.
+        
         Args:
             image_path: Path to original image
             transformation_configs: List of transformation configurations
             dataset_split: Dataset split (train/val/test)
             output_format: Output image format
             annotations: List of annotations to update
+            output_filename: Name to derive augmented filenames from (defaults to basename of image_path)
             
         Returns:
             List of AugmentationResult objects
         """
         results = []
+        if not transformation_configs:
+            return results
+        
+        source_digest = self._source_digest(image_path)
+        original_image = None
+        original_dims = None
+        resize_cache: Dict[str, ImageBuffer] = {}
+        encode_pool = self._get_encode_pool()
         
         for config_data in transformation_configs:
             try:
                 config_id = config_data.get('config_id', str(uuid.uuid4()))
                 transformations = config_data.get('transformations', {})
                 
-                result = self.generate_augmented_image(
-                    image_path=image_path,
-                    transformation_config=transformations,
-                    config_id=config_id,
-                    dataset_split=dataset_split,
-                    output_format=output_format,
-                    annotations=annotations
+                cached, cache_key = self._reuse_cached_output(
+                    image_path, source_digest, transformations, config_id,
+                    dataset_split, output_format, annotations, output_filename
                 )
+                if cached is not None:
+                    results.append(cached)
+                    continue
+                
+                # Decode once for all configs that miss the cache
+                if original_image is None:
+                    try:
+                        original_image, original_dims = self.load_image_from_path(
+                            image_path, [config.get('transformations', {}) for config in transformation_configs]
+                        )
+                    except Exception as e:
+                        logger.error("errors.system", f"Failed to load image for augmentation: {str(e)}", "augmentation_source_load_error", {
+                            'error': str(e),
+                            'image_path': image_path,
+                            'config_count': len(transformation_configs)
+                        })
+                        return results
+                
+                if encode_pool is None:
+                    result = self._generate_from_decoded(
+                        image_path,
+                        original_image,
+                        original_dims,
+                        transformations,
+                        config_id,
+                        dataset_split=dataset_split,
+                        output_format=output_format,
+                        annotations=annotations,
+                        output_filename=output_filename,
+                        resize_cache=resize_cache,
+                        cache_key=cache_key
+                    )
+                else:
+                    # Transform here, encode on the pool while the next config is transformed
+                    rendered = self._render_from_decoded(original_image, original_dims, transformations,
+                                                         annotations, resize_cache)
+                    result = encode_pool.submit(
+                        self._encode_rendered, image_path, rendered, config_id, dataset_split,
+                        output_format, annotations, output_filename, cache_key
+                    )
                 
                 results.append(result)
                 
@@ -365,12 +698,31 @@ class ImageAugmentationEngine:
                 })
                 continue
         
+        if encode_pool is not None:
+            results = self._collect_encoded(image_path, results)
+        
         logger.info("operations.transformations", f"Processed {len(results)} configurations for image: {os.path.basename(image_path)}", "configurations_processed", {
             'config_count': len(results),
             'image_filename': os.path.basename(image_path)
         })
         return results
     
+    def _collect_encoded(self, image_path: str, pending: List[Any]) -> List[AugmentationResult]:
+        """Wait for pooled encodes, keeping config order and dropping failed ones"""
+        results = []
+        for item in pending:
+            if not isinstance(item, Future):
+                results.append(item)
+                continue
+            try:
+                results.append(item.result())
+            except Exception as e:
+                logger.error("errors.system", f"Failed to encode augmented image: {str(e)}", "augmented_image_encode_error", {
+                    'error': str(e),
+                    'image_path': image_path
+                })
+        return results
+
     def get_available_transformations(self) -> Dict[str, Dict[str, Any]]:
         """Get available transformations from ImageTransformer service"""
         return self.transformer.get_available_transformations()
@@ -396,9 +748,343 @@ class ImageAugmentationEngine:
                 self.cleanup_output_directory(split)
 
 
-def create_augmentation_engine(output_dir: str = "augmented") -> ImageAugmentationEngine:
+def create_augmentation_engine(output_dir: str = "augmented", in_memory: bool = False,
+                               fuse_geometry: Optional[bool] = None,
+                               encode_preset: Optional[str] = None,
+                               encoder_backend: Optional[str] = None,
+                               encode_threads: Optional[int] = None,
+                               encode_stats: Optional[EncodeStats] = None) -> ImageAugmentationEngine:
     """Create and configure augmentation engine"""
-    return ImageAugmentationEngine(output_dir)
+    return ImageAugmentationEngine(output_dir, in_memory=in_memory, fuse_geometry=fuse_geometry,
+                                   encode_preset=encode_preset, encoder_backend=encoder_backend,
+                                   encode_threads=encode_threads, encode_stats=encode_stats)
+
+
+def _release_image_inputs(image_path: str,
+                          transformation_configs: Dict[str, List[Dict[str, Any]]],
+                          dataset_splits: Dict[str, str],
+                          dataset_sources: Dict[str, Dict[str, Any]],
+                          annotations_map: Dict[str, List[Union[BoundingBox, Polygon]]]
+                          ) -> Optional[Tuple[List[Dict[str, Any]], str, List[Union[BoundingBox, Polygon]], Optional[str]]]:
+    """Look up (configs, split, pixel annotations, output filename) for one source image; None without configs"""
+    image_filename = Path(image_path).stem
+    output_filename = None
+
+    # Use the actual database image_id that matches transformation_configs keys
+    if dataset_sources and image_path in dataset_sources:
+        source_info = dataset_sources[image_path]
+        original_filename = source_info.get("original_filename", image_filename)
+        # FIXED: Use the actual database image ID instead of filename stem
+        image_id = source_info.get("source_image_id", image_filename)
+        dataset_name = source_info.get("dataset_name", "unknown")
+        output_filename = source_info.get("output_filename")
+        logger.info("operations.transformations",
+                    f"   Processing {dataset_name}/{original_filename} (ID: {image_id})",
+                    "image_processing_start",
+                    {
+                        'dataset_name': dataset_name,
+                        'original_filename': original_filename,
+                        'image_path': image_path,
+                        'image_id': image_id
+                    })
+    else:
+        image_id = image_filename
+        dataset_name = "unknown"
+
+    # Get transformation configs for this image_id
+    configs = transformation_configs.get(image_id, [])
+    if not configs:
+        logger.warning("errors.validation",
+                       f"No transformation configs found for image: {image_id} (from {dataset_name})",
+                       "no_transformation_configs",
+                       {
+                           'image_id': image_id,
+                           'dataset_name': dataset_name,
+                           'image_path': image_path
+                       })
+        return None
+
+    # Resolve dataset split
+    split = dataset_splits.get(image_path, "train")
+
+    # Pull pixel-space annotations for this image, if provided by caller
+    annotations_for_this_image: Optional[List[Union[BoundingBox, Polygon]]] = None
+    if annotations_map:
+        # 1) exact key by absolute path
+        annotations_for_this_image = annotations_map.get(image_path)
+        if annotations_for_this_image is None:
+            # 2) key by image_id (stem of original filename)
+            annotations_for_this_image = annotations_map.get(image_id)
+
+    # Log how many we’re using for this image (safe even if None)
+    logger.info("operations.annotations",
+        f"Using {len(annotations_for_this_image or [])} annotations for {image_id}",
+        "release_annotations_selected",
+        {"image_path": image_path, "image_id": image_id},
+    )
+    if not annotations_for_this_image:
+        logger.warning(
+            "operations.annotations",
+            "No annotations found for this image; labels will NOT be transformed",
+            "release_annotations_missing",
+            {"image_path": image_path, "image_id": image_id}
+        )
+    # Optional: normalize to empty list
+    if annotations_for_this_image is None:
+        annotations_for_this_image = []
+
+    return configs, split, annotations_for_this_image, output_filename
+
+
+def _process_single_release_image(engine: ImageAugmentationEngine,
+                                  image_path: str,
+                                  transformation_configs: Dict[str, List[Dict[str, Any]]],
+                                  dataset_splits: Dict[str, str],
+                                  output_format: str,
+                                  dataset_sources: Dict[str, Dict[str, Any]],
+                                  annotations_map: Dict[str, List[Union[BoundingBox, Polygon]]]
+                                  ) -> Optional[List[AugmentationResult]]:
+    """Augment one source image with all of its configs (None when it has no configs)"""
+    inputs = _release_image_inputs(image_path, transformation_configs, dataset_splits,
+                                   dataset_sources, annotations_map)
+    if inputs is None:
+        return None
+    configs, split, annotations, output_filename = inputs
+
+    # Process with all configurations (now passing annotations)
+    return engine.process_image_with_multiple_configs(
+        image_path=image_path,
+        transformation_configs=configs,
+        dataset_split=split,
+        output_format=output_format,
+        annotations=annotations,
+        output_filename=output_filename
+    )
+
+
+# ---------------------------------------------------------------------------
+# Process-pool workers for parallel release generation.
+# The shared mappings (configs, splits, sources, annotations) are handed to each
+# worker once through the pool initializer instead of being pickled per task.
+# ---------------------------------------------------------------------------
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_release_worker(output_dir: str,
+                         in_memory: bool,
+                         output_format: str,
+                         transformation_configs: Dict[str, List[Dict[str, Any]]],
+                         dataset_splits: Dict[str, str],
+                         dataset_sources: Dict[str, Dict[str, Any]],
+                         annotations_map: Dict[str, List[Union[BoundingBox, Polygon]]],
+                         encode_preset: Optional[str] = None,
+                         encoder_backend: Optional[str] = None) -> None:
+    """Pool initializer: build one engine per worker and keep the shared inputs"""
+    _worker_state.clear()
+    _worker_state.update({
+        "engine": create_augmentation_engine(output_dir, in_memory=in_memory, encode_preset=encode_preset,
+                                             encoder_backend=encoder_backend),
+        "output_format": output_format,
+        "transformation_configs": transformation_configs,
+        "dataset_splits": dataset_splits,
+        "dataset_sources": dataset_sources,
+        "annotations_map": annotations_map,
+    })
+
+
+def _release_worker_task(index: int, image_path: str
+                         ) -> Tuple[int, str, Optional[List[AugmentationResult]], Optional[str], Dict[str, Dict[str, float]]]:
+    """Run one image inside a pool worker; failures are returned, never raised (plus its encode timings)"""
+    engine = _worker_state["engine"]
+    try:
+        results = _process_single_release_image(
+            engine,
+            image_path,
+            _worker_state["transformation_configs"],
+            _worker_state["dataset_splits"],
+            _worker_state["output_format"],
+            _worker_state["dataset_sources"],
+            _worker_state["annotations_map"],
+        )
+        return index, image_path, results, None, engine.encoder.stats.drain()
+    except Exception as e:
+        return index, image_path, None, str(e), engine.encoder.stats.drain()
+
+
+def _resolve_release_workers(max_workers: Optional[int], total_images: int) -> int:
+    """Resolve the worker count (None -> settings.RELEASE_MAX_WORKERS, 0 -> cpu count)"""
+    if max_workers is None:
+        from core.config import settings
+        max_workers = settings.RELEASE_MAX_WORKERS
+    if max_workers <= 0:
+        max_workers = os.cpu_count() or 1
+    return max(1, min(max_workers, total_images))
+
+
+# ---------------------------------------------------------------------------
+# Pipelined release generation: decode -> transform -> encode stages on threads,
+# joined by bounded queues, with the caller's thread packaging finished images.
+# Only `queue_size` images wait between two stages, so memory does not grow with
+# the dataset, and file/ZIP I/O overlaps the CPU-heavy stages.
+# ---------------------------------------------------------------------------
+@dataclass
+class _PipelineImageJob:
+    """One source image travelling through the release pipeline"""
+    index: int
+    image_path: str
+    split: str = "train"
+    annotations: List[Union[BoundingBox, Polygon]] = field(default_factory=list)
+    output_filename: Optional[str] = None
+    # Per config, in config order: a finished AugmentationResult (cache hit), a pending
+    # (config_id, transformations, cache_key) tuple, or a RenderedAugmentation
+    slots: List[Any] = field(default_factory=list)
+    image: Optional[Image.Image] = None
+    dims: Optional[Tuple[int, int]] = None
+    has_configs: bool = True
+
+
+def _resolve_pipeline_stage_workers() -> Dict[str, int]:
+    """Per-stage thread counts from settings (0 -> cpu count)"""
+    from core.config import settings
+    cpu = os.cpu_count() or 1
+    return {
+        "decode": settings.RELEASE_DECODE_WORKERS or cpu,
+        "transform": settings.RELEASE_TRANSFORM_WORKERS or cpu,
+        "encode": settings.RELEASE_ENCODE_WORKERS or cpu,
+    }
+
+
+def _process_release_images_pipelined(image_paths: List[str],
+                                      transformation_configs: Dict[str, List[Dict[str, Any]]],
+                                      dataset_splits: Dict[str, str],
+                                      output_dir: str,
+                                      output_format: str,
+                                      dataset_sources: Dict[str, Dict[str, Any]],
+                                      annotations_map: Dict[str, List[Union[BoundingBox, Polygon]]],
+                                      in_memory: bool,
+                                      on_image_done: Callable[[int, str, Optional[List[AugmentationResult]], Optional[str]], None],
+                                      encode_preset: Optional[str] = None,
+                                      encoder_backend: Optional[str] = None,
+                                      encode_stats: Optional[EncodeStats] = None
+                                      ) -> None:
+    """Run every image through the bounded stage pipeline; on_image_done(index, path, results, error) per image"""
+    from core.config import settings
+
+    # The transformer keeps per-call state, so each worker thread gets its own engine
+    local = threading.local()
+
+    def _engine() -> ImageAugmentationEngine:
+        engine = getattr(local, "engine", None)
+        if engine is None:
+            # The encode stage is already threaded, so engines encode inline
+            engine = local.engine = create_augmentation_engine(
+                output_dir, in_memory=in_memory, encode_preset=encode_preset,
+                encoder_backend=encoder_backend, encode_threads=1, encode_stats=encode_stats
+            )
+        return engine
+
+    def _decode(job: _PipelineImageJob) -> _PipelineImageJob:
+        inputs = _release_image_inputs(job.image_path, transformation_configs, dataset_splits,
+                                       dataset_sources, annotations_map)
+        if inputs is None:
+            job.has_configs = False
+            return job
+        configs, job.split, job.annotations, job.output_filename = inputs
+
+        engine = _engine()
+        source_digest = engine._source_digest(job.image_path)
+        for config_data in configs:
+            config_id = config_data.get('config_id', str(uuid.uuid4()))
+            transformations = config_data.get('transformations', {})
+            cached, cache_key = engine._reuse_cached_output(
+                job.image_path, source_digest, transformations, config_id,
+                job.split, output_format, job.annotations, job.output_filename
+            )
+            job.slots.append(cached if cached is not None else (config_id, transformations, cache_key))
+
+        # Decode only when some config missed the cache; the pixels are decoded here (at reduced
+        # resolution when every missing config starts by downscaling), not lazily in _transform
+        if any(isinstance(slot, tuple) for slot in job.slots):
+            try:
+                job.image, job.dims = engine.load_image_from_path(
+                    job.image_path, [slot[1] for slot in job.slots if isinstance(slot, tuple)]
+                )
+            except Exception as e:
+                logger.error("errors.system", f"Failed to load image for augmentation: {str(e)}", "augmentation_source_load_error", {
+                    'error': str(e),
+                    'image_path': job.image_path,
+                    'config_count': len(job.slots)
+                })
+                job.slots = [slot for slot in job.slots if isinstance(slot, AugmentationResult)]
+        return job
+
+    def _transform(job: _PipelineImageJob) -> _PipelineImageJob:
+        if job.image is None:
+            return job
+        engine = _engine()
+        resize_cache: Dict[str, ImageBuffer] = {}
+        slots = []
+        for slot in job.slots:
+            if isinstance(slot, tuple):
+                config_id, transformations, cache_key = slot
+                try:
+                    rendered = engine._render_from_decoded(job.image, job.dims, transformations,
+                                                           job.annotations, resize_cache)
+                except Exception as e:
+                    logger.error("errors.system", f"Failed to process config {config_id}: {str(e)}", "config_processing_error", {
+                        'error': str(e),
+                        'config_id': config_id,
+                        'image_path': job.image_path
+                    })
+                    continue
+                slot = (config_id, rendered, cache_key)
+            slots.append(slot)
+        job.slots = slots
+        # The decoded source is no longer needed once every variant is rendered
+        job.image = None
+        return job
+
+    def _encode(job: _PipelineImageJob) -> _PipelineImageJob:
+        engine = _engine()
+        results = []
+        for slot in job.slots:
+            if isinstance(slot, AugmentationResult):
+                results.append(slot)
+                continue
+            config_id, rendered, cache_key = slot
+            try:
+                results.append(engine._encode_rendered(
+                    job.image_path, rendered, config_id, job.split, output_format,
+                    job.annotations, job.output_filename, cache_key
+                ))
+            except Exception as e:
+                logger.error("errors.system", f"Failed to process config {config_id}: {str(e)}", "config_processing_error", {
+                    'error': str(e),
+                    'config_id': config_id,
+                    'image_path': job.image_path
+                })
+        job.slots = results
+        return job
+
+    def _sink(item: Any) -> None:
+        if isinstance(item, StageFailure):
+            job = item.item
+            on_image_done(job.index, job.image_path, None, f"{item.stage} stage failed: {item.error}")
+        elif not item.has_configs:
+            on_image_done(item.index, item.image_path, None, None)
+        else:
+            on_image_done(item.index, item.image_path, item.slots, None)
+
+    stage_workers = _resolve_pipeline_stage_workers()
+    pipeline = BoundedPipeline([
+        PipelineStage("decode", _decode, stage_workers["decode"]),
+        PipelineStage("transform", _transform, stage_workers["transform"]),
+        PipelineStage("encode", _encode, stage_workers["encode"]),
+    ], queue_size=settings.RELEASE_PIPELINE_QUEUE_SIZE)
+    pipeline.run(
+        (_PipelineImageJob(index=index, image_path=image_path) for index, image_path in enumerate(image_paths)),
+        _sink
+    )
 
 
 def process_release_images(image_paths: List[str], 
@@ -407,7 +1093,14 @@ def process_release_images(image_paths: List[str],
                            output_dir: str = "augmented",
                            output_format: str = "jpg",
                            dataset_sources: Dict[str, Dict[str, Any]] = None,
-                           annotations_map: Optional[Dict[str, List[Union[BoundingBox, Polygon]]]] = None
+                           annotations_map: Optional[Dict[str, List[Union[BoundingBox, Polygon]]]] = None,
+                           max_workers: Optional[int] = None,
+                           progress_callback: Optional[Callable[[int, int, int], None]] = None,
+                           in_memory: bool = False,
+                           result_callback: Optional[Callable[[str, List[AugmentationResult]], None]] = None,
+                           pipeline: Optional[bool] = None,
+                           encode_preset: Optional[str] = None,
+                           encoder_backend: Optional[str] = None
                            ) -> Dict[str, List[AugmentationResult]]:
     """
     Process multiple images for release generation with multi-dataset support
@@ -420,17 +1113,37 @@ def process_release_images(image_paths: List[str],
         output_format: Output image format ("jpg"|"png"|"webp"|"tiff"|"original")
         dataset_sources: Dict mapping image_path -> {"dataset_name": ..., "original_filename": ...}
         annotations_map: OPTIONAL. Dict keyed by image_path and/or image_id -> List[BoundingBox|Polygon] in **pixels**
+        max_workers: Worker processes (None -> settings.RELEASE_MAX_WORKERS, 0 -> cpu count, 1 -> serial)
+        progress_callback: OPTIONAL. Called as (finished_images, total_images, generated_images)
+                           each time an image finishes, in completion order
+        in_memory: Encode outputs into AugmentationResult.encoded_image instead of writing files
+        result_callback: OPTIONAL. Called as (image_path, results) in completion order, before
+                         progress_callback; it may consume and drop encoded_image bytes
+        pipeline: Run decode/transform/encode as concurrent thread stages with bounded queues
+                  (None -> settings.RELEASE_PIPELINE); takes precedence over max_workers
+        encode_preset: "quality" | "balanced" | "fast" (None -> settings.RELEASE_ENCODE_PRESET)
+        encoder_backend: "pil" | "cv2" (None -> settings.RELEASE_ENCODER_BACKEND)
+
+    Results are always returned in the order of image_paths, whatever the worker count.
+    A failing image is logged and skipped without affecting the others.
     """
-    engine = create_augmentation_engine(output_dir)
     all_results: Dict[str, List[AugmentationResult]] = {}
     dataset_sources = dataset_sources or {}
     annotations_map = annotations_map or {}
+    total_images = len(image_paths)
+    workers = _resolve_release_workers(max_workers, total_images) if total_images else 1
+    if pipeline is None:
+        from core.config import settings
+        pipeline = settings.RELEASE_PIPELINE
+    encode_stats = EncodeStats()
 
     logger.info("operations.transformations",
                 f"🎨 PROCESSING {len(image_paths)} IMAGES FROM MULTIPLE DATASETS",
                 "multi_dataset_processing_start",
                 {
                     'total_images': len(image_paths),
+                    'workers': workers,
+                    'pipeline': bool(pipeline),
                     'dataset_count': len(set(
                         (dataset_sources[p].get('dataset_name', 'unknown')
                          if (dataset_sources and p in dataset_sources) else 'unknown')
@@ -438,101 +1151,111 @@ def process_release_images(image_paths: List[str],
                     ))
                 })
 
-    for image_path in image_paths:
-        try:
-            image_filename = Path(image_path).stem
-
-            # Use the actual database image_id that matches transformation_configs keys
-            if dataset_sources and image_path in dataset_sources:
-                source_info = dataset_sources[image_path]
-                original_filename = source_info.get("original_filename", image_filename)
-                # FIXED: Use the actual database image ID instead of filename stem
-                image_id = source_info.get("source_image_id", image_filename)
-                dataset_name = source_info.get("dataset_name", "unknown")
-                logger.info("operations.transformations",
-                            f"   Processing {dataset_name}/{original_filename} (ID: {image_id})",
-                            "image_processing_start",
-                            {
-                                'dataset_name': dataset_name,
-                                'original_filename': original_filename,
-                                'image_path': image_path,
-                                'image_id': image_id
-                            })
-            else:
-                image_id = image_filename
-                dataset_name = "unknown"
-
-            # Get transformation configs for this image_id
-            configs = transformation_configs.get(image_id, [])
-            if not configs:
-                logger.warning("errors.validation",
-                               f"No transformation configs found for image: {image_id} (from {dataset_name})",
-                               "no_transformation_configs",
-                               {
-                                   'image_id': image_id,
-                                   'dataset_name': dataset_name,
-                                   'image_path': image_path
-                               })
-                continue
+    def _report_image_error(image_path: str, error: str) -> None:
+        logger.error("errors.system",
+                     f"Failed to process image {image_path}: {error}",
+                     "image_processing_error",
+                     {
+                         'error': error,
+                         'image_path': image_path
+                     })
 
-            # Resolve dataset split
-            split = dataset_splits.get(image_path, "train")
+    finished = 0
+    generated = 0
 
-            # ----- FIXED: pull pixel annotations with robust fallback keys -----
-            
-# Pull pixel-space annotations for this image, if provided by caller
-            annotations_for_this_image: Optional[List[Union[BoundingBox, Polygon]]] = None
-            if annotations_map:
-                # 1) exact key by absolute path
-                annotations_for_this_image = annotations_map.get(image_path)
-                if annotations_for_this_image is None:
-                    # 2) key by image_id (stem of original filename)
-                    annotations_for_this_image = annotations_map.get(image_id)
-
-            # Log how many we’re using for this image (safe even if None)
-            logger.info("operations.annotations",
-                f"Using {len(annotations_for_this_image or [])} annotations for {image_id}",
-                "release_annotations_selected",
-                {"image_path": image_path, "image_id": image_id}, 
-            )
-            if not annotations_for_this_image:
-                logger.warning(
-                    "operations.annotations",
-                    "No annotations found for this image; labels will NOT be transformed",
-                    "release_annotations_missing",
-                    {"image_path": image_path, "image_id": image_id}
-                )  
-            # Optional: normalize to empty list
-            if annotations_for_this_image is None:
-                annotations_for_this_image = []
-             # Process with all configurations (now passing annotations)
-            results = engine.process_image_with_multiple_configs(
-                image_path=image_path,
-                transformation_configs=configs,
-                dataset_split=split,
-                output_format=output_format,
-                annotations=annotations_for_this_image
-            )
+    def _report_progress(image_path: str, results: Optional[List[AugmentationResult]]) -> None:
+        nonlocal finished, generated
+        if results is not None and result_callback:
+            try:
+                result_callback(image_path, results)
+            except Exception as cb_err:
+                _report_image_error(image_path, f"result callback failed: {cb_err}")
+        finished += 1
+        generated += len(results or [])
+        if progress_callback:
+            try:
+                progress_callback(finished, total_images, generated)
+            except Exception as cb_err:
+                logger.warning("operations.transformations",
+                               f"Release progress callback failed: {cb_err}",
+                               "release_progress_callback_failed",
+                               {'error': str(cb_err)})
 
-            all_results[image_path] = results
+    if pipeline and total_images:
+        ordered: List[Optional[List[AugmentationResult]]] = [None] * total_images
 
+        def _on_image_done(index: int, image_path: str, results: Optional[List[AugmentationResult]],
+                           error: Optional[str]) -> None:
+            if error:
+                _report_image_error(image_path, error)
+            ordered[index] = results
+            _report_progress(image_path, results)
 
-        except Exception as e:
-            logger.error("errors.system",
-                         f"Failed to process image {image_path}: {str(e)}",
-                         "image_processing_error",
-                         {
-                             'error': str(e),
-                             'image_path': image_path
-                         })
-            continue
+        _process_release_images_pipelined(
+            image_paths, transformation_configs, dataset_splits, output_dir, output_format,
+            dataset_sources, annotations_map, in_memory, _on_image_done,
+            encode_preset=encode_preset, encoder_backend=encoder_backend, encode_stats=encode_stats
+        )
+
+        for index, image_path in enumerate(image_paths):
+            if ordered[index] is not None:
+                all_results[image_path] = ordered[index]
+    elif workers <= 1:
+        engine = create_augmentation_engine(output_dir, in_memory=in_memory, encode_preset=encode_preset,
+                                            encoder_backend=encoder_backend, encode_stats=encode_stats)
+        for image_path in image_paths:
+            results = None
+            try:
+                results = _process_single_release_image(
+                    engine, image_path, transformation_configs, dataset_splits,
+                    output_format, dataset_sources, annotations_map
+                )
+                if results is not None:
+                    all_results[image_path] = results
+            except Exception as e:
+                _report_image_error(image_path, str(e))
+            _report_progress(image_path, results)
+        engine.close()
+    else:
+        ordered: List[Optional[List[AugmentationResult]]] = [None] * total_images
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_release_worker,
+            initargs=(output_dir, in_memory, output_format, transformation_configs,
+                      dataset_splits, dataset_sources, annotations_map, encode_preset, encoder_backend)
+        ) as pool:
+            futures = {
+                pool.submit(_release_worker_task, index, image_path): (index, image_path)
+                for index, image_path in enumerate(image_paths)
+            }
+            for future in as_completed(futures):
+                index, image_path = futures[future]
+                results = None
+                try:
+                    _, _, results, error, worker_encode_stats = future.result()
+                    encode_stats.merge(worker_encode_stats)
+                except Exception as e:
+                    # Worker process died (e.g. BrokenProcessPool) - isolate to this image
+                    error = str(e)
+                if error:
+                    _report_image_error(image_path, error)
+                    results = None
+                ordered[index] = results
+                _report_progress(image_path, results)
+
+        # Deterministic output: insertion order follows image_paths
+        for index, image_path in enumerate(image_paths):
+            if ordered[index] is not None:
+                all_results[image_path] = ordered[index]
 
     logger.info("operations.transformations",
                 f"Processed {len(all_results)} images for release generation",
                 "release_images_processed",
                 {
                     'processed_images': len(all_results),
-                    'total_images': len(image_paths)
+                    'total_images': len(image_paths),
+                    'workers': workers,
+                    'encode_timings': encode_stats.summary()
                 })
     return all_results
 
@@ -0,0 +1,171 @@
+"""
+Photometric lookup-table compiler
+Folds runs of point-wise photometric steps (brightness, contrast, gamma, grayscale and the
+brightness/contrast part of color jitter) into one 256-entry table, so the image is touched
+by a single Image.point pass instead of one full-image PIL pass per step.
+"""
+
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageEnhance, ImageStat
+
+# Every 8-bit value once; steps are evaluated on this ramp to get their tables
+_RAMP = Image.frombytes("L", (256, 1), bytes(range(256)))
+_IDENTITY = np.arange(256, dtype=np.uint8)
+
+# PIL's RGB -> L weights (Convert.c: L = (R*19595 + G*38470 + B*7471 + 0x8000) >> 16)
+_LUMA_WEIGHTS = np.array([19595, 38470, 7471], dtype=np.float64) / 65536.0
+
+# One step of a chain: (kind, value). "apply" runs value(image) as a non point-wise barrier;
+# "table" composes a prebuilt 256-entry table (see core.transform_plan).
+PhotometricOp = Tuple[str, Any]
+
+
+def _table(image: Image.Image) -> np.ndarray:
+    return np.asarray(image, dtype=np.uint8).reshape(256)
+
+
+def brightness_table(factor: float) -> np.ndarray:
+    """ImageEnhance.Brightness(factor) as a table (blend with black)"""
+    return _table(ImageEnhance.Brightness(_RAMP).enhance(factor))
+
+
+def contrast_table(factor: float, mean: int) -> np.ndarray:
+    """ImageEnhance.Contrast(factor) as a table, for an image whose rounded L mean is `mean`"""
+    return _table(Image.blend(Image.new("L", (256, 1), mean), _RAMP, factor))
+
+
+def gamma_table(gamma: float) -> np.ndarray:
+    """Same arithmetic as ImageTransformer._apply_gamma_correction"""
+    return (np.power(_IDENTITY / 255.0, gamma) * 255).astype(np.uint8)
+
+
+class PhotometricChain:
+    """
+    Pending point-wise steps for one image.
+
+    Each step's table comes from running the step's own PIL/NumPy arithmetic on a 0..255
+    ramp, and tables compose by indexing, so brightness and gamma chains are bit-exact with
+    the sequential steps. Contrast needs the image's mean luminance at that point: it is
+    exact for the first step (or after grayscale) and otherwise estimated from the channel
+    histograms through the pending table, which can move the result by one level.
+    Grayscale switches the chain to a single L channel; "apply" steps (hue shift,
+    saturation) materialize the pending table and restart the chain on their output.
+    """
+
+    MODES = ("RGB", "L")
+
+    def __init__(self, image: Image.Image):
+        self.image = image
+        self.table = _IDENTITY
+        self.steps: List[str] = []
+        self.passes = 0
+        self._to_rgb = False
+        self._histogram: Optional[np.ndarray] = None
+
+    @classmethod
+    def supports(cls, image: Image.Image) -> bool:
+        return image.mode in cls.MODES
+
+    def _identity(self) -> bool:
+        return np.array_equal(self.table, _IDENTITY)
+
+    def _compose(self, step_table: np.ndarray) -> None:
+        self.table = step_table[self.table]
+
+    def _materialize(self) -> Image.Image:
+        image = self.image
+        if not self._identity():
+            image = image.point(self.table.tolist() * len(image.getbands()))
+            self.passes += 1
+        self.table = _IDENTITY
+        return image
+
+    def _rebase(self, image: Image.Image) -> None:
+        self.image = image
+        self.table = _IDENTITY
+        self._histogram = None
+
+    def _mean_luma(self) -> int:
+        """Rounded L mean of the image as it would be after the pending table (as ImageEnhance.Contrast)"""
+        if self.image.mode == "RGB" and self._identity():
+            mean = ImageStat.Stat(self.image.convert("L")).mean[0]
+        else:
+            if self._histogram is None:
+                self._histogram = np.asarray(self.image.histogram(), dtype=np.float64).reshape(-1, 256)
+            channel_means = (self._histogram * self.table).sum(axis=1) / self._histogram[0].sum()
+            mean = channel_means[0] if len(channel_means) == 1 else float(np.dot(_LUMA_WEIGHTS, channel_means))
+        return int(mean + 0.5)
+
+    def add(self, kind: str, value: Any = None) -> None:
+        if kind == "brightness":
+            self._compose(brightness_table(value))
+        elif kind == "contrast":
+            self._compose(contrast_table(value, self._mean_luma()))
+        elif kind == "gamma":
+            self._compose(gamma_table(value))
+        elif kind == "table":
+            self._compose(value)
+        elif kind == "grayscale":
+            image = self._materialize()
+            if image.mode != "L":
+                image = image.convert("L")
+                self.passes += 1
+            self._rebase(image)
+            self._to_rgb = True
+        elif kind == "apply":
+            self._rebase(value(self.result()))
+            self._to_rgb = False
+        else:
+            raise ValueError(f"Unknown photometric step: {kind}")
+        self.steps.append(kind)
+
+    def extend(self, ops: Iterable[PhotometricOp]) -> None:
+        for kind, value in ops:
+            self.add(kind, value)
+
+    def result(self) -> Image.Image:
+        """The image with every pending step applied"""
+        image = self._materialize()
+        if self._to_rgb:
+            image = image.convert("RGB")
+            self.passes += 1
+            self._rebase(image)
+            self._to_rgb = False
+        else:
+            self._rebase(image)
+        return image
+
+
+def benchmark(image: Image.Image, ops: List[PhotometricOp],
+              sequential: Callable[[Image.Image], Image.Image], repeats: int = 5) -> Dict[str, Any]:
+    """
+    Time a fused chain against the equivalent sequential steps on one image.
+    Returns both timings (best of `repeats`, ms), the speedup and the largest per-pixel difference.
+    """
+    def best(run: Callable[[], Image.Image]) -> Tuple[float, Image.Image]:
+        timings, output = [], None
+        for _ in range(max(1, repeats)):
+            started = time.perf_counter()
+            output = run()
+            timings.append((time.perf_counter() - started) * 1000.0)
+        return min(timings), output
+
+    def fused() -> Image.Image:
+        chain = PhotometricChain(image)
+        chain.extend(ops)
+        return chain.result()
+
+    sequential_ms, expected = best(lambda: sequential(image))
+    fused_ms, actual = best(fused)
+    difference = np.abs(np.asarray(expected, dtype=np.int16) - np.asarray(actual, dtype=np.int16))
+    return {
+        'steps': [kind for kind, _ in ops],
+        'image_size': f"{image.size[0]}x{image.size[1]}",
+        'sequential_ms': round(sequential_ms, 2),
+        'fused_ms': round(fused_ms, 2),
+        'speedup': round(sequential_ms / fused_ms, 2) if fused_ms else None,
+        'max_abs_diff': int(difference.max()) if difference.size else 0
+    }
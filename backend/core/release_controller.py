@@ -7,8 +7,8 @@ import os
 import json
 import uuid
 import shutil
-import zipfile
 import tempfile
+import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
@@ -18,12 +18,18 @@ from PIL import Image
 
 # Import our components
 from core.transformation_schema import TransformationSchema, create_schema_from_database, generate_release_configurations
-from core.image_generator import ImageAugmentationEngine, create_augmentation_engine, process_release_images
+from core.image_generator import ImageAugmentationEngine, AugmentationResult, create_augmentation_engine, process_release_images
+from core.release_packager import (
+    StreamingReleaseZip, yolo_label_text, YOLO_EXPORT_FORMATS,
+    write_directory_to_zip, zip_compression_metadata
+)
+from core.release_journal import ReleaseJournal, JOURNAL_FILENAME, journal_fingerprint, has_journal, remove_stale_checkpoints
 from database.database import get_db
-from database.models import ImageTransformation, Release, Image, Dataset, Project
+from database.models import ImageTransformation, Release, Image, Dataset, Project, Annotation
 from sqlalchemy.orm import Session
 from typing import Union
 from core.annotation_transformer import BoundingBox, Polygon
+from core.coco_writer import write_coco
 # Import export system
 from api.routes.enhanced_export import ExportFormats, ExportRequest
 
@@ -34,6 +40,128 @@ from utils.path_utils import PathManager
 from database.operations import ImageOperations, AnnotationOperations
 # Initialize professional logger
 logger = get_professional_logger()
+
+
+def _segmentation_to_points(seg, image_id: str) -> List[Tuple[float, float]]:
+    """Parse a stored segmentation ([{x,y}] or [[x,y]], JSON text or list) into pixel points"""
+    # seg can be JSON text or a python list
+    if isinstance(seg, str):
+        try:
+            seg = json.loads(seg)
+        except Exception:
+            logger.warning("operations.annotations",
+                           "Segmentation JSON parse failed; skipping segmentation",
+                           "release_segmentation_json_parse_failed",
+                           {"image_id": image_id})
+            seg = []
+
+    pts = []
+    for pt in (seg or []):
+        if isinstance(pt, dict) and ("x" in pt and "y" in pt):
+            pts.append((float(pt["x"]), float(pt["y"])))
+        elif isinstance(pt, (list, tuple)) and len(pt) >= 2:
+            pts.append((float(pt[0]), float(pt[1])))
+    return pts
+
+
+# SQLite allows at most 999 bound parameters per statement on older builds
+ANNOTATION_PREFETCH_CHUNK = 500
+
+
+def _bulk_get_pixel_annotations_from_db(db, dataset_ids: List[str],
+                                        split_sections: Optional[List[str]] = None,
+                                        chunk_size: int = ANNOTATION_PREFETCH_CHUNK
+                                        ) -> Dict[str, List[Union[BoundingBox, Polygon]]]:
+    """
+    Prefetch pixel annotations for every dataset image of a release.
+
+    Same selection as ReleaseController.get_dataset_images and same conversion
+    rules as _get_pixel_annotations_from_db, but with chunked IN queries instead
+    of one round trip per image. Returns image_id -> [BoundingBox|Polygon].
+    """
+    rows = []
+    for start in range(0, len(dataset_ids), chunk_size):
+        chunk = dataset_ids[start:start + chunk_size]
+        query = db.query(
+            Annotation.image_id,
+            Annotation.class_name,
+            Annotation.class_id,
+            Annotation.confidence,
+            Annotation.x_min,
+            Annotation.y_min,
+            Annotation.x_max,
+            Annotation.y_max,
+            Annotation.segmentation,
+        ).join(Image, Image.id == Annotation.image_id).filter(
+            Image.dataset_id.in_(chunk),
+            Image.split_type == "dataset"
+        )
+        if split_sections:
+            query = query.filter(Image.split_section.in_(split_sections))
+        rows.extend(query.all())
+
+    out: Dict[str, List[Union[BoundingBox, Polygon]]] = {}
+    if not rows:
+        return out
+
+    image_ids, class_names, class_ids, confidences, x_min, y_min, x_max, y_max, segmentations = zip(*rows)
+
+    # Numeric columns in one pass; NULLs become NaN
+    boxes = np.array([x_min, y_min, x_max, y_max], dtype=float).T
+    box_valid = ~np.isnan(boxes).any(axis=1)
+    class_id_arr = np.nan_to_num(np.array(class_ids, dtype=float), nan=0.0).astype(int)
+    conf_arr = np.array(confidences, dtype=float)
+    # matches `float(confidence or 1.0)` of the per-image loader
+    conf_arr = np.where(np.isnan(conf_arr) | (conf_arr == 0), 1.0, conf_arr)
+
+    boxes_list = boxes.tolist()
+    class_id_list = class_id_arr.tolist()
+    conf_list = conf_arr.tolist()
+    skipped = 0
+
+    for i, image_id in enumerate(image_ids):
+        bucket = out.setdefault(image_id, [])
+        try:
+            if segmentations[i]:
+                pts = _segmentation_to_points(segmentations[i], image_id)
+                if len(pts) >= 3:
+                    bucket.append(Polygon(
+                        points=pts,
+                        class_name=class_names[i],
+                        class_id=class_id_list[i],
+                        confidence=conf_list[i],
+                    ))
+                    continue
+
+            if not box_valid[i]:
+                raise ValueError("bounding box has NULL coordinates")
+
+            bx0, by0, bx1, by1 = boxes_list[i]
+            bucket.append(BoundingBox(
+                x_min=bx0,
+                y_min=by0,
+                x_max=bx1,
+                y_max=by1,
+                class_name=class_names[i],
+                class_id=class_id_list[i],
+                confidence=conf_list[i],
+            ))
+        except Exception as ex:
+            skipped += 1
+            logger.warning("operations.annotations",
+                           f"Failed to convert annotation to pixel object: {ex}",
+                           "release_annotation_convert_failed",
+                           {"image_id": image_id})
+
+    logger.info("operations.annotations",
+                f"Prefetched {len(rows) - skipped} pixel annotations for {len(out)} images",
+                "release_annotations_prefetched",
+                {"dataset_ids": dataset_ids, "split_sections": split_sections,
+                 "annotation_count": len(rows) - skipped, "image_count": len(out),
+                 "skipped": skipped})
+    return out
+
+
 def _get_pixel_annotations_from_db(db, image_id: str) -> List[Union[BoundingBox, Polygon]]: 
     """ 
     Read annotations for an image in *pixels* and return engine-ready objects. 
@@ -55,24 +183,7 @@ def _get_pixel_annotations_from_db(db, image_id: str) -> List[Union[BoundingBox,
     for a in anns: 
         try: 
             if getattr(a, "segmentation", None): 
-                seg = a.segmentation 
-                # seg can be JSON text or a python list 
-                if isinstance(seg, str): 
-                    try: 
-                        seg = json.loads(seg) 
-                    except Exception: 
-                        logger.warning("operations.annotations", 
-                                       "Segmentation JSON parse failed; skipping segmentation", 
-                                       "release_segmentation_json_parse_failed", 
-                                       {"image_id": image_id}) 
-                        seg = [] 
-
-                pts = [] 
-                for pt in (seg or []): 
-                    if isinstance(pt, dict) and ("x" in pt and "y" in pt): 
-                        pts.append((float(pt["x"]), float(pt["y"]))) 
-                    elif isinstance(pt, (list, tuple)) and len(pt) >= 2: 
-                        pts.append((float(pt[0]), float(pt[1]))) 
+                pts = _segmentation_to_points(a.segmentation, image_id) 
 
                 if len(pts) >= 3: 
                     out.append( 
@@ -182,6 +293,13 @@ class ReleaseConfig:
     include_original: bool = True
     split_sections: List[str] = None  # train, val, test - if None, includes all
     preserve_original_splits: bool = True  # Always preserve original train/val/test assignments
+    max_workers: Optional[int] = None  # augmentation worker processes (None -> settings.RELEASE_MAX_WORKERS)
+    stream_package: Optional[bool] = None  # write straight into the ZIP (None -> settings.RELEASE_STREAM_PACKAGE)
+    resume_release_id: Optional[str] = None  # continue an interrupted release from its journal
+    pipeline: Optional[bool] = None  # concurrent decode/transform/encode stages (None -> settings.RELEASE_PIPELINE)
+    encode_preset: Optional[str] = None  # quality, balanced, fast (None -> settings.RELEASE_ENCODE_PRESET)
+    encoder_backend: Optional[str] = None  # pil, cv2 (None -> settings.RELEASE_ENCODER_BACKEND)
+    zip_compression: Optional[str] = None  # auto, deflate, store (None -> settings.RELEASE_ZIP_COMPRESSION)
 
 @dataclass
 class ReleaseProgress:
@@ -197,6 +315,8 @@ class ReleaseProgress:
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
+_RELEASE_PROGRESS: Dict[str, ReleaseProgress] = {}
+
 class ReleaseController:
     """
     Central controller for release generation pipeline
@@ -206,7 +326,8 @@ class ReleaseController:
     def __init__(self, db_session: Optional[Session] = None):
         self.db = db_session or next(get_db())
         self.augmentation_engine = None
-        self.release_progress: Dict[str, ReleaseProgress] = {}
+        # Shared by every controller so the progress endpoint sees background runs
+        self.release_progress: Dict[str, ReleaseProgress] = _RELEASE_PROGRESS
         
     # -----------------------------------------------------------
     # Utility: Calculate split-counts directly from DB
@@ -277,6 +398,54 @@ class ReleaseController:
             })
             raise
     
+    def _resume_or_create_release_record(self, config: ReleaseConfig) -> str:
+        """Reuse the record of the release being resumed, or create a new one"""
+        if config.resume_release_id:
+            release = self.db.query(Release).filter(Release.id == config.resume_release_id).first()
+            if release:
+                logger.info("operations.releases", f"Resuming release record: {release.id}", "release_record_resumed", {
+                    'release_id': release.id,
+                    'project_id': config.project_id
+                })
+                return release.id
+            logger.warning("errors.validation", f"Release to resume not found: {config.resume_release_id}", "release_resume_not_found", {
+                'release_id': config.resume_release_id,
+                'project_id': config.project_id
+            })
+        return self.create_release_record(config)
+
+    def _open_release_journal(self, output_dir: str, release_version: str, config: ReleaseConfig,
+                              transformation_records: List[Dict[str, Any]]) -> Optional[ReleaseJournal]:
+        """Open the completion journal kept next to the release's staging directory"""
+        fingerprint = journal_fingerprint({
+            "release_version": release_version,
+            "dataset_ids": sorted(config.dataset_ids),
+            "split_sections": sorted(config.split_sections or []),
+            "images_per_original": config.images_per_original,
+            "output_format": config.output_format,
+            "transformations": [
+                [t["transformation_type"], t["parameters"], t["order_index"]] for t in transformation_records
+            ],
+        })
+        journal_path = os.path.join(output_dir, JOURNAL_FILENAME)
+        try:
+            return ReleaseJournal(journal_path, fingerprint)
+        except Exception as e:
+            logger.warning("errors.system", f"Release journal unavailable, release will not be resumable: {e}", "release_journal_unavailable", {
+                'journal_path': journal_path,
+                'error': str(e)
+            })
+            return None
+
+    def _load_resumable_images(self, journal: ReleaseJournal) -> Dict[str, dict]:
+        """Journal entries whose outputs are all still on disk, keyed by source image id"""
+        resumable = {}
+        for image_key, entry in journal.completed().items():
+            results = entry.get("results") or []
+            if all(os.path.exists(r.get("output_path", "")) for r in results):
+                resumable[image_key] = entry
+        return resumable
+
     def load_pending_transformations(self, release_version: str) -> List[Dict[str, Any]]:
         """Load pending transformations from database for release generation"""
         try:
@@ -495,6 +664,8 @@ class ReleaseController:
         from typing import Dict, List
 
         release_id = None
+        package_writer: Optional[StreamingReleaseZip] = None
+        journal: Optional[ReleaseJournal] = None
 
         # --- helper: serialize engine result objects to plain dicts for exporter ---
         def _serialize_aug_result(r, split_section: str, source_dataset: str) -> dict:
@@ -538,8 +709,8 @@ class ReleaseController:
             }
 
         try:
-            # Create release record
-            release_id = self.create_release_record(config)
+            # Create release record (or pick up the interrupted one being resumed)
+            release_id = self._resume_or_create_release_record(config)
 
             # Initialize progress tracking
             self.update_release_progress(
@@ -584,7 +755,34 @@ class ReleaseController:
             project = self.db.query(Project).filter(Project.id == config.project_id).first()
             project_name = project.name if project else f"project_{config.project_id}"
             output_dir = os.path.join("projects", project_name, "releases", release_id)
-            self.augmentation_engine = create_augmentation_engine(output_dir)
+            remove_stale_checkpoints(os.path.dirname(output_dir))
+
+            # Streaming mode reads sources in place and encodes each image once, straight into the ZIP
+            stream_package = config.stream_package
+            if stream_package is None:
+                from core.config import settings
+                stream_package = settings.RELEASE_STREAM_PACKAGE
+            self.augmentation_engine = create_augmentation_engine(
+                output_dir, in_memory=stream_package,
+                encode_preset=config.encode_preset, encoder_backend=config.encoder_backend
+            )
+
+            # Pipeline mode overlaps decoding, transforming, encoding and packaging and reads
+            # sources in place instead of copying every image into staging up front
+            use_pipeline = config.pipeline
+            if use_pipeline is None:
+                from core.config import settings
+                use_pipeline = settings.RELEASE_PIPELINE
+            read_in_place = stream_package or use_pipeline
+
+            # Per-image journal: images finished by an interrupted run of this release are skipped.
+            # A streamed archive cannot be reopened after a crash, so streaming runs start over.
+            resumable: Dict[str, dict] = {}
+            if not stream_package:
+                journal = self._open_release_journal(output_dir, release_version, config, transformation_records)
+                if journal is not None:
+                    resumable = self._load_resumable_images(journal)
+            resumed_by_path: Dict[str, List[dict]] = {}
 
             # Prepare image paths and dataset splits with multi-dataset support
             image_paths: List[str] = []
@@ -596,7 +794,8 @@ class ReleaseController:
 
             # Create staging directory for copied images
             staging_dir = f"{output_dir}/staging"
-            os.makedirs(staging_dir, exist_ok=True)
+            if not read_in_place:
+                os.makedirs(staging_dir, exist_ok=True)
 
             logger.info(
                 "operations.releases",
@@ -609,6 +808,11 @@ class ReleaseController:
                 }
             )
 
+            # One chunked query for every image's annotations instead of one per image
+            annotations_by_image = _bulk_get_pixel_annotations_from_db(
+                self.db, config.dataset_ids, config.split_sections
+            )
+
             for img_record in image_records:
                 # DB identity of the original image
                 source_image_id = img_record["id"]
@@ -634,8 +838,15 @@ class ReleaseController:
                 unique_filename = f"{dataset_name}_{original_filename}"
 
                 # Copy / convert into staging
+                resumed_entry = resumable.get(str(source_image_id))
                 try:
-                    if config.output_format.lower() == "original":
+                    if resumed_entry is not None:
+                        # Finished in an earlier run: its outputs are already on disk
+                        staging_path = resumed_entry["staging_path"]
+                    elif read_in_place:
+                        # No staging copy: the engine decodes the dataset file directly
+                        staging_path = source_path
+                    elif config.output_format.lower() == "original":
                         staging_path = os.path.join(staging_dir, unique_filename)
                         shutil.copy2(source_path, staging_path)
                         logger.info(
@@ -707,10 +918,13 @@ class ReleaseController:
                         "source_path": img_record["source_path"],
                         "original_filename": original_filename,   # for deriving stem if needed
                         "source_image_id": source_image_id,       # DB image id for lookups
+                        "output_filename": unique_filename,       # dataset-prefixed name for outputs
                     }
+                    if resumed_entry is not None:
+                        resumed_by_path[staging_path] = resumed_entry["results"]
 
-                    # Fetch pixel annotations by DB id and map under multiple keys
-                    anns_px = _get_pixel_annotations_from_db(self.db, source_image_id)
+                    # Pixel annotations (prefetched) by DB id, mapped under multiple keys
+                    anns_px = annotations_by_image.get(source_image_id, [])
 
                     # map by the exact path we’ll send to the engine
                     annotations_map[staging_path] = anns_px
@@ -771,20 +985,96 @@ class ReleaseController:
                     }
                 )
 
+            # Streaming mode: open the archive now and fill it as images finish
+            serialized_by_path: Dict[str, List[dict]] = {}
+            deferred_labels: List[Tuple[str, str, List[Union[BoundingBox, Polygon]], Tuple[int, int]]] = []
+            label_format = config.export_format if config.export_format in YOLO_EXPORT_FORMATS else None
+            if stream_package:
+                package_writer = StreamingReleaseZip(
+                    os.path.join(os.path.dirname(os.path.dirname(__file__)), "projects",
+                                 project_name, "releases", f".{release_id}.zip.part"),
+                    compression_policy=config.zip_compression
+                )
+
+            def _stream_image_results(img_path: str, results: List[AugmentationResult]) -> None:
+                split = dataset_splits.get(img_path, "train")
+                src_ds = (dataset_sources.get(img_path) or {}).get("dataset_name", "unknown")
+                self._stream_results_to_package(package_writer, results, split, label_format)
+                if not label_format:
+                    # Export format is picked after generation ("auto"); labels follow then
+                    deferred_labels.extend(
+                        (split, r.augmented_image_path, r.updated_annotations, r.augmented_dimensions)
+                        for r in results
+                    )
+                serialized_by_path[img_path] = [_serialize_aug_result(r, split, src_ds) for r in results]
+
+            def _journal_image_results(img_path: str, results: List[AugmentationResult]) -> None:
+                split = dataset_splits.get(img_path, "train")
+                source = dataset_sources.get(img_path) or {}
+                serialized = [_serialize_aug_result(r, split, source.get("dataset_name", "unknown")) for r in results]
+                serialized_by_path[img_path] = serialized
+                journal.record(str(source.get("source_image_id")), {
+                    "staging_path": img_path,
+                    "results": serialized
+                })
+
+            if stream_package:
+                result_callback = _stream_image_results
+            elif journal is not None:
+                result_callback = _journal_image_results
+            else:
+                result_callback = None
+
+            pending_paths = [p for p in image_paths if p not in resumed_by_path]
+            resumed_generated = sum(len(results) for results in resumed_by_path.values())
+            if resumed_by_path:
+                logger.info("operations.releases", f"Resuming release {release_id}: {len(resumed_by_path)} images already finished", "release_resumed", {
+                    'release_id': release_id,
+                    'finished_images': len(resumed_by_path),
+                    'finished_outputs': resumed_generated,
+                    'remaining_images': len(pending_paths)
+                })
+                self.update_release_progress(
+                    release_id,
+                    processed_images=len(resumed_by_path),
+                    generated_images=resumed_generated
+                )
+
             # Process all images with multi-dataset support (pass annotations_map)
             all_results = process_release_images(
-                image_paths=image_paths,
+                image_paths=pending_paths,
                 transformation_configs=transformation_configs,
                 dataset_splits=dataset_splits,
                 output_dir=output_dir,
                 output_format=config.output_format,
                 dataset_sources=dataset_sources,
-                annotations_map=annotations_map    # labels travel with the same affine
+                annotations_map=annotations_map,   # labels travel with the same affine
+                max_workers=config.max_workers,
+                progress_callback=lambda done, _total, generated: self.update_release_progress(
+                    release_id,
+                    processed_images=len(resumed_by_path) + done,
+                    generated_images=resumed_generated + generated
+                ),
+                in_memory=stream_package,
+                result_callback=result_callback,
+                pipeline=use_pipeline,
+                encode_preset=config.encode_preset,
+                encoder_backend=config.encoder_backend
             )
 
-            # Convert AugmentationResult objects -> plain dicts for exporter
+            # Convert AugmentationResult objects -> plain dicts for exporter (journaled images included)
+            all_results = all_results or {}
             serialized_results: Dict[str, List[dict]] = {}
-            for img_path, results in (all_results or {}).items():
+            for img_path in image_paths:
+                if img_path in resumed_by_path:
+                    serialized_results[img_path] = resumed_by_path[img_path]
+                    continue
+                if img_path not in all_results:
+                    continue
+                if img_path in serialized_by_path:
+                    serialized_results[img_path] = serialized_by_path[img_path]
+                    continue
+                results = all_results[img_path]
                 split = dataset_splits.get(img_path, "train")
                 src_ds = (dataset_sources.get(img_path) or {}).get("dataset_name", "unknown")
                 serialized_results[img_path] = [
@@ -833,12 +1123,15 @@ class ReleaseController:
             )
 
             # Generate export files with transformed annotations
-            export_path = self._generate_export_files(
-                release_id,
-                all_results,
-                optimal_export_format,
-                getattr(config, 'task_type', 'object_detection')
-            )
+            # (streaming mode packages everything in the ZIP only - no loose export copy)
+            export_path = None
+            if not stream_package:
+                export_path = self._generate_export_files(
+                    release_id,
+                    all_results,
+                    optimal_export_format,
+                    getattr(config, 'task_type', 'object_detection')
+                )
 
             # Update progress
             self.update_release_progress(
@@ -850,12 +1143,23 @@ class ReleaseController:
             # Create comprehensive ZIP package with organized structure
             try:
                 config.export_format = optimal_export_format
-                zip_path = self.create_zip_package(
-                    release_id,
-                    all_results,
-                    config,
-                    transformation_records
-                )
+                if stream_package:
+                    zip_path = self._finalize_streaming_package(
+                        package_writer,
+                        release_id,
+                        all_results,
+                        config,
+                        transformation_records,
+                        deferred_labels
+                    )
+                    package_writer = None
+                else:
+                    zip_path = self.create_zip_package(
+                        release_id,
+                        all_results,
+                        config,
+                        transformation_records
+                    )
 
                 # Update release with ZIP path
                 if release and zip_path:
@@ -892,8 +1196,19 @@ class ReleaseController:
                     release.task_type = getattr(config, 'task_type', 'object_detection')
                     self.db.commit()
 
+            # A streamed archive that could not be finalized is not kept half-written
+            if package_writer is not None:
+                package_writer.abort()
+                package_writer = None
+
             # Cleanup staging directory (images were copied, not moved)
-            self._cleanup_staging_directory(staging_dir)
+            if not read_in_place:
+                self._cleanup_staging_directory(staging_dir)
+
+            # Release is packaged - nothing left to resume
+            if journal is not None:
+                journal.discard()
+                journal = None
 
             # Update final progress
             self.update_release_progress(
@@ -933,7 +1248,21 @@ class ReleaseController:
                 'release_id': release_id
             })
 
+            if package_writer is not None:
+                package_writer.abort()
+
+            # Keep the journal and outputs so the release can be resumed
+            if journal is not None:
+                logger.info("operations.releases", f"Release {release_id} checkpoint kept: {journal.count()} images finished", "release_checkpoint_kept", {
+                    'release_id': release_id,
+                    'journal_path': journal.path,
+                    'finished_images': journal.count()
+                })
+                journal.close()
+
             if release_id:
+                # Drops the partial output unless it holds a resumable journal
+                self.cleanup_failed_release(release_id, config.project_id)
                 self.update_release_progress(
                     release_id,
                     status="failed",
@@ -1198,12 +1527,11 @@ class ReleaseController:
                         f.write(content)
                         
             elif export_request.format == 'coco':
-                coco_data = ExportFormats.export_coco(export_request)
-                
-                # Write COCO JSON
+                # Write COCO JSON row by row (same bytes as json.dump of export_coco, indent=2)
                 coco_path = os.path.join(export_dir, 'annotations.json')
                 with open(coco_path, 'w') as f:
-                    json.dump(coco_data, f, indent=2)
+                    write_coco(f, ExportFormats.coco_fields(export_request.dataset_name),
+                               ExportFormats.coco_sections(export_request), indent=2)
                     
             elif export_request.format == 'pascal_voc':
                 xml_files = ExportFormats.export_pascal_voc(export_request)
@@ -1257,6 +1585,156 @@ class ReleaseController:
                 shutil.rmtree(temp_dir)
             raise e
             
+    def _new_package_stats(self) -> Dict[str, Any]:
+        """Empty dataset statistics for a release package"""
+        return {
+            "total_images": 0,
+            "split_counts": {"train": 0, "val": 0, "test": 0},
+            "class_distribution": {},
+            "original_images": 0,
+            "augmented_images": 0,
+            "dataset_distribution": {}
+        }
+
+    def _record_package_entry(self, dataset_stats: Dict[str, Any], transformation_log: Dict[str, Any],
+                              original_image: str, result: Dict[str, Any]) -> None:
+        """Account one packaged image in the dataset stats and transformation log"""
+        output_filename = result.get('output_filename', '')
+        split_section = result.get('split_section', 'train')
+        is_original = result.get('is_original', False)
+        source_dataset = result.get('source_dataset', 'unknown')
+
+        dataset_stats["total_images"] += 1
+        dataset_stats["split_counts"][split_section] = dataset_stats["split_counts"].get(split_section, 0) + 1
+
+        if is_original:
+            dataset_stats["original_images"] += 1
+        else:
+            dataset_stats["augmented_images"] += 1
+
+        distribution = dataset_stats["dataset_distribution"]
+        distribution[source_dataset] = distribution.get(source_dataset, 0) + 1
+
+        for ann in result.get('annotations') or []:
+            class_name = ann.get('class_name', 'unknown')
+            class_distribution = dataset_stats["class_distribution"]
+            class_distribution[class_name] = class_distribution.get(class_name, 0) + 1
+
+        if not is_original:
+            transformation_log[output_filename] = {
+                "source_image": original_image,
+                "transformations": result.get('transformations_applied', [])
+            }
+
+    def _persist_package_counts(self, release: Release, release_id: str, config: ReleaseConfig,
+                                dataset_stats: Dict[str, Any]) -> None:
+        """Persist split counts and class count of a package to the release record"""
+        try:
+            # Fallback to user-defined split_counts in the original configuration when
+            # automatic counting produced zeros (e.g. when images are not physically split yet).
+            train_count = dataset_stats["split_counts"].get("train", 0)
+            val_count = dataset_stats["split_counts"].get("val", 0)
+            test_count = dataset_stats["split_counts"].get("test", 0)
+            if train_count == 0 and hasattr(config, "split_counts"):
+                train_count = config.split_counts.get("train", 0)
+            if val_count == 0 and hasattr(config, "split_counts"):
+                val_count = config.split_counts.get("val", 0)
+            if test_count == 0 and hasattr(config, "split_counts"):
+                test_count = config.split_counts.get("test", 0)
+
+            release.train_image_count = train_count
+            release.val_image_count = val_count
+            release.test_image_count = test_count
+            release.class_count = len(dataset_stats["class_distribution"])
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.warning("errors.system", f"Could not update split/class counts for release {release_id}: {str(e)}", "release_counts_update_failed", {
+                'release_id': release_id,
+                'error': str(e)
+            })
+
+    def _build_release_config_metadata(self, release: Release, release_id: str, config: ReleaseConfig,
+                                       dataset_stats: Dict[str, Any],
+                                       transformation_records: List[Dict]) -> Dict[str, Any]:
+        """Contents of metadata/release_config.json"""
+        transformations_summary = [
+            {
+                "tool": rec.get("transformation_type", "unknown"),
+                "params": rec.get("parameters", {})
+            }
+            for rec in transformation_records
+        ]
+        return {
+            "release_version": release.name,
+            "release_id": release_id,
+            "release_date": datetime.utcnow().isoformat(),
+            "description": release.description,
+            "export_format": config.export_format,
+            "task_type": config.task_type,
+            "image_format": config.output_format,
+            "images_per_original": config.images_per_original,
+            "include_original": config.include_original,
+            "sampling_strategy": config.sampling_strategy,
+            "preserve_original_splits": config.preserve_original_splits,
+            "classes": sorted(dataset_stats["class_distribution"].keys()),
+            "dataset_stats": dataset_stats,
+            "transformations": transformations_summary,
+            "source_datasets": config.dataset_ids,
+            "zip_compression": zip_compression_metadata(config.zip_compression)
+        }
+
+    def _build_release_readme(self, release: Release, release_id: str, config: ReleaseConfig,
+                              dataset_stats: Dict[str, Any], transformation_records: List[Dict]) -> str:
+        """Contents of README.md for a release package"""
+        return f"""# Release: {release.name}
+
+## Overview
+- **Release ID:** {release_id}
+- **Created:** {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')}
+- **Description:** {release.description}
+- **Export Format:** {config.export_format}
+- **Task Type:** {config.task_type}
+
+## Dataset Statistics
+- **Total Images:** {dataset_stats["total_images"]}
+- **Original Images:** {dataset_stats["original_images"]}
+- **Augmented Images:** {dataset_stats["augmented_images"]}
+
+### Split Distribution
+- **Train:** {dataset_stats["split_counts"]["train"]} images
+- **Validation:** {dataset_stats["split_counts"]["val"]} images
+- **Test:** {dataset_stats["split_counts"]["test"]} images
+
+### Source Datasets
+{chr(10).join([f"- {dataset_id}" for dataset_id in config.dataset_ids])}
+
+## Transformations Applied
+{chr(10).join([f"- {t['transformation_type']}" for t in transformation_records])}
+
+## Directory Structure
+- `images/` - Contains all images organized by split (train/val/test)
+- `labels/` - Contains all annotation files organized by split
+- `metadata/` - Contains configuration and statistics files
+
+## Metadata Files
+- `release_config.json` - Build information, classes array, dataset stats, transformations
+- `annotations.json` - Ready-to-draw shapes with class IDs
+"""
+
+    def _release_zip_path(self, release: Release, config: ReleaseConfig) -> str:
+        """Absolute path of the release ZIP inside the project's releases folder"""
+        project = self.db.query(Project).filter(Project.id == config.project_id).first()
+        project_name = project.name if project else f"project_{config.project_id}"
+
+        # Use absolute path to projects directory (one level up from backend)
+        projects_root = os.path.join(os.path.dirname(os.path.dirname(__file__)), "projects")
+        releases_dir = os.path.join(projects_root, project_name, "releases")
+        os.makedirs(releases_dir, exist_ok=True)
+
+        zip_filename = f"{release.name.replace(' ', '_')}_{config.export_format}.zip"
+        return os.path.join(releases_dir, zip_filename)
+
     def create_zip_package(self, release_id: str, generation_results: Dict[str, List[Dict]], 
                           config: ReleaseConfig, transformation_records: List[Dict]) -> str:
         """
@@ -1286,6 +1764,7 @@ class ReleaseController:
         Returns:
             Path to the generated ZIP file
         """
+        zip_path = None
         try:
             logger.info("operations.releases", f"Creating ZIP package for release {release_id}", "zip_package_creation_start", {
                 'release_id': release_id
@@ -1312,15 +1791,7 @@ class ReleaseController:
             os.makedirs(metadata_dir, exist_ok=True)
             
             # Organize images and labels by split
-            dataset_stats = {
-                "total_images": 0,
-                "split_counts": {"train": 0, "val": 0, "test": 0},
-                "class_distribution": {},
-                "original_images": 0,
-                "augmented_images": 0,
-                "dataset_distribution": {}
-            }
-            
+            dataset_stats = self._new_package_stats()
             transformation_log = {}
             
             # Process all images and organize by split
@@ -1330,8 +1801,6 @@ class ReleaseController:
                     output_filename = result.get('output_filename', '')
                     output_path = result.get('output_path', '')
                     split_section = result.get('split_section', 'train')  # Default to train if not specified
-                    is_original = result.get('is_original', False)
-                    source_dataset = result.get('source_dataset', 'unknown')
                     
                     # Skip if output path doesn't exist
                     if not output_path or not os.path.exists(output_path):
@@ -1345,19 +1814,8 @@ class ReleaseController:
                     dst_image_path = os.path.join(images_dir, split_section, output_filename)
                     shutil.copy2(output_path, dst_image_path)
                     
-                    # Update dataset stats
-                    dataset_stats["total_images"] += 1
-                    dataset_stats["split_counts"][split_section] += 1
-                    
-                    if is_original:
-                        dataset_stats["original_images"] += 1
-                    else:
-                        dataset_stats["augmented_images"] += 1
-                    
-                    # Update dataset distribution
-                    if source_dataset not in dataset_stats["dataset_distribution"]:
-                        dataset_stats["dataset_distribution"][source_dataset] = 0
-                    dataset_stats["dataset_distribution"][source_dataset] += 1
+                    # Update dataset stats, class distribution and transformation log
+                    self._record_package_entry(dataset_stats, transformation_log, original_image, result)
                     
                     # Process annotations if available
                     if 'annotations' in result and result['annotations']:
@@ -1370,78 +1828,14 @@ class ReleaseController:
                             if os.path.exists(src_label_path):
                                 dst_label_path = os.path.join(labels_dir, split_section, label_filename)
                                 shutil.copy2(src_label_path, dst_label_path)
-                        
-                        # Update class distribution
-                        for ann in result['annotations']:
-                            class_name = ann.get('class_name', 'unknown')
-                            if class_name not in dataset_stats["class_distribution"]:
-                                dataset_stats["class_distribution"][class_name] = 0
-                            dataset_stats["class_distribution"][class_name] += 1
-                    
-                    # Record transformation log
-                    if not is_original:
-                        transformations_applied = result.get('transformations_applied', [])
-                        transformation_log[output_filename] = {
-                            "source_image": original_image,
-                            "transformations": transformations_applied
-                        }
 
             # --- NEW: Persist split counts and class count to release record ---
-            try:
-                # Fallback to user-defined split_counts in the original configuration when
-                # automatic counting produced zeros (e.g. when images are not physically split yet).
-                train_count = dataset_stats["split_counts"].get("train", 0)
-                val_count = dataset_stats["split_counts"].get("val", 0)
-                test_count = dataset_stats["split_counts"].get("test", 0)
-                if train_count == 0 and hasattr(config, "split_counts"):
-                    train_count = config.split_counts.get("train", 0)
-                if val_count == 0 and hasattr(config, "split_counts"):
-                    val_count = config.split_counts.get("val", 0)
-                if test_count == 0 and hasattr(config, "split_counts"):
-                    test_count = config.split_counts.get("test", 0)
-
-                release.train_image_count = train_count
-                release.val_image_count = val_count
-                release.test_image_count = test_count
-                release.class_count = len(dataset_stats["class_distribution"])
-                self.db.commit()
-            except Exception as e:
-                self.db.rollback()
-                logger.warning("errors.system", f"Could not update split/class counts for release {release_id}: {str(e)}", "release_counts_update_failed", {
-                    'release_id': release_id,
-                    'error': str(e)
-                })
+            self._persist_package_counts(release, release_id, config, dataset_stats)
             
             # Generate metadata files (two-file schema)
-            
-            # Build classes array and transformation summary
-            classes = sorted(dataset_stats["class_distribution"].keys())
-            transformations_summary = [
-                {
-                    "tool": rec.get("transformation_type", "unknown"),
-                    "params": rec.get("parameters", {})
-                }
-                for rec in transformation_records
-            ]
-            
-            # Prepare release configuration dictionary
-            release_config = {
-                "release_version": release.name,
-                "release_id": release_id,
-                "release_date": datetime.utcnow().isoformat(),
-                "description": release.description,
-                "export_format": config.export_format,
-                "task_type": config.task_type,
-                "image_format": config.output_format,
-                "images_per_original": config.images_per_original,
-                "include_original": config.include_original,
-                "sampling_strategy": config.sampling_strategy,
-                "preserve_original_splits": config.preserve_original_splits,
-                "classes": classes,
-                "dataset_stats": dataset_stats,
-                "transformations": transformations_summary,
-                "source_datasets": config.dataset_ids
-            }
+            release_config = self._build_release_config_metadata(
+                release, release_id, config, dataset_stats, transformation_records
+            )
             
             # Write release_config.json
             with open(os.path.join(metadata_dir, "release_config.json"), "w") as f:
@@ -1451,84 +1845,21 @@ class ReleaseController:
             annotations_data = self._prepare_export_data(generation_results, config.task_type)
             with open(os.path.join(metadata_dir, "annotations.json"), "w") as f:
                 json.dump(annotations_data, f, indent=4)
-            release_config = {
-                "release_version": release.name,
-                "release_id": release_id,
-                "release_date": datetime.utcnow().isoformat(),
-                "description": release.description,
-                "export_format": config.export_format,
-                "task_type": config.task_type,
-                "image_format": config.output_format,
-                "images_per_original": config.images_per_original,
-                "include_original": config.include_original,
-                "sampling_strategy": config.sampling_strategy,
-                "preserve_original_splits": config.preserve_original_splits,
-                "source_datasets": config.dataset_ids
-            }
             
             # Legacy aggregated metadata generation removed
             
-            
-            # 4. README.md
-            readme_content = f"""# Release: {release.name}
-
-## Overview
-- **Release ID:** {release_id}
-- **Created:** {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')}
-- **Description:** {release.description}
-- **Export Format:** {config.export_format}
-- **Task Type:** {config.task_type}
-
-## Dataset Statistics
-- **Total Images:** {dataset_stats["total_images"]}
-- **Original Images:** {dataset_stats["original_images"]}
-- **Augmented Images:** {dataset_stats["augmented_images"]}
-
-### Split Distribution
-- **Train:** {dataset_stats["split_counts"]["train"]} images
-- **Validation:** {dataset_stats["split_counts"]["val"]} images
-- **Test:** {dataset_stats["split_counts"]["test"]} images
-
-### Source Datasets
-{chr(10).join([f"- {dataset_id}" for dataset_id in config.dataset_ids])}
-
-## Transformations Applied
-{chr(10).join([f"- {t['transformation_type']}" for t in transformation_records])}
-
-## Directory Structure
-- `images/` - Contains all images organized by split (train/val/test)
-- `labels/` - Contains all annotation files organized by split
-- `metadata/` - Contains configuration and statistics files
-
-## Metadata Files
-- `release_config.json` - Build information, classes array, dataset stats, transformations
-- `annotations.json` - Ready-to-draw shapes with class IDs
-"""
-            
+            # README.md
+            readme_content = self._build_release_readme(
+                release, release_id, config, dataset_stats, transformation_records
+            )
             with open(os.path.join(temp_dir, "README.md"), 'w') as f:
                 f.write(readme_content)
             
             # Create ZIP file in project-specific folder
-            # Get project name for folder structure
-            project = self.db.query(Project).filter(Project.id == config.project_id).first()
-            project_name = project.name if project else f"project_{config.project_id}"
+            zip_path = self._release_zip_path(release, config)
             
-            # Create project-specific releases directory
-            # Use absolute path to projects directory (one level up from backend)
-            projects_root = os.path.join(os.path.dirname(os.path.dirname(__file__)), "projects")
-            releases_dir = os.path.join(projects_root, project_name, "releases")
-            os.makedirs(releases_dir, exist_ok=True)
-            
-            zip_filename = f"{release.name.replace(' ', '_')}_{config.export_format}.zip"
-            zip_path = os.path.join(releases_dir, zip_filename)
-            
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Add all files from temp directory to ZIP
-                for root, _, files in os.walk(temp_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, temp_dir)
-                        zipf.write(file_path, arcname)
+            # Add all files from temp directory to ZIP (images stored, text deflated)
+            write_directory_to_zip(temp_dir, zip_path, policy=config.zip_compression)
             
             # Clean up temp directory
             shutil.rmtree(temp_dir)
@@ -1546,6 +1877,61 @@ class ReleaseController:
                 'zip_path': zip_path
             })
             raise e
+
+    def _stream_results_to_package(self, writer: StreamingReleaseZip, results: List[AugmentationResult],
+                                   split_section: str, label_format: Optional[str]) -> None:
+        """Write encoded images (and YOLO labels when the format is known) of one source image"""
+        for r in results:
+            arc_image = f"images/{split_section}/{Path(r.augmented_image_path).name}"
+            if r.encoded_image is not None:
+                writer.write_bytes(arc_image, r.encoded_image)
+                # Drop the pixels as soon as they are in the archive
+                r.encoded_image = None
+            r.augmented_image_path = arc_image
+            if label_format:
+                self._write_package_label(writer, split_section, arc_image, r.updated_annotations,
+                                          r.augmented_dimensions, label_format)
+
+    def _write_package_label(self, writer: StreamingReleaseZip, split_section: str, arc_image: str,
+                             annotations: List[Union[BoundingBox, Polygon]],
+                             dims: Tuple[int, int], label_format: str) -> None:
+        """Write labels/<split>/<stem>.txt for one packaged image"""
+        label_text = yolo_label_text(annotations or [], dims[0], dims[1], label_format)
+        if label_text:
+            writer.write_text(f"labels/{split_section}/{Path(arc_image).stem}.txt", label_text)
+
+    def _finalize_streaming_package(self, writer: StreamingReleaseZip, release_id: str,
+                                    generation_results: Dict[str, List[Dict]], config: ReleaseConfig,
+                                    transformation_records: List[Dict],
+                                    deferred_labels: List[Tuple[str, str, List[Union[BoundingBox, Polygon]], Tuple[int, int]]]
+                                    ) -> str:
+        """Write labels still pending, metadata and README, then move the streamed ZIP into place"""
+        release = self.db.query(Release).filter(Release.id == release_id).first()
+        if not release:
+            raise ValueError(f"Release {release_id} not found in database")
+
+        if config.export_format in YOLO_EXPORT_FORMATS:
+            for split_section, arc_image, annotations, dims in deferred_labels:
+                self._write_package_label(writer, split_section, arc_image, annotations, dims, config.export_format)
+
+        dataset_stats = self._new_package_stats()
+        transformation_log = {}
+        for original_image, results in generation_results.items():
+            for result in results:
+                self._record_package_entry(dataset_stats, transformation_log, original_image, result)
+
+        self._persist_package_counts(release, release_id, config, dataset_stats)
+
+        writer.write_json("metadata/release_config.json", self._build_release_config_metadata(
+            release, release_id, config, dataset_stats, transformation_records
+        ))
+        writer.write_json("metadata/annotations.json",
+                          self._prepare_export_data(generation_results, config.task_type))
+        writer.write_text("README.md", self._build_release_readme(
+            release, release_id, config, dataset_stats, transformation_records
+        ))
+
+        return writer.finalize(self._release_zip_path(release, config))
     
     def get_release_progress(self, release_id: str) -> Optional[ReleaseProgress]:
         """Get current progress for a release"""
@@ -1587,8 +1973,13 @@ class ReleaseController:
             })
             return []
     
-    def cleanup_failed_release(self, release_id: str, project_id: int = None) -> None:
-        """Clean up resources for a failed release"""
+    def cleanup_failed_release(self, release_id: str, project_id: int = None, keep_checkpoint: bool = True) -> None:
+        """
+        Clean up resources for a failed release
+
+        A release that left a completion journal is kept on disk (so it can be resumed
+        with resume_release_id) unless keep_checkpoint is False.
+        """
         try:
             # Remove output directory if it exists - use project-specific path
             if project_id:
@@ -1599,7 +1990,13 @@ class ReleaseController:
                 # Fallback to old path for backward compatibility
                 output_dir = Path(f"backend/releases/{release_id}")
             
-            if output_dir.exists():
+            if keep_checkpoint and has_journal(str(output_dir)):
+                logger.info("operations.releases", f"Keeping resumable output of failed release: {release_id}", "failed_release_checkpoint_kept", {
+                    'release_id': release_id,
+                    'project_id': project_id,
+                    'output_dir': str(output_dir)
+                })
+            elif output_dir.exists():
                 import shutil
                 shutil.rmtree(output_dir)
                 logger.info("operations.releases", f"Cleaned up output directory for failed release: {release_id}", "failed_release_cleanup", {
@@ -1803,15 +2200,8 @@ class ReleaseController:
                         }
                     }, f, indent=2)
                 
-                # Create the ZIP file
-                with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
-                    # Add all files from the temp directory
-                    for root, _, files in os.walk(temp_dir):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            # Get the relative path for the ZIP file
-                            rel_path = os.path.relpath(file_path, temp_dir)
-                            zf.write(file_path, rel_path)
+                # Create the ZIP file from everything in the temp directory
+                write_directory_to_zip(temp_dir, zip_path)
             
             logger.info("operations.releases", f"Successfully created ZIP file at {zip_path}", "minimal_zip_created", {
                 'zip_path': zip_path,
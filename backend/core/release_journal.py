@@ -0,0 +1,133 @@
+"""
+Release completion journal
+Per-image checkpoint log kept next to a release's staging directory so an interrupted
+release can be resumed: finished images are skipped and only the rest are processed.
+"""
+
+import os
+import json
+import time
+import shutil
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+
+# Import professional logging system - CORRECT UNIFORM PATTERN
+from logging_system.professional_logger import get_professional_logger
+
+# Initialize professional logger
+logger = get_professional_logger()
+
+JOURNAL_FILENAME = "release_journal.sqlite"
+
+
+def journal_fingerprint(settings: Dict[str, Any]) -> str:
+    """Stable hash of everything that decides a release's outputs"""
+    return hashlib.sha256(
+        json.dumps(settings, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+class ReleaseJournal:
+    """
+    SQLite journal of completed images for one release run.
+
+    Each finished image is committed as its own row, so a crash loses at most the
+    images that were in flight. The journal remembers the fingerprint of the run
+    that wrote it; opening it with a different fingerprint (datasets, transformations
+    or output settings changed) starts over with an empty journal.
+    """
+
+    def __init__(self, path: str, fingerprint: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS completed_images ("
+            "image_key TEXT PRIMARY KEY, payload TEXT NOT NULL, completed_at REAL NOT NULL)"
+        )
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        if row is not None and row[0] != fingerprint:
+            logger.info("operations.releases", "Release settings changed, starting a fresh journal", "release_journal_reset", {
+                'journal_path': path
+            })
+            self._conn.execute("DELETE FROM completed_images")
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)", (fingerprint,))
+        self._conn.commit()
+
+    def completed(self) -> Dict[str, Any]:
+        """All finished images as image_key -> recorded payload"""
+        with self._lock:
+            rows = self._conn.execute("SELECT image_key, payload FROM completed_images").fetchall()
+        return {key: json.loads(payload) for key, payload in rows}
+
+    def record(self, image_key: str, payload: Any) -> None:
+        """Mark one image as finished (durable once this returns)"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completed_images (image_key, payload, completed_at) VALUES (?, ?, ?)",
+                (image_key, json.dumps(payload, default=str), time.time())
+            )
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM completed_images").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+
+    def discard(self) -> None:
+        """Close and delete the journal once the release has been packaged"""
+        self.close()
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(self.path + suffix)
+            except OSError:
+                pass
+
+
+def has_journal(directory: str) -> bool:
+    """True when `directory` holds a resumable release checkpoint"""
+    return os.path.exists(os.path.join(directory, JOURNAL_FILENAME))
+
+
+def remove_stale_checkpoints(releases_dir: str, max_age_hours: Optional[float] = None) -> List[str]:
+    """
+    Delete checkpoints (directories directly below `releases_dir` holding a journal) that
+    have not been written for max_age_hours (None -> settings.RELEASE_CHECKPOINT_MAX_AGE_HOURS,
+    0 keeps them forever). Returns the removed directories.
+    """
+    if max_age_hours is None:
+        from core.config import settings
+        max_age_hours = settings.RELEASE_CHECKPOINT_MAX_AGE_HOURS
+    if not max_age_hours or max_age_hours <= 0 or not os.path.isdir(releases_dir):
+        return []
+    cutoff = time.time() - max_age_hours * 3600
+    removed = []
+    for entry in os.scandir(releases_dir):
+        if not entry.is_dir() or not has_journal(entry.path):
+            continue
+        journal_path = os.path.join(entry.path, JOURNAL_FILENAME)
+        # Recent records may only be in the WAL file
+        last_write = max(os.path.getmtime(path) for path in (journal_path, journal_path + "-wal") if os.path.exists(path))
+        if last_write >= cutoff:
+            continue
+        shutil.rmtree(entry.path, ignore_errors=True)
+        removed.append(entry.path)
+    if removed:
+        logger.info("operations.releases", f"Removed {len(removed)} abandoned release checkpoints", "release_checkpoints_expired", {
+            'releases_dir': releases_dir,
+            'removed': removed,
+            'max_age_hours': max_age_hours
+        })
+    return removed
@@ -0,0 +1,237 @@
+"""
+Streaming release packager
+Writes release images, YOLO labels and metadata straight into the output ZIP
+so a release needs a single write pass instead of staging + temp tree + zip.
+Also owns the per-entry compression policy shared by every release ZIP writer.
+"""
+
+import os
+import json
+import time
+import zipfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Union
+
+from core.annotation_transformer import (
+    BoundingBox,
+    Polygon,
+    transform_detection_annotations_to_yolo,
+    transform_segmentation_annotations_to_yolo,
+)
+
+# Import professional logging system - CORRECT UNIFORM PATTERN
+from logging_system.professional_logger import get_professional_logger
+
+# Initialize professional logger
+logger = get_professional_logger()
+
+YOLO_EXPORT_FORMATS = ("yolo_detection", "yolo_segmentation")
+
+# auto: store already-compressed images, deflate labels / YAML / JSON / everything else
+# deflate: deflate every entry (historical behaviour), store: no compression at all
+ZIP_COMPRESSION_POLICIES = ("auto", "deflate", "store")
+# Entropy-coded formats: deflating them again costs CPU for next to no size gain
+PRECOMPRESSED_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif")
+
+
+def resolve_zip_compression(policy: Optional[str] = None) -> str:
+    """Validated compression policy (None -> settings.RELEASE_ZIP_COMPRESSION)"""
+    if policy is None:
+        from core.config import settings
+        policy = settings.RELEASE_ZIP_COMPRESSION
+    policy = (policy or "auto").lower()
+    if policy not in ZIP_COMPRESSION_POLICIES:
+        logger.warning("errors.validation", f"Unknown ZIP compression policy: {policy}, using auto", "unknown_zip_compression", {
+            'policy': policy,
+            'available_policies': list(ZIP_COMPRESSION_POLICIES)
+        })
+        policy = "auto"
+    return policy
+
+
+def resolve_read_workers(read_workers: Optional[int] = None) -> int:
+    """Threads reading files ahead of the ZIP writer (None -> settings.RELEASE_ZIP_READ_WORKERS, 0 -> cpu count)"""
+    if read_workers is None:
+        from core.config import settings
+        read_workers = settings.RELEASE_ZIP_READ_WORKERS
+    if read_workers <= 0:
+        read_workers = os.cpu_count() or 1
+    return read_workers
+
+
+def entry_compression(arcname: str, policy: str = "auto") -> int:
+    """zipfile compression constant for one entry under `policy`"""
+    if policy == "store":
+        return zipfile.ZIP_STORED
+    if policy == "auto" and os.path.splitext(arcname)[1].lower() in PRECOMPRESSED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def zip_compression_metadata(policy: Optional[str] = None, read_workers: Optional[int] = None) -> Dict[str, Any]:
+    """Description of the compression policy for metadata/release_config.json"""
+    policy = resolve_zip_compression(policy)
+    return {
+        "policy": policy,
+        "stored_extensions": list(PRECOMPRESSED_EXTENSIONS) if policy == "auto" else [],
+        "read_workers": resolve_read_workers(read_workers)
+    }
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def write_directory_to_zip(source_dir: str, zip_path: str, policy: Optional[str] = None,
+                           read_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Zip every file below `source_dir` (arcnames relative to it) using the compression policy.
+    Entries keep os.walk order; `read_workers` threads read files ahead of the writer,
+    which compresses and appends them. Returns per-mode entry and byte counts.
+    """
+    policy = resolve_zip_compression(policy)
+    workers = resolve_read_workers(read_workers)
+    entries = []
+    for root, _, files in os.walk(source_dir):
+        for file in files:
+            file_path = os.path.join(root, file)
+            arcname = os.path.relpath(file_path, source_dir).replace(os.sep, "/")
+            entries.append((file_path, arcname, entry_compression(arcname, policy)))
+
+    summary = {"policy": policy, "read_workers": workers, "stored_entries": 0, "deflated_entries": 0,
+               "uncompressed_bytes": 0, "compressed_bytes": 0}
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="zip-read") if workers > 1 else None
+    # Reads run at most a few entries ahead of the writer to bound memory
+    to_read = deque(range(len(entries))) if pool else deque()
+    pending = {}
+    try:
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for index, (file_path, arcname, compression) in enumerate(entries):
+                while to_read and len(pending) < workers * 4:
+                    ahead = to_read.popleft()
+                    pending[ahead] = pool.submit(_read_file, entries[ahead][0])
+                try:
+                    if index in pending:
+                        zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+                        zf.writestr(zinfo, pending.pop(index).result(), compress_type=compression)
+                    else:
+                        zf.write(file_path, arcname, compress_type=compression)
+                except Exception as e:
+                    logger.error("errors.system", f"Error writing file to zip: {file_path} - {str(e)}", "zip_file_write_error", {
+                        'zip_path': zip_path,
+                        'file_path': file_path,
+                        'error': str(e)
+                    })
+                    raise
+                zinfo = zf.getinfo(arcname)
+                summary["stored_entries" if compression == zipfile.ZIP_STORED else "deflated_entries"] += 1
+                summary["uncompressed_bytes"] += zinfo.file_size
+                summary["compressed_bytes"] += zinfo.compress_size
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    logger.info("operations.releases", f"Release ZIP written: {zip_path}", "release_zip_written", dict(summary, zip_path=zip_path))
+    return summary
+
+
+def yolo_label_text(annotations: List[Union[BoundingBox, Polygon]],
+                    image_width: int, image_height: int,
+                    export_format: str) -> str:
+    """Build the YOLO .txt content for already-transformed pixel annotations"""
+    if not annotations or image_width <= 0 or image_height <= 0:
+        return ""
+    if export_format == "yolo_segmentation":
+        lines = transform_segmentation_annotations_to_yolo(annotations, image_width, image_height)
+    else:
+        lines = transform_detection_annotations_to_yolo(annotations, image_width, image_height)
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+class StreamingReleaseZip:
+    """
+    Append-only release ZIP writer.
+
+    Entries are written to `<final name>.part` as they are produced and the
+    archive is moved into place by finalize(); abort() removes the partial file.
+    Writes are serialized with a lock so producers on several threads can share it.
+    """
+
+    def __init__(self, part_path: str, compression_policy: Optional[str] = None):
+        self.part_path = part_path
+        self.compression_policy = resolve_zip_compression(compression_policy)
+        os.makedirs(os.path.dirname(part_path) or ".", exist_ok=True)
+        self._zip = zipfile.ZipFile(part_path, "w", zipfile.ZIP_DEFLATED)
+        self._lock = threading.Lock()
+        self._names = set()
+        self.entry_count = 0
+        self.bytes_written = 0
+        self.compressed_bytes = 0
+
+    def _add(self, arcname: str, data: bytes) -> bool:
+        arcname = arcname.replace(os.sep, "/")
+        compression = entry_compression(arcname, self.compression_policy)
+        with self._lock:
+            if arcname in self._names:
+                logger.warning("errors.validation", f"Duplicate ZIP entry skipped: {arcname}", "zip_duplicate_entry", {
+                    'arcname': arcname,
+                    'zip_path': self.part_path
+                })
+                return False
+            zinfo = zipfile.ZipInfo(arcname, time.localtime(time.time())[:6])
+            zinfo.external_attr = 0o600 << 16  # permissions: ?rw------- (as writestr with a name)
+            self._zip.writestr(zinfo, data, compress_type=compression)
+            self.compressed_bytes += zinfo.compress_size
+            self._names.add(arcname)
+            self.entry_count += 1
+            self.bytes_written += len(data)
+        return True
+
+    def write_bytes(self, arcname: str, data: bytes) -> bool:
+        """Add an in-memory file (e.g. an encoded image)"""
+        return self._add(arcname, data)
+
+    def write_text(self, arcname: str, text: str) -> bool:
+        """Add a UTF-8 text file"""
+        return self._add(arcname, text.encode("utf-8"))
+
+    def write_json(self, arcname: str, data: Any, indent: int = 4) -> bool:
+        """Add a JSON document"""
+        return self.write_text(arcname, json.dumps(data, indent=indent))
+
+    def has_entry(self, arcname: str) -> bool:
+        with self._lock:
+            return arcname.replace(os.sep, "/") in self._names
+
+    def finalize(self, zip_path: str) -> str:
+        """Close the archive and move it to its final name"""
+        with self._lock:
+            self._zip.close()
+        os.replace(self.part_path, zip_path)
+        logger.info("operations.releases", f"Streaming ZIP finalized: {zip_path}", "streaming_zip_finalized", {
+            'zip_path': zip_path,
+            'entries': self.entry_count,
+            'uncompressed_bytes': self.bytes_written,
+            'compressed_bytes': self.compressed_bytes,
+            'compression_policy': self.compression_policy
+        })
+        return zip_path
+
+    def abort(self) -> None:
+        """Close and delete the partial archive"""
+        try:
+            with self._lock:
+                self._zip.close()
+        except Exception:
+            pass
+        if os.path.exists(self.part_path):
+            try:
+                os.remove(self.part_path)
+            except OSError as e:
+                logger.warning("errors.system", f"Could not remove partial ZIP {self.part_path}: {e}", "streaming_zip_cleanup_failed", {
+                    'zip_path': self.part_path,
+                    'error': str(e)
+                })
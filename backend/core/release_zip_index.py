@@ -0,0 +1,228 @@
+"""
+Release ZIP index cache
+Keeps recently used release ZIPs open together with their name -> ZipInfo maps, so
+serving a file from a release is a dict lookup plus a streamed read instead of
+re-opening the archive and scanning namelist() on every request.
+"""
+
+import os
+import struct
+import zipfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+# Import professional logging system - CORRECT UNIFORM PATTERN
+from logging_system.professional_logger import get_professional_logger
+
+# Initialize professional logger
+logger = get_professional_logger()
+
+CHUNK_SIZE = 64 * 1024
+
+# Local file header layout (see zipfile.structFileHeader)
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_LOCAL_HEADER_SIGNATURE = b"PK\003\004"
+
+
+class ReleaseZipIndex:
+    """
+    An open release ZIP and its entry index; safe to read from several threads.
+    Readers may outlive the index: once it is closed (evicted or invalidated), entries
+    are opened through a private handle on the archive instead of the shared one.
+    """
+
+    def __init__(self, zip_path: str):
+        stat = os.stat(zip_path)
+        self.zip_path = zip_path
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        self._zip = zipfile.ZipFile(zip_path, "r")
+        self.entries: Dict[str, zipfile.ZipInfo] = {info.filename: info for info in self._zip.infolist()}
+        self.names: List[str] = list(self.entries)
+        self._data_offsets: Dict[str, int] = {}
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def is_current(self, stat: os.stat_result) -> bool:
+        return stat.st_mtime_ns == self.mtime_ns and stat.st_size == self.size
+
+    def get(self, name: str) -> Optional[zipfile.ZipInfo]:
+        return self.entries.get(name)
+
+    def open(self, name: str):
+        """File-like reader for one entry (decompressed)"""
+        return self._open_entry(self.entries[name])
+
+    def _open_entry(self, info: zipfile.ZipInfo):
+        with self._lock:
+            if not self._closed:
+                return self._zip.open(info, "r")
+        private = zipfile.ZipFile(self.zip_path, "r")
+        try:
+            return private.open(info, "r")
+        finally:
+            # The open reader keeps the file handle alive until it is closed itself
+            private.close()
+
+    def _data_offset(self, info: zipfile.ZipInfo) -> int:
+        """Absolute offset of an entry's data, read from its local header once"""
+        with self._lock:
+            offset = self._data_offsets.get(info.filename)
+        if offset is None:
+            with open(self.zip_path, "rb") as f:
+                f.seek(info.header_offset)
+                header = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+            if header[0] != _LOCAL_HEADER_SIGNATURE:
+                raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+            offset = info.header_offset + _LOCAL_HEADER.size + header[10] + header[11]
+            with self._lock:
+                self._data_offsets[info.filename] = offset
+        return offset
+
+    def iter_range(self, name: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Iterator over bytes [start, end] (inclusive) of an entry's content.
+        Stored entries are read straight from the archive at their data offset; compressed
+        ones are decompressed from the start of the entry. The entry is opened before this
+        returns, so the iterator keeps working if the index is evicted meanwhile.
+        """
+        info = self.entries[name]
+        end = info.file_size - 1 if end is None else min(end, info.file_size - 1)
+        if end < start:
+            return iter(())
+        if info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1:
+            reader = open(self.zip_path, "rb")
+            reader.seek(self._data_offset(info) + start)
+        else:
+            reader = self._open_entry(info)
+            if start:
+                reader.seek(start)
+        return _iter_chunks(reader, end - start + 1)
+
+    def close(self) -> None:
+        # Readers that are still streaming keep the underlying file open until they finish
+        with self._lock:
+            self._closed = True
+            self._zip.close()
+
+
+def _iter_chunks(reader, remaining: int) -> Iterator[bytes]:
+    with reader:
+        while remaining > 0:
+            chunk = reader.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+class ReleaseZipCache:
+    """
+    Process-wide LRU of open release ZIP indexes, keyed by release id.
+    An entry is reopened when the ZIP's mtime or size changes (release regenerated).
+    """
+
+    def __init__(self, max_open: int = 16):
+        self.max_open = max(1, max_open)
+        self._indexes: "OrderedDict[str, ReleaseZipIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, release_id: str, zip_path: str) -> ReleaseZipIndex:
+        stat = os.stat(zip_path)
+        with self._lock:
+            index = self._indexes.get(release_id)
+            if index is not None and index.zip_path == zip_path and index.is_current(stat):
+                self._indexes.move_to_end(release_id)
+                return index
+        fresh = ReleaseZipIndex(zip_path)
+        evicted = []
+        with self._lock:
+            stale = self._indexes.pop(release_id, None)
+            self._indexes[release_id] = fresh
+            while len(self._indexes) > self.max_open:
+                evicted.append(self._indexes.popitem(last=False))
+        for old in ([stale] if stale is not None else []) + [idx for _, idx in evicted]:
+            old.close()
+        logger.debug("operations.releases", f"Indexed release ZIP {zip_path}", "release_zip_indexed", {
+            'release_id': release_id,
+            'entries': len(fresh.entries),
+            'replaced_stale': stale is not None,
+            'evicted': [rid for rid, _ in evicted]
+        })
+        return fresh
+
+    def invalidate(self, release_id: str) -> None:
+        """Close a release's archive, e.g. before its ZIP is deleted or renamed"""
+        with self._lock:
+            index = self._indexes.pop(release_id, None)
+        if index is not None:
+            index.close()
+
+
+_release_zip_cache: Optional[ReleaseZipCache] = None
+_release_zip_cache_lock = threading.Lock()
+
+
+def get_release_zip_cache() -> ReleaseZipCache:
+    """Shared cache (size from settings.RELEASE_ZIP_INDEX_MAX_OPEN)"""
+    global _release_zip_cache
+    with _release_zip_cache_lock:
+        if _release_zip_cache is None:
+            from core.config import settings
+            _release_zip_cache = ReleaseZipCache(settings.RELEASE_ZIP_INDEX_MAX_OPEN)
+        return _release_zip_cache
+
+
+def parse_byte_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    (start, end) for a single "bytes=" range, or None to serve the whole entry
+    (no header, multiple ranges, or a unit other than bytes).
+    Raises ValueError when the range cannot be satisfied.
+    """
+    if not range_header or not range_header.strip().lower().startswith("bytes="):
+        return None
+    spec = range_header.strip()[6:].strip()
+    if "," in spec or "-" not in spec:
+        return None
+    if size <= 0:
+        raise ValueError(f"Range not satisfiable: {range_header}")
+    first, last = (part.strip() for part in spec.split("-", 1))
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix <= 0:
+                raise ValueError("empty suffix range")
+            return max(0, size - suffix), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        raise ValueError(f"Invalid range: {range_header}")
+    if start >= size or end < start:
+        raise ValueError(f"Range not satisfiable: {range_header}")
+    return start, min(end, size - 1)
+
+
+def zip_entry_response(index: ReleaseZipIndex, name: str, media_type: str,
+                       range_header: Optional[str] = None,
+                       headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    """Stream one entry (200, or 206 for a byte range) without reading it into memory"""
+    info = index.entries[name]
+    response_headers = dict(headers or {})
+    response_headers["Accept-Ranges"] = "bytes"
+    try:
+        byte_range = parse_byte_range(range_header, info.file_size)
+    except ValueError:
+        raise HTTPException(status_code=416, detail="Requested range not satisfiable",
+                            headers={"Content-Range": f"bytes */{info.file_size}"})
+    if byte_range is None:
+        response_headers["Content-Length"] = str(info.file_size)
+        return StreamingResponse(index.iter_range(name), media_type=media_type, headers=response_headers)
+    start, end = byte_range
+    response_headers["Content-Range"] = f"bytes {start}-{end}/{info.file_size}"
+    response_headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(index.iter_range(name, start, end), status_code=206,
+                             media_type=media_type, headers=response_headers)
@@ -0,0 +1,157 @@
+"""
+Bounded multi-stage pipeline
+Runs items through a chain of thread-pooled stages connected by bounded queues, so a
+slow stage throttles the ones feeding it (backpressure) and the number of items in
+flight - and therefore memory - stays fixed no matter how many items pass through.
+"""
+
+import time
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List
+
+# Import professional logging system - CORRECT UNIFORM PATTERN
+from logging_system.professional_logger import get_professional_logger
+
+# Initialize professional logger
+logger = get_professional_logger()
+
+_END = object()
+
+
+@dataclass
+class PipelineStage:
+    """One step of the pipeline: `func(item) -> item` run on `workers` threads"""
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+
+
+@dataclass
+class StageFailure:
+    """Passed downstream in place of an item whose stage raised"""
+    item: Any
+    stage: str
+    error: Exception
+
+
+class BoundedPipeline:
+    """
+    Thread-stage pipeline with bounded hand-off queues.
+
+    run() feeds the items, lets every stage work concurrently and calls `sink` for each
+    finished item on the calling thread, in completion order. An exception inside a stage
+    only affects that item: the sink receives a StageFailure for it. If the sink itself
+    raises, the pipeline is cancelled and the exception propagates.
+    """
+
+    def __init__(self, stages: List[PipelineStage], queue_size: int = 4):
+        if not stages:
+            raise ValueError("BoundedPipeline needs at least one stage")
+        for stage in stages:
+            stage.workers = max(1, int(stage.workers))
+        self.stages = stages
+        self.queue_size = max(1, int(queue_size))
+        self._cancelled = threading.Event()
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, float]] = {
+            stage.name: {"items": 0, "busy_seconds": 0.0, "failures": 0} for stage in stages
+        }
+
+    def _put(self, q: "queue.Queue", item: Any) -> bool:
+        while not self._cancelled.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: "queue.Queue") -> Any:
+        while not self._cancelled.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _feed(self, items: Iterable[Any], out_q: "queue.Queue", workers: int) -> None:
+        try:
+            for item in items:
+                if not self._put(out_q, item):
+                    return
+        finally:
+            for _ in range(workers):
+                self._put(out_q, _END)
+
+    def _run_stage(self, stage: PipelineStage, in_q: "queue.Queue", out_q: "queue.Queue",
+                   remaining: List[int], lock: threading.Lock, next_workers: int) -> None:
+        while True:
+            item = self._get(in_q)
+            if item is _END:
+                break
+            if not isinstance(item, StageFailure):
+                started = time.perf_counter()
+                try:
+                    item = stage.func(item)
+                    failed = False
+                except Exception as e:
+                    item = StageFailure(item, stage.name, e)
+                    failed = True
+                with self._stats_lock:
+                    stats = self.stats[stage.name]
+                    stats["items"] += 1
+                    stats["busy_seconds"] += time.perf_counter() - started
+                    stats["failures"] += int(failed)
+            if not self._put(out_q, item):
+                return
+        # The last worker of a stage closes the next queue
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            for _ in range(next_workers):
+                self._put(out_q, _END)
+
+    def run(self, items: Iterable[Any], sink: Callable[[Any], None]) -> None:
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        threads = [threading.Thread(
+            target=self._feed, args=(items, queues[0], self.stages[0].workers),
+            name="pipeline-feed", daemon=True
+        )]
+        for index, stage in enumerate(self.stages):
+            next_workers = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+            remaining, lock = [stage.workers], threading.Lock()
+            for worker in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._run_stage,
+                    args=(stage, queues[index], queues[index + 1], remaining, lock, next_workers),
+                    name=f"pipeline-{stage.name}-{worker}", daemon=True
+                ))
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = self._get(queues[-1])
+                if item is _END:
+                    break
+                sink(item)
+        except BaseException:
+            self._cancelled.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join(timeout=5)
+
+        logger.info("operations.operations", "Pipeline finished", "pipeline_finished", {
+            'elapsed_seconds': round(time.perf_counter() - started, 3),
+            'queue_size': self.queue_size,
+            'stages': {
+                stage.name: dict(self.stats[stage.name], workers=stage.workers,
+                                 busy_seconds=round(self.stats[stage.name]["busy_seconds"], 3))
+                for stage in self.stages
+            }
+        })
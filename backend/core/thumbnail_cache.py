@@ -0,0 +1,250 @@
+"""
+Thumbnail cache
+Disk-backed thumbnails for release and dataset image browsing, keyed by the source
+image's content hash and the thumbnail size. Thumbnails are rendered on first request
+(or by a warm-up job), kept under a size cap with LRU eviction, and served with ETags
+so browsers can revalidate instead of downloading them again.
+"""
+
+import io
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi.responses import Response
+from PIL import Image
+
+from core.augmentation_cache import AugmentationCache
+
+# Import professional logging system - CORRECT UNIFORM PATTERN
+from logging_system.professional_logger import get_professional_logger
+
+# Initialize professional logger
+logger = get_professional_logger()
+
+# Source identity -> content hash memo size (identities include mtime, so edits miss)
+_DIGEST_MEMO_SIZE = 20000
+
+
+def _hash_chunks(chunks: Iterable[bytes]) -> str:
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def render_thumbnail(source: BinaryIO, size: int) -> Tuple[bytes, str]:
+    """Encode a thumbnail fitting size x size: (bytes, media type). JPEG, or PNG when the image has alpha."""
+    image = Image.open(source)
+    # thumbnail() lets the JPEG decoder scale down while decoding (draft mode)
+    image.thumbnail((size, size), Image.Resampling.LANCZOS)
+    output = io.BytesIO()
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image.save(output, format="PNG", optimize=True)
+        return output.getvalue(), "image/png"
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    image.save(output, format="JPEG", quality=85)
+    return output.getvalue(), "image/jpeg"
+
+
+class ThumbnailCache:
+    """
+    Thumbnails stored in an AugmentationCache-style directory (sharded files, mtime LRU,
+    size cap). Requested sizes are snapped to the configured sizes so each image has at
+    most len(sizes) variants.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int, sizes: Iterable[int]):
+        self.store = AugmentationCache(cache_dir, max_bytes, label="thumbnail")
+        self.sizes: List[int] = sorted({int(s) for s in sizes if int(s) > 0}) or [256]
+        self._digests: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def snap_size(self, size: Optional[int]) -> int:
+        """Smallest configured size that covers `size` (the largest one beyond that)"""
+        if not size:
+            return self.sizes[len(self.sizes) // 2]
+        for candidate in self.sizes:
+            if candidate >= size:
+                return candidate
+        return self.sizes[-1]
+
+    def _memo_digest(self, identity: tuple, compute: Callable[[], str]) -> str:
+        with self._lock:
+            digest = self._digests.get(identity)
+            if digest is not None:
+                self._digests.move_to_end(identity)
+                return digest
+        digest = compute()
+        with self._lock:
+            self._digests[identity] = digest
+            while len(self._digests) > _DIGEST_MEMO_SIZE:
+                self._digests.popitem(last=False)
+        return digest
+
+    def file_digest(self, path: str) -> str:
+        """Content hash of a file, memoized per (path, mtime, size)"""
+        stat = os.stat(path)
+
+        def compute() -> str:
+            with open(path, "rb") as f:
+                return _hash_chunks(iter(lambda: f.read(1024 * 1024), b""))
+        return self._memo_digest(("file", path, stat.st_mtime_ns, stat.st_size), compute)
+
+    def zip_entry_digest(self, zip_index, name: str) -> str:
+        """Content hash of a release ZIP entry, memoized per (archive, mtime, entry)"""
+        return self._memo_digest(
+            ("zip", zip_index.zip_path, zip_index.mtime_ns, name),
+            lambda: _hash_chunks(zip_index.iter_range(name))
+        )
+
+    @staticmethod
+    def etag(digest: str, size: int) -> str:
+        return f'"{digest[:32]}-{size}"'
+
+    def get(self, digest: str, size: int, open_source: Callable[[], BinaryIO]) -> Tuple[bytes, str]:
+        """Cached thumbnail bytes and media type, rendering and storing it on a miss"""
+        key = f"{digest}-{size}"
+        entry = self.store.get(key)
+        if entry is not None:
+            data, meta = entry
+            return data, meta.get("media_type", "image/jpeg")
+        with open_source() as source:
+            data, media_type = render_thumbnail(source, size)
+        self.store.put(key, data, {"media_type": media_type, "size": size})
+        return data, media_type
+
+    def has(self, digest: str, size: int) -> bool:
+        return self.store.contains(f"{digest}-{size}")
+
+
+_thumbnail_cache: Optional[ThumbnailCache] = None
+_thumbnail_cache_lock = threading.Lock()
+
+
+def get_thumbnail_cache() -> Optional[ThumbnailCache]:
+    """Process-wide thumbnail cache configured from settings; None when disabled"""
+    global _thumbnail_cache
+    from core.config import settings
+    if not settings.THUMBNAIL_CACHE_ENABLED or settings.THUMBNAIL_CACHE_MAX_MB <= 0:
+        return None
+    with _thumbnail_cache_lock:
+        if _thumbnail_cache is None:
+            try:
+                _thumbnail_cache = ThumbnailCache(
+                    str(settings.THUMBNAIL_CACHE_DIR),
+                    settings.THUMBNAIL_CACHE_MAX_MB * 1024 * 1024,
+                    settings.THUMBNAIL_SIZES
+                )
+            except OSError as e:
+                logger.warning("errors.system", f"Thumbnail cache unavailable: {e}", "thumbnail_cache_unavailable", {
+                    'cache_dir': str(settings.THUMBNAIL_CACHE_DIR),
+                    'error': str(e)
+                })
+                return None
+        return _thumbnail_cache
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True when an If-None-Match header already names `etag`"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == etag:
+            return True
+    return False
+
+
+def thumbnail_response(data: bytes, media_type: str, etag: str, if_none_match: Optional[str] = None,
+                       headers: Optional[Dict[str, str]] = None) -> Response:
+    """200 with the thumbnail, or 304 when the client's copy is current"""
+    response_headers = dict(headers or {})
+    response_headers["ETag"] = etag
+    # Clients may keep the bytes but must revalidate; unchanged thumbnails cost a 304
+    response_headers["Cache-Control"] = "no-cache"
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=response_headers)
+    return Response(content=data, media_type=media_type, headers=response_headers)
+
+
+def cached_file_thumbnail(path: str, size: Optional[int], if_none_match: Optional[str] = None,
+                          headers: Optional[Dict[str, str]] = None) -> Optional[Response]:
+    """Thumbnail response for an image file on disk; None when the cache is disabled"""
+    cache = get_thumbnail_cache()
+    if cache is None:
+        return None
+    size = cache.snap_size(size)
+    digest = cache.file_digest(path)
+    etag = cache.etag(digest, size)
+    if etag_matches(if_none_match, etag):
+        return thumbnail_response(b"", "", etag, if_none_match, headers)
+    data, media_type = cache.get(digest, size, lambda: open(path, "rb"))
+    return thumbnail_response(data, media_type, etag, if_none_match, headers)
+
+
+def cached_zip_thumbnail(zip_index, name: str, size: Optional[int], if_none_match: Optional[str] = None,
+                         headers: Optional[Dict[str, str]] = None) -> Optional[Response]:
+    """Thumbnail response for an image inside a release ZIP; None when the cache is disabled"""
+    cache = get_thumbnail_cache()
+    if cache is None:
+        return None
+    size = cache.snap_size(size)
+    digest = cache.zip_entry_digest(zip_index, name)
+    etag = cache.etag(digest, size)
+    if etag_matches(if_none_match, etag):
+        return thumbnail_response(b"", "", etag, if_none_match, headers)
+    data, media_type = cache.get(digest, size, lambda: zip_index.open(name))
+    return thumbnail_response(data, media_type, etag, if_none_match, headers)
+
+
+def _warm(sources: Iterable[Tuple[str, Callable[[], str], Callable[[], BinaryIO]]],
+          sizes: Optional[Iterable[int]], job: Dict[str, str]) -> int:
+    cache = get_thumbnail_cache()
+    if cache is None:
+        return 0
+    sizes = [cache.snap_size(s) for s in sizes] if sizes else list(cache.sizes)
+    rendered = failed = 0
+    for name, digest_of, open_source in sources:
+        try:
+            digest = digest_of()
+            for size in sizes:
+                if not cache.has(digest, size):
+                    cache.get(digest, size, open_source)
+                    rendered += 1
+        except Exception as e:
+            failed += 1
+            logger.warning("errors.system", f"Thumbnail warm-up failed for {name}: {e}", "thumbnail_warm_failed", dict(job, name=name, error=str(e)))
+    logger.info("operations.images", f"Thumbnail warm-up finished: {rendered} rendered", "thumbnail_warm_completed", dict(
+        job, rendered=rendered, failed=failed, sizes=sizes
+    ))
+    return rendered
+
+
+def warm_file_thumbnails(paths: Iterable[str], sizes: Optional[Iterable[int]] = None, job: Optional[Dict[str, str]] = None) -> int:
+    """Background job: render missing thumbnails for image files"""
+    cache = get_thumbnail_cache()
+    if cache is None:
+        return 0
+    return _warm(
+        ((path, (lambda p=path: cache.file_digest(p)), (lambda p=path: open(p, "rb"))) for path in paths),
+        sizes, job or {}
+    )
+
+
+def warm_release_thumbnails(release_id: str, zip_path: str, sizes: Optional[Iterable[int]] = None) -> int:
+    """Background job: render missing thumbnails for every image in a release ZIP"""
+    from core.release_zip_index import get_release_zip_cache
+    cache = get_thumbnail_cache()
+    if cache is None:
+        return 0
+    zip_index = get_release_zip_cache().get(release_id, zip_path)
+    names = [n for n in zip_index.names if n.startswith("images/") and not n.endswith("/")]
+    return _warm(
+        ((name, (lambda n=name: cache.zip_entry_digest(zip_index, n)), (lambda n=name: zip_index.open(n)))
+         for name in names),
+        sizes, {'release_id': release_id}
+    )
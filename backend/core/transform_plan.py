@@ -0,0 +1,137 @@
+"""
+Compiled transformation plans
+A resolved transformation config turned once into the steps that will actually run:
+enabled steps only, in config order, with point-wise lookup tables prebuilt and geometry
+matrices cached per input size. ImageTransformer.apply_transformations(_fused) accept a
+plan in place of the config dict, so a release applies each distinct config to every
+image without re-reading it.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.photometric_lut import PhotometricOp, brightness_table, gamma_table
+
+# Geometry matrices kept per step (one per distinct input size)
+MAX_CACHED_SIZES = 64
+
+GeometryStep = Optional[Tuple[np.ndarray, Tuple[int, int], Optional[Tuple[int, int, int]]]]
+
+
+def _prebuild(ops: List[PhotometricOp]) -> Tuple[PhotometricOp, ...]:
+    """Replace table-only ops (brightness, gamma) by their finished lookup tables"""
+    built = []
+    for kind, value in ops:
+        if kind == 'brightness':
+            built.append(('table', brightness_table(value)))
+        elif kind == 'gamma':
+            built.append(('table', gamma_table(value)))
+        else:
+            built.append((kind, value))
+    return tuple(built)
+
+
+@dataclass(frozen=True)
+class PlanStep:
+    """
+    One enabled step. photometric_ops is None when the step is not point-wise (or LUT
+    fusion was off when compiling). Geometry matrices of deterministic steps are computed
+    once per input size; the geometry parameters the transformer records while computing
+    one are replayed on every reuse, so annotation code sees the same values.
+    """
+    name: str
+    params: Dict[str, Any]
+    photometric_ops: Optional[Tuple[PhotometricOp, ...]] = None
+    cache_geometry: bool = False
+    _matrices: Dict[Tuple[int, int], Tuple[GeometryStep, Dict[str, Any]]] = field(
+        default_factory=dict, compare=False, repr=False)
+
+    def geometry_matrix(self, transformer, size: Tuple[int, int]) -> GeometryStep:
+        """(matrix, output size, fill) as transformer._geometry_step_matrix; treat the matrix as read-only"""
+        if not self.cache_geometry:
+            return transformer._geometry_step_matrix(self.name, self.params, size)
+        recorded_params = transformer._actual_geometry_params
+        cached = self._matrices.get(size)
+        if cached is not None:
+            step, recorded = cached
+            recorded_params.update({key: dict(value) for key, value in recorded.items()})
+            return step
+        before = dict(recorded_params)
+        step = transformer._geometry_step_matrix(self.name, self.params, size)
+        recorded = {key: dict(value) for key, value in recorded_params.items() if before.get(key) is not value}
+        if len(self._matrices) < MAX_CACHED_SIZES:
+            self._matrices[size] = (step, recorded)
+        return step
+
+
+@dataclass(frozen=True)
+class TransformPlan:
+    """
+    A compiled config. `config` is the resolved config it came from (for annotation
+    updates and cache keys; do not modify it), `key` its canonical JSON. When the first
+    step is a resize, leading_resize is that step and remainder the plan of the rest.
+    """
+    config: Dict[str, Any]
+    steps: Tuple[PlanStep, ...]
+    key: str
+    leading_resize: Optional[PlanStep] = None
+    remainder: Optional["TransformPlan"] = None
+
+    @property
+    def names(self) -> List[str]:
+        return [step.name for step in self.steps]
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    @property
+    def is_random(self) -> bool:
+        """True when some step draws new random values on every run, so its output is not reusable"""
+        return any(_random_step(step.name, step.params) for step in self.steps)
+
+
+def _random_geometry(name: str, params: Dict[str, Any]) -> bool:
+    """Steps whose geometry is drawn anew on every call"""
+    return name == 'perspective_warp' or (name == 'crop' and params.get('crop_mode', 'center') == 'random')
+
+
+def _random_step(name: str, params: Dict[str, Any]) -> bool:
+    """Steps whose pixels are drawn anew on every call (random geometry, noise, cutout holes)"""
+    return name in ('noise', 'cutout') or _random_geometry(name, params)
+
+
+def compile_plan(config: Dict[str, Any], transformer, geometry_transforms: Tuple[str, ...] = ()) -> TransformPlan:
+    """
+    Compile a resolved config for `transformer` (its methods and fuse_photometric setting).
+    Steps the transformer does not know, disabled ones and non-dict entries are dropped.
+    """
+    steps = []
+    for name, params in config.items():
+        if name not in transformer.transformation_methods or not isinstance(params, dict):
+            continue
+        if not params.get('enabled', True):
+            continue
+        try:
+            ops = transformer._photometric_ops(name, params)
+        except Exception:
+            # Left to the step's own method, which reports the error when it runs
+            ops = None
+        steps.append(PlanStep(
+            name=name,
+            params=params,
+            photometric_ops=None if ops is None else _prebuild(ops),
+            cache_geometry=name in geometry_transforms and not _random_geometry(name, params)
+        ))
+    return _plan(config, tuple(steps))
+
+
+def _plan(config: Dict[str, Any], steps: Tuple[PlanStep, ...]) -> TransformPlan:
+    key = json.dumps(config, sort_keys=True, default=str)
+    if steps and steps[0].name == 'resize':
+        names = {step.name for step in steps[1:]}
+        remainder = _plan({name: params for name, params in config.items() if name in names}, steps[1:])
+        return TransformPlan(config, steps, key, leading_resize=steps[0], remainder=remainder)
+    return TransformPlan(config, steps, key)
@@ -22,7 +22,7 @@ from datetime import datetime
 from pathlib import Path
 import threading
 import time
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Optional, Set, Tuple
 
 # Add backend directory to path for imports
 backend_dir = Path(__file__).parent.parent
@@ -61,6 +61,84 @@ def log_warning(category, message, operation, data):
     else:
         logger.warning(f"{message} - {data if data else ''}")
 
+class ExportScheduler:
+    """
+    Coalesces export requests onto a single worker thread.
+    
+    request() only marks an export as pending. The worker runs it once requests
+    have been quiet for `debounce` seconds, or `max_latency` seconds after the first
+    pending request, whichever comes first. Requests arriving while an export runs
+    schedule exactly one follow-up export, so exports never overlap.
+    """
+    
+    def __init__(self, export_func: Callable[[], Any], debounce: float = 2.0, max_latency: float = 15.0):
+        self._export_func = export_func
+        self.debounce = max(0.0, float(debounce))
+        self.max_latency = max(self.debounce, float(max_latency))
+        self._cond = threading.Condition()
+        self._first_request: Optional[float] = None
+        self._last_request: Optional[float] = None
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self.request_count = 0
+        self.export_count = 0
+    
+    def request(self):
+        """Mark an export as pending; returns immediately"""
+        with self._cond:
+            now = time.monotonic()
+            if self._first_request is None:
+                self._first_request = now
+            self._last_request = now
+            self.request_count += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._running = True
+                self._thread = threading.Thread(target=self._run, name="db-export-scheduler", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and self._first_request is None:
+                    self._cond.wait()
+                if self._first_request is None:
+                    return  # stopped with nothing pending
+                while self._running:
+                    due = min(self._last_request + self.debounce, self._first_request + self.max_latency)
+                    remaining = due - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                coalesced = self.request_count
+                self._first_request = None
+                self._last_request = None
+            
+            try:
+                self._export_func()
+            except Exception as e:
+                log_error("app.database", "Scheduled database export failed", "scheduled_export_error", {
+                    "error": str(e)
+                })
+            self.export_count += 1
+            log_info("app.database", "Scheduled database export finished", "scheduled_export_complete", {
+                "requests_so_far": coalesced,
+                "exports_so_far": self.export_count
+            })
+    
+    def stop(self, flush: bool = True, timeout: float = 10):
+        """Stop the worker; with flush=True a pending export runs first"""
+        with self._cond:
+            self._running = False
+            if not flush:
+                self._first_request = None
+                self._last_request = None
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=timeout)
+
+
 class DatabaseAutoExporter:
     def __init__(self, db_path=None, export_dir="database_exports"):
         if db_path is None:
@@ -84,13 +162,30 @@ class DatabaseAutoExporter:
         self.monitoring = False
         self.monitor_thread = None
         
+        # Incremental export state: dataset_id -> exported dataset dict (statistics + images),
+        # the newest change timestamp covered by the last export, and a cheap signature of it
+        self._dataset_cache: Dict[str, Dict[str, Any]] = {}
+        self._change_marker: Optional[str] = None
+        self._last_signature = None
+        self._images_layout = None
+        self._export_lock = threading.Lock()
+        self.scheduler: Optional[ExportScheduler] = None
+        
         log_info("app.database", "Database auto-exporter initialized", "auto_export_init", {
             "db_path": str(self.db_path),
             "export_dir": str(self.export_dir)
         })
     
-    def get_database_data(self) -> Dict[str, Any]:
-        """Extract all database data in a structured format"""
+    def get_database_data(self, dataset_cache: Optional[Dict[str, Dict[str, Any]]] = None,
+                          changed_dataset_ids: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """
+        Extract all database data in a structured format
+        
+        With dataset_cache, datasets that are not in changed_dataset_ids and whose
+        statistics are unchanged reuse their cached image list instead of re-reading
+        (and stat-ing) every image row. "refreshed_datasets" counts the re-read datasets
+        whose rows differ from the cached ones.
+        """
         # Debug: Print actual database path being used
         print(f"🔍 DEBUG: Database path being used: {self.db_path}")
         print(f"🔍 DEBUG: Database exists: {os.path.exists(self.db_path)}")
@@ -111,6 +206,7 @@ class DatabaseAutoExporter:
                 "export_timestamp": datetime.now().isoformat(),
                 "database_path": str(self.db_path),
                 "projects": [],
+                "refreshed_datasets": 0,
                 "summary": {
                     "total_projects": 0,
                     "total_datasets": 0,
@@ -206,6 +302,14 @@ class DatabaseAutoExporter:
                         "images": []
                     }
                     
+                    cached = dataset_cache.get(dataset["id"]) if dataset_cache is not None else None
+                    if (cached is not None
+                            and dataset["id"] not in (changed_dataset_ids or ())
+                            and cached["statistics"] == dataset_data["statistics"]):
+                        dataset_data["images"] = cached["images"]
+                        project_data["datasets"].append(dataset_data)
+                        continue
+                    
                     # Get images for this dataset
                     cursor.execute("""
                         SELECT i.*, COUNT(a.id) as annotation_count
@@ -241,6 +345,8 @@ class DatabaseAutoExporter:
                         
                         dataset_data["images"].append(image_data)
                     
+                    if cached is None or cached["images"] != dataset_data["images"] or cached["statistics"] != dataset_data["statistics"]:
+                        data["refreshed_datasets"] += 1
                     project_data["datasets"].append(dataset_data)
                 
                 data["projects"].append(project_data)
@@ -297,8 +403,8 @@ class DatabaseAutoExporter:
             })
             return False
     
-    def export_to_csv(self, data: Dict[str, Any]) -> bool:
-        """Export data to CSV files"""
+    def export_to_csv(self, data: Dict[str, Any], include_images: bool = True) -> bool:
+        """Export data to CSV files (images.csv is left as is when include_images is False)"""
         try:
             # Export projects
             with open(self.csv_projects_file, 'w', newline='', encoding='utf-8') as f:
@@ -350,6 +456,13 @@ class DatabaseAutoExporter:
                         ])
             
             # Export images
+            if not include_images:
+                log_info("app.database", "CSV export completed, image rows unchanged", "csv_export_success", {
+                    "projects_file": str(self.csv_projects_file),
+                    "datasets_file": str(self.csv_datasets_file),
+                    "images_file_skipped": str(self.csv_images_file)
+                })
+                return True
             with open(self.csv_images_file, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
                 writer.writerow([
@@ -398,26 +511,161 @@ class DatabaseAutoExporter:
             return False
     
     def export_now(self) -> bool:
-        """Perform immediate export of database data"""
-        log_info("app.database", "Starting database export", "export_start", {})
+        """Perform immediate full export of database data"""
+        with self._export_lock:
+            return self._export(incremental=False)
+    
+    def export_incremental(self) -> bool:
+        """Export, re-reading only datasets changed since the last export (full export the first time)"""
+        with self._export_lock:
+            return self._export(incremental=self._change_marker is not None)
+    
+    def _export(self, incremental: bool) -> bool:
+        log_info("app.database", "Starting database export", "export_start", {
+            "incremental": incremental
+        })
+        
+        # Taken before reading so that writes racing with this export are seen next time
+        marker = self._query_change_marker()
+        changed_dataset_ids = None
+        if incremental:
+            changed_dataset_ids = self._query_changed_datasets(self._change_marker)
+            if changed_dataset_ids is None:
+                incremental = False
         
-        data = self.get_database_data()
+        if incremental:
+            data = self.get_database_data(self._dataset_cache, changed_dataset_ids)
+        else:
+            data = self.get_database_data()
         if not data:
             return False
+        refreshed_datasets = data.pop("refreshed_datasets", 0)
+        
+        signature = self._data_signature(data)
+        if incremental and refreshed_datasets == 0 and signature == self._last_signature:
+            self._change_marker = marker or self._change_marker
+            log_info("app.database", "Database unchanged since last export, skipping write", "export_skipped_unchanged", {
+                "change_marker": self._change_marker
+            })
+            return True
+        
+        # images.csv repeats project and dataset names on every row, so it is rewritten when
+        # those change or a dataset's image rows did; the JSON document is always rewritten
+        images_layout = self._images_signature(data)
+        write_images = not incremental or refreshed_datasets > 0 or images_layout != self._images_layout
         
         json_success = self.export_to_json(data)
-        csv_success = self.export_to_csv(data)
+        csv_success = self.export_to_csv(data, include_images=write_images)
         
         success = json_success and csv_success
         
         if success:
+            self._dataset_cache = {
+                dataset["id"]: dataset
+                for project in data.get("projects", [])
+                for dataset in project.get("datasets", [])
+            }
+            self._change_marker = marker
+            self._last_signature = signature
+            self._images_layout = images_layout
             log_info("app.database", "Database export completed successfully", "export_complete", {
                 "json_file": str(self.json_file),
-                "csv_files": [str(self.csv_projects_file), str(self.csv_datasets_file), str(self.csv_images_file)]
+                "csv_files": [str(self.csv_projects_file), str(self.csv_datasets_file), str(self.csv_images_file)],
+                "incremental": incremental,
+                "refreshed_datasets": refreshed_datasets,
+                "images_csv_written": write_images,
+                "total_datasets": len(self._dataset_cache)
             })
         
         return success
     
+    def _query_change_marker(self) -> Optional[str]:
+        """
+        Newest created_at/updated_at across datasets, images and annotations, truncated to
+        the second. Rows are written both as "YYYY-MM-DD HH:MM:SS" (func.now()) and with
+        microseconds (datetime.utcnow()), so timestamps are compared through julianday().
+        """
+        if not os.path.exists(self.db_path):
+            return None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                row = conn.execute("""
+                    SELECT strftime('%Y-%m-%d %H:%M:%S', NULLIF(MAX(ts), 0)) FROM (
+                        SELECT MAX(COALESCE(MAX(julianday(created_at)), 0), COALESCE(MAX(julianday(updated_at)), 0)) AS ts FROM datasets
+                        UNION ALL
+                        SELECT MAX(COALESCE(MAX(julianday(created_at)), 0), COALESCE(MAX(julianday(updated_at)), 0)) FROM images
+                        UNION ALL
+                        SELECT MAX(COALESCE(MAX(julianday(created_at)), 0), COALESCE(MAX(julianday(updated_at)), 0)) FROM annotations
+                    )
+                """).fetchone()
+            finally:
+                conn.close()
+            return row[0] if row and row[0] else None
+        except Exception as e:
+            log_warning("app.database", "Could not read change marker, next export will be full", "change_marker_error", {
+                "error": str(e)
+            })
+            return None
+    
+    def _query_changed_datasets(self, since: str) -> Optional[Set[str]]:
+        """
+        IDs of datasets touched in or after the second `since` (the dataset, its images or
+        their annotations). Whole-second timestamps cannot order writes within that second,
+        so it is re-read; the caller then finds rows identical to its cache and skips them.
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                rows = conn.execute("""
+                    SELECT id FROM datasets WHERE julianday(updated_at) >= julianday(?1) OR julianday(created_at) >= julianday(?1)
+                    UNION
+                    SELECT dataset_id FROM images WHERE julianday(updated_at) >= julianday(?1) OR julianday(created_at) >= julianday(?1)
+                    UNION
+                    SELECT i.dataset_id FROM annotations a JOIN images i ON a.image_id = i.id
+                    WHERE julianday(a.updated_at) >= julianday(?1) OR julianday(a.created_at) >= julianday(?1)
+                """, (since,)).fetchall()
+            finally:
+                conn.close()
+            return {row[0] for row in rows}
+        except Exception as e:
+            log_warning("app.database", "Could not detect changed datasets, falling back to full export", "changed_datasets_error", {
+                "error": str(e),
+                "since": since
+            })
+            return None
+    
+    @staticmethod
+    def _data_signature(data: Dict[str, Any]) -> Tuple:
+        """Project/dataset level fingerprint used to skip rewriting identical exports"""
+        return tuple(
+            (project.get("id"), project.get("name"), project.get("description"), project.get("updated_at"),
+             json.dumps(project.get("statistics"), sort_keys=True),
+             tuple((dataset.get("id"), dataset.get("name"), dataset.get("description"), dataset.get("updated_at"))
+                   for dataset in project.get("datasets", [])))
+            for project in data.get("projects", [])
+        )
+    
+    @staticmethod
+    def _images_signature(data: Dict[str, Any]) -> Tuple:
+        """Project and dataset names in images.csv order"""
+        return tuple(
+            (project.get("name"), dataset.get("id"), dataset.get("name"))
+            for project in data.get("projects", [])
+            for dataset in project.get("datasets", [])
+        )
+    
+    def request_export(self):
+        """Schedule a debounced, coalesced incremental export (non-blocking)"""
+        if self.scheduler is None:
+            try:
+                from .export_config import export_settings
+                debounce, max_latency = export_settings.DEBOUNCE_SECONDS, export_settings.MAX_LATENCY_SECONDS
+            except ImportError:
+                debounce, max_latency = 2.0, 15.0
+            self.scheduler = ExportScheduler(self.export_incremental, debounce, max_latency)
+        self.scheduler.request()
+    
     def get_db_modification_time(self) -> float:
         """Get database file modification time"""
         try:
@@ -443,11 +691,8 @@ class DatabaseAutoExporter:
                         "current_modified": current_modified
                     })
                     
-                    # Wait a moment for any ongoing database operations to complete
-                    time.sleep(1)
-                    
-                    # Export data
-                    self.export_now()
+                    # Debounced through the scheduler, so it coalesces with hook-triggered exports
+                    self.request_export()
                     self.last_modified = current_modified
                 
                 time.sleep(check_interval)
@@ -477,10 +722,12 @@ class DatabaseAutoExporter:
         })
     
     def stop_monitoring(self):
-        """Stop monitoring database"""
+        """Stop monitoring database (a pending scheduled export is flushed first)"""
         self.monitoring = False
         if self.monitor_thread:
             self.monitor_thread.join(timeout=10)
+        if self.scheduler is not None:
+            self.scheduler.stop(flush=True)
         
         log_info("app.database", "Database monitoring stopped", "monitor_stopped", {})
 
@@ -32,6 +32,8 @@ class DatabaseExportSettings(BaseSettings):
     # Performance settings
     USE_BACKGROUND_THREADS: bool = True
     MAX_EXPORT_SIZE_MB: int = 50  # Maximum export file size
+    DEBOUNCE_SECONDS: float = 2.0  # wait for writes to go quiet before exporting
+    MAX_LATENCY_SECONDS: float = 15.0  # export at the latest this long after the first pending change
     
     # Environment-based overrides
     # These can be set via environment variables
@@ -82,7 +84,9 @@ class DatabaseExportSettings(BaseSettings):
             },
             "performance": {
                 "background_threads": self.USE_BACKGROUND_THREADS,
-                "max_size_mb": self.MAX_EXPORT_SIZE_MB
+                "max_size_mb": self.MAX_EXPORT_SIZE_MB,
+                "debounce_seconds": self.DEBOUNCE_SECONDS,
+                "max_latency_seconds": self.MAX_LATENCY_SECONDS
             },
             "environment": self.ENVIRONMENT
         }
@@ -94,4 +98,5 @@ export_settings = DatabaseExportSettings()
 # DB_EXPORT_ENVIRONMENT=production
 # DB_EXPORT_ENABLE_MONITORING=false
 # DB_EXPORT_CHECK_INTERVAL=30
+# DB_EXPORT_DEBOUNCE_SECONDS=5
 # DB_EXPORT_EXPORT_DIRECTORY=/var/exports/database
\ No newline at end of file
@@ -47,12 +47,11 @@ def trigger_export():
     exporter = get_exporter()
     if exporter:
         try:
-            # Use a separate thread to avoid blocking the main operation
-            import threading
-            export_thread = threading.Thread(target=exporter.export_now, daemon=True)
-            export_thread.start()
+            # Debounced and coalesced on the exporter's single worker thread; a burst of
+            # writes produces one incremental export instead of one full dump per write
+            exporter.request_export()
             
-            logger.debug("app.database", "Database export triggered", "export_triggered", {})
+            logger.debug("app.database", "Database export requested", "export_triggered", {})
         except Exception as e:
             logger.error("app.database", "Failed to trigger database export", "export_trigger_error", {
                 "error": str(e)
@@ -85,33 +84,30 @@ def patch_database_operations():
     try:
         from . import operations
         
-        # Patch Project operations
-        if hasattr(operations, 'ProjectOperations'):
-            operations.ProjectOperations.create_project = with_auto_export(operations.ProjectOperations.create_project)
-            operations.ProjectOperations.update_project = with_auto_export(operations.ProjectOperations.update_project)
-            operations.ProjectOperations.delete_project = with_auto_export(operations.ProjectOperations.delete_project)
+        patch_targets = {
+            'ProjectOperations': ['create_project', 'update_project', 'delete_project'],
+            'DatasetOperations': ['create_dataset', 'update_dataset', 'delete_dataset'],
+            'ImageOperations': ['create_image', 'update_image', 'delete_image', 'move_image'],
+            'AnnotationOperations': ['create_annotation', 'update_annotation', 'delete_annotation',
+                                     'bulk_create_annotations'],
+        }
         
-        # Patch Dataset operations
-        if hasattr(operations, 'DatasetOperations'):
-            operations.DatasetOperations.create_dataset = with_auto_export(operations.DatasetOperations.create_dataset)
-            operations.DatasetOperations.update_dataset = with_auto_export(operations.DatasetOperations.update_dataset)
-            operations.DatasetOperations.delete_dataset = with_auto_export(operations.DatasetOperations.delete_dataset)
+        # Patch each operation that exists; a missing one must not stop the rest
+        patched = []
+        for class_name, method_names in patch_targets.items():
+            operations_class = getattr(operations, class_name, None)
+            if operations_class is None:
+                continue
+            for method_name in method_names:
+                method = getattr(operations_class, method_name, None)
+                if method is None:
+                    continue
+                setattr(operations_class, method_name, staticmethod(with_auto_export(method)))
+                patched.append(f"{class_name}.{method_name}")
         
-        # Patch Image operations
-        if hasattr(operations, 'ImageOperations'):
-            operations.ImageOperations.create_image = with_auto_export(operations.ImageOperations.create_image)
-            operations.ImageOperations.update_image = with_auto_export(operations.ImageOperations.update_image)
-            operations.ImageOperations.delete_image = with_auto_export(operations.ImageOperations.delete_image)
-            operations.ImageOperations.move_image = with_auto_export(operations.ImageOperations.move_image)
-        
-        # Patch Annotation operations
-        if hasattr(operations, 'AnnotationOperations'):
-            operations.AnnotationOperations.create_annotation = with_auto_export(operations.AnnotationOperations.create_annotation)
-            operations.AnnotationOperations.update_annotation = with_auto_export(operations.AnnotationOperations.update_annotation)
-            operations.AnnotationOperations.delete_annotation = with_auto_export(operations.AnnotationOperations.delete_annotation)
-            operations.AnnotationOperations.bulk_create_annotations = with_auto_export(operations.AnnotationOperations.bulk_create_annotations)
-        
-        logger.info("app.database", "Database operations patched for auto-export", "operations_patched", {})
+        logger.info("app.database", "Database operations patched for auto-export", "operations_patched", {
+            "patched": patched
+        })
         
     except Exception as e:
         logger.error("app.database", "Failed to patch database operations", "patch_error", {
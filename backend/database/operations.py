@@ -4,7 +4,7 @@ CRUD operations for all models
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy import and_, or_, func, desc, case
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import uuid
@@ -1005,6 +1005,105 @@ class AnnotationOperations:
             })
             raise
     
+    @staticmethod
+    def bulk_create_annotations(
+        db: Session,
+        annotations: List[Dict[str, Any]],
+        image_ids: Optional[List[str]] = None,
+        is_auto_labeled: Optional[bool] = None,
+        replace_existing: bool = False,
+        chunk_size: int = 1000
+    ) -> int:
+        """
+        Insert many annotations in a single transaction and update image flags in bulk
+        
+        Args:
+            annotations: dicts with create_annotation's fields (image_id, class_name, class_id,
+                x_min, y_min, x_max, y_max and optionally confidence, segmentation,
+                is_auto_generated, model_id)
+            image_ids: images covered by this write; each ends up is_labeled only if it
+                received annotations here. Defaults to the images referenced by annotations.
+            is_auto_labeled: when not None, set on every image in image_ids
+            replace_existing: delete the existing annotations of image_ids first
+            chunk_size: rows per executemany INSERT
+        
+        Returns:
+            Number of annotations inserted
+        """
+        labeled_ids = {ann['image_id'] for ann in annotations}
+        if image_ids is None:
+            image_ids = list(labeled_ids)
+        else:
+            image_ids = list(dict.fromkeys(list(image_ids) + list(labeled_ids)))
+        
+        logger.info("app.database", "Bulk creating annotations", "annotation_bulk_creation_start", {
+            "annotations_count": len(annotations),
+            "images_count": len(image_ids),
+            "replace_existing": replace_existing,
+            "is_auto_labeled": is_auto_labeled
+        })
+        
+        now = datetime.utcnow()
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "image_id": ann['image_id'],
+                "class_name": ann['class_name'],
+                "class_id": ann['class_id'],
+                "confidence": ann.get('confidence', 1.0),
+                "x_min": ann['x_min'],
+                "y_min": ann['y_min'],
+                "x_max": ann['x_max'],
+                "y_max": ann['y_max'],
+                "segmentation": ann.get('segmentation'),
+                "is_auto_generated": ann.get('is_auto_generated', False),
+                "is_verified": False,
+                "model_id": ann.get('model_id'),
+                "created_at": now,
+                "updated_at": now
+            }
+            for ann in annotations
+        ]
+        
+        try:
+            if replace_existing and image_ids:
+                for start in range(0, len(image_ids), chunk_size):
+                    db.query(Annotation).filter(
+                        Annotation.image_id.in_(image_ids[start:start + chunk_size])
+                    ).delete(synchronize_session=False)
+            
+            for start in range(0, len(rows), chunk_size):
+                db.bulk_insert_mappings(Annotation, rows[start:start + chunk_size])
+            
+            # One UPDATE per chunk of images: is_labeled follows whether the image got rows
+            for start in range(0, len(image_ids), chunk_size):
+                chunk = image_ids[start:start + chunk_size]
+                values = {
+                    Image.is_labeled: case((Image.id.in_([i for i in chunk if i in labeled_ids]), True), else_=False),
+                    Image.updated_at: now
+                }
+                if is_auto_labeled is not None:
+                    values[Image.is_auto_labeled] = is_auto_labeled
+                db.query(Image).filter(Image.id.in_(chunk)).update(values, synchronize_session=False)
+            
+            db.commit()
+            
+            logger.info("app.database", "Annotations bulk created successfully", "annotation_bulk_creation_complete", {
+                "annotations_count": len(rows),
+                "images_count": len(image_ids),
+                "labeled_images": len(labeled_ids)
+            })
+            return len(rows)
+        except Exception as e:
+            db.rollback()
+            logger.error("errors.system", f"Bulk annotation creation failed: {str(e)}", "annotation_bulk_creation_error", {
+                "annotations_count": len(rows),
+                "images_count": len(image_ids),
+                "error": str(e),
+                "error_type": type(e).__name__
+            })
+            raise
+    
     @staticmethod
     def get_annotations_by_image(db: Session, image_id: str) -> List[Annotation]:
         """Get all annotations for an image"""
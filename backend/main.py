@@ -117,6 +117,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Preview-Applied-Transformations", "X-Preview-Image-Width", "X-Preview-Image-Height",
+                    "X-Preview-Processing-Time-Ms", "X-Preview-Proxy-Hit"],
 )
 
 # ✅ NEW: Include labels route
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Compare fused photometric lookup tables with the sequential ImageTransformer steps.
+Usage: python backend/scripts/benchmark_photometric_lut.py [image_path] [repeats]
+Without an image a 1920x1080 synthetic frame is used.
+"""
+import sys
+import os
+# Add the backend package directory so imports like `from core.config` work
+backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+from api.services.image_transformer import ImageTransformer
+from core.photometric_lut import benchmark
+
+# (label, transformation config) pairs, each a run of point-wise steps
+CHAINS = [
+    ("brightness", {'brightness': {'percentage': 20}}),
+    ("brightness+contrast+gamma", {
+        'brightness': {'percentage': -15},
+        'contrast': {'percentage': 30},
+        'gamma_correction': {'gamma': 1.4}
+    }),
+    ("gamma+grayscale+contrast+brightness", {
+        'gamma_correction': {'gamma': 0.8},
+        'grayscale': {},
+        'contrast': {'percentage': 25},
+        'brightness': {'percentage': 10}
+    }),
+    ("color_jitter+brightness+contrast", {
+        'color_jitter': {'brightness_variation': 10, 'contrast_variation': -15},
+        'brightness': {'percentage': 20},
+        'contrast': {'percentage': -20}
+    }),
+]
+
+
+def load_image(path=None) -> Image.Image:
+    if path:
+        return Image.open(path).convert("RGB")
+    noise = np.random.default_rng(0).integers(0, 256, (1080, 1920, 3), dtype=np.uint8)
+    return Image.fromarray(noise).filter(ImageFilter.GaussianBlur(4))
+
+
+def run(path=None, repeats=5):
+    image = load_image(path)
+    sequential = ImageTransformer(fuse_photometric=False)
+    fused = ImageTransformer(fuse_photometric=True)
+    for label, config in CHAINS:
+        ops = []
+        for name, params in config.items():
+            ops.extend(fused._photometric_ops(name, params))
+        result = benchmark(image, ops, lambda img, c=config: sequential.apply_transformations(img, c), repeats)
+        print(f"{label:38s} sequential {result['sequential_ms']:8.2f} ms   fused {result['fused_ms']:7.2f} ms"
+              f"   x{result['speedup']:<6}  max diff {result['max_abs_diff']}")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1] if len(sys.argv) > 1 else None, int(sys.argv[2]) if len(sys.argv) > 2 else 5)
@@ -8,7 +8,7 @@ import numpy as np
 import random
 import math
 from PIL import Image, ImageEnhance, ImageFilter
-from typing import List, Dict, Tuple, Optional, Any
+from typing import List, Dict, Tuple, Optional, Any, Union
 import albumentations as A
 from albumentations.pytorch import ToTensorV2
 import json
@@ -33,6 +33,7 @@ from core.transformation_config import (
     get_blur_parameters, get_hue_parameters,
     get_saturation_parameters, get_gamma_parameters
 )
+from core.image_buffer import ImageBuffer
 
 
 class AdvancedDataAugmentation:
@@ -497,13 +498,14 @@ class AdvancedDataAugmentation:
         
         return self.augmentation_pipeline
     
-    def apply_augmentation(self, image: np.ndarray, bboxes: List[List[float]], 
-                          class_labels: List[str]) -> Tuple[np.ndarray, List[List[float]], List[str]]:
+    def apply_augmentation(self, image: Union[np.ndarray, ImageBuffer], bboxes: List[List[float]], 
+                          class_labels: List[str]) -> Tuple[Union[np.ndarray, ImageBuffer], List[List[float]], List[str]]:
         """
         Apply augmentation to image and annotations
         
         Args:
-            image: Input image as numpy array
+            image: Input image as numpy array, or an ImageBuffer (augmented as RGB and
+                returned as an ImageBuffer)
             bboxes: List of bounding boxes in YOLO format [x_center, y_center, width, height]
             class_labels: List of class labels for each bbox
             
@@ -524,7 +526,7 @@ class AdvancedDataAugmentation:
             
         try:
             augmented = self.augmentation_pipeline(
-                image=image,
+                image=image.array('RGB') if isinstance(image, ImageBuffer) else image,
                 bboxes=bboxes,
                 class_labels=class_labels
             )
@@ -535,7 +537,10 @@ class AdvancedDataAugmentation:
                 'output_labels_count': len(augmented['class_labels']) if 'class_labels' in augmented else 0
             })
             
-            return augmented['image'], augmented['bboxes'], augmented['class_labels']
+            output = augmented['image']
+            if isinstance(image, ImageBuffer):
+                output = ImageBuffer.from_array(output, 'RGB')
+            return output, augmented['bboxes'], augmented['class_labels']
         except Exception as e:
             logger.error("errors.system", f"Augmentation failed: {str(e)}", "augmentation_failed", {
                 'error': str(e),
@@ -22,6 +22,7 @@ from core.transformation_config import (
     get_random_zoom_parameters, get_affine_transform_parameters,
     get_perspective_warp_parameters
 )
+from core import array_augment
 
 logger = get_professional_logger()
 
@@ -30,7 +31,10 @@ class ImageTransformer:
     Handles all image transformation operations
     """
     
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
+        # Random draws of noise and cutout (seed for reproducible output)
+        self.rng = np.random.default_rng(seed)
+        
         logger.info("operations.transformations", "Initializing ImageTransformer with transformation methods", "transformer_init", {
             'transformation_count': 18,
             'basic_transformations': ['resize', 'rotate', 'flip', 'crop', 'brightness', 'contrast', 'blur', 'noise'],
@@ -738,15 +742,11 @@ class ImageTransformer:
                 'params': params
             })
             
-            # Convert to numpy array
-            img_array = np.array(image)
-            
-            # Generate noise
-            noise = np.random.normal(0, std * 255, img_array.shape)
-            
-            # Add noise and clip values
-            noisy_array = np.clip(img_array + noise, 0, 255).astype(np.uint8)
-            result = Image.fromarray(noisy_array)
+            # Add noise in place on the thread's working buffer
+            workspace = array_augment.get_workspace()
+            pixels = workspace.load(image)
+            array_augment.add_noise(pixels, self.rng, 'gaussian', std, workspace)
+            result = workspace.result(image, pixels)
             
             logger.info("operations.transformations", f"Noise transformation completed", "noise_success", {
                 'original_size': f"{original_size[0]}x{original_size[1]}",
@@ -777,40 +777,20 @@ class ImageTransformer:
                 'params': params
             })
             
-            result = image
-            applied_effects = []
-            
-            # Apply brightness
             brightness_factor = params.get('brightness', color_jitter_params['brightness']['default'])
-            if brightness_factor != 1.0:
-                enhancer = ImageEnhance.Brightness(result)
-                result = enhancer.enhance(brightness_factor)
-                applied_effects.append(f"brightness({brightness_factor})")
-            
-            # Apply contrast
             contrast_factor = params.get('contrast', color_jitter_params['contrast']['default'])
-            if contrast_factor != 1.0:
-                enhancer = ImageEnhance.Contrast(result)
-                result = enhancer.enhance(contrast_factor)
-                applied_effects.append(f"contrast({contrast_factor})")
-            
-            # Apply saturation
             saturation_factor = params.get('saturation', color_jitter_params['saturation']['default'])
-            if saturation_factor != 1.0:
-                enhancer = ImageEnhance.Color(result)
-                result = enhancer.enhance(saturation_factor)
-                applied_effects.append(f"saturation({saturation_factor})")
-            
-            # Apply hue shift (simplified implementation)
             hue_shift = params.get('hue', color_jitter_params['hue']['default'])
-            if hue_shift != 0:
-                # Convert to HSV, shift hue, convert back
-                img_array = np.array(result)
-                hsv = cv2.cvtColor(img_array, cv2.COLOR_RGB2HSV)
-                hsv[:, :, 0] = (hsv[:, :, 0] + hue_shift * 180) % 180
-                rgb = cv2.cvtColor(hsv, cv2.COLOR_HSV2RGB)
-                result = Image.fromarray(rgb)
-                applied_effects.append(f"hue({hue_shift})")
+            
+            # Brightness, contrast, saturation, then hue (simplified HSV shift), in place
+            workspace = array_augment.get_workspace()
+            pixels = workspace.load(image, 'RGB' if image.mode == 'RGB' else None)
+            values = {'brightness': brightness_factor, 'contrast': contrast_factor,
+                      'saturation': saturation_factor, 'hue': hue_shift}
+            applied_effects = [f"{effect}({values[effect]})" for effect in array_augment.color_jitter(
+                pixels, workspace, hue_shift, brightness_factor, contrast_factor, saturation_factor,
+                order=['brightness', 'contrast', 'saturation', 'hue'])]
+            result = workspace.result(image, pixels)
             
             logger.info("operations.transformations", f"Color jitter transformation completed", "color_jitter_success", {
                 'original_size': f"{original_size[0]}x{original_size[1]}",
@@ -849,17 +829,10 @@ class ImageTransformer:
                 'params': params
             })
             
-            img_array = np.array(image)
-            height, width = img_array.shape[:2]
-            hole_positions = []
-            
-            for i in range(num_holes):
-                y = random.randint(0, height - hole_size)
-                x = random.randint(0, width - hole_size)
-                img_array[y:y+hole_size, x:x+hole_size] = 0
-                hole_positions.append(f"({x},{y})")
-            
-            result = Image.fromarray(img_array)
+            workspace = array_augment.get_workspace()
+            pixels = workspace.load(image)
+            hole_positions = [f"({x},{y})" for x, y in array_augment.cutout(pixels, self.rng, num_holes, hole_size)]
+            result = workspace.result(image, pixels)
             
             logger.info("operations.transformations", f"Cutout transformation completed", "cutout_success", {
                 'original_size': f"{original_size[0]}x{original_size[1]}",
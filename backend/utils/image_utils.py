@@ -7,7 +7,9 @@ import numpy as np
 from PIL import Image, ImageEnhance, ImageFilter
 import base64
 import io
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Tuple, Optional, Union
+
+from core.image_buffer import COLOR_ORDERS, ImageBuffer
 
 # Import professional logging system
 from logging_system.professional_logger import get_professional_logger
@@ -15,25 +17,31 @@ from logging_system.professional_logger import get_professional_logger
 # Initialize professional logger
 logger = get_professional_logger()
 
-def encode_image_to_base64(image: np.ndarray) -> str:
-    """Convert numpy image array to base64 string"""
+def encode_image_to_base64(image: Union[np.ndarray, ImageBuffer]) -> str:
+    """Convert numpy image array (BGR) or ImageBuffer to base64 string"""
     logger.info("operations.images", "Starting image encoding to base64", "encode_image_start", {
         'image_shape': image.shape if image is not None else None,
         'image_dtype': str(image.dtype) if image is not None else None
     })
     
     try:
-        # Convert BGR to RGB if needed
-        if len(image.shape) == 3 and image.shape[2] == 3:
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            logger.info("operations.images", "Converted BGR to RGB", "color_conversion", {
-                'conversion': 'BGR2RGB'
-            })
+        if isinstance(image, ImageBuffer):
+            # The buffer knows its color order; no guessing or round trip needed
+            pil_image = image.pil()
+            if pil_image.mode not in ('RGB', 'L'):
+                pil_image = pil_image.convert('RGB')
         else:
-            image_rgb = image
-        
-        # Convert to PIL Image
-        pil_image = Image.fromarray(image_rgb.astype(np.uint8))
+            # Convert BGR to RGB if needed
+            if len(image.shape) == 3 and image.shape[2] == 3:
+                image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+                logger.info("operations.images", "Converted BGR to RGB", "color_conversion", {
+                    'conversion': 'BGR2RGB'
+                })
+            else:
+                image_rgb = image
+            
+            # Convert to PIL Image
+            pil_image = Image.fromarray(image_rgb.astype(np.uint8))
         
         # Convert to base64
         buffer = io.BytesIO()
@@ -164,8 +172,8 @@ def save_image_to_file(image: np.ndarray, file_path: str) -> bool:
         })
         return False
 
-def resize_image_for_preview(image: np.ndarray, max_size: int = 400) -> np.ndarray:
-    """Resize image for preview while maintaining aspect ratio"""
+def resize_image_for_preview(image: Union[np.ndarray, ImageBuffer], max_size: int = 400) -> Union[np.ndarray, ImageBuffer]:
+    """Resize image (array or ImageBuffer, returned as the same kind) for preview while maintaining aspect ratio"""
     logger.info("operations.images", "Resizing image for preview", "resize_preview_start", {
         'original_shape': image.shape if image is not None else None,
         'max_size': max_size
@@ -179,7 +187,14 @@ def resize_image_for_preview(image: np.ndarray, max_size: int = 400) -> np.ndarr
     if scale < 1:
         new_width = int(width * scale)
         new_height = int(height * scale)
-        resized = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_AREA)
+        if isinstance(image, ImageBuffer):
+            # Resize the native pixels and keep their color order
+            order = image.order if image.order in COLOR_ORDERS else 'RGB'
+            resized = ImageBuffer.from_array(
+                cv2.resize(image.array(order), (new_width, new_height), interpolation=cv2.INTER_AREA), order
+            )
+        else:
+            resized = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_AREA)
         
         logger.info("operations.images", "Image resized for preview", "resize_preview_success", {
             'original_shape': (height, width),
@@ -230,8 +245,12 @@ def validate_image_format(image: np.ndarray) -> bool:
     
     return True
 
-def normalize_image_values(image: np.ndarray) -> np.ndarray:
+def normalize_image_values(image: Union[np.ndarray, ImageBuffer]) -> Union[np.ndarray, ImageBuffer]:
     """Normalize image values to 0-255 range"""
+    if isinstance(image, ImageBuffer):
+        # Buffers always hold 8-bit pixels
+        return image
+    
     logger.info("operations.images", "Normalizing image values", "normalize_values_start", {
         'original_dtype': str(image.dtype),
         'original_min': float(np.min(image)),
@@ -259,8 +278,12 @@ def normalize_image_values(image: np.ndarray) -> np.ndarray:
     
     return image
 
-def convert_to_rgb(image: np.ndarray) -> np.ndarray:
-    """Convert image to RGB format"""
+def convert_to_rgb(image: Union[np.ndarray, ImageBuffer]) -> np.ndarray:
+    """Convert image to RGB format (bare arrays are assumed to be BGR, as from cv2)"""
+    if isinstance(image, ImageBuffer):
+        # Known color order: no copy when the buffer is already RGB
+        return image.array('RGB')
+    
     logger.info("operations.images", "Converting image to RGB format", "convert_to_rgb_start", {
         'original_shape': image.shape,
         'original_channels': image.shape[2] if len(image.shape) == 3 else 1
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Modal, Form, Input, Button, Row, Col, Card, message, Spin, Alert, Divider, Slider, Space, Select } from 'antd';
 import { SettingOutlined, EyeOutlined, SaveOutlined, ArrowLeftOutlined, RocketOutlined } from '@ant-design/icons';
 import IndividualTransformationControl from './IndividualTransformationControl';
@@ -56,6 +56,12 @@ const TransformationModal = ({
   const [validationErrors, setValidationErrors] = useState([]);
   const [currentSelectedImage, setCurrentSelectedImage] = useState(null); // Store the current image for reuse
   const [combinationCount, setCombinationCount] = useState(1); // Track number of possible combinations
+  // Slider drags fire bursts of previews: the backend renders only the latest request per
+  // session and image, and only the newest response here may update the preview
+  const previewSessionId = useRef(
+    window.crypto?.randomUUID ? window.crypto.randomUUID() : `${Date.now()}-${Math.random().toString(36).slice(2)}`
+  );
+  const latestPreviewRequest = useRef(0);
 
   // Calculate combination count based on parameter ranges
   const calculateCombinationCount = (config, transformationDetails) => {
@@ -120,6 +126,15 @@ const TransformationModal = ({
     return finalCombinationCount;
   };
 
+  // Binary previews arrive as blob URLs; release each one once it is replaced
+  useEffect(() => {
+    return () => {
+      if (previewImage && previewImage.startsWith('blob:')) {
+        URL.revokeObjectURL(previewImage);
+      }
+    };
+  }, [previewImage]);
+
   // Initialize form and config when modal opens or editing transformation changes
   useEffect(() => {
     if (visible) {
@@ -421,6 +436,9 @@ const TransformationModal = ({
       return;
     }
 
+    const previewRequest = ++latestPreviewRequest.current;
+    const isStalePreview = () => previewRequest !== latestPreviewRequest.current;
+
     try {
       setPreviewLoading(true);
       setPreviewError(null);
@@ -506,12 +524,20 @@ const TransformationModal = ({
       const formData = new FormData();
       formData.append('image_id', selectedImage.id.toString());
       formData.append('transformations', JSON.stringify(transformConfig));
+      // Binary JPEG rendered from the backend's cached proxy (no base64 round trip)
+      formData.append('response_format', 'jpeg');
+      formData.append('session_id', previewSessionId.current);
       
       const previewResponse = await fetch('http://localhost:12000/api/transformation/preview-with-image-id', {
         method: 'POST',
         body: formData
       });
       
+      // 409: a newer request from this modal replaced this one before it was rendered
+      if (previewResponse.status === 409 || isStalePreview()) {
+        return;
+      }
+      
       if (!previewResponse.ok) {
         logError('app.frontend.interactions', 'preview_api_failed', 'Preview API call failed', {
           timestamp: new Date().toISOString(),
@@ -524,21 +550,13 @@ const TransformationModal = ({
         throw new Error('Failed to generate transformation preview');
       }
       
-      const previewResult = await previewResponse.json();
-      
-      if (!previewResult.success) {
-        logError('app.frontend.interactions', 'preview_backend_failed', 'Backend failed to generate preview', {
-          timestamp: new Date().toISOString(),
-          transformationType: transformationType,
-          imageId: selectedImage.id,
-          backendError: previewResult.error || 'Unknown backend error',
-          function: 'generatePreview'
-        });
-        throw new Error('Backend failed to generate preview');
+      const previewBlob = await previewResponse.blob();
+      if (isStalePreview()) {
+        return;
       }
       
       // Set the preview image from the backend response
-      setPreviewImage(previewResult.data.preview_image);
+      setPreviewImage(URL.createObjectURL(previewBlob));
       
       // Only set the original image if we're NOT using a provided image
       // This prevents the original image from changing when parameters are updated
@@ -546,9 +564,13 @@ const TransformationModal = ({
         setOriginalImage(`http://localhost:12000/api/images/${selectedImage.id}`);
       }
       
-      // Log the successful transformation
-      const appliedTransformations = previewResult.data.applied_transformations;
-      const processingTime = previewResult.data.processing_time_ms;
+      // Log the successful transformation (metadata travels in X-Preview-* headers)
+      const appliedTransformations = (previewResponse.headers.get('X-Preview-Applied-Transformations') || '').split(',').filter(Boolean);
+      const processingTime = Number(previewResponse.headers.get('X-Preview-Processing-Time-Ms'));
+      const imageDimensions = {
+        width: Number(previewResponse.headers.get('X-Preview-Image-Width')),
+        height: Number(previewResponse.headers.get('X-Preview-Image-Height'))
+      };
       
       logInfo('app.frontend.interactions', 'preview_generated_successfully', 'Preview generated successfully', {
         timestamp: new Date().toISOString(),
@@ -557,8 +579,8 @@ const TransformationModal = ({
         imageFilename: selectedImage.filename,
         appliedTransformations: appliedTransformations,
         processingTimeMs: processingTime,
-        originalDimensions: previewResult.data.image_dimensions,
-        previewDimensions: previewResult.data.preview_dimensions,
+        transformedDimensions: imageDimensions,
+        previewBytes: previewBlob.size,
         function: 'generatePreview'
       });
       
@@ -566,8 +588,8 @@ const TransformationModal = ({
       console.log(`📸 Image: ${selectedImage.filename}`);
       console.log(`🔧 Applied transformations: ${appliedTransformations.join(', ')}`);
       console.log(`⏱️ Processing time: ${processingTime}ms`);
-      console.log(`📐 Original dimensions: ${previewResult.data.image_dimensions.width}x${previewResult.data.image_dimensions.height}`);
-      console.log(`🖼️ Preview dimensions: ${previewResult.data.preview_dimensions.width}x${previewResult.data.preview_dimensions.height}`);
+      console.log(`📐 Transformed dimensions: ${imageDimensions.width}x${imageDimensions.height}`);
+      console.log(`🖼️ Preview size: ${previewBlob.size} bytes`);
       
     } catch (error) {
       logError('app.frontend.interactions', 'generate_preview_failed', 'Failed to generate preview', {
@@ -577,9 +599,13 @@ const TransformationModal = ({
         function: 'generatePreview'
       });
       console.error('Failed to generate preview:', error);
-      setPreviewError("Failed to generate preview. Please try again.");
+      if (!isStalePreview()) {
+        setPreviewError("Failed to generate preview. Please try again.");
+      }
     } finally {
-      setPreviewLoading(false);
+      if (!isStalePreview()) {
+        setPreviewLoading(false);
+      }
       logInfo('app.frontend.ui', 'generate_preview_completed', 'Generate preview completed', {
         timestamp: new Date().toISOString(),
         function: 'generatePreview'
@@ -937,11 +937,15 @@ export const augmentationAPI = {
   },
 
   // Generate transformation preview
-  generatePreview: async (imageFile, transformations) => {
+  // sessionId (optional): requests from one session are latest-wins on the backend (409 when superseded)
+  generatePreview: async (imageFile, transformations, sessionId = null) => {
     try {
       const formData = new FormData();
       formData.append('image', imageFile);
       formData.append('transformations', JSON.stringify(transformations));
+      if (sessionId) {
+        formData.append('session_id', sessionId);
+      }
 
       const response = await api.post('/api/transformation/preview', formData, {
         headers: {